@@ -152,6 +152,7 @@ class ResponsibleAdmin(CatalogReferenceAdminMixin, BaseAdmin):
         "middle_name",
         "employee_id",
         "user",
+        "email_digest",
     )
 
     def get_queryset(self, request: HttpRequest) -> QuerySet[Responsible]:
@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 from django.utils.translation import gettext_lazy as _
 
 
@@ -8,4 +9,6 @@ class CatalogsConfig(AppConfig):
     verbose_name = _("Catalogs")
 
     def ready(self) -> None:
-        import catalogs.signals  # noqa: F401
+        import catalogs.signals
+
+        post_migrate.connect(catalogs.signals.ensure_on_hand_location, sender=self)
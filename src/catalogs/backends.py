@@ -0,0 +1,26 @@
+"""Authentication backend that loads the linked ``Responsible`` with the user."""
+
+from typing import Any
+
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+
+
+class ResponsibleModelBackend(ModelBackend):
+    """
+    ``ModelBackend`` whose session user load joins ``Responsible`` in one query.
+
+    ``request.user.responsible`` (templates, ``request_responsible()``,
+    notifications) is then answered from the relation cache instead of a
+    separate lookup on every authenticated request.
+    """
+
+    def get_user(self, user_id: Any) -> Any:
+        user_model = get_user_model()
+        try:
+            user = user_model._default_manager.select_related("responsible").get(
+                pk=user_id
+            )
+        except user_model.DoesNotExist:
+            return None
+        return user if self.user_can_authenticate(user) else None
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalogs", "0006_alter_location_name"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="responsible",
+            name="email_digest",
+            field=models.BooleanField(
+                default=False,
+                help_text=(
+                    "Collect inventory notifications into one summary email per "
+                    "digest interval instead of one email per change."
+                ),
+                verbose_name="Email digest",
+            ),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from typing import Any, Optional, Union
+from typing import Any, ClassVar, Optional, Union, cast
 
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
@@ -6,6 +6,8 @@ from django.contrib.auth.models import AnonymousUser
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
 from django.db.models import Q, QuerySet
+from django.db.models.fields.reverse_related import OneToOneRel
+from django.dispatch import Signal
 from django.utils.translation import gettext
 from django.utils.translation import gettext_lazy as _
 
@@ -45,6 +47,9 @@ class Location(CatalogCorrectionWindowMixin, NamedModel):
 
     objects = LocationQuerySet.as_manager()
 
+    #: Primary key of the committed ``on_hand`` row, cached per process.
+    _on_hand_pk_cache: ClassVar[int | None] = None
+
     class Meta:
         verbose_name = _("Location")
         verbose_name_plural = _("Locations")
@@ -76,8 +81,53 @@ class Location(CatalogCorrectionWindowMixin, NamedModel):
             responsible=None,
             name=cls.ON_HAND,
         )
+        cls._remember_on_hand_id(location.pk)
         return location
 
+    @classmethod
+    def on_hand_id(cls) -> int:
+        """
+        Return the primary key of the ``on_hand`` location without a query.
+
+        The row is created at migrate time (``post_migrate``) and cannot be
+        renamed or deleted, so its id is cached for the lifetime of the process
+        once it has been read from committed data. The first call (and the first
+        call after any ``Location`` save/delete, see ``catalogs.signals``) falls
+        back to ``on_hand()``.
+        """
+
+        cached = cls._on_hand_pk_cache
+        if cached is not None:
+            return cached
+        return cls.on_hand().pk
+
+    @classmethod
+    def is_on_hand_id(cls, location_id: int | None) -> bool:
+        """True when ``location_id`` is the cached ``on_hand`` id (no query)."""
+
+        return location_id is not None and location_id == cls._on_hand_pk_cache
+
+    @classmethod
+    def _remember_on_hand_id(cls, pk: int) -> None:
+        """
+        Cache ``pk`` once the surrounding transaction commits.
+
+        A row inserted by ``get_or_create`` inside a transaction that later rolls
+        back must not end up in the cache; ``on_commit`` runs immediately in
+        autocommit mode and is discarded on rollback.
+        """
+
+        def remember() -> None:
+            cls._on_hand_pk_cache = pk
+
+        transaction.on_commit(remember)
+
+    @classmethod
+    def forget_on_hand_id(cls) -> None:
+        """Drop the cached ``on_hand`` id (next ``on_hand_id()`` re-reads it)."""
+
+        cls._on_hand_pk_cache = None
+
     @property
     def is_system_location(self) -> bool:
         return self.responsible_id is None and self.name == self.ON_HAND
@@ -155,6 +205,13 @@ class Location(CatalogCorrectionWindowMixin, NamedModel):
         return Operation.objects.filter(location_id=self.pk).exists()
 
 
+#: Sent by ``catalogs.signals`` instead of an immediate email when a change to a
+#: ``Responsible`` that opted into ``email_digest`` is reported to its own linked
+#: user, with ``responsible`` and ``event`` ("linked" or "updated"), inside the
+#: saving transaction. ``inventory.signals`` queues it for the digest.
+responsible_digest_event = Signal()
+
+
 class Responsible(CatalogCorrectionWindowMixin, BaseModel):
     """Person responsible for inventory items.
 
@@ -181,6 +238,14 @@ class Responsible(CatalogCorrectionWindowMixin, BaseModel):
         blank=True,
         verbose_name=_("User"),
     )
+    email_digest = models.BooleanField(
+        default=False,
+        verbose_name=_("Email digest"),
+        help_text=_(
+            "Collect inventory notifications into one summary email per "
+            "digest interval instead of one email per change."
+        ),
+    )
 
     class Meta:
         verbose_name = _("Responsible")
@@ -246,11 +311,18 @@ class Responsible(CatalogCorrectionWindowMixin, BaseModel):
         Return the ``Responsible`` row linked to this Django user, if any.
 
         Anonymous or unlinked accounts return ``None`` so callers can show an
-        empty inventory UI without raising.
+        empty inventory UI without raising. When the profile was already joined
+        into the user load (``ResponsibleModelBackend``), the cached relation is
+        used and no query is issued. Views call
+        ``catalogs.request_helpers.request_responsible()``, which memoizes the answer
+        per request.
         """
 
-        if not getattr(user, "is_authenticated", False):
+        if isinstance(user, AnonymousUser) or not user.is_authenticated:
             return None
+        linked = cast(OneToOneRel, cls._meta.get_field("user").remote_field)
+        if linked.is_cached(user):
+            return cast(Optional["Responsible"], linked.get_cached_value(user))
         return cls.objects.filter(user=user).first()
 
     @classmethod
@@ -0,0 +1,24 @@
+"""Per-request resolution of the ``Responsible`` linked to ``request.user``."""
+
+from django.http import HttpRequest
+
+from catalogs.models import Responsible
+
+
+def request_responsible(request: HttpRequest) -> Responsible | None:
+    """
+    Return the ``Responsible`` linked to ``request.user`` (or ``None``).
+
+    Resolved on first call and memoized on the request, so views, context
+    processors, and templates share one answer and requests that never ask
+    (static files, health checks, anonymous pages) do no lookup. With
+    ``ResponsibleModelBackend`` the profile arrives joined to the session user,
+    so even the first call costs no query of its own.
+    """
+
+    try:
+        return request._cached_responsible  # type: ignore[attr-defined, no-any-return]
+    except AttributeError:
+        responsible = Responsible.linked_profile_for_user(request.user)
+        request._cached_responsible = responsible  # type: ignore[attr-defined]
+        return responsible
@@ -1,18 +1,25 @@
 """Signal handlers for catalog model changes.
 
 This module handles email notifications when a Responsible record's
-linked user changes. The _pre_save_user_id attribute is set by
-Responsible.save() to track the previous user assignment.
+linked user changes. Changes for users who opted into the digest are handed to
+``responsible_digest_event`` instead.
+The _pre_save_user_id attribute is set by Responsible.save() to track the
+previous user assignment.
+
+It also keeps the process-level ``on_hand`` location id cache honest
+(``Location.on_hand_id()``) and guarantees the system location exists after
+every ``migrate``/``flush``.
 """
 
 import logging
 from typing import Any
 
+from django.apps import apps as global_apps
 from django.contrib.auth import get_user_model
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from catalogs.models import Responsible
+from catalogs.models import Location, Responsible, responsible_digest_event
 from common.email_utils import send_transfer_email
 
 logger = logging.getLogger(__name__)
@@ -34,7 +41,16 @@ def _notify_responsible(
             (e.g., 'linked', 'unlinked', 'updated')
         responsible: The Responsible instance that changed
         user: The user to notify (either newly assigned or previously assigned)
+
+    Users who opted into ``email_digest`` on the profile they are linked to get
+    the event in their digest instead: ``responsible_digest_event`` is sent and
+    the inventory app queues it.
     """
+    if responsible.email_digest and responsible.user_id == user.pk:
+        responsible_digest_event.send(
+            sender=Responsible, responsible=responsible, event=template_name
+        )
+        return
     send_transfer_email(
         f"emails/responsible_{template_name}_subject.txt",
         f"emails/responsible_{template_name}_body.txt",
@@ -87,3 +103,36 @@ def notify_responsible_user_changed(
         logger.exception(
             "Failed to send responsible notification for responsible %s", instance.pk
         )
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def forget_cached_on_hand_location(
+    sender: type[Location], instance: Location, **kwargs: Any
+) -> None:
+    """Drop the cached ``on_hand`` id whenever any location row is written.
+
+    Location writes are rare admin actions, so invalidating on every one is
+    cheaper than deciding whether the system row was affected.
+    """
+    Location.forget_on_hand_id()
+
+
+def ensure_on_hand_location(
+    sender: Any, using: str, apps: Any = global_apps, **kwargs: Any
+) -> None:
+    """Create the global ``on_hand`` location after ``migrate`` or ``flush``.
+
+    Connected to ``post_migrate`` for the catalogs app in ``CatalogsConfig.ready``.
+    Uses the migration-state model so a database migrated back to before
+    ``Location.responsible`` existed is left alone; ``flush`` sends no
+    migration state, so the installed models are used then.
+    """
+    location_model = apps.get_model("catalogs", "Location")
+    field_names = {field.name for field in location_model._meta.get_fields()}
+    if "responsible" not in field_names:
+        return
+    location_model.objects.using(using).get_or_create(
+        responsible=None, name=Location.ON_HAND
+    )
+    Location.forget_on_hand_id()
@@ -1,6 +1,7 @@
 import pytest
 from django.contrib.auth.models import AnonymousUser, User
 from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.test import RequestFactory, override_settings
 
 from catalogs.models import Location, Responsible, Status
@@ -103,6 +104,46 @@ def test_location_global_on_hand_display_name() -> None:
     assert str(location) == "On hand (System)"
 
 
+@pytest.mark.django_db
+def test_location_on_hand_id_is_cached_until_location_write(
+    django_capture_on_commit_callbacks, django_assert_num_queries
+) -> None:
+    """The id is cached after commit and dropped on any Location save/delete."""
+
+    Location.forget_on_hand_id()
+    with django_capture_on_commit_callbacks(execute=True):
+        pk = Location.on_hand_id()
+    assert pk == Location.on_hand().pk
+
+    with django_assert_num_queries(0):
+        assert Location.on_hand_id() == pk
+        assert Location.is_on_hand_id(pk) is True
+        assert Location.is_on_hand_id(None) is False
+
+    shelf = Location.objects.create(name="Shelf")
+    assert Location.is_on_hand_id(pk) is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Location.on_hand_id()
+    shelf.delete()
+    assert Location.is_on_hand_id(pk) is False
+
+
+@pytest.mark.django_db
+def test_location_on_hand_id_not_cached_from_rolled_back_transaction(
+    django_capture_on_commit_callbacks,
+) -> None:
+    """A lookup inside a rolled-back transaction leaves the cache empty."""
+
+    Location.forget_on_hand_id()
+    with django_capture_on_commit_callbacks(execute=True):
+        with pytest.raises(RuntimeError), transaction.atomic():
+            Location.on_hand_id()
+            raise RuntimeError("rollback")
+
+    assert Location._on_hand_pk_cache is None
+
+
 @pytest.mark.django_db
 def test_location_system_location_protects_on_save_against_name_change() -> None:
     location = Location.on_hand()
@@ -0,0 +1,125 @@
+"""Tests for ``request_responsible()`` resolution and the joined user load."""
+
+import pytest
+from django.contrib.auth import authenticate
+from django.contrib.auth.models import AnonymousUser, User
+from django.db import connection
+from django.test import Client, RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from catalogs.backends import ResponsibleModelBackend
+from catalogs.models import Responsible
+from catalogs.request_helpers import request_responsible
+
+
+def _profile_lookups(ctx: CaptureQueriesContext) -> list[str]:
+    """Standalone ``Responsible`` by-user lookups (not the joined user load)."""
+
+    return [
+        q["sql"]
+        for q in ctx.captured_queries
+        if q["sql"].startswith('SELECT "catalogs_responsible"')
+        and '"catalogs_responsible"."user_id" =' in q["sql"]
+    ]
+
+
+@pytest.mark.django_db
+def test_authenticated_page_resolves_responsible_with_user_load() -> None:
+    """The profile arrives joined to the session user; views add no lookup."""
+
+    user = User.objects.create_user(username="mw", password="pw", email="mw@ex.com")
+    responsible = Responsible.objects.create(
+        last_name="Mid", first_name="Dle", user=user
+    )
+    client = Client()
+    client.force_login(user)
+
+    for url in ("/", "/previous/", "/locations/"):
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.get(url)
+        assert response.status_code == 200
+        assert _profile_lookups(ctx) == []
+        with CaptureQueriesContext(connection) as ctx:
+            assert request_responsible(response.wsgi_request) == responsible
+        assert ctx.captured_queries == []
+
+
+@pytest.mark.django_db
+def test_unlinked_and_anonymous_requests_get_none() -> None:
+    """Unlinked users and anonymous visitors get ``None``."""
+
+    user = User.objects.create_user(username="nl", password="pw", email="nl@ex.com")
+    client = Client()
+
+    response = client.get("/login/")
+    assert request_responsible(response.wsgi_request) is None
+
+    client.force_login(user)
+    response = client.get("/")
+    assert request_responsible(response.wsgi_request) is None
+    assert response.status_code == 302
+
+
+@pytest.mark.django_db
+def test_responsible_is_resolved_only_when_asked_for() -> None:
+    """Requests whose views never ask for the profile never resolve it."""
+
+    user = User.objects.create_user(username="lz", password="pw", email="lz@ex.com")
+    Responsible.objects.create(last_name="Lazy", first_name="Z", user=user)
+    client = Client()
+    client.force_login(user)
+
+    response = client.get("/health/liveness/")
+    assert response.status_code == 200
+    assert not hasattr(response.wsgi_request, "_cached_responsible")
+
+
+@pytest.mark.django_db
+def test_request_responsible_resolves_once_per_request() -> None:
+    """The accessor resolves the profile on first call and memoizes it."""
+
+    user = User.objects.create_user(username="rf", password="pw", email="rf@ex.com")
+    responsible = Responsible.objects.create(last_name="Rf", first_name="X", user=user)
+    request = RequestFactory().get("/")
+    request.user = User.objects.get(pk=user.pk)
+
+    assert request_responsible(request) == responsible
+    with CaptureQueriesContext(connection) as ctx:
+        assert request_responsible(request) == responsible
+    assert ctx.captured_queries == []
+
+    anonymous = RequestFactory().get("/")
+    anonymous.user = AnonymousUser()
+    assert request_responsible(anonymous) is None
+
+
+@pytest.mark.django_db
+def test_responsible_backend_get_user() -> None:
+    """``get_user`` joins the profile and rejects missing or inactive users."""
+
+    backend = ResponsibleModelBackend()
+    user = User.objects.create_user(username="be", password="pw", email="be@ex.com")
+
+    loaded = backend.get_user(user.pk)
+    assert loaded == user
+    with CaptureQueriesContext(connection) as ctx:
+        assert Responsible.linked_profile_for_user(loaded) is None
+    assert ctx.captured_queries == []
+
+    assert backend.get_user(user.pk + 1000) is None
+    User.objects.filter(pk=user.pk).update(is_active=False)
+    assert backend.get_user(user.pk) is None
+
+
+@pytest.mark.django_db
+def test_failed_login_checks_the_password_once(monkeypatch) -> None:
+    """Only one backend authenticates, so a miss hashes the password once."""
+
+    User.objects.create_user(username="pw", password="pw", email="pw@ex.com")
+    hashes: list[str] = []
+    monkeypatch.setattr(User, "check_password", lambda self, raw: hashes.append(raw))
+    monkeypatch.setattr(User, "set_password", lambda self, raw: hashes.append(raw))
+
+    assert authenticate(username="pw", password="wrong") is None
+    assert authenticate(username="nobody", password="wrong") is None
+    assert hashes == ["wrong", "wrong"]
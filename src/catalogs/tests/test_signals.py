@@ -4,8 +4,11 @@ import pytest
 from django.contrib.auth.models import User
 from django.core import mail
 from django.core.exceptions import ValidationError
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
 
-from catalogs.models import Responsible
+from catalogs.models import Location, Responsible
+from catalogs.signals import ensure_on_hand_location
 
 
 @pytest.fixture(autouse=True)
@@ -118,3 +121,37 @@ def test_responsible_notification_failure_does_not_roll_back_save() -> None:
         resp = Responsible.objects.create(last_name="Test", first_name="Err", user=user)
 
     assert Responsible.objects.filter(pk=resp.pk).exists()
+
+
+@pytest.mark.django_db
+def test_post_migrate_recreates_on_hand_location() -> None:
+    """``post_migrate`` (migrate/flush) guarantees the system location exists."""
+
+    from django.apps import apps
+
+    Location.objects.filter(responsible__isnull=True, name=Location.ON_HAND).delete()
+
+    # ``flush`` sends ``post_migrate`` without a migration state.
+    ensure_on_hand_location(sender=apps.get_app_config("catalogs"), using="default")
+
+    assert Location.objects.filter(
+        responsible__isnull=True, name=Location.ON_HAND
+    ).exists()
+
+
+@pytest.mark.django_db
+def test_post_migrate_skips_schema_without_location_responsible() -> None:
+    """Migrating back before ``Location.responsible`` does not touch the table."""
+
+    from django.apps import apps
+
+    Location.objects.filter(responsible__isnull=True, name=Location.ON_HAND).delete()
+    old_state = MigrationLoader(connection).project_state(
+        ("catalogs", "0004_alter_location_options_alter_status_options")
+    )
+
+    ensure_on_hand_location(
+        sender=apps.get_app_config("catalogs"), apps=old_state.apps, using="default"
+    )
+
+    assert not Location.objects.filter(name=Location.ON_HAND).exists()
@@ -9,7 +9,8 @@ from django.http import HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils.translation import gettext_lazy as _
 
-from .models import Location, Responsible
+from .models import Location
+from .request_helpers import request_responsible
 
 
 class _LocationForm(forms.Form):
@@ -26,7 +27,7 @@ class _LocationForm(forms.Form):
 def location_list(request: HttpRequest) -> HttpResponse:
     """List personal locations for the current user, with optional search."""
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     has_any = False
     locations: list[Location] = []
 
@@ -60,7 +61,7 @@ def location_list(request: HttpRequest) -> HttpResponse:
 def location_create(request: HttpRequest) -> HttpResponse:
     """Create a new personal location."""
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         messages.error(
             request,
@@ -97,7 +98,7 @@ def location_create(request: HttpRequest) -> HttpResponse:
 def location_edit(request: HttpRequest, *, location_id: int) -> HttpResponse:
     """Edit an existing personal location."""
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         messages.error(
             request,
@@ -148,7 +149,7 @@ def location_edit(request: HttpRequest, *, location_id: int) -> HttpResponse:
 def location_delete(request: HttpRequest, *, location_id: int) -> HttpResponse:
     """Delete a personal location that is not in use."""
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         messages.error(
             request,
@@ -8,7 +8,11 @@ class CommonConfig(AppConfig):
     name = "common"
 
     def ready(self) -> None:
-        """Connect application group signals on startup."""
+        """Connect application group signals and task metrics on startup."""
+        from django_q.signals import post_execute
+
         from common.application_groups import connect_application_group_signals
+        from common.metrics import record_task_duration
 
         connect_application_group_signals()
+        post_execute.connect(record_task_duration, dispatch_uid="common.metrics")
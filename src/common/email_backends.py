@@ -1,16 +1,43 @@
-"""Custom Django email backend providing async delivery via django-q2."""
+"""
+Custom Django email backend providing async delivery via django-q2.
+
+With ``EMAIL_SEND_ASYNC`` on, messages are delivered in one of two modes:
+
+- batched (``EMAIL_BATCH_DELIVERY``, the default): ``send_messages()`` stores
+  every message as a ``QueuedEmail`` row and makes sure one flush is scheduled
+  ``EMAIL_BATCH_WINDOW_SECONDS`` ahead, so everything queued in that window is
+  delivered by :func:`flush_email_queue` over one SMTP connection per
+  ``EMAIL_BATCH_SIZE`` messages. Transient failures move the affected rows'
+  ``next_attempt_at`` back (exponential backoff) and schedule another flush
+  instead of sleeping in the worker.
+- per call: one :func:`_deliver_messages` task per ``send_messages()`` call.
+
+Both modes run on the email queue (``common.task_queues.email_queue``).
+
+With ``EMAIL_SEND_ASYNC`` off, :func:`_deliver_messages` runs in the caller.
+"""
 
 import logging
 import smtplib
 import time
-from typing import Sequence
+from datetime import datetime, timedelta
+from typing import Sequence, cast
 
 from django.conf import settings
 from django.core.mail import EmailMessage
 from django.core.mail.backends.base import BaseEmailBackend
 from django.core.mail.backends.smtp import EmailBackend as SmtpBackend
+from django.core.mail.message import sanitize_address
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
 from django_q.tasks import async_task
 
+from common import metrics
+from common.models import QueuedEmail
+from common.scheduling import schedule_once
+from common.task_queues import email_queue
+
 logger = logging.getLogger(__name__)
 
 # Errors that warrant retry (transient network/connection issues).
@@ -21,20 +48,33 @@ _RECOVERABLE_ERRORS = (
     TimeoutError,
 )
 
+#: Name (and dotted path) of the one-off django-q2 schedule that flushes the queue.
+EMAIL_FLUSH_SCHEDULE = "common.email_backends.flush_email_queue"
+
+
+def retry_delay(attempt: int) -> timedelta:
+    """Backoff before retry number ``attempt`` (1-based), per ``EMAIL_RETRY_*``."""
+
+    return timedelta(
+        seconds=settings.EMAIL_RETRY_BASE_DELAY_SECONDS
+        * settings.EMAIL_RETRY_BACKOFF_FACTOR ** (attempt - 1)
+    )
+
 
 def _deliver_messages(messages: list[EmailMessage]) -> int:
     """django-q2 task: deliver messages via SMTP with exponential backoff retry."""
     max_retries: int = settings.EMAIL_RETRY_MAX_RETRIES
-    base_delay: float = settings.EMAIL_RETRY_BASE_DELAY_SECONDS
-    backoff_factor: float = settings.EMAIL_RETRY_BACKOFF_FACTOR
 
-    delay = base_delay
     for attempt in range(max_retries + 1):
         try:
             with SmtpBackend() as backend:
-                return backend.send_messages(messages)
+                sent = backend.send_messages(messages)
+            metrics.inc("email_deliveries_total", sent, result="sent")
+            return sent
         except _RECOVERABLE_ERRORS as exc:
             if attempt < max_retries:
+                delay = retry_delay(attempt + 1).total_seconds()
+                metrics.inc("email_deliveries_total", len(messages), result="retried")
                 logger.warning(
                     "Email attempt %d/%d failed (%s), retrying in %.0fs",
                     attempt + 1,
@@ -43,7 +83,6 @@ def _deliver_messages(messages: list[EmailMessage]) -> int:
                     delay,
                 )
                 time.sleep(delay)
-                delay *= backoff_factor
             else:
                 logger.error(
                     "Email failed after %d attempts: %s",
@@ -52,23 +91,177 @@ def _deliver_messages(messages: list[EmailMessage]) -> int:
                 )
         except Exception:
             logger.exception("Email send failed (non-recoverable)")
-            return 0
+            break
+    metrics.inc("email_deliveries_total", len(messages), result="failed")
     return 0
 
 
+def queued_email(message: EmailMessage, now: datetime) -> QueuedEmail | None:
+    """Serialize ``message`` like ``SmtpBackend`` would; ``None`` without recipients."""
+
+    recipients = message.recipients()
+    if not recipients:
+        return None
+    encoding = message.encoding or settings.DEFAULT_CHARSET
+    return QueuedEmail(
+        from_email=sanitize_address(message.from_email, encoding),
+        recipients=[sanitize_address(address, encoding) for address in recipients],
+        message=message.message().as_bytes(linesep="\r\n"),
+        next_attempt_at=now,
+    )
+
+
+def enqueue_messages(messages: Sequence[EmailMessage]) -> int:
+    """Queue ``messages`` for batched delivery; return how many were queued."""
+
+    now = timezone.now()
+    rows = [row for row in (queued_email(m, now) for m in messages) if row is not None]
+    if not rows:
+        return 0
+    QueuedEmail.objects.bulk_create(rows)
+    transaction.on_commit(
+        lambda: schedule_email_flush(settings.EMAIL_BATCH_WINDOW_SECONDS),
+        robust=True,
+    )
+    return len(rows)
+
+
+def schedule_email_flush(delay: float) -> None:
+    """
+    Make sure :func:`flush_email_queue` runs within ``delay`` seconds.
+
+    A pending flush that is due soon enough is reused, which is what coalesces
+    all messages queued during the window into one delivery run.
+    """
+
+    schedule_once(
+        EMAIL_FLUSH_SCHEDULE,
+        timezone.now() + timedelta(seconds=delay),
+        cluster=email_queue(),
+    )
+
+
+def flush_email_queue(batch_size: int | None = None) -> int:
+    """
+    django-q2 task: deliver due ``QueuedEmail`` rows; return the number sent.
+
+    Rows are claimed with ``SELECT ... FOR UPDATE SKIP LOCKED``, so concurrent
+    flushes never send the same message twice. Each batch uses one SMTP
+    connection. When rows are left (postponed, or not yet due) another flush is
+    scheduled for the earliest of them.
+    """
+
+    batch_size = batch_size or settings.EMAIL_BATCH_SIZE
+    sent = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                QueuedEmail.objects.select_for_update(skip_locked=True)
+                .filter(next_attempt_at__lte=timezone.now())
+                .order_by("pk")[:batch_size]
+            )
+            if not rows:
+                break
+            delivered, rejected, failed = send_queued_batch(rows)
+            metrics.inc("email_deliveries_total", len(delivered), result="sent")
+            metrics.inc("email_deliveries_total", len(rejected), result="failed")
+            done = [row.pk for row in (*delivered, *rejected)]
+            QueuedEmail.objects.filter(pk__in=done).delete()
+            _postpone(failed)
+        sent += len(delivered)
+        if failed or len(rows) < batch_size:
+            break
+
+    earliest = QueuedEmail.objects.aggregate(next_run=Min("next_attempt_at"))
+    if earliest["next_run"] is not None:
+        delay = (earliest["next_run"] - timezone.now()).total_seconds()
+        schedule_email_flush(max(delay, 0.0))
+    return sent
+
+
+def send_queued_batch(
+    rows: Sequence[QueuedEmail],
+) -> tuple[list[QueuedEmail], list[QueuedEmail], list[QueuedEmail]]:
+    """
+    Send ``rows`` over one SMTP connection.
+
+    Returns ``(delivered, rejected, failed)``: rejected messages were refused by
+    the server and will never go through; failed ones hit a connection problem
+    and are worth another attempt.
+    """
+
+    delivered: list[QueuedEmail] = []
+    rejected: list[QueuedEmail] = []
+    backend = SmtpBackend()
+    try:
+        backend.open()
+        # open() raises instead of returning without a connection.
+        connection = cast(smtplib.SMTP, backend.connection)
+        for row in rows:
+            try:
+                connection.sendmail(row.from_email, row.recipients, bytes(row.message))
+            except _RECOVERABLE_ERRORS:
+                raise
+            except smtplib.SMTPException:
+                logger.exception("Email %s rejected (non-recoverable)", row.pk)
+                rejected.append(row)
+            else:
+                delivered.append(row)
+    except (*_RECOVERABLE_ERRORS, smtplib.SMTPException, OSError) as exc:
+        failed = list(rows[len(delivered) + len(rejected) :])
+        logger.warning("Email batch interrupted (%s), %d postponed", exc, len(failed))
+        return delivered, rejected, failed
+    finally:
+        try:
+            backend.close()
+        except smtplib.SMTPException, OSError:
+            pass
+    return delivered, rejected, []
+
+
+def _postpone(rows: Sequence[QueuedEmail]) -> None:
+    """Back off ``rows`` for another attempt, dropping those out of retries."""
+
+    max_retries: int = settings.EMAIL_RETRY_MAX_RETRIES
+    expired = [row.pk for row in rows if row.attempts >= max_retries]
+    metrics.inc("email_deliveries_total", len(expired), result="failed")
+    if expired:
+        logger.error(
+            "Email failed after %d attempts, dropping %d message(s)",
+            max_retries + 1,
+            len(expired),
+        )
+        QueuedEmail.objects.filter(pk__in=expired).delete()
+
+    now = timezone.now()
+    retried = [row for row in rows if row.attempts < max_retries]
+    metrics.inc("email_deliveries_total", len(retried), result="retried")
+    for row in retried:
+        row.attempts += 1
+        row.next_attempt_at = now + retry_delay(row.attempts)
+    QueuedEmail.objects.bulk_update(retried, ["attempts", "next_attempt_at"])
+
+
 class AsyncEmailBackend(BaseEmailBackend):
-    """Email backend that enqueues messages to django-q2 for async delivery.
+    """Email backend that hands messages to django-q2 for async delivery.
 
     Respects EMAIL_SEND_ASYNC: when False, delivers synchronously (useful
-    for local dev without a running qcluster).
+    for local dev without a running qcluster). EMAIL_BATCH_DELIVERY picks
+    the batched queue over one task per call.
     """
 
     def send_messages(self, email_messages: Sequence[EmailMessage]) -> int:
-        """Enqueue messages for async delivery, or deliver synchronously."""
+        """Queue messages for async delivery, or deliver synchronously."""
         messages = list(email_messages)
         if not messages:
             return 0
-        if settings.EMAIL_SEND_ASYNC:
-            async_task("common.email_backends._deliver_messages", messages)
-            return len(messages)
-        return _deliver_messages(messages)
+        if not settings.EMAIL_SEND_ASYNC:
+            return _deliver_messages(messages)
+        if settings.EMAIL_BATCH_DELIVERY:
+            return enqueue_messages(messages)
+        async_task(
+            "common.email_backends._deliver_messages",
+            messages,
+            cluster=email_queue(),
+        )
+        return len(messages)
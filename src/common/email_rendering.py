@@ -0,0 +1,83 @@
+"""
+Email rendering service: compiled ``emails/*`` templates rendered without lookups.
+
+``render_to_string`` looks each template up through the loaders on every call,
+i.e. three lookups per email (subject, text, HTML). :func:`render_email` keeps
+the compiled templates for the life of the process (web workers and the
+django-q2 cluster alike), so a message costs three template passes. Each part
+still gets a fresh ``Context``, so nothing one template pushes into its context
+leaks into the next.
+
+With ``DEBUG`` on, templates come straight from the (cached, auto-reloaded)
+template loaders so edits show up without a restart.
+"""
+
+from __future__ import annotations
+
+import functools
+from dataclasses import dataclass
+from typing import Any
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template import Context, Template
+from django.template.loader import get_template
+
+
+@dataclass(frozen=True)
+class RenderedEmail:
+    """The rendered parts of one email."""
+
+    subject: str
+    body: str
+    html: str | None
+
+
+def compiled_template(name: str) -> Template:
+    """Return the compiled template ``name``, loaded once per process."""
+
+    if settings.DEBUG:
+        return _load_template(name)
+    return _cached_template(name)
+
+
+def _load_template(name: str) -> Template:
+    # ``get_template`` returns the backend wrapper; its ``template`` is the
+    # compiled ``django.template.Template`` that renders a ``Context`` directly.
+    return get_template(name).template  # type: ignore[attr-defined, no-any-return]
+
+
+_cached_template = functools.cache(_load_template)
+
+
+@receiver(setting_changed)
+def _forget_compiled_templates(*, setting: str, **kwargs: Any) -> None:
+    if setting in ("TEMPLATES", "DEBUG"):
+        _cached_template.cache_clear()
+
+
+def render_email(
+    subject_template: str,
+    body_template: str,
+    context: dict[str, Any],
+    html_template: str | None = None,
+) -> RenderedEmail:
+    """
+    Render the subject, text body and optional HTML body of one email.
+
+    Output matches ``render_to_string`` for each template (no request, so no
+    context processors; autoescaping as configured on the engine). The subject
+    is stripped.
+    """
+
+    return RenderedEmail(
+        subject=_render(subject_template, context).strip(),
+        body=_render(body_template, context),
+        html=_render(html_template, context) if html_template else None,
+    )
+
+
+def _render(name: str, context: dict[str, Any]) -> str:
+    template = compiled_template(name)
+    return template.render(Context(context, autoescape=template.engine.autoescape))
@@ -1,18 +1,47 @@
-"""Email utilities: template rendering helpers for common email types."""
+"""Email utilities: template rendering helpers for common email types.
+
+All emails are rendered through :func:`common.email_rendering.render_email`.
+"""
 
 import logging
 from typing import Any
 
 from django.conf import settings
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+from django.core.mail import EmailMultiAlternatives, send_mail
 from django.urls import reverse
 from django.utils.encoding import force_bytes
 from django.utils.http import urlsafe_base64_encode
 
+from common.email_rendering import render_email
+
 logger = logging.getLogger(__name__)
 
 
+def build_transfer_email(
+    subject_template: str,
+    body_template: str,
+    context: dict,
+    recipient: str | list[str],
+    html_template: str | None = None,
+) -> EmailMultiAlternatives | None:
+    """Render an inventory notification without sending it.
+
+    Returns ``None`` when no recipient has an address (empty strings are
+    dropped), so callers can collect messages and send them in one backend call.
+    """
+    recipients = [recipient] if isinstance(recipient, str) else list(recipient)
+    recipients = [r for r in recipients if r]
+    if not recipients:
+        return None
+    rendered = render_email(subject_template, body_template, context, html_template)
+    message = EmailMultiAlternatives(
+        subject=rendered.subject, body=rendered.body, to=recipients
+    )
+    if rendered.html is not None:
+        message.attach_alternative(rendered.html, "text/html")
+    return message
+
+
 def send_transfer_email(
     subject_template: str,
     body_template: str,
@@ -28,15 +57,13 @@ def send_transfer_email(
     recipients = [r for r in recipients if r]
     if not recipients:
         return
-    subject = render_to_string(subject_template, context).strip()
-    message = render_to_string(body_template, context)
-    html_message = render_to_string(html_template, context) if html_template else None
+    rendered = render_email(subject_template, body_template, context, html_template)
     send_mail(
-        subject=subject,
-        message=message,
+        subject=rendered.subject,
+        message=rendered.body,
         from_email=None,
         recipient_list=recipients,
-        html_message=html_message,
+        html_message=rendered.html,
     )
 
 
@@ -63,17 +90,18 @@ def send_email_change_confirmation(user: Any, new_email: str) -> None:
         "new_email": new_email,
         "confirmation_url": confirmation_url,
     }
-    subject = render_to_string(
-        "emails/email_change_subject.txt", {"user": user}
-    ).strip()
-    text_body = render_to_string("emails/email_change_body.txt", context)
-    html_body = render_to_string("emails/email_change_body.html", context)
+    rendered = render_email(
+        "emails/email_change_subject.txt",
+        "emails/email_change_body.txt",
+        context,
+        html_template="emails/email_change_body.html",
+    )
     send_mail(
-        subject=subject,
-        message=text_body,
+        subject=rendered.subject,
+        message=rendered.body,
         from_email=None,
         recipient_list=[new_email],
-        html_message=html_body,
+        html_message=rendered.html,
     )
 
 
@@ -83,15 +111,16 @@ def send_email_changed_notification(user: Any, old_email: str, new_email: str) -
     Sent after successful email change confirmation as a security measure.
     """
     context = {"user": user, "old_email": old_email, "new_email": new_email}
-    subject = render_to_string(
-        "emails/email_changed_notification_subject.txt", {"user": user}
-    ).strip()
-    text_body = render_to_string("emails/email_changed_notification_body.txt", context)
-    html_body = render_to_string("emails/email_changed_notification_body.html", context)
+    rendered = render_email(
+        "emails/email_changed_notification_subject.txt",
+        "emails/email_changed_notification_body.txt",
+        context,
+        html_template="emails/email_changed_notification_body.html",
+    )
     send_mail(
-        subject=subject,
-        message=text_body,
+        subject=rendered.subject,
+        message=rendered.body,
         from_email=None,
         recipient_list=[old_email],
-        html_message=html_body,
+        html_message=rendered.html,
     )
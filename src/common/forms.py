@@ -1,9 +1,11 @@
 from typing import TYPE_CHECKING, Any
 
 from django import forms
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.utils.translation import gettext_lazy as _
+from django.utils.translation import ngettext
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import User as UserType
@@ -58,3 +60,23 @@ class EmailChangeForm(forms.Form):
             )
 
         return cleaned_data
+
+
+class NotificationSettingsForm(forms.Form):
+    """Notification preferences of the user's linked ``Responsible`` profile."""
+
+    email_digest = forms.BooleanField(
+        label=_("Send a periodic digest instead of one email per change"),
+        required=False,
+    )
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        minutes = settings.NOTIFICATION_DIGEST_INTERVAL_MINUTES
+        self.fields["email_digest"].help_text = ngettext(
+            "Inventory notifications are collected and sent at most once every "
+            "%(minutes)d minute.",
+            "Inventory notifications are collected and sent at most once every "
+            "%(minutes)d minutes.",
+            minutes,
+        ) % {"minutes": minutes}
@@ -1,15 +1,19 @@
-"""Management command: supervised launcher for qcluster + runserver (dev only)."""
+"""Management command: supervised launcher for qcluster(s) + runserver (dev only)."""
 
 import subprocess  # nosec B404 — fixed args, no shell, no user input
 import sys
 
 from django.core.management.base import BaseCommand
 
-from common.management.commands.start import _supervise
+from common.management.commands.start import (
+    _qcluster_queues,
+    _spawn_qcluster,
+    _supervise,
+)
 
 
 class Command(BaseCommand):
-    """Spawn qcluster and runserver as supervised children (development only)."""
+    """Spawn qclusters and runserver as supervised children (development only)."""
 
     help = "Start qcluster and runserver together for local development"
 
@@ -19,10 +23,7 @@ class Command(BaseCommand):
 
         _supervise(
             [
-                subprocess.Popen(  # nosec B603 — fixed args, no user input
-                    [sys.executable, "manage.py", "qcluster"],
-                    cwd=settings.BASE_DIR,
-                ),
+                *map(_spawn_qcluster, _qcluster_queues()),
                 subprocess.Popen(  # nosec B603 — fixed args, no user input
                     [sys.executable, "manage.py", "runserver", "0.0.0.0:8000"],
                     cwd=settings.BASE_DIR,
@@ -4,6 +4,8 @@ import os
 
 from django.core.management.base import BaseCommand
 
+from common.web_server import gunicorn_argv
+
 
 class Command(BaseCommand):
     """Start the Gunicorn WSGI server."""
@@ -11,7 +13,7 @@ class Command(BaseCommand):
     help = "Start Gunicorn (replaces direct gunicorn invocation)"
 
     def handle(self, *args: object, **options: object) -> None:
-        """Replace the current process with Gunicorn."""
+        """Replace the current process with Gunicorn (see ``common.web_server``)."""
         os.execvp(
-            "gunicorn", ["gunicorn", "sloths_inventory.wsgi"]
-        )  # nosec B606 B607 — fixed executable from venv, no user input
+            "gunicorn", ["gunicorn", *gunicorn_argv()]
+        )  # nosec B606 B607 — fixed executable from venv, args from settings
@@ -0,0 +1,148 @@
+"""
+Measure SMTP delivery throughput: one connection per message vs batched.
+
+Starts a local stub SMTP server (accepts and discards everything, optionally
+delaying every reply to emulate network round trips) and delivers the same
+messages twice: through ``_deliver_messages`` one message per call, as the
+per-call task mode does for single ``send_mail()`` calls, and through
+``send_queued_batch`` in ``EMAIL_BATCH_SIZE`` chunks, as ``flush_email_queue``
+does. Nothing touches the database or a real mail server.
+"""
+
+from __future__ import annotations
+
+import socketserver
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from django.core.mail import EmailMessage
+from django.core.management.base import BaseCommand, CommandParser
+from django.test import override_settings
+from django.utils import timezone
+
+from common.email_backends import _deliver_messages, queued_email, send_queued_batch
+
+
+class _StubSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, latency: float) -> None:
+        super().__init__(("127.0.0.1", 0), _StubSMTPHandler)
+        self.latency = latency
+        self.received = 0
+        self.lock = threading.Lock()
+
+
+class _StubSMTPHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP dialogue that accepts every message."""
+
+    server: _StubSMTPServer
+
+    def handle(self) -> None:
+        self._reply(b"220 stub ESMTP")
+        while line := self.rfile.readline():
+            command = line[:4].upper()
+            if command == b"DATA":
+                self._reply(b"354 End data with <CR><LF>.<CR><LF>")
+                while self.rfile.readline() not in (b".\r\n", b""):
+                    pass
+                with self.server.lock:
+                    self.server.received += 1
+                self._reply(b"250 Queued")
+            elif command == b"QUIT":
+                self._reply(b"221 Bye")
+                return
+            else:
+                self._reply(b"250 OK")
+
+    def _reply(self, line: bytes) -> None:
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        self.wfile.write(line + b"\r\n")
+
+
+class Command(BaseCommand):
+    """Compare per-message and batched SMTP delivery against a stub server."""
+
+    help = (
+        "Deliver N messages to a local stub SMTP server one connection per "
+        "message and in batches over one connection, and print messages/second."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--messages", type=int, default=500, help="Messages to send (default: 500)."
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Messages per connection in batched mode (default: 200).",
+        )
+        parser.add_argument(
+            "--latency-ms",
+            type=float,
+            default=0.0,
+            help="Delay before every server reply, emulating a round trip.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count: int = options["messages"]
+        batch_size: int = options["batch_size"]
+        server = _StubSMTPServer(options["latency_ms"] / 1000)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        messages = [
+            EmailMessage(
+                subject=f"Benchmark {n}",
+                body="x" * 1024,
+                from_email="bench@example.com",
+                to=[f"user{n}@example.com"],
+            )
+            for n in range(count)
+        ]
+
+        def per_message() -> None:
+            for message in messages:
+                _deliver_messages([message])
+
+        def batched() -> None:
+            now = timezone.now()
+            rows = [
+                row
+                for row in (queued_email(message, now) for message in messages)
+                if row is not None
+            ]
+            for start in range(0, len(rows), batch_size):
+                send_queued_batch(rows[start : start + batch_size])
+
+        smtp = {
+            "EMAIL_HOST": "127.0.0.1",
+            "EMAIL_PORT": server.server_address[1],
+            "EMAIL_USE_TLS": False,
+            "EMAIL_USE_SSL": False,
+            "EMAIL_HOST_USER": "",
+            "EMAIL_HOST_PASSWORD": "",  # nosec B105 — local test server, no auth
+            "EMAIL_RETRY_MAX_RETRIES": 0,
+        }
+        try:
+            with override_settings(**smtp):
+                for label, run in (("per message", per_message), ("batched", batched)):
+                    self._measure(server, label, count, run)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def _measure(
+        self, server: _StubSMTPServer, label: str, count: int, run: Callable[[], None]
+    ) -> None:
+        server.received = 0
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label:>12}: {server.received}/{count} messages in {elapsed:.2f}s "
+            f"({server.received / elapsed:.0f} msg/s)"
+        )
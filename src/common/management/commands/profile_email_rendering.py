@@ -0,0 +1,84 @@
+"""
+Measure notification rendering throughput: ``render_to_string`` vs ``render_email``.
+
+Renders the same notification (subject, text and HTML) N times both ways, from
+plain in-memory context objects, and prints notifications per second. Nothing
+touches the database or the mail backend.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from types import SimpleNamespace
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.template.loader import render_to_string
+
+from common.email_rendering import render_email
+
+
+class Command(BaseCommand):
+    """Compare per-template rendering with the compiled-template email renderer."""
+
+    help = (
+        "Render an inventory notification N times with render_to_string and "
+        "with common.email_rendering.render_email; print notifications/second."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--count",
+            type=int,
+            default=2000,
+            help="Notifications to render per mode (default: 2000).",
+        )
+        parser.add_argument(
+            "--kind",
+            default="transfer_accepted",
+            help="Template family under emails/ (default: transfer_accepted).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        count: int = options["count"]
+        kind: str = options["kind"]
+        subject, body, html = (
+            f"emails/{kind}_subject.txt",
+            f"emails/{kind}_body.txt",
+            f"emails/{kind}_body.html",
+        )
+        context = {
+            "item": "Laptop ThinkPad X1 (INV-000123)",
+            "sender": "Ivanov Ivan",
+            "receiver": "Petrov Petr",
+            "responsible": "Petrov Petr",
+            "operation": SimpleNamespace(
+                status="In use", location="Office 101", responsible="Petrov Petr"
+            ),
+        }
+
+        def per_template() -> None:
+            for _ in range(count):
+                render_to_string(subject, context).strip()
+                render_to_string(body, context)
+                render_to_string(html, context)
+
+        def compiled() -> None:
+            for _ in range(count):
+                render_email(subject, body, context, html)
+
+        for label, run in (
+            ("render_to_string", per_template),
+            ("render_email", compiled),
+        ):
+            self._measure(label, count, run)
+
+    def _measure(self, label: str, count: int, run: Callable[[], None]) -> None:
+        started = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{label:>16}: {count} notifications in {elapsed:.2f}s "
+            f"({count / elapsed:.0f}/s)"
+        )
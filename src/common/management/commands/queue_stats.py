@@ -0,0 +1,48 @@
+"""
+Print backlog and recent task run times of every django-q2 queue.
+
+One line per queue (see ``common.task_queues``): tasks waiting and in flight,
+how long the oldest one has waited, and the tasks finished within ``--minutes``
+with their failures and mean / longest run time.
+"""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from common.task_queues import STATS_WINDOW, queue_stats
+
+
+def _seconds(value: timedelta | None) -> str:
+    return "-" if value is None else f"{value.total_seconds():.1f}s"
+
+
+class Command(BaseCommand):
+    """Report per-queue task metrics."""
+
+    help = "Show backlog and recent run times of each django-q2 queue."
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        default = int(STATS_WINDOW.total_seconds() // 60)
+        parser.add_argument(
+            "--minutes",
+            type=int,
+            default=default,
+            help=f"Window for finished tasks (default: {default}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["minutes"] < 1:
+            raise CommandError("--minutes must be positive.")
+        for stats in queue_stats(timedelta(minutes=options["minutes"])):
+            self.stdout.write(
+                f"{stats.name}: queued={stats.queued} "
+                f"in_flight={stats.in_flight} "
+                f"oldest_wait={_seconds(stats.oldest_wait)} "
+                f"finished={stats.finished} failed={stats.failed} "
+                f"mean_run={_seconds(stats.mean_run_time)} "
+                f"max_run={_seconds(stats.max_run_time)}"
+            )
@@ -1,4 +1,4 @@
-"""Management command: supervised launcher for qcluster + gunicorn."""
+"""Management command: supervised launcher for qcluster(s) + gunicorn."""
 
 import os
 import signal
@@ -6,8 +6,12 @@ import subprocess  # nosec B404 — fixed args, no shell, no user input
 import sys
 import time
 
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.base import BaseCommand
 
+from common.metrics import clear_metrics_dir
+from common.web_server import gunicorn_argv
+
 # Seconds all children share before SIGKILL; override via GRACEFUL_TIMEOUT env var.
 _GRACEFUL_TIMEOUT = int(os.environ.get("GRACEFUL_TIMEOUT", "25"))
 
@@ -51,23 +55,56 @@ def _supervise(procs: list[subprocess.Popen[bytes]]) -> None:
         time.sleep(0.5)
 
 
+def _qcluster_queues() -> list[str]:
+    """
+    One entry per qcluster child: ``""`` for the default queue, else the name.
+
+    ``Q_CLUSTERS`` children serve the default queue and ``Q_EMAIL_CLUSTERS`` the
+    email queue when it is enabled (see ``common.task_queues``).
+    """
+    from django.conf import settings
+
+    if settings.Q_CLUSTERS < 1:
+        raise ImproperlyConfigured("Q_CLUSTERS must be positive.")
+    queues = [""] * settings.Q_CLUSTERS
+    if settings.Q_EMAIL_QUEUE:
+        if settings.Q_EMAIL_CLUSTERS < 1:
+            raise ImproperlyConfigured(
+                "Q_EMAIL_CLUSTERS must be positive while Q_EMAIL_QUEUE is set."
+            )
+        queues += [settings.Q_EMAIL_QUEUE] * settings.Q_EMAIL_CLUSTERS
+    return queues
+
+
+def _spawn_qcluster(queue: str) -> subprocess.Popen[bytes]:
+    """Start ``manage.py qcluster`` for ``queue`` (settings read ``Q_QUEUE``)."""
+    from django.conf import settings
+
+    return subprocess.Popen(  # nosec B603 — fixed args, no user input
+        [sys.executable, "manage.py", "qcluster"],
+        cwd=settings.BASE_DIR,
+        env={**os.environ, "Q_QUEUE": queue},
+    )
+
+
 class Command(BaseCommand):
-    """Spawn qcluster and gunicorn as supervised children; forward signals to both."""
+    """Spawn qclusters and gunicorn as supervised children; forward signals."""
 
-    help = "Start qcluster and gunicorn under a common supervisor"
+    help = "Start qcluster(s) and gunicorn under a common supervisor"
 
     def handle(self, *args: object, **options: object) -> None:
         """Launch child processes and hand off to the supervisor loop."""
         from django.conf import settings
 
+        # Built first: a misconfiguration must fail before any child starts.
+        queues = _qcluster_queues()
+        gunicorn_args = gunicorn_argv()
+        clear_metrics_dir()
         _supervise(
             [
-                subprocess.Popen(  # nosec B603 — fixed args, no user input
-                    [sys.executable, "manage.py", "qcluster"],
-                    cwd=settings.BASE_DIR,
-                ),
+                *map(_spawn_qcluster, queues),
                 subprocess.Popen(  # nosec B603 B607 — fixed venv path, no user input
-                    ["gunicorn", "sloths_inventory.wsgi"],
+                    ["gunicorn", *gunicorn_args],
                     cwd=settings.BASE_DIR,
                 ),
             ]
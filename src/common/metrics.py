@@ -0,0 +1,392 @@
+"""
+Process-local counters and histograms, shared across workers through files.
+
+Web requests (:class:`MetricsMiddleware`), email delivery, item row locks and
+django-q2 task runs record into this process with :func:`inc`, :func:`observe`
+and :func:`timer`. The ``/health/metrics`` endpoint (``health.metrics``) renders
+the merged values in the Prometheus text format.
+
+Gunicorn workers and qcluster processes do not share memory. With
+``METRICS_DIR`` set, every process writes its own values to
+``metrics-<pid>.json`` in that directory, at most every
+``METRICS_FLUSH_SECONDS`` and at exit, by atomic rename. :func:`collect` adds up
+all files. Files of processes that have exited (gunicorn recycles workers after
+``GUNICORN_MAX_REQUESTS``) are folded into one ``metrics-archive.json``, so
+their values are kept without one file per dead pid piling up, and a process
+that reuses a dead pid archives its predecessor's file before writing its own.
+``start`` empties the directory before it launches the processes. Without
+``METRICS_DIR`` only the serving process's own values are reported.
+
+With ``METRICS`` off nothing is recorded and the middleware drops out of the
+chain.
+"""
+
+from __future__ import annotations
+
+import atexit
+import fcntl
+import json
+import logging
+import math
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.http import HttpRequest, HttpResponse
+
+from common.task_queues import default_queue
+
+logger = logging.getLogger(__name__)
+
+#: Metric name -> (help text, type, histogram bucket upper bounds in seconds).
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    "http_request_duration_seconds": (
+        "Time to answer a request, per URL name.",
+        "histogram",
+        (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+    ),
+    "db_queries_total": (
+        "SQL statements run by requests, per URL name.",
+        "counter",
+        (),
+    ),
+    "email_deliveries_total": (
+        "Email messages sent, failed for good, or postponed for a retry.",
+        "counter",
+        (),
+    ),
+    "django_q_task_duration_seconds": (
+        "Run time of finished django-q2 tasks, per queue.",
+        "histogram",
+        (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0),
+    ),
+    "inventory_item_lock_wait_seconds": (
+        "Time to acquire item row locks (SELECT ... FOR UPDATE).",
+        "histogram",
+        (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0),
+    ),
+}
+
+Labels = tuple[tuple[str, str], ...]
+Key = tuple[str, Labels]
+
+
+@dataclass
+class Histogram:
+    """Observations per bucket (not cumulative): one per bound, then ``+Inf``."""
+
+    buckets: list[int]
+    sum: float = 0.0
+    count: int = 0
+
+    def add(self, other: Histogram) -> None:
+        self.buckets = [a + b for a, b in zip(self.buckets, other.buckets)]
+        self.sum += other.sum
+        self.count += other.count
+
+
+@dataclass
+class Samples:
+    """Counter values and histograms keyed by metric name and labels."""
+
+    counters: dict[Key, float] = field(default_factory=dict)
+    histograms: dict[Key, Histogram] = field(default_factory=dict)
+
+    def merge(self, other: Samples) -> None:
+        for key, value in other.counters.items():
+            self.counters[key] = self.counters.get(key, 0.0) + value
+        for key, histogram in other.histograms.items():
+            if key in self.histograms:
+                self.histograms[key].add(histogram)
+            else:
+                self.histograms[key] = Histogram(
+                    list(histogram.buckets), histogram.sum, histogram.count
+                )
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "counters": [
+                [name, list(map(list, labels)), value]
+                for (name, labels), value in self.counters.items()
+            ],
+            "histograms": [
+                [name, list(map(list, labels)), h.buckets, h.sum, h.count]
+                for (name, labels), h in self.histograms.items()
+            ],
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> Samples:
+        samples = cls()
+        for name, labels, value in data["counters"]:
+            samples.counters[(name, _labels(dict(labels)))] = value
+        for name, labels, buckets, total, count in data["histograms"]:
+            samples.histograms[(name, _labels(dict(labels)))] = Histogram(
+                buckets, total, count
+            )
+        return samples
+
+
+_lock = threading.Lock()
+_samples = Samples()
+#: Process the samples belong to; a forked child starts from zero.
+_pid = os.getpid()
+#: ``time.monotonic()`` of the last flush; the first record always flushes.
+_last_flush = -math.inf
+#: Process that wrote ``metrics-<pid>.json`` last; see :func:`flush`.
+_flushed_pid: int | None = None
+
+#: Values of exited processes, merged by :func:`_archive`.
+ARCHIVE_FILE = "metrics-archive.json"
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _own_samples() -> Samples:
+    """This process's samples (caller holds ``_lock``)."""
+
+    global _samples, _pid, _last_flush
+    if _pid != os.getpid():
+        _samples, _pid, _last_flush = Samples(), os.getpid(), -math.inf
+    return _samples
+
+
+def inc(name: str, amount: float = 1, **labels: str) -> None:
+    """Add ``amount`` to counter ``name``."""
+
+    if not settings.METRICS:
+        return
+    key = (name, _labels(labels))
+    with _lock:
+        counters = _own_samples().counters
+        counters[key] = counters.get(key, 0.0) + amount
+    _maybe_flush()
+
+
+def observe(name: str, seconds: float, **labels: str) -> None:
+    """Record ``seconds`` in histogram ``name``."""
+
+    if not settings.METRICS:
+        return
+    bounds = METRICS[name][2]
+    key = (name, _labels(labels))
+    with _lock:
+        histograms = _own_samples().histograms
+        histogram = histograms.get(key)
+        if histogram is None:
+            histogram = histograms[key] = Histogram([0] * (len(bounds) + 1))
+        index = next(
+            (i for i, bound in enumerate(bounds) if seconds <= bound), len(bounds)
+        )
+        histogram.buckets[index] += 1
+        histogram.sum += seconds
+        histogram.count += 1
+    _maybe_flush()
+
+
+@contextmanager
+def timer(name: str, **labels: str) -> Iterator[None]:
+    """Record the duration of the ``with`` block in histogram ``name``."""
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started, **labels)
+
+
+def _metrics_dir() -> Path | None:
+    return Path(settings.METRICS_DIR) if settings.METRICS_DIR else None
+
+
+def _maybe_flush() -> None:
+    if time.monotonic() - _last_flush >= settings.METRICS_FLUSH_SECONDS:
+        flush()
+
+
+def flush() -> None:
+    """Write this process's samples to ``METRICS_DIR`` (no-op without one)."""
+
+    global _last_flush, _flushed_pid
+    directory = _metrics_dir()
+    if directory is None or not settings.METRICS:
+        return
+    with _lock:
+        data = _own_samples().to_json()
+        _last_flush = time.monotonic()
+    pid = os.getpid()
+    path = directory / f"metrics-{pid}.json"
+    try:
+        directory.mkdir(parents=True, exist_ok=True)
+        if _flushed_pid != pid and path.exists():
+            # Left by an exited process with the same pid: keep its values.
+            _archive(directory, [path])
+        _write(path, data)
+        _flushed_pid = pid
+    except OSError:
+        logger.exception("Could not write metrics to %s", directory)
+
+
+atexit.register(flush)
+
+
+def _write(path: Path, data: dict[str, Any]) -> None:
+    with tempfile.NamedTemporaryFile(
+        "w", dir=path.parent, prefix=".metrics-", delete=False
+    ) as handle:
+        json.dump(data, handle)
+    os.replace(handle.name, path)
+
+
+def _read(path: Path) -> Samples | None:
+    try:
+        return Samples.from_json(json.loads(path.read_text()))
+    except FileNotFoundError:
+        return None
+    except OSError, ValueError, KeyError, TypeError:
+        logger.warning("Skipping unreadable metrics file %s", path)
+        return None
+
+
+def _file_pid(path: Path) -> int | None:
+    pid = path.stem.removeprefix("metrics-")
+    return int(pid) if pid.isdigit() else None
+
+
+def _process_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _archive(directory: Path, paths: list[Path]) -> None:
+    """
+    Add the files in ``paths`` to :data:`ARCHIVE_FILE` and delete them.
+
+    Runs under an exclusive lock on the directory, so concurrent scrapes do not
+    archive a file twice. Files of processes that are alive again (a reused
+    pid that has not flushed yet) are left to that process, except this
+    process's own file, which :func:`flush` passes before its first write.
+    """
+
+    with open(directory / ".metrics.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        archive_path = directory / ARCHIVE_FILE
+        archive = _read(archive_path) if archive_path.exists() else Samples()
+        if archive is None:
+            return
+        archived = []
+        for path in paths:
+            pid = _file_pid(path)
+            if pid != os.getpid() and pid is not None and _process_alive(pid):
+                continue
+            samples = _read(path)
+            if samples is not None:
+                archive.merge(samples)
+                archived.append(path)
+        if archived:
+            _write(archive_path, archive.to_json())
+        for path in archived:
+            path.unlink(missing_ok=True)
+
+
+def collect() -> Samples:
+    """Samples of every process sharing ``METRICS_DIR`` (or of this one)."""
+
+    merged = Samples()
+    with _lock:
+        merged.merge(_own_samples())
+    directory = _metrics_dir()
+    if directory is None:
+        return merged
+    own_file = f"metrics-{os.getpid()}.json"
+    dead = [
+        path
+        for path in directory.glob("metrics-*.json")
+        if (pid := _file_pid(path)) is not None
+        and path.name != own_file
+        and not _process_alive(pid)
+    ]
+    if dead:
+        try:
+            _archive(directory, dead)
+        except OSError:
+            logger.exception("Could not archive metrics in %s", directory)
+    for path in sorted(directory.glob("metrics-*.json")):
+        if path.name == own_file:
+            continue
+        samples = _read(path)
+        if samples is not None:
+            merged.merge(samples)
+    return merged
+
+
+def clear_metrics_dir() -> None:
+    """Remove files left by previous runs; called by ``start`` before launching."""
+
+    directory = _metrics_dir()
+    if directory is None or not directory.is_dir():
+        return
+    for path in directory.glob("metrics-*.json"):
+        path.unlink(missing_ok=True)
+
+
+def record_task_duration(sender: object, task: dict[str, Any], **kwargs: Any) -> None:
+    """``post_execute`` receiver: time finished django-q2 tasks per queue."""
+
+    started, stopped = task.get("started"), task.get("stopped")
+    if started is None or stopped is None:
+        return
+    observe(
+        "django_q_task_duration_seconds",
+        (stopped - started).total_seconds(),
+        queue=settings.Q_CLUSTER.get("cluster_name") or default_queue(),
+        result="success" if task.get("success") else "failure",
+    )
+
+
+class MetricsMiddleware:
+    """
+    Record request duration and query count per URL name (``METRICS``).
+
+    Removes itself from the chain when metrics are off.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.METRICS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        queries = 0
+
+        def count(execute: Callable[..., Any], *args: Any) -> Any:
+            nonlocal queries
+            queries += 1
+            return execute(*args)
+
+        started = time.perf_counter()
+        with connection.execute_wrapper(count):
+            response = self.get_response(request)
+        match = request.resolver_match
+        view = match.view_name if match else "unresolved"
+        observe(
+            "http_request_duration_seconds", time.perf_counter() - started, view=view
+        )
+        inc("db_queries_total", queries, view=view)
+        return response
@@ -32,3 +32,31 @@ class NamedModel(BaseModel):
 
     def __str__(self) -> str:
         return self.name
+
+
+class QueuedEmail(models.Model):
+    """
+    Serialized outgoing email waiting for batched SMTP delivery.
+
+    ``AsyncEmailBackend`` writes one row per message (envelope plus the rendered
+    MIME bytes) instead of one django-q2 task per ``send_messages()`` call;
+    ``common.email_backends.flush_email_queue`` sends due rows over a single
+    SMTP connection per batch. A row whose delivery failed transiently gets a
+    later ``next_attempt_at`` rather than a sleeping worker.
+    """
+
+    from_email = models.CharField(max_length=320, verbose_name=_("From"))
+    recipients = models.JSONField(verbose_name=_("Recipients"))
+    message = models.BinaryField(verbose_name=_("Message"))
+    attempts = models.PositiveSmallIntegerField(default=0, verbose_name=_("Attempts"))
+    next_attempt_at = models.DateTimeField(
+        db_index=True, verbose_name=_("Next attempt at")
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    class Meta:
+        verbose_name = _("Queued email")
+        verbose_name_plural = _("Queued emails")
+
+    def __str__(self) -> str:
+        return f"{self.from_email} -> {', '.join(self.recipients)}"
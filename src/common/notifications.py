@@ -37,7 +37,10 @@ def persistent_notifications(request: HttpRequest) -> dict[str, object]:
         messages.error(request, msg)
         return {}
 
-    if not hasattr(user, "responsible") or user.responsible is None:
+    from catalogs.request_helpers import request_responsible
+
+    # Shares the per-request answer with the views (no extra profile lookup).
+    if request_responsible(request) is None:
         if user.has_perm("catalogs.change_responsible"):
             no_responsible_msg = gettext(
                 "Your account is not linked to a responsible person profile."
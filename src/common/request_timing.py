@@ -0,0 +1,207 @@
+"""
+Per-request SQL and timing instrumentation (``REQUEST_TIMING``).
+
+:class:`RequestTimingMiddleware` counts queries and database time through
+``connection.execute_wrapper``, and measures view time (from ``process_view`` to
+the response), template render time and the total time spent below it in the
+middleware chain. The figures are sent back in a ``Server-Timing`` header (shown
+per request in the browser's network panel) and logged on the
+``common.request_timing`` logger with one field per figure. Requests slower than
+``REQUEST_TIMING_SLOW_MS`` are logged as warnings with their
+``REQUEST_TIMING_SLOW_QUERIES`` slowest statements.
+
+Template time comes from :class:`TimedDjangoTemplates`, which the settings select
+as the template backend only when timing is enabled. With ``REQUEST_TIMING``
+off, the middleware removes itself at startup (``MiddlewareNotUsed``), so
+requests pay nothing.
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+import time
+from collections.abc import Callable
+from contextlib import ExitStack
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpRequest, HttpResponse
+from django.template.backends.django import DjangoTemplates
+from django.template.backends.django import Template as DjangoTemplate
+
+logger = logging.getLogger(__name__)
+
+#: Timings of the request being handled in this thread or task.
+_current: ContextVar[RequestTimings | None] = ContextVar(
+    "request_timings", default=None
+)
+
+
+@dataclass
+class RequestTimings:
+    """Figures collected for one request; durations in seconds."""
+
+    slow_query_count: int
+    queries: int = 0
+    db_seconds: float = 0.0
+    template_seconds: float = 0.0
+    view_started: float | None = None
+    view_seconds: float = 0.0
+    #: Min-heap of ``(seconds, sql)`` holding the slowest statements.
+    slowest: list[tuple[float, str]] = field(default_factory=list)
+    _rendering: bool = False
+
+    def record_query(self, sql: str, seconds: float) -> None:
+        self.queries += 1
+        self.db_seconds += seconds
+        if len(self.slowest) < self.slow_query_count:
+            heapq.heappush(self.slowest, (seconds, sql))
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, sql))
+
+    def execute_wrapper(
+        self,
+        execute: Callable[..., Any],
+        sql: str,
+        params: Any,
+        many: bool,
+        context: dict[str, Any],
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record_query(sql, time.perf_counter() - started)
+
+
+class _TimedTemplate(DjangoTemplate):
+    """Backend template that adds its render time to the current request."""
+
+    def __init__(self, template: DjangoTemplate) -> None:
+        super().__init__(template.template, template.backend)
+
+    def render(
+        self,
+        context: dict[str, Any] | None = None,
+        request: HttpRequest | None = None,
+    ) -> str:
+        timings = _current.get()
+        # Templates rendered while rendering (e.g. from a template tag) are
+        # already inside the outer measurement.
+        if timings is None or timings._rendering:
+            return super().render(context, request)
+        timings._rendering = True
+        started = time.perf_counter()
+        try:
+            return super().render(context, request)
+        finally:
+            timings.template_seconds += time.perf_counter() - started
+            timings._rendering = False
+
+
+class TimedDjangoTemplates(DjangoTemplates):
+    """``DjangoTemplates`` whose templates report render time to the middleware."""
+
+    def from_string(self, template_code: str) -> _TimedTemplate:
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name: str) -> _TimedTemplate:
+        return _TimedTemplate(super().get_template(template_name))
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 1)
+
+
+class RequestTimingMiddleware:
+    """
+    Measure queries, database, template, view and total time per request.
+
+    Place it early in ``MIDDLEWARE`` so the total covers sessions and
+    authentication; it removes itself unless ``REQUEST_TIMING`` is set.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        if not settings.REQUEST_TIMING:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_seconds = settings.REQUEST_TIMING_SLOW_MS / 1000
+        self.slow_query_count = settings.REQUEST_TIMING_SLOW_QUERIES
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        timings = RequestTimings(slow_query_count=self.slow_query_count)
+        token = _current.set(timings)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(
+                        connection.execute_wrapper(timings.execute_wrapper)
+                    )
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_seconds = time.perf_counter() - started
+        if timings.view_started is not None:
+            timings.view_seconds = time.perf_counter() - timings.view_started
+
+        response["Server-Timing"] = ", ".join(
+            [
+                f'db;dur={_ms(timings.db_seconds)};desc="{timings.queries} queries"',
+                f"tpl;dur={_ms(timings.template_seconds)}",
+                f"view;dur={_ms(timings.view_seconds)}",
+                f"total;dur={_ms(total_seconds)}",
+            ]
+        )
+        self._log(request, response, timings, total_seconds)
+        return response
+
+    def process_view(
+        self,
+        request: HttpRequest,
+        _view_func: Callable[..., HttpResponse],
+        _view_args: Any,
+        _view_kwargs: Any,
+    ) -> None:
+        timings = _current.get()
+        if timings is not None:
+            timings.view_started = time.perf_counter()
+
+    def _log(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        timings: RequestTimings,
+        total_seconds: float,
+    ) -> None:
+        match = request.resolver_match
+        fields: dict[str, Any] = {
+            "http_method": request.method,
+            "http_path": request.path,
+            "http_status": response.status_code,
+            "url_name": match.view_name if match else "",
+            "db_queries": timings.queries,
+            "db_ms": _ms(timings.db_seconds),
+            "template_ms": _ms(timings.template_seconds),
+            "view_ms": _ms(timings.view_seconds),
+            "total_ms": _ms(total_seconds),
+        }
+        message = " ".join(f"{key}={value}" for key, value in fields.items())
+        if total_seconds < self.slow_seconds:
+            logger.info(message, extra=fields)
+            return
+        slowest = sorted(timings.slowest, reverse=True)
+        fields["slow_queries"] = [
+            {"ms": _ms(seconds), "sql": sql} for seconds, sql in slowest
+        ]
+        logger.warning(
+            "Slow request %s%s",
+            message,
+            "".join(f"\n  {_ms(seconds)} ms: {sql}" for seconds, sql in slowest),
+            extra=fields,
+        )
@@ -0,0 +1,30 @@
+"""One-off django-q2 schedules that coalesce repeated requests."""
+
+from datetime import datetime
+
+from django_q.models import Schedule
+from django_q.tasks import schedule
+
+
+def schedule_once(func: str, next_run: datetime, cluster: str | None = None) -> None:
+    """
+    Make sure the task ``func`` (dotted path) runs no later than ``next_run``.
+
+    The schedule is named after ``func``. A pending one that is already due by
+    ``next_run`` is kept, a later one is brought forward, so any number of
+    callers end up with a single run. django-q2 deletes the schedule once it
+    has fired. ``cluster`` picks the queue (see ``common.task_queues``).
+    """
+
+    pending = Schedule.objects.filter(name=func).exclude(repeats=0)
+    if pending.filter(next_run__lte=next_run).exists():
+        return
+    if pending.update(next_run=next_run, cluster=cluster):
+        return
+    schedule(
+        func,
+        name=func,
+        schedule_type=Schedule.ONCE,
+        next_run=next_run,
+        cluster=cluster,
+    )
@@ -0,0 +1,135 @@
+"""
+django-q2 queues: task routing and per-queue metrics.
+
+With the ORM broker a queue is a cluster name: ``async_task(..., cluster=q)``
+stores the task under key ``q`` and only a qcluster started for ``q`` pulls it.
+With ``Q_EMAIL_QUEUE`` set (opt-in), email delivery (:func:`email_queue`) gets
+its own queue, so ``_deliver_messages`` sleeping between SMTP retries, or a
+large flush, cannot hold up the default queue. ``manage.py start`` runs
+``Q_CLUSTERS`` qcluster processes for the default queue and ``Q_EMAIL_CLUSTERS``
+for the email queue. A deployment that runs ``manage.py qcluster`` itself must
+then also run one with ``Q_QUEUE=<Q_EMAIL_QUEUE>``. Unset, email shares the
+default queue.
+
+:func:`queue_stats` reports each queue's backlog and the run time of its recent
+tasks (``manage.py queue_stats``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import (
+    Avg,
+    Count,
+    DurationField,
+    ExpressionWrapper,
+    F,
+    Max,
+    Min,
+    Q,
+    Value,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django_q.models import OrmQ, Task
+
+#: How far back :func:`queue_stats` looks for finished tasks by default.
+STATS_WINDOW = timedelta(minutes=15)
+
+
+def default_queue() -> str:
+    """Name of the default queue (the cluster name of plain ``qcluster``)."""
+
+    return str(settings.Q_CLUSTER["name"])
+
+
+def email_queue() -> str | None:
+    """Queue for email delivery tasks; ``None`` routes them to the default queue."""
+
+    return settings.Q_EMAIL_QUEUE or None
+
+
+def queue_names() -> list[str]:
+    """The default queue, then the dedicated ones that are configured."""
+
+    email = email_queue()
+    return [default_queue(), *([email] if email else [])]
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """Backlog and recent throughput of one queue."""
+
+    name: str
+    #: Tasks waiting for a worker.
+    queued: int
+    #: Tasks pulled by a worker and not yet acknowledged.
+    in_flight: int
+    #: How long the oldest waiting task has been queued.
+    oldest_wait: timedelta | None
+    #: Tasks finished within the window, and how many of them failed.
+    finished: int
+    failed: int
+    mean_run_time: timedelta | None
+    max_run_time: timedelta | None
+
+
+def queue_stats(window: timedelta = STATS_WINDOW) -> list[QueueStats]:
+    """
+    Return :class:`QueueStats` for every queue (two aggregate queries).
+
+    A waiting broker row's ``lock`` is its enqueue time; a worker pulling it
+    moves ``lock`` into the future until the task is acknowledged. Run times come
+    from the ``Task`` results stored for tasks that stopped within ``window``.
+    """
+
+    now = timezone.now()
+    waiting = Q(lock__lte=now)
+    backlog = {
+        row["key"]: row
+        for row in OrmQ.objects.order_by()
+        .values("key")
+        .annotate(
+            queued=Count("pk", filter=waiting),
+            in_flight=Count("pk", filter=~waiting),
+            oldest=Min("lock", filter=waiting),
+        )
+    }
+    run_time = ExpressionWrapper(
+        F("stopped") - F("started"), output_field=DurationField()
+    )
+    recent = {
+        row["queue"]: row
+        for row in Task.objects.filter(stopped__gte=now - window).order_by()
+        # Tasks queued without a cluster ran on the default queue.
+        .annotate(queue=Coalesce("cluster", Value(default_queue())))
+        .values("queue")
+        .annotate(
+            finished=Count("pk"),
+            failed=Count("pk", filter=Q(success=False)),
+            mean=Avg(run_time),
+            longest=Max(run_time),
+        )
+    }
+
+    stats: list[QueueStats] = []
+    for name in queue_names():
+        queued = backlog.get(name, {})
+        done = recent.get(name, {})
+        oldest = queued.get("oldest")
+        stats.append(
+            QueueStats(
+                name=name,
+                queued=queued.get("queued", 0),
+                in_flight=queued.get("in_flight", 0),
+                oldest_wait=now - oldest if oldest is not None else None,
+                finished=done.get("finished", 0),
+                failed=done.get("failed", 0),
+                mean_run_time=done.get("mean"),
+                max_run_time=done.get("longest"),
+            )
+        )
+    return stats
@@ -5,6 +5,16 @@ import sys
 from unittest.mock import MagicMock, patch
 
 import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from common.web_server import gunicorn_argv
+
+
+@pytest.fixture(autouse=True)
+def _single_queue(settings):
+    """Start tests below model one qcluster; multi-queue spawning is tested apart."""
+    settings.Q_CLUSTERS = 1
+    settings.Q_EMAIL_QUEUE = ""
 
 
 def test_gunicorn_command_execs_gunicorn():
@@ -16,7 +26,7 @@ def test_gunicorn_command_execs_gunicorn():
 
         Command().handle()
 
-    mock_exec.assert_called_once_with("gunicorn", ["gunicorn", "sloths_inventory.wsgi"])
+    mock_exec.assert_called_once_with("gunicorn", ["gunicorn", *gunicorn_argv()])
 
 
 def test_start_command_spawns_correct_processes():
@@ -44,7 +54,76 @@ def test_start_command_spawns_correct_processes():
         Command().handle()
 
     assert popen_calls[0] == [sys.executable, "manage.py", "qcluster"]
-    assert popen_calls[1] == ["gunicorn", "sloths_inventory.wsgi"]
+    assert popen_calls[1] == ["gunicorn", *gunicorn_argv()]
+    assert popen_calls[1][-1] == "sloths_inventory.wsgi"
+
+
+def test_start_command_rejects_bad_worker_class_before_spawning(settings):
+    """A misconfigured gunicorn never leaves an unsupervised qcluster behind."""
+    settings.GUNICORN_WORKER_CLASS = "eventlet"
+
+    with (
+        patch("subprocess.Popen") as mock_popen,
+        pytest.raises(ImproperlyConfigured),
+    ):
+        from common.management.commands.start import Command
+
+        Command().handle()
+
+    mock_popen.assert_not_called()
+
+
+def test_start_command_spawns_a_qcluster_per_queue(settings):
+    """Q_CLUSTERS default-queue clusters, then the email queue ones, then gunicorn."""
+    settings.Q_CLUSTERS = 2
+    settings.Q_EMAIL_QUEUE = "email"
+    settings.Q_EMAIL_CLUSTERS = 1
+    children = [MagicMock() for _ in range(4)]
+    for child in children:
+        child.poll.return_value = 0
+
+    with (
+        patch("subprocess.Popen", side_effect=children) as mock_popen,
+        patch("signal.signal"),
+        patch("time.sleep"),
+        patch("common.management.commands.start._stop"),
+        pytest.raises(SystemExit),
+    ):
+        from common.management.commands.start import Command
+
+        Command().handle()
+
+    calls = mock_popen.call_args_list
+    assert [call.args[0][-1] for call in calls] == [
+        "qcluster",
+        "qcluster",
+        "qcluster",
+        "sloths_inventory.wsgi",
+    ]
+    assert [call.kwargs["env"]["Q_QUEUE"] for call in calls[:3]] == ["", "", "email"]
+    assert "env" not in calls[3].kwargs
+
+
+@pytest.mark.parametrize(
+    ("setting", "email_queue"),
+    [("Q_CLUSTERS", ""), ("Q_EMAIL_CLUSTERS", "email")],
+)
+def test_start_command_rejects_zero_clusters_before_spawning(
+    settings, setting, email_queue
+):
+    """A queue without any qcluster would never run its tasks."""
+    settings.Q_EMAIL_QUEUE = email_queue
+    setattr(settings, setting, 0)
+
+    with (
+        patch("subprocess.Popen") as mock_popen,
+        pytest.raises(ImproperlyConfigured, match=setting),
+    ):
+        from common.management.commands.start import Command
+
+        Command().handle()
+
+    mock_popen.assert_not_called()
 
 
 def test_start_command_stops_survivor_and_exits_with_rc():
@@ -1,12 +1,26 @@
 """Tests for common.email_backends."""
 
 import smtplib
+from datetime import timedelta
 from unittest.mock import MagicMock, call, patch
 
+import pytest
 from django.core.mail import EmailMessage
 from django.test import override_settings
+from django.utils import timezone
+from django_q.models import Schedule
 
-from common.email_backends import AsyncEmailBackend, _deliver_messages
+from common import metrics
+from common.email_backends import (
+    EMAIL_FLUSH_SCHEDULE,
+    AsyncEmailBackend,
+    _deliver_messages,
+    enqueue_messages,
+    flush_email_queue,
+    schedule_email_flush,
+)
+from common.metrics import Samples
+from common.models import QueuedEmail
 
 _RETRY_0 = dict(
     EMAIL_RETRY_MAX_RETRIES=0,
@@ -20,6 +34,23 @@ _RETRY_2 = dict(
 )
 
 
+@pytest.fixture
+def deliveries(settings, monkeypatch):
+    """Return ``{result: count}`` of ``email_deliveries_total`` recorded so far."""
+    settings.METRICS = True
+    settings.METRICS_DIR = ""
+    monkeypatch.setattr(metrics, "_samples", Samples())
+
+    def counts() -> dict[str, float]:
+        return {
+            dict(labels)["result"]: value
+            for (name, labels), value in metrics.collect().counters.items()
+            if name == "email_deliveries_total" and value
+        }
+
+    return counts
+
+
 class TestDeliverMessages:
     @override_settings(**_RETRY_0)
     def test_success_returns_count(self):
@@ -70,6 +101,22 @@ class TestDeliverMessages:
             assert _deliver_messages(messages) == 0
         mock_smtp.send_messages.assert_called_once()
 
+    @override_settings(**_RETRY_2)
+    def test_outcomes_are_counted(self, deliveries):
+        messages = [MagicMock(), MagicMock()]
+        mock_smtp = MagicMock()
+        mock_smtp.__enter__ = MagicMock(return_value=mock_smtp)
+        mock_smtp.__exit__ = MagicMock(return_value=False)
+        mock_smtp.send_messages.side_effect = [
+            smtplib.SMTPConnectError(421, "retry"),
+            2,
+            smtplib.SMTPAuthenticationError(535, "auth"),
+        ]
+        with patch("common.email_backends.SmtpBackend", return_value=mock_smtp):
+            _deliver_messages(messages)
+            _deliver_messages(messages)
+        assert deliveries() == {"retried": 2, "sent": 2, "failed": 2}
+
     @override_settings(
         EMAIL_RETRY_MAX_RETRIES=2,
         EMAIL_RETRY_BASE_DELAY_SECONDS=10.0,
@@ -93,16 +140,29 @@ class TestAsyncEmailBackend:
     def test_empty_list_returns_zero(self):
         assert AsyncEmailBackend().send_messages([]) == 0
 
-    @override_settings(EMAIL_SEND_ASYNC=True)
-    def test_enqueues_when_async_enabled(self):
+    @override_settings(
+        EMAIL_SEND_ASYNC=True, EMAIL_BATCH_DELIVERY=False, Q_EMAIL_QUEUE="email"
+    )
+    def test_enqueues_on_the_email_queue_when_async_enabled(self):
         messages = [EmailMessage(subject="s", body="b", to=["a@example.com"])]
         with patch("common.email_backends.async_task") as mock_task:
             result = AsyncEmailBackend().send_messages(messages)
         mock_task.assert_called_once_with(
-            "common.email_backends._deliver_messages", messages
+            "common.email_backends._deliver_messages", messages, cluster="email"
         )
         assert result == 1
 
+    @override_settings(
+        EMAIL_SEND_ASYNC=True, EMAIL_BATCH_DELIVERY=False, Q_EMAIL_QUEUE=""
+    )
+    def test_without_email_queue_uses_the_default_queue(self):
+        messages = [EmailMessage(subject="s", body="b", to=["a@example.com"])]
+        with patch("common.email_backends.async_task") as mock_task:
+            AsyncEmailBackend().send_messages(messages)
+        mock_task.assert_called_once_with(
+            "common.email_backends._deliver_messages", messages, cluster=None
+        )
+
     @override_settings(EMAIL_SEND_ASYNC=False)
     def test_delivers_synchronously_when_async_disabled(self):
         messages = [EmailMessage(subject="s", body="b", to=["a@example.com"])]
@@ -111,3 +171,153 @@ class TestAsyncEmailBackend:
             result = AsyncEmailBackend().send_messages(messages)
         mock_deliver.assert_called_once_with(messages)
         assert result == 1
+
+    @pytest.mark.django_db
+    @override_settings(EMAIL_SEND_ASYNC=True, EMAIL_BATCH_DELIVERY=True)
+    def test_batch_mode_queues_rows_instead_of_tasks(self):
+        messages = [
+            EmailMessage(subject="s", body="b", to=["a@example.com"]),
+            EmailMessage(subject="s", body="b", to=[]),
+        ]
+        with patch("common.email_backends.async_task") as mock_task:
+            assert AsyncEmailBackend().send_messages(messages) == 1
+        mock_task.assert_not_called()
+        row = QueuedEmail.objects.get()
+        assert row.recipients == ["a@example.com"]
+        assert b"Subject: s" in bytes(row.message)
+        assert str(row).endswith(" -> a@example.com")
+
+    @pytest.mark.django_db
+    @override_settings(EMAIL_SEND_ASYNC=True, EMAIL_BATCH_DELIVERY=True)
+    def test_batch_mode_without_recipients_queues_nothing(self):
+        messages = [EmailMessage(subject="s", body="b", to=[])]
+        assert AsyncEmailBackend().send_messages(messages) == 0
+        assert not QueuedEmail.objects.exists()
+
+
+def _smtp_backend() -> MagicMock:
+    backend = MagicMock()
+    backend.connection.sendmail.return_value = {}
+    return backend
+
+
+def _queue(*addresses: str) -> None:
+    enqueue_messages(
+        [EmailMessage(subject="s", body="b", to=[address]) for address in addresses]
+    )
+
+
+@pytest.mark.django_db
+class TestBatchedDelivery:
+    @pytest.fixture(autouse=True)
+    def batch_settings(self, settings):
+        settings.EMAIL_BATCH_WINDOW_SECONDS = 5.0
+        settings.EMAIL_BATCH_SIZE = 2
+        for name, value in _RETRY_2.items():
+            setattr(settings, name, value)
+
+    def test_messages_queued_in_window_share_one_flush(
+        self, settings, django_capture_on_commit_callbacks
+    ):
+        settings.Q_EMAIL_QUEUE = "email"
+        with django_capture_on_commit_callbacks(execute=True):
+            _queue("a@example.com")
+        with django_capture_on_commit_callbacks(execute=True):
+            _queue("b@example.com")
+
+        flush = Schedule.objects.get(name=EMAIL_FLUSH_SCHEDULE)
+        assert flush.func == EMAIL_FLUSH_SCHEDULE
+        assert flush.schedule_type == Schedule.ONCE
+        assert flush.cluster == settings.Q_EMAIL_QUEUE
+        assert QueuedEmail.objects.count() == 2
+
+    def test_later_flush_is_brought_forward(self):
+        later = timezone.now() + timedelta(hours=1)
+        Schedule.objects.create(
+            func=EMAIL_FLUSH_SCHEDULE,
+            name=EMAIL_FLUSH_SCHEDULE,
+            schedule_type=Schedule.ONCE,
+            next_run=later,
+        )
+
+        schedule_email_flush(5.0)
+
+        flush = Schedule.objects.get(name=EMAIL_FLUSH_SCHEDULE)
+        assert flush.next_run < later - timedelta(minutes=50)
+
+    def test_flush_reuses_one_connection_per_batch(self):
+        _queue("a@example.com", "b@example.com", "c@example.com")
+        backend = _smtp_backend()
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            assert flush_email_queue() == 3
+
+        assert backend.open.call_count == 2  # batches of 2 + 1
+        assert backend.connection.sendmail.call_count == 3
+        assert not QueuedEmail.objects.exists()
+        assert not Schedule.objects.filter(name=EMAIL_FLUSH_SCHEDULE).exists()
+
+    def test_failing_close_does_not_undo_delivery(self):
+        _queue("a@example.com")
+        backend = _smtp_backend()
+        backend.close.side_effect = smtplib.SMTPServerDisconnected("gone")
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            assert flush_email_queue() == 1
+        assert not QueuedEmail.objects.exists()
+
+    def test_connection_failure_postpones_batch_without_sleeping(self):
+        _queue("a@example.com", "b@example.com")
+        backend = _smtp_backend()
+        backend.open.side_effect = smtplib.SMTPConnectError(421, "busy")
+        with (
+            patch("common.email_backends.SmtpBackend", return_value=backend),
+            patch("common.email_backends.time.sleep") as mock_sleep,
+            override_settings(EMAIL_RETRY_BASE_DELAY_SECONDS=60.0),
+        ):
+            assert flush_email_queue() == 0
+
+        mock_sleep.assert_not_called()
+        rows = list(QueuedEmail.objects.all())
+        assert [row.attempts for row in rows] == [1, 1]
+        assert rows[0].next_attempt_at > timezone.now() + timedelta(seconds=50)
+        flush = Schedule.objects.get(name=EMAIL_FLUSH_SCHEDULE)
+        assert flush.next_run > timezone.now() + timedelta(seconds=50)
+
+    def test_rejected_message_is_dropped_and_batch_continues(self):
+        _queue("bad@example.com", "good@example.com")
+        backend = _smtp_backend()
+        backend.connection.sendmail.side_effect = [
+            smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no")}),
+            {},
+        ]
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            assert flush_email_queue() == 1
+        assert not QueuedEmail.objects.exists()
+
+    def test_outcomes_are_counted(self, deliveries):
+        _queue("bad@example.com", "good@example.com")
+        backend = _smtp_backend()
+        backend.connection.sendmail.side_effect = [
+            smtplib.SMTPRecipientsRefused({"bad@example.com": (550, b"no")}),
+            {},
+        ]
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            flush_email_queue()
+        assert deliveries() == {"sent": 1, "failed": 1}
+
+        _queue("a@example.com", "b@example.com")
+        first = QueuedEmail.objects.order_by("pk").first()
+        assert first is not None
+        QueuedEmail.objects.filter(pk=first.pk).update(attempts=2)
+        backend.open.side_effect = smtplib.SMTPConnectError(421, "busy")
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            flush_email_queue()
+        assert deliveries() == {"sent": 1, "failed": 2, "retried": 1}
+
+    def test_exhausted_retries_drop_message(self):
+        _queue("a@example.com")
+        QueuedEmail.objects.update(attempts=2)
+        backend = _smtp_backend()
+        backend.connection.sendmail.side_effect = smtplib.SMTPServerDisconnected("x")
+        with patch("common.email_backends.SmtpBackend", return_value=backend):
+            assert flush_email_queue() == 0
+        assert not QueuedEmail.objects.exists()
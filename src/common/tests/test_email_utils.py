@@ -2,13 +2,25 @@
 
 from unittest.mock import patch
 
-from common.email_utils import send_transfer_email
+from django.template.loader import get_template, render_to_string
+from django.test import override_settings
+
+from common.email_rendering import RenderedEmail, render_email
+from common.email_utils import build_transfer_email, send_transfer_email
+
+
+def _rendered(subject_template, body_template, context, html_template=None):
+    return RenderedEmail(
+        subject="rendered",
+        body="rendered",
+        html="rendered" if html_template else None,
+    )
 
 
 class TestSendTransferEmail:
     def test_renders_templates_and_sends(self):
         with (
-            patch("common.email_utils.render_to_string", return_value="rendered"),
+            patch("common.email_utils.render_email", side_effect=_rendered),
             patch("common.email_utils.send_mail") as mock_send,
         ):
             send_transfer_email("subj.txt", "body.txt", {}, "a@example.com")
@@ -22,7 +34,7 @@ class TestSendTransferEmail:
 
     def test_html_template_rendered_and_passed(self):
         with (
-            patch("common.email_utils.render_to_string", return_value="rendered"),
+            patch("common.email_utils.render_email", side_effect=_rendered),
             patch("common.email_utils.send_mail") as mock_send,
         ):
             send_transfer_email(
@@ -38,7 +50,7 @@ class TestSendTransferEmail:
 
     def test_empty_string_recipient_skips_send(self):
         with (
-            patch("common.email_utils.render_to_string", return_value="rendered"),
+            patch("common.email_utils.render_email", side_effect=_rendered),
             patch("common.email_utils.send_mail") as mock_send,
         ):
             send_transfer_email("subj.txt", "body.txt", {}, "")
@@ -46,8 +58,101 @@ class TestSendTransferEmail:
 
     def test_list_of_empty_strings_skips_send(self):
         with (
-            patch("common.email_utils.render_to_string", return_value="rendered"),
+            patch("common.email_utils.render_email", side_effect=_rendered),
             patch("common.email_utils.send_mail") as mock_send,
         ):
             send_transfer_email("subj.txt", "body.txt", {}, ["", ""])
         mock_send.assert_not_called()
+
+
+class TestBuildTransferEmail:
+    def test_builds_message_with_html_alternative(self):
+        with patch("common.email_utils.render_email", side_effect=_rendered):
+            message = build_transfer_email(
+                "subj.txt",
+                "body.txt",
+                {},
+                ["a@example.com", ""],
+                html_template="body.html",
+            )
+        assert message is not None
+        assert message.subject == "rendered"
+        assert message.to == ["a@example.com"]
+        assert message.alternatives[0][0] == "rendered"
+
+    def test_builds_plain_text_message_without_html_template(self):
+        with patch("common.email_utils.render_email", side_effect=_rendered):
+            message = build_transfer_email("subj.txt", "body.txt", {}, "a@example.com")
+        assert message is not None
+        assert message.alternatives == []
+
+    def test_no_recipient_returns_none(self):
+        with patch("common.email_utils.render_email") as mock_render:
+            assert build_transfer_email("subj.txt", "body.txt", {}, "") is None
+        mock_render.assert_not_called()
+
+
+class TestRenderEmail:
+    _TEMPLATES = (
+        "emails/operation_updated_subject.txt",
+        "emails/operation_updated_body.txt",
+    )
+    _CONTEXT = {
+        "item": "Laptop <X1>",
+        "operation": {"status": "OK", "location": "Desk", "responsible": "Ann"},
+    }
+
+    def test_matches_render_to_string(self):
+        rendered = render_email(
+            *self._TEMPLATES,
+            self._CONTEXT,
+            html_template="emails/operation_updated_body.html",
+        )
+        assert (
+            rendered.subject
+            == render_to_string(self._TEMPLATES[0], self._CONTEXT).strip()
+        )
+        assert rendered.body == render_to_string(self._TEMPLATES[1], self._CONTEXT)
+        assert rendered.html == render_to_string(
+            "emails/operation_updated_body.html", self._CONTEXT
+        )
+
+    @override_settings(
+        TEMPLATES=[
+            {
+                "BACKEND": "django.template.backends.django.DjangoTemplates",
+                "OPTIONS": {
+                    "loaders": [
+                        (
+                            "django.template.loaders.locmem.Loader",
+                            {
+                                "subject.txt": "{% firstof 'set' as leaked %}S",
+                                "body.txt": "[{{ leaked }}]",
+                            },
+                        )
+                    ]
+                },
+            }
+        ]
+    )
+    def test_parts_do_not_share_a_context(self):
+        rendered = render_email("subject.txt", "body.txt", {})
+        assert (rendered.subject, rendered.body) == ("S", "[]")
+
+    @override_settings(DEBUG=False)
+    def test_templates_are_compiled_once_per_process(self):
+        with patch(
+            "common.email_rendering.get_template", wraps=get_template
+        ) as mock_get:
+            for _ in range(3):
+                render_email(*self._TEMPLATES, self._CONTEXT)
+        assert mock_get.call_count == 2
+
+    @override_settings(DEBUG=True)
+    def test_debug_loads_templates_on_every_render(self):
+        with patch(
+            "common.email_rendering.get_template", wraps=get_template
+        ) as mock_get:
+            for _ in range(2):
+                render_email(*self._TEMPLATES, self._CONTEXT)
+        assert mock_get.call_count == 4
@@ -0,0 +1,295 @@
+"""Tests for common.metrics."""
+
+import json
+import logging
+import math
+import os
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+from common import metrics
+from common.metrics import Histogram, MetricsMiddleware, Samples
+
+
+@pytest.fixture
+def recording(settings, monkeypatch):
+    """Metrics on, in a fresh in-memory store, without a shared directory."""
+    settings.METRICS = True
+    settings.METRICS_DIR = ""
+    settings.METRICS_FLUSH_SECONDS = 0
+    monkeypatch.setattr(metrics, "_samples", Samples())
+    monkeypatch.setattr(metrics, "_last_flush", -math.inf)
+    monkeypatch.setattr(metrics, "_flushed_pid", None)
+    return settings
+
+
+@pytest.fixture
+def shared_dir(recording, tmp_path):
+    recording.METRICS_DIR = str(tmp_path)
+    return tmp_path
+
+
+def _counter(samples: Samples, name: str, **labels: str) -> float:
+    return samples.counters[(name, tuple(sorted(labels.items())))]
+
+
+def _histogram(samples: Samples, name: str, **labels: str) -> Histogram:
+    return samples.histograms[(name, tuple(sorted(labels.items())))]
+
+
+def test_nothing_is_recorded_when_disabled(settings, monkeypatch) -> None:
+    settings.METRICS = False
+    monkeypatch.setattr(metrics, "_samples", Samples())
+    metrics.inc("db_queries_total", view="x")
+    metrics.observe("http_request_duration_seconds", 0.1, view="x")
+    assert metrics.collect() == Samples()
+
+
+def test_counters_add_up_per_label_set(recording) -> None:
+    metrics.inc("email_deliveries_total", 2, result="sent")
+    metrics.inc("email_deliveries_total", result="sent")
+    metrics.inc("email_deliveries_total", result="failed")
+
+    samples = metrics.collect()
+    assert _counter(samples, "email_deliveries_total", result="sent") == 3
+    assert _counter(samples, "email_deliveries_total", result="failed") == 1
+
+
+def test_observations_land_in_their_bucket(recording) -> None:
+    for seconds in (0.0005, 0.001, 0.07, 60.0):
+        metrics.observe("inventory_item_lock_wait_seconds", seconds)
+
+    histogram = _histogram(metrics.collect(), "inventory_item_lock_wait_seconds")
+    # Bounds: 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, +Inf.
+    assert histogram.buckets == [2, 0, 0, 0, 1, 0, 0, 0, 1]
+    assert histogram.count == 4
+    assert histogram.sum == pytest.approx(60.0715)
+
+
+def test_timer_records_the_block_even_when_it_raises(recording) -> None:
+    with pytest.raises(ValueError), metrics.timer("inventory_item_lock_wait_seconds"):
+        raise ValueError
+
+    assert _histogram(metrics.collect(), "inventory_item_lock_wait_seconds").count == 1
+
+
+def test_forked_process_starts_from_zero(recording, monkeypatch) -> None:
+    metrics.inc("db_queries_total", view="x")
+    monkeypatch.setattr(metrics, "_pid", -1)
+    assert metrics.collect() == Samples()
+
+
+def test_processes_are_summed_through_the_shared_directory(shared_dir) -> None:
+    other = Samples()
+    other.counters[("db_queries_total", (("view", "x"),))] = 5
+    other.histograms[("http_request_duration_seconds", (("view", "x"),))] = Histogram(
+        [1] + [0] * 11, 0.001, 1
+    )
+    (shared_dir / "metrics-1.json").write_text(json.dumps(other.to_json()))
+
+    metrics.inc("db_queries_total", 2, view="x")
+    metrics.observe("http_request_duration_seconds", 20.0, view="x")
+
+    samples = metrics.collect()
+    assert _counter(samples, "db_queries_total", view="x") == 7
+    histogram = _histogram(samples, "http_request_duration_seconds", view="x")
+    assert histogram.buckets == [1] + [0] * 10 + [1]
+    assert (histogram.count, histogram.sum) == (2, pytest.approx(20.001))
+    # This process's own file is not counted twice.
+    assert sorted(path.name for path in shared_dir.iterdir()) == [
+        "metrics-1.json",
+        f"metrics-{os.getpid()}.json",
+    ]
+
+
+def _write_samples(path, value: float) -> None:
+    samples = Samples()
+    samples.counters[("db_queries_total", (("view", "x"),))] = value
+    path.write_text(json.dumps(samples.to_json()))
+
+
+def test_files_of_exited_processes_are_archived(shared_dir, monkeypatch) -> None:
+    monkeypatch.setattr(metrics, "_process_alive", lambda pid: pid not in (7, 8))
+    _write_samples(shared_dir / "metrics-1.json", 1)
+    _write_samples(shared_dir / "metrics-7.json", 10)
+    metrics.inc("db_queries_total", 2, view="x")
+
+    assert _counter(metrics.collect(), "db_queries_total", view="x") == 13
+    _write_samples(shared_dir / "metrics-8.json", 100)
+    assert _counter(metrics.collect(), "db_queries_total", view="x") == 113
+    assert _counter(metrics.collect(), "db_queries_total", view="x") == 113
+
+    assert sorted(path.name for path in shared_dir.glob("metrics-*.json")) == [
+        "metrics-1.json",
+        f"metrics-{os.getpid()}.json",
+        metrics.ARCHIVE_FILE,
+    ]
+    archive = json.loads((shared_dir / metrics.ARCHIVE_FILE).read_text())
+    assert archive["counters"] == [["db_queries_total", [["view", "x"]], 110]]
+
+
+def test_reused_pid_archives_its_predecessors_file(shared_dir) -> None:
+    _write_samples(shared_dir / f"metrics-{os.getpid()}.json", 5)
+    metrics.inc("db_queries_total", view="x")
+    metrics.inc("db_queries_total", view="x")
+
+    assert _counter(metrics.collect(), "db_queries_total", view="x") == 7
+    archive = json.loads((shared_dir / metrics.ARCHIVE_FILE).read_text())
+    assert archive["counters"] == [["db_queries_total", [["view", "x"]], 5]]
+
+
+def test_archive_keeps_files_it_cannot_merge(shared_dir, monkeypatch, caplog) -> None:
+    monkeypatch.setattr(metrics, "_process_alive", lambda pid: pid == 1)
+    _write_samples(shared_dir / "metrics-1.json", 1)
+    (shared_dir / "metrics-7.json").write_text("{not json")
+    # Archived by a concurrent scrape between listing and reading: no warning.
+    assert metrics._read(shared_dir / "metrics-9.json") is None
+    assert caplog.text == ""
+    # Alive again by the time the lock is held: left to its new owner.
+    metrics._archive(shared_dir, [shared_dir / "metrics-1.json"])
+    metrics.collect()
+    assert not (shared_dir / metrics.ARCHIVE_FILE).exists()
+
+    (shared_dir / metrics.ARCHIVE_FILE).write_text("{not json")
+    _write_samples(shared_dir / "metrics-8.json", 1)
+    metrics.collect()
+    assert (shared_dir / "metrics-8.json").exists()
+    assert "Skipping unreadable metrics file" in caplog.text
+
+    def fail(*args: object) -> None:
+        raise OSError("locked out")
+
+    monkeypatch.setattr(metrics, "_archive", fail)
+    with caplog.at_level(logging.ERROR, logger="common.metrics"):
+        metrics.collect()
+    assert "Could not archive metrics" in caplog.text
+
+
+def test_process_alive_asks_the_kernel(monkeypatch) -> None:
+    assert metrics._process_alive(os.getpid())
+
+    def kill(error: type[OSError]):
+        def raise_(pid: int, signal: int) -> None:
+            raise error
+
+        return raise_
+
+    monkeypatch.setattr(os, "kill", kill(ProcessLookupError))
+    assert not metrics._process_alive(12345)
+    monkeypatch.setattr(os, "kill", kill(PermissionError))
+    assert metrics._process_alive(12345)
+
+
+def test_flush_is_rate_limited(shared_dir, settings, monkeypatch) -> None:
+    settings.METRICS_FLUSH_SECONDS = 3600
+    # A host up for seconds still flushes the first record.
+    monkeypatch.setattr(time, "monotonic", lambda: 5.0)
+    metrics.inc("db_queries_total", view="x")
+    metrics.inc("db_queries_total", view="x")
+
+    written = json.loads(next(shared_dir.iterdir()).read_text())
+    assert written["counters"] == [["db_queries_total", [["view", "x"]], 1]]
+
+
+def test_unreadable_files_are_skipped(shared_dir, caplog) -> None:
+    (shared_dir / "metrics-1.json").write_text("{not json")
+    metrics.inc("db_queries_total", view="x")
+
+    assert _counter(metrics.collect(), "db_queries_total", view="x") == 1
+    assert "Skipping unreadable metrics file" in caplog.text
+
+
+def test_flush_logs_write_errors(shared_dir, settings, caplog) -> None:
+    blocker = shared_dir / "file"
+    blocker.write_text("")
+    settings.METRICS_DIR = str(blocker / "metrics")
+
+    with caplog.at_level(logging.ERROR, logger="common.metrics"):
+        metrics.flush()
+
+    assert "Could not write metrics" in caplog.text
+
+
+def test_flush_without_directory_or_when_disabled_writes_nothing(
+    shared_dir, settings
+) -> None:
+    settings.METRICS = False
+    metrics.flush()
+    settings.METRICS, settings.METRICS_DIR = True, ""
+    metrics.flush()
+    assert list(shared_dir.iterdir()) == []
+
+
+def test_clear_metrics_dir_removes_previous_runs(shared_dir, settings) -> None:
+    (shared_dir / "metrics-1.json").write_text("{}")
+    (shared_dir / "keep.txt").write_text("")
+    metrics.clear_metrics_dir()
+    assert [path.name for path in shared_dir.iterdir()] == ["keep.txt"]
+
+    settings.METRICS_DIR = str(shared_dir / "missing")
+    metrics.clear_metrics_dir()
+
+
+def test_task_durations_are_recorded_per_queue(recording) -> None:
+    started = datetime(2026, 1, 1, 12, 0, 0)
+    recording.Q_CLUSTER = {**recording.Q_CLUSTER, "cluster_name": "email"}
+    metrics.record_task_duration(
+        "django_q",
+        {"started": started, "stopped": started + timedelta(seconds=2)},
+    )
+    metrics.record_task_duration(
+        "django_q",
+        {
+            "started": started,
+            "stopped": started + timedelta(seconds=1),
+            "success": True,
+        },
+    )
+    metrics.record_task_duration("django_q", {"started": started})
+
+    samples = metrics.collect()
+    failure = _histogram(
+        samples, "django_q_task_duration_seconds", queue="email", result="failure"
+    )
+    success = _histogram(
+        samples, "django_q_task_duration_seconds", queue="email", result="success"
+    )
+    assert (failure.count, failure.sum) == (1, 2.0)
+    assert (success.count, success.sum) == (1, 1.0)
+
+
+def test_middleware_drops_out_when_disabled(settings) -> None:
+    settings.METRICS = False
+    with pytest.raises(MiddlewareNotUsed):
+        MetricsMiddleware(lambda request: None)  # type: ignore[arg-type]
+
+
+@pytest.mark.django_db
+def test_middleware_records_latency_and_queries_per_url_name(recording) -> None:
+    client = Client()
+    client.get(reverse("common:login"))
+    client.get("/no-such-page/")
+
+    samples = metrics.collect()
+    assert _histogram(
+        samples, "http_request_duration_seconds", view="common:login"
+    ).count
+    assert _histogram(samples, "http_request_duration_seconds", view="unresolved")
+    assert ("db_queries_total", (("view", "common:login"),)) in samples.counters
+
+
+def test_middleware_counts_queries_of_the_view(recording, db) -> None:
+    def view(request):
+        request.resolver_match = None
+        User.objects.count()
+        User.objects.count()
+        return "response"
+
+    assert MetricsMiddleware(view)(RequestFactory().get("/")) == "response"
+    assert _counter(metrics.collect(), "db_queries_total", view="unresolved") == 2
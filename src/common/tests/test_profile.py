@@ -363,3 +363,56 @@ def test_notifications_no_messages_for_anonymous(client: Client) -> None:
     response = client.get(reverse("common:login"))
     assert response.status_code == 200
     assert b"flash-messages" not in response.content
+
+
+@pytest.mark.django_db
+class TestNotificationSettings:
+    """Tests for the digest preference on the profile page."""
+
+    def test_section_hidden_without_linked_responsible(
+        self, client: Client, django_user_model
+    ):
+        django_user_model.objects.create_user(
+            username="unlinked", password="pw", email="unlinked@example.com"
+        )
+        client.login(username="unlinked", password="pw")
+        response = client.get(reverse("common:profile"))
+        assert 'name="notification_submit"' not in response.content.decode()
+
+        response = client.post(
+            reverse("common:profile"),
+            {"notification_submit": "1", "email_digest": "on"},
+        )
+        assert response.status_code == 302
+        assert response["Location"] == reverse("common:profile")
+
+    def test_toggle_digest_updates_responsible_without_email(
+        self, client: Client, django_user_model
+    ):
+        from catalogs.models import Responsible
+
+        user = django_user_model.objects.create_user(
+            username="digest", password="pw", email="digest@example.com"
+        )
+        responsible = Responsible.objects.create(
+            last_name="Digest", first_name="User", user=user
+        )
+        client.login(username="digest", password="pw")
+        assert 'name="notification_submit"' in (
+            client.get(reverse("common:profile")).content.decode()
+        )
+        mail.outbox.clear()
+
+        response = client.post(
+            reverse("common:profile"),
+            {"notification_submit": "1", "email_digest": "on"},
+        )
+
+        assert response.status_code == 302
+        responsible.refresh_from_db()
+        assert responsible.email_digest is True
+        assert len(mail.outbox) == 0
+
+        client.post(reverse("common:profile"), {"notification_submit": "1"})
+        responsible.refresh_from_db()
+        assert responsible.email_digest is False
@@ -0,0 +1,162 @@
+"""Tests for the request timing middleware and template backend."""
+
+import copy
+import logging
+import re
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.exceptions import MiddlewareNotUsed
+from django.template import TemplateDoesNotExist
+from django.test import Client, RequestFactory
+from django.urls import reverse
+
+from catalogs.models import Responsible
+from common.request_timing import (
+    RequestTimingMiddleware,
+    RequestTimings,
+    TimedDjangoTemplates,
+    _current,
+)
+
+SERVER_TIMING = re.compile(
+    r'^db;dur=[\d.]+;desc="(\d+) queries", tpl;dur=([\d.]+), '
+    r"view;dur=([\d.]+), total;dur=([\d.]+)$"
+)
+
+
+@pytest.fixture
+def timing_enabled(settings):
+    settings.REQUEST_TIMING = True
+    templates = copy.deepcopy(settings.TEMPLATES)
+    templates[0]["BACKEND"] = "common.request_timing.TimedDjangoTemplates"
+    settings.TEMPLATES = templates
+    return settings
+
+
+@pytest.fixture
+def logged_in_client(db) -> Client:
+    user = User.objects.create_user(
+        username="timed", password="pw", email="timed@example.com"
+    )
+    Responsible.objects.create(last_name="Timed", first_name="User", user=user)
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def _timing_record(caplog, level: int) -> logging.LogRecord:
+    records = [
+        r
+        for r in caplog.records
+        if r.name == "common.request_timing" and r.levelno == level
+    ]
+    assert len(records) == 1
+    return records[0]
+
+
+def test_middleware_drops_out_when_disabled(settings) -> None:
+    settings.REQUEST_TIMING = False
+    with pytest.raises(MiddlewareNotUsed):
+        RequestTimingMiddleware(lambda request: None)  # type: ignore[arg-type]
+
+
+@pytest.mark.django_db
+def test_no_header_when_disabled(settings, logged_in_client) -> None:
+    settings.REQUEST_TIMING = False
+    response = logged_in_client.get(reverse("inventory:my-items"))
+    assert "Server-Timing" not in response
+
+
+def test_page_reports_queries_and_timings(
+    timing_enabled, logged_in_client, caplog
+) -> None:
+    timing_enabled.REQUEST_TIMING_SLOW_MS = 60_000
+    caplog.set_level(logging.INFO, logger="common.request_timing")
+
+    response = logged_in_client.get(reverse("inventory:my-items"))
+
+    assert response.status_code == 200
+    match = SERVER_TIMING.match(response["Server-Timing"])
+    assert match is not None
+    queries, template_ms, view_ms, total_ms = match.groups()
+    assert int(queries) > 0
+    assert 0 < float(template_ms) <= float(view_ms) <= float(total_ms)
+    record = _timing_record(caplog, logging.INFO)
+    assert record.url_name == "inventory:my-items"
+    assert (record.http_method, record.http_status) == ("GET", 200)
+    assert record.db_queries == int(queries)
+    assert record.total_ms == float(total_ms)
+    assert "url_name=inventory:my-items" in record.getMessage()
+
+
+def test_slow_request_logs_its_slowest_queries(
+    timing_enabled, logged_in_client, caplog
+) -> None:
+    timing_enabled.REQUEST_TIMING_SLOW_MS = 0
+    timing_enabled.REQUEST_TIMING_SLOW_QUERIES = 2
+    caplog.set_level(logging.INFO, logger="common.request_timing")
+
+    logged_in_client.get(reverse("inventory:my-items"))
+
+    record = _timing_record(caplog, logging.WARNING)
+    assert record.db_queries > 2
+    assert len(record.slow_queries) == 2
+    assert record.slow_queries[0]["ms"] >= record.slow_queries[1]["ms"]
+    assert record.getMessage().startswith("Slow request http_method=GET")
+    assert record.slow_queries[0]["sql"] in record.getMessage()
+
+
+def test_unresolved_request_has_no_view_time(timing_enabled, db, caplog) -> None:
+    caplog.set_level(logging.INFO, logger="common.request_timing")
+
+    response = Client().get("/no-such-page/")
+
+    assert response.status_code == 404
+    match = SERVER_TIMING.match(response["Server-Timing"])
+    assert match is not None and match.group(3) == "0.0"
+    assert _timing_record(caplog, logging.INFO).url_name == ""
+
+
+def test_record_query_keeps_the_slowest_statements() -> None:
+    timings = RequestTimings(slow_query_count=2)
+    for seconds, sql in [(0.2, "b"), (0.1, "a"), (0.3, "c"), (0.05, "d")]:
+        timings.record_query(sql, seconds)
+
+    assert timings.queries == 4
+    assert timings.db_seconds == pytest.approx(0.65)
+    assert sorted(timings.slowest, reverse=True) == [(0.3, "c"), (0.2, "b")]
+
+    untracked = RequestTimings(slow_query_count=0)
+    untracked.record_query("x", 1.0)
+    assert untracked.slowest == []
+
+
+def test_timed_template_counts_outer_renders_only() -> None:
+    backend = TimedDjangoTemplates(
+        {"NAME": "timed", "DIRS": [], "APP_DIRS": False, "OPTIONS": {}}
+    )
+    template = backend.from_string("{{ value }}")
+    assert template.origin is not None
+    # Outside a request nothing is recorded.
+    assert template.render({"value": "x"}) == "x"
+
+    timings = RequestTimings(slow_query_count=0)
+    token = _current.set(timings)
+    try:
+        assert template.render({"value": "y"}) == "y"
+        measured = timings.template_seconds
+        assert measured > 0
+        timings._rendering = True
+        template.render({"value": "z"})
+        assert timings.template_seconds == measured
+    finally:
+        _current.reset(token)
+
+    with pytest.raises(TemplateDoesNotExist):
+        backend.get_template("missing.html")
+
+
+def test_process_view_outside_a_timed_request_is_a_no_op(timing_enabled) -> None:
+    middleware = RequestTimingMiddleware(lambda request: None)  # type: ignore[arg-type]
+    assert middleware.process_view(RequestFactory().get("/"), print, (), {}) is None
@@ -0,0 +1,90 @@
+"""Tests for django-q2 queue routing and per-queue metrics."""
+
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.utils import timezone
+from django_q.models import OrmQ, Task
+
+from common.task_queues import email_queue, queue_names, queue_stats
+
+
+def _task(number: int, cluster: str | None, run_time: timedelta, **kwargs) -> Task:
+    stopped = kwargs.pop("stopped", timezone.now())
+    return Task.objects.create(
+        id=f"{number:032x}",
+        name=f"task-{number}",
+        func="common.email_backends._deliver_messages",
+        cluster=cluster,
+        started=stopped - run_time,
+        stopped=stopped,
+        success=kwargs.pop("success", True),
+    )
+
+
+def test_queue_names_follow_settings(settings):
+    settings.Q_EMAIL_QUEUE = "email"
+    assert email_queue() == "email"
+    assert queue_names() == [settings.Q_CLUSTER["name"], "email"]
+
+    settings.Q_EMAIL_QUEUE = ""
+    assert email_queue() is None
+    assert queue_names() == [settings.Q_CLUSTER["name"]]
+
+
+@pytest.mark.django_db
+def test_queue_stats_reports_backlog_and_run_times(settings):
+    settings.Q_EMAIL_QUEUE = "email"
+    default = settings.Q_CLUSTER["name"]
+    now = timezone.now()
+    OrmQ.objects.create(key="email", payload="x", lock=now - timedelta(seconds=30))
+    OrmQ.objects.create(key="email", payload="x", lock=now - timedelta(seconds=5))
+    OrmQ.objects.create(key="email", payload="x", lock=now + timedelta(minutes=1))
+    _task(1, "email", timedelta(seconds=2))
+    _task(2, "email", timedelta(seconds=4), success=False)
+    # Queued without a cluster: ran on the default queue.
+    _task(3, None, timedelta(seconds=1))
+    # Outside the window.
+    _task(4, "email", timedelta(seconds=60), stopped=now - timedelta(hours=1))
+
+    default_stats, email_stats = queue_stats()
+
+    assert default_stats.name == default
+    assert (default_stats.queued, default_stats.in_flight) == (0, 0)
+    assert default_stats.oldest_wait is None
+    assert (default_stats.finished, default_stats.failed) == (1, 0)
+    assert default_stats.max_run_time == timedelta(seconds=1)
+
+    assert email_stats.name == "email"
+    assert (email_stats.queued, email_stats.in_flight) == (2, 1)
+    assert email_stats.oldest_wait is not None
+    assert email_stats.oldest_wait >= timedelta(seconds=30)
+    assert (email_stats.finished, email_stats.failed) == (2, 1)
+    assert email_stats.mean_run_time == timedelta(seconds=3)
+    assert email_stats.max_run_time == timedelta(seconds=4)
+
+
+@pytest.mark.django_db
+def test_queue_stats_command_prints_one_line_per_queue(settings):
+    settings.Q_EMAIL_QUEUE = "email"
+    _task(1, "email", timedelta(seconds=2))
+    out = StringIO()
+
+    call_command("queue_stats", "--minutes", "5", stdout=out)
+
+    lines = out.getvalue().splitlines()
+    assert lines[0] == (
+        f"{settings.Q_CLUSTER['name']}: queued=0 in_flight=0 oldest_wait=- "
+        "finished=0 failed=0 mean_run=- max_run=-"
+    )
+    assert lines[1] == (
+        "email: queued=0 in_flight=0 oldest_wait=- "
+        "finished=1 failed=0 mean_run=2.0s max_run=2.0s"
+    )
+
+
+def test_queue_stats_command_rejects_empty_window():
+    with pytest.raises(CommandError, match="--minutes"):
+        call_command("queue_stats", "--minutes", "0")
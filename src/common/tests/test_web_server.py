@@ -0,0 +1,77 @@
+"""Tests for common.web_server."""
+
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from common.web_server import ASGI_APP, WSGI_APP, gunicorn_argv
+
+
+@pytest.fixture
+def two_cpus():
+    with patch("common.web_server.os.process_cpu_count", return_value=2):
+        yield
+
+
+def test_default_is_gthread_sized_from_cpu_count(settings, two_cpus) -> None:
+    settings.GUNICORN_WORKERS = 0
+    settings.GUNICORN_THREADS = 0
+    settings.GUNICORN_PRELOAD = False
+    settings.GUNICORN_WORKER_CLASS = "gthread"
+
+    argv = gunicorn_argv()
+
+    assert argv[0] == "--workers=5"
+    assert "--worker-class=gthread" in argv
+    assert "--threads=4" in argv
+    assert "--max-requests=1000" in argv
+    assert "--preload" not in argv
+    assert argv[-1] == WSGI_APP
+
+
+def test_explicit_sync_workers_and_preload(settings, two_cpus) -> None:
+    settings.GUNICORN_WORKER_CLASS = "sync"
+    settings.GUNICORN_WORKERS = 3
+    settings.GUNICORN_THREADS = 8
+    settings.GUNICORN_PRELOAD = True
+
+    argv = gunicorn_argv()
+
+    assert argv[0] == "--workers=3"
+    assert "--preload" in argv
+    # Threads only apply to gthread; sync workers serve one request each.
+    assert "--threads=1" in argv
+
+
+def test_uvicorn_serves_asgi_one_worker_per_cpu(settings, two_cpus) -> None:
+    settings.GUNICORN_WORKER_CLASS = "uvicorn"
+    settings.GUNICORN_WORKERS = 0
+
+    with patch("common.web_server.importlib.util.find_spec", return_value=object()):
+        argv = gunicorn_argv()
+
+    assert argv[0] == "--workers=2"
+    assert argv[-2:] == ["--worker-class=uvicorn_worker.UvicornWorker", ASGI_APP]
+    assert not any(arg.startswith("--threads") for arg in argv)
+
+    with (
+        patch("common.web_server.importlib.util.find_spec", return_value=None),
+        pytest.raises(ImproperlyConfigured, match="uvicorn-worker"),
+    ):
+        gunicorn_argv()
+
+
+def test_unknown_worker_class_is_rejected(settings) -> None:
+    settings.GUNICORN_WORKER_CLASS = "eventlet"
+
+    with pytest.raises(ImproperlyConfigured, match="eventlet"):
+        gunicorn_argv()
+
+
+def test_unknown_cpu_count_falls_back_to_one(settings) -> None:
+    settings.GUNICORN_WORKER_CLASS = "sync"
+    settings.GUNICORN_WORKERS = 0
+
+    with patch("common.web_server.os.process_cpu_count", return_value=None):
+        assert gunicorn_argv()[0] == "--workers=3"
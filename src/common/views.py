@@ -19,6 +19,7 @@ from django.utils.translation import gettext_lazy as _
 from django.views import View
 from django.views.generic import TemplateView
 
+from catalogs.request_helpers import request_responsible
 from common.email_tokens import email_change_token_generator
 from common.email_utils import (
     send_email_change_confirmation,
@@ -28,7 +29,7 @@ from common.email_utils import (
 if TYPE_CHECKING:
     from django.contrib.auth.models import User as UserType
 
-from .forms import EmailChangeForm
+from .forms import EmailChangeForm, NotificationSettingsForm
 
 User = get_user_model()
 
@@ -38,7 +39,9 @@ User = get_user_model()
 
 class ProfileView(LoginRequiredMixin, TemplateView):
     """
-    User profile page with email and password change forms.
+    User profile page with email, password and notification settings forms.
+
+    The notification section is shown only to users linked to a ``Responsible``.
     """
 
     template_name = "profile.html"
@@ -49,6 +52,7 @@ class ProfileView(LoginRequiredMixin, TemplateView):
         user = cast("UserType", self.request.user)
         context["email_form"] = EmailChangeForm(user=user)
         context["password_form"] = PasswordChangeForm(user=user)
+        context["notification_form"] = _notification_form(self.request)
         return context
 
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponse:
@@ -57,6 +61,8 @@ class ProfileView(LoginRequiredMixin, TemplateView):
             return self._handle_email_change(request)
         elif "password_submit" in request.POST:
             return self._handle_password_change(request)
+        elif "notification_submit" in request.POST:
+            return self._handle_notification_settings(request)
         return self.get(request, *args, **kwargs)
 
     def _handle_email_change(self, request: HttpRequest) -> HttpResponse:
@@ -84,7 +90,11 @@ class ProfileView(LoginRequiredMixin, TemplateView):
         return render(
             request,
             "profile.html",
-            {"email_form": email_form, "password_form": password_form},
+            {
+                "email_form": email_form,
+                "password_form": password_form,
+                "notification_form": _notification_form(request),
+            },
         )
 
     def _handle_password_change(self, request: HttpRequest) -> HttpResponse:
@@ -103,9 +113,42 @@ class ProfileView(LoginRequiredMixin, TemplateView):
         return render(
             request,
             "profile.html",
-            {"email_form": email_form, "password_form": password_form},
+            {
+                "email_form": email_form,
+                "password_form": password_form,
+                "notification_form": _notification_form(request),
+            },
         )
 
+    def _handle_notification_settings(self, request: HttpRequest) -> HttpResponse:
+        """
+        Store the digest preference on the linked ``Responsible``.
+
+        A queryset update: this is a preference, not catalog data, so it
+        neither goes through the correction window nor emails an "updated"
+        notice to the user who just changed it.
+        """
+        responsible = request_responsible(request)
+        if responsible is None:
+            return redirect("common:profile")
+        form = NotificationSettingsForm(data=request.POST)
+        # A lone optional checkbox always validates.
+        if form.is_valid():  # pragma: no branch
+            email_digest = form.cleaned_data["email_digest"]
+            type(responsible).objects.filter(pk=responsible.pk).update(
+                email_digest=email_digest
+            )
+            responsible.email_digest = email_digest
+            messages.success(request, _("Your notification settings have been saved."))
+        return redirect("common:profile")
+
+
+def _notification_form(request: HttpRequest) -> NotificationSettingsForm | None:
+    responsible = request_responsible(request)
+    if responsible is None:
+        return None
+    return NotificationSettingsForm(initial={"email_digest": responsible.email_digest})
+
 
 class EmailChangeConfirmView(View):
     """Confirm email change via token link."""
@@ -0,0 +1,78 @@
+"""
+Gunicorn command line built from the ``GUNICORN_*`` settings.
+
+``manage.py gunicorn`` and ``manage.py start`` both launch
+``gunicorn <gunicorn_argv()>``. Worker classes:
+
+- ``gthread`` (default): ``workers`` processes with ``threads`` request threads
+  each, so ``workers * threads`` requests are served concurrently and a thread
+  waiting on PostgreSQL does not hold up the rest of its worker.
+- ``sync``: one request per worker process.
+- ``uvicorn``: ``sloths_inventory.asgi`` under ``uvicorn_worker.UvicornWorker``
+  (install the ``uvicorn-worker`` package). Django runs the sync views of one
+  worker on a single thread, so this pays off for long-lived connections rather
+  than for request throughput.
+
+``GUNICORN_CMD_ARGS`` (bind address, logging, control socket) still applies;
+options given here take precedence over it.
+"""
+
+import importlib.util
+import os
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+WSGI_APP = "sloths_inventory.wsgi"
+ASGI_APP = "sloths_inventory.asgi:application"
+UVICORN_WORKER = "uvicorn_worker.UvicornWorker"
+
+#: Request threads per ``gthread`` worker when ``GUNICORN_THREADS`` is 0.
+DEFAULT_THREADS = 4
+
+_WORKER_CLASSES = ("gthread", "sync", "uvicorn")
+
+
+def default_workers(worker_class: str) -> int:
+    """
+    Worker processes for this machine: ``2 * CPUs + 1``, one per CPU for ASGI.
+
+    CPUs are those the process may run on (``os.process_cpu_count()``), so a
+    CPU affinity mask is honoured; a container CPU quota is not, so set
+    ``GUNICORN_WORKERS`` explicitly there.
+    """
+
+    cpus = os.process_cpu_count() or 1
+    return cpus if worker_class == "uvicorn" else 2 * cpus + 1
+
+
+def gunicorn_argv() -> list[str]:
+    """Return the gunicorn argument list (without the executable)."""
+
+    worker_class = settings.GUNICORN_WORKER_CLASS
+    if worker_class not in _WORKER_CLASSES:
+        raise ImproperlyConfigured(
+            f"GUNICORN_WORKER_CLASS must be one of {', '.join(_WORKER_CLASSES)}, "
+            f"not {worker_class!r}."
+        )
+    workers = settings.GUNICORN_WORKERS or default_workers(worker_class)
+    argv = [
+        f"--workers={workers}",
+        f"--timeout={settings.GUNICORN_TIMEOUT}",
+        f"--keep-alive={settings.GUNICORN_KEEPALIVE}",
+        f"--max-requests={settings.GUNICORN_MAX_REQUESTS}",
+        f"--max-requests-jitter={settings.GUNICORN_MAX_REQUESTS_JITTER}",
+    ]
+    if settings.GUNICORN_PRELOAD:
+        argv.append("--preload")
+
+    if worker_class == "uvicorn":
+        if importlib.util.find_spec("uvicorn_worker") is None:
+            raise ImproperlyConfigured(
+                "GUNICORN_WORKER_CLASS=uvicorn needs the uvicorn-worker package."
+            )
+        return [*argv, f"--worker-class={UVICORN_WORKER}", ASGI_APP]
+    threads = 1
+    if worker_class == "gthread":
+        threads = settings.GUNICORN_THREADS or DEFAULT_THREADS
+    return [*argv, f"--worker-class={worker_class}", f"--threads={threads}", WSGI_APP]
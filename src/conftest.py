@@ -24,6 +24,19 @@ def _env_truthy(name: str) -> bool:
     return os.environ.get(name) in {"1", "true", "True"}
 
 
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip ``benchmark`` tests unless ``INVENTORY_BENCHMARK`` is set."""
+
+    if _env_truthy("INVENTORY_BENCHMARK"):
+        return
+    skip = pytest.mark.skip(reason="set INVENTORY_BENCHMARK=1 to run benchmarks")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
+
+
 @pytest.fixture
 def inventory_test_device(db: Any) -> Device:
     """
@@ -17,6 +17,21 @@ def check_database() -> tuple[bool, str]:
         return False, "Database connection failed"
 
 
+def check_database_pool() -> tuple[bool, str]:
+    """Report the state of the psycopg connection pool, if one is configured."""
+    pool = getattr(connection, "pool", None)
+    if pool is None:
+        return True, "Connection pool disabled"
+    if pool.closed:
+        return False, "Connection pool closed"
+    stats = pool.get_stats()
+    return True, (
+        f"Connection pool: {stats.get('pool_size', 0)}/{stats.get('pool_max', 0)} "
+        f"open, {stats.get('pool_available', 0)} idle, "
+        f"{stats.get('requests_waiting', 0)} waiting"
+    )
+
+
 def liveness(request: HttpRequest) -> JsonResponse:
     """
     Liveness probe checks that the application process is running.
@@ -30,7 +45,10 @@ def readiness(request: HttpRequest) -> JsonResponse:
 
     It verifies availability of critical dependencies.
     """
-    checks = {"database": check_database()}
+    checks = {
+        "database": check_database(),
+        "database_pool": check_database_pool(),
+    }
 
     all_ok = all(status for status, _ in checks.values())
 
@@ -0,0 +1,99 @@
+"""
+``/health/metrics``: Prometheus text exposition of application metrics.
+
+Counters and histograms recorded by the web and qcluster processes come from
+``common.metrics`` (merged across processes through ``METRICS_DIR``). Queue
+depth and transfer counts are read from the database on each scrape.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils import timezone
+
+from common.metrics import METRICS, Labels, Samples, collect
+from common.task_queues import queue_stats
+from inventory.models import PendingTransfer
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name: str, labels: Labels, value: float) -> str:
+    number = int(value) if float(value).is_integer() else value
+    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels)
+    return f"{name}{{{rendered}}} {number}" if rendered else f"{name} {number}"
+
+
+def _header(name: str, help_text: str, kind: str) -> Iterator[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} {kind}"
+
+
+def _recorded_lines(samples: Samples) -> Iterator[str]:
+    for name, (help_text, kind, bounds) in METRICS.items():
+        yield from _header(name, help_text, kind)
+        if kind == "counter":
+            for (metric, labels), value in sorted(samples.counters.items()):
+                if metric == name:
+                    yield _series(name, labels, value)
+            continue
+        for (metric, labels), histogram in sorted(samples.histograms.items()):
+            if metric != name:
+                continue
+            cumulative = 0
+            for bound, count in zip((*map(str, bounds), "+Inf"), histogram.buckets):
+                cumulative += count
+                yield _series(f"{name}_bucket", (*labels, ("le", bound)), cumulative)
+            yield _series(f"{name}_sum", labels, histogram.sum)
+            yield _series(f"{name}_count", labels, histogram.count)
+
+
+def _queue_lines() -> Iterator[str]:
+    stats = queue_stats()
+    gauges = (
+        ("django_q_queued_tasks", "Tasks waiting for a worker.", "queued"),
+        ("django_q_in_flight_tasks", "Tasks pulled but not acknowledged.", "in_flight"),
+    )
+    for name, help_text, attribute in gauges:
+        yield from _header(name, help_text, "gauge")
+        for queue in stats:
+            yield _series(name, (("queue", queue.name),), getattr(queue, attribute))
+    name = "django_q_oldest_task_wait_seconds"
+    yield from _header(name, "Age of the oldest waiting task.", "gauge")
+    for queue in stats:
+        wait = queue.oldest_wait.total_seconds() if queue.oldest_wait else 0.0
+        yield _series(name, (("queue", queue.name),), wait)
+
+
+def _transfer_lines() -> Iterator[str]:
+    name = "inventory_pending_transfers"
+    yield from _header(
+        name,
+        "Open transfer offers: active, or lapsed and waiting for the expiry sweep.",
+        "gauge",
+    )
+    open_offers = PendingTransfer.objects.open()
+    lapsed = open_offers.filter(expires_at__lte=timezone.now()).count()
+    active = open_offers.count() - lapsed
+    yield _series(name, (("state", "active"),), active)
+    yield _series(name, (("state", "lapsed"),), lapsed)
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """Serve all metrics; 404 unless ``METRICS`` is on."""
+
+    if not settings.METRICS:
+        raise Http404
+    lines = [
+        *_recorded_lines(collect()),
+        *_queue_lines(),
+        *_transfer_lines(),
+    ]
+    return HttpResponse("\n".join(lines) + "\n", content_type=CONTENT_TYPE)
@@ -1,13 +1,21 @@
 from __future__ import annotations
 
 import json
+from datetime import timedelta
 from unittest.mock import MagicMock
 
 import pytest
 from django.db import DatabaseError
 from django.test import Client, RequestFactory
+from django.utils import timezone
+from django_q.models import OrmQ
 
+from common import metrics as common_metrics
+from common.metrics import Samples
 from health import health
+from health import metrics as health_metrics
+from inventory.models import PendingTransfer
+from inventory.synthetic_data import SyntheticSpec, generate_dataset
 
 
 def test_check_database_ok(monkeypatch) -> None:
@@ -36,8 +44,37 @@ def test_check_database_error(monkeypatch) -> None:
     assert message == "Database connection failed"
 
 
+def test_check_database_pool_disabled(monkeypatch) -> None:
+    monkeypatch.setattr(health, "connection", MagicMock(pool=None))
+
+    assert health.check_database_pool() == (True, "Connection pool disabled")
+
+
+def test_check_database_pool_reports_stats(monkeypatch) -> None:
+    pool = MagicMock(closed=False)
+    pool.get_stats.return_value = {
+        "pool_min": 2,
+        "pool_max": 10,
+        "pool_size": 4,
+        "pool_available": 3,
+        "requests_waiting": 0,
+    }
+    monkeypatch.setattr(health, "connection", MagicMock(pool=pool))
+
+    ok, message = health.check_database_pool()
+    assert ok is True
+    assert message == "Connection pool: 4/10 open, 3 idle, 0 waiting"
+
+
+def test_check_database_pool_closed(monkeypatch) -> None:
+    monkeypatch.setattr(health, "connection", MagicMock(pool=MagicMock(closed=True)))
+
+    assert health.check_database_pool() == (False, "Connection pool closed")
+
+
 def test_readiness_returns_503_when_database_fails(monkeypatch) -> None:
     monkeypatch.setattr(health, "check_database", lambda: (False, "db down"))
+    monkeypatch.setattr(health, "check_database_pool", lambda: (True, "pool ok"))
 
     rf = RequestFactory()
     request = rf.get("/health/readiness/")
@@ -46,7 +83,7 @@ def test_readiness_returns_503_when_database_fails(monkeypatch) -> None:
     assert response.status_code == 503
     assert json.loads(response.content) == {
         "status": "error",
-        "checks": {"database": "db down"},
+        "checks": {"database": "db down", "database_pool": "pool ok"},
     }
 
 
@@ -56,7 +93,13 @@ def test_readiness_returns_503_when_database_fails(monkeypatch) -> None:
         (health.liveness, {"status": "ok"}),
         (
             lambda request: health.readiness(request),
-            {"status": "ok", "checks": {"database": "Database connection OK"}},
+            {
+                "status": "ok",
+                "checks": {
+                    "database": "Database connection OK",
+                    "database_pool": "Connection pool disabled",
+                },
+            },
         ),
     ],
 )
@@ -64,6 +107,9 @@ def test_health_views_return_ok_json(monkeypatch, view, expected_json) -> None:
     monkeypatch.setattr(
         health, "check_database", lambda: (True, "Database connection OK")
     )
+    monkeypatch.setattr(
+        health, "check_database_pool", lambda: (True, "Connection pool disabled")
+    )
 
     rf = RequestFactory()
     request = rf.get("/health/")
@@ -85,3 +131,57 @@ def test_health_probe_urls_keep_trailing_slash_contract(monkeypatch) -> None:
         "/health/readiness/",
     ):
         assert client.get(path).status_code == 200
+
+
+def test_metrics_is_not_found_when_disabled(settings) -> None:
+    settings.METRICS = False
+    assert Client().get("/health/metrics/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_metrics_renders_prometheus_text(settings, monkeypatch) -> None:
+    settings.METRICS = True
+    settings.METRICS_DIR = ""
+    monkeypatch.setattr(common_metrics, "_samples", Samples())
+    common_metrics.inc("email_deliveries_total", 3, result="sent")
+    common_metrics.observe("inventory_item_lock_wait_seconds", 0.002)
+    generate_dataset(
+        SyntheticSpec(
+            responsibles=4, items=20, active_transfers=0.5, users=2, statuses=2
+        )
+    )
+    open_offers = PendingTransfer.objects.open()
+    total = open_offers.count()
+    PendingTransfer.objects.filter(pk__in=open_offers.values("pk")[:2]).update(
+        expires_at=timezone.now() - timedelta(hours=1)
+    )
+    OrmQ.objects.create(
+        key=settings.Q_CLUSTER["name"], payload="x", lock=timezone.now()
+    )
+
+    response = Client().get("/health/metrics/")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == health_metrics.CONTENT_TYPE
+    lines = response.content.decode().splitlines()
+    assert "# TYPE http_request_duration_seconds histogram" in lines
+    assert 'email_deliveries_total{result="sent"} 3' in lines
+    assert 'inventory_item_lock_wait_seconds_bucket{le="0.001"} 0' in lines
+    assert 'inventory_item_lock_wait_seconds_bucket{le="0.005"} 1' in lines
+    assert 'inventory_item_lock_wait_seconds_bucket{le="+Inf"} 1' in lines
+    assert "inventory_item_lock_wait_seconds_count 1" in lines
+    queue = settings.Q_CLUSTER["name"]
+    assert f'django_q_queued_tasks{{queue="{queue}"}} 1' in lines
+    assert f'django_q_in_flight_tasks{{queue="{queue}"}} 0' in lines
+    assert any(
+        line.startswith(f'django_q_oldest_task_wait_seconds{{queue="{queue}"}} ')
+        for line in lines
+    )
+    assert f'inventory_pending_transfers{{state="active"}} {total - 2}' in lines
+    assert 'inventory_pending_transfers{state="lapsed"} 2' in lines
+    assert response.content.decode().endswith("\n")
+
+
+def test_metrics_escapes_label_values() -> None:
+    labels = (("view", 'a"b\\c\nd'),)
+    assert health_metrics._series("m", labels, 1.5) == 'm{view="a\\"b\\\\c\\nd"} 1.5'
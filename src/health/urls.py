@@ -2,6 +2,7 @@ from django.http import HttpRequest, HttpResponse
 from django.urls import path, reverse
 
 from .health import liveness, readiness
+from .metrics import metrics
 
 app_name = "health"
 
@@ -9,9 +10,11 @@ app_name = "health"
 def health_index(request: HttpRequest) -> HttpResponse:
     liveness_url = reverse("health:liveness")
     readiness_url = reverse("health:readiness")
+    metrics_url = reverse("health:metrics")
     return HttpResponse(
         f'<a href="{liveness_url}">liveness</a><br>'
-        f'<a href="{readiness_url}">readiness</a>'
+        f'<a href="{readiness_url}">readiness</a><br>'
+        f'<a href="{metrics_url}">metrics</a>'
     )
 
 
@@ -19,4 +22,5 @@ urlpatterns = [
     path("", health_index, name="health-index"),
     path("liveness/", liveness, name="liveness"),
     path("readiness/", readiness, name="readiness"),
+    path("metrics/", metrics, name="metrics"),
 ]
@@ -6,16 +6,23 @@ from dal import autocomplete
 from dal_select2.widgets import ModelSelect2
 from django import forms
 from django.contrib import admin
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.core.exceptions import PermissionDenied
 from django.db.models import Model, Q, QuerySet
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponseBadRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from django.urls import path
+from django.utils import timezone
 from django.utils.html import format_html
+from django.utils.text import smart_split, unescape_string_literal
 from django.utils.translation import gettext_lazy as _
 
 from catalogs.models import Location
 from common.admin import BaseAdmin, auth_has_change_permission
 from common.edit_window import is_within_inventory_correction_window
-from inventory.models import Item, Operation, PendingTransfer
+from devices.models import Device
+from inventory.export import iter_inventory_rows, stream_inventory_csv
+from inventory.models import Item, ItemQuerySet, Operation, PendingTransfer
 
 
 class _EmptyValueFormatter(Protocol):
@@ -34,6 +41,10 @@ class CurrentFieldMixin:
     Provides display methods that show current status, location, and responsible person
     for an item by reading from the item's current_* descriptors. Missing journal state
     is formatted with the same hyphen placeholder as ``BaseAdmin`` readouts.
+
+    Columns sort on the ``ItemCurrentState`` projection joined by
+    ``ItemQuerySet.with_current_operation()``; with that queryset the descriptors
+    read from memory, so a changelist page costs no per-row queries.
     """
 
     def get_current_field(self, obj: Item, field_name: str) -> str:
@@ -50,17 +61,24 @@ class CurrentFieldMixin:
         formatter = cast(_EmptyValueFormatter, self)
         return formatter._format_empty_value(getattr(obj, f"current_{field_name}"))
 
-    @admin.display(description=_("Status"))
+    @admin.display(
+        description=_("Status"), ordering="current_state__operation__status__name"
+    )
     def current_status(self, obj: Item) -> str:
         """Display the current status of the item."""
         return self.get_current_field(obj, "status")
 
-    @admin.display(description=_("Location"))
+    @admin.display(
+        description=_("Location"), ordering="current_state__operation__location__name"
+    )
     def current_location(self, obj: Item) -> str:
         """Display the current location of the item."""
         return self.get_current_field(obj, "location")
 
-    @admin.display(description=_("Responsible Person"))
+    @admin.display(
+        description=_("Responsible Person"),
+        ordering="current_state__operation__responsible__last_name",
+    )
     def current_responsible(self, obj: Item) -> str:
         """Display the current responsible person for the item."""
         return self.get_current_field(obj, "responsible")
@@ -102,21 +120,24 @@ class ItemAdmin(BaseAdmin, CurrentFieldMixin, DeviceFieldsMixin):
         "inventory_number",
         "device",
         "serial_number",
+        "current_responsible",
+        "current_location",
+        "current_status",
         "updated_at",
         "created_at",
     ]
     list_display_links = ["inventory_number", "device", "serial_number"]
     list_filter = [
+        "current_state__responsible",
+        "current_state__location",
         *list(DeviceFieldsMixin.device_list_filter),
         "updated_at",
         "created_at",
     ]
-    search_fields = [
-        "inventory_number",
-        *list(DeviceFieldsMixin.device_search_fields),
-        "serial_number",
-        "notes",
-    ]
+    # ``search_text`` covers inventory number, serial, manufacturer and model;
+    # both columns are trigram-indexed on PostgreSQL. Category and type names
+    # are matched too, see ``get_search_results``.
+    search_fields = ["search_text", "notes"]
     readonly_fields = list(BaseAdmin.readonly_fields) + [
         "current_responsible",
         "current_location",
@@ -209,17 +230,79 @@ class ItemAdmin(BaseAdmin, CurrentFieldMixin, DeviceFieldsMixin):
         """
         Avoid N+1 queries in admin list pages by preloading device relations.
 
-        `Item.__str__` renders `Device`, which touches multiple FK relations.
+        `Item.__str__` renders `Device`, which touches multiple FK relations. The
+        current-state columns read the journal head joined through the
+        ``ItemCurrentState`` projection, so the changelist query count does not
+        grow with the page size.
         """
 
-        qs = super().get_queryset(request)
-        return qs.select_related(
-            "device",
-            "device__category",
-            "device__type",
-            "device__manufacturer",
-            "device__model",
+        qs = cast(ItemQuerySet, super().get_queryset(request))
+        return qs.with_device_relations().with_current_operation()
+
+    def get_search_results(
+        self, request: HttpRequest, queryset: QuerySet[Item], search_term: str
+    ) -> tuple[QuerySet[Item], bool]:
+        """
+        Match every search word in ``search_fields`` or the device category/type.
+
+        Category and type names go through a ``device_id IN (...)`` subquery on
+        the small device tables instead of joins, so PostgreSQL can still combine
+        the trigram indexes of ``inventory_item`` (bitmap OR). Results are ranked
+        by :meth:`ItemQuerySet.order_by_search_rank`, which puts the closest
+        matches first in the item autocomplete widgets; the changelist applies
+        its own column ordering.
+        """
+
+        for bit in smart_split(search_term):
+            if bit.startswith(('"', "'")) and bit[0] == bit[-1]:
+                bit = unescape_string_literal(bit)
+            devices = Device.objects.filter(
+                Q(category__name__icontains=bit) | Q(type__name__icontains=bit)
+            ).values("pk")
+            queryset = queryset.filter(
+                Q(search_text__icontains=bit)
+                | Q(notes__icontains=bit)
+                | Q(device__in=devices)
+            )
+        return cast(ItemQuerySet, queryset).order_by_search_rank(search_term), False
+
+    def get_urls(self) -> list:
+        """Prepend the CSV export endpoint to the item admin URLs."""
+        urls = super().get_urls()
+        custom_urls = [
+            path(
+                "export/",
+                self.admin_site.admin_view(self.export_view),
+                name="inventory_item_export",
+            ),
+        ]
+        return custom_urls + urls
+
+    def export_view(self, request: HttpRequest) -> HttpResponseBase:
+        """
+        Stream the items the changelist shows, with their current state, as CSV.
+
+        Takes the changelist's query string: ``q``, the list filters and the
+        ordering go through the same :class:`ChangeList` (and so through
+        :meth:`get_search_results`), so the file holds the same rows as the list.
+        Rows come from a server-side cursor, so the response never holds the
+        whole table in memory.
+        """
+
+        if not self.has_view_permission(request):
+            raise PermissionDenied
+        try:
+            changelist = self.get_changelist_instance(request)
+        except IncorrectLookupParameters:
+            return HttpResponseBadRequest(_("Invalid export filters."))
+        items = cast(ItemQuerySet, changelist.queryset)
+        response = StreamingHttpResponse(
+            stream_inventory_csv(iter_inventory_rows(items)),
+            content_type="text/csv; charset=utf-8",
         )
+        filename = f"inventory-{timezone.localdate().isoformat()}.csv"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
 
     def get_fieldsets(self, request: HttpRequest, obj: Model | None = None) -> Any:
         fieldsets = super().get_fieldsets(request, obj)
@@ -573,6 +656,7 @@ class PendingTransferAdmin(BaseAdmin):
     readonly_fields = list(BaseAdmin.readonly_fields) + [
         "accepted_at",
         "cancelled_at",
+        "expired_at",
     ]
     list_display = [
         "item",
@@ -581,6 +665,7 @@ class PendingTransferAdmin(BaseAdmin):
         "expires_at",
         "accepted_at",
         "cancelled_at",
+        "expired_at",
         "updated_at",
         "created_at",
     ]
@@ -600,6 +685,7 @@ class PendingTransferAdmin(BaseAdmin):
         "to_responsible",
         "accepted_at",
         "cancelled_at",
+        "expired_at",
         "updated_at",
         "created_at",
     ]
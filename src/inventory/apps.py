@@ -1,4 +1,5 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
 from django.utils.translation import gettext_lazy as _
 
 
@@ -9,3 +10,6 @@ class InventoryConfig(AppConfig):
 
     def ready(self) -> None:
         import inventory.signals  # noqa: F401
+        from inventory.transfer_expiry import ensure_expiry_schedule
+
+        post_migrate.connect(ensure_expiry_schedule, sender=self)
@@ -0,0 +1,151 @@
+"""
+Keyset (cursor) pagination for inventory list pages.
+
+My items and Previously held render one card list made of consecutive sections
+(incoming transfer cards, item cards, outgoing transfer cards). A page is a
+window of at most ``page_size`` rows across those sections; the URL cursor
+records the section and the sort key of the last row shown, so the next page
+continues with ``WHERE (key) > (cursor)`` instead of ``OFFSET``. Deep pages cost
+the same as the first one and stay stable while rows are added above them.
+
+Each section's ordering must end in a unique column so the key identifies one
+row. Cursors are opaque URL-safe strings; anything that does not decode to a
+known section and key (edited or stale bookmarks) restarts from the first page.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+
+
+@dataclass(frozen=True)
+class KeysetSection:
+    """One ordered block of a paginated list (``ordering`` as for ``order_by``)."""
+
+    name: str
+    queryset: QuerySet[Any]
+    ordering: tuple[str, ...]
+
+    def ordered(self) -> QuerySet[Any]:
+        return self.queryset.order_by(*self.ordering)
+
+    def key(self, row: Model) -> list[Any]:
+        return [getattr(row, field.lstrip("-")) for field in self.ordering]
+
+    def after(self, key: Sequence[Any]) -> Q:
+        """
+        Return the "strictly after ``key``" predicate for this ordering.
+
+        Expands the row comparison ``(a, b) > (x, y)`` into
+        ``a > x OR (a = x AND b > y)`` so mixed ascending/descending orderings
+        work on every backend.
+        """
+
+        condition = Q(pk__in=[])
+        equal_prefix = Q()
+        for field, value in zip(self.ordering, key, strict=True):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal_prefix & Q(**{f"{name}__{lookup}": value})
+            equal_prefix &= Q(**{name: value})
+        return condition
+
+
+@dataclass(frozen=True)
+class KeysetPage:
+    """Rows of one page per section name, plus the cursor of the following page."""
+
+    rows: dict[str, list[Any]]
+    next_cursor: str | None
+
+
+def encode_cursor(section: str, key: Sequence[Any] | None) -> str:
+    """Encode a section name and last-row key (``None``: section start)."""
+
+    # Datetimes keep their microseconds: ``DjangoJSONEncoder`` rounds them to
+    # milliseconds, and rows sharing the last row's millisecond (bulk-created
+    # offers, quick journal writes) would then drop out of every later page.
+    if key is not None:
+        key = [v.isoformat() if isinstance(v, datetime) else v for v in key]
+    payload = json.dumps(
+        [section, key],
+        cls=DjangoJSONEncoder,
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(
+    cursor: str, sections: Sequence[KeysetSection]
+) -> tuple[int, list[Any] | None]:
+    """Return ``(section index, key)``; ``(0, None)`` for empty or invalid input."""
+
+    if not cursor:
+        return 0, None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        name, key = json.loads(raw)
+    except binascii.Error, UnicodeDecodeError, ValueError, TypeError:
+        return 0, None
+    for index, section in enumerate(sections):
+        if section.name != name:
+            continue
+        if key is None:
+            return index, None
+        if isinstance(key, list) and len(key) == len(section.ordering):
+            return index, key
+        break
+    return 0, None
+
+
+def paginate_sections(
+    sections: Sequence[KeysetSection], cursor: str, *, page_size: int
+) -> KeysetPage:
+    """
+    Return the page of ``sections`` that starts right after ``cursor``.
+
+    Issues at most one bounded query per section on the page (``LIMIT`` of the
+    remaining slots plus one to detect a following page), and one ``EXISTS``
+    per following section when the page ends exactly on a section boundary.
+    """
+
+    page_size = max(1, page_size)
+    start, after = _decode_cursor(cursor, sections)
+    rows: dict[str, list[Any]] = {section.name: [] for section in sections}
+    remaining = page_size
+    next_cursor: str | None = None
+
+    for index, section in enumerate(sections[start:], start=start):
+        queryset = section.ordered()
+        if index == start and after is not None:
+            try:
+                queryset = queryset.filter(section.after(after))
+            except ValidationError, ValueError, TypeError:
+                # Key values of the wrong type for this section: start over.
+                return paginate_sections(sections, "", page_size=page_size)
+        if remaining == 0:
+            if queryset.exists():
+                next_cursor = encode_cursor(section.name, None)
+                break
+            continue
+        fetched = list(queryset[: remaining + 1])
+        if len(fetched) > remaining:
+            rows[section.name] = fetched[:remaining]
+            next_cursor = encode_cursor(
+                section.name, section.key(rows[section.name][-1])
+            )
+            break
+        rows[section.name] = fetched
+        remaining -= len(fetched)
+
+    return KeysetPage(rows=rows, next_cursor=next_cursor)
@@ -1,10 +1,15 @@
 """
 Reusable ORM fragments for inventory list pages.
 
-Centralizes correlated subqueries for "latest operation per item" so My items,
-Previously held, and transfer cards stay aligned and do not duplicate ordering
-logic (``-created_at``, ``-id`` tiebreaker matches :class:`~inventory.models.Item`
-journal semantics).
+Centralizes "current state per item" expressions so My items, Previously held,
+and transfer cards stay aligned. Current state is read from the
+:class:`~inventory.models.ItemCurrentState` projection (journal head maintained
+by ``Operation.save()``) through a plain join, instead of one correlated
+``ORDER BY -created_at, -id LIMIT 1`` subquery per column and row.
+
+``item_prefix`` is the lookup path from the outer queryset to ``Item``: ``""``
+for :class:`~inventory.models.Item` rows, ``"item__"`` for
+:class:`~inventory.models.PendingTransfer` rows.
 
 Imports of concrete models are deferred inside callables to keep Django app
 loading order predictable when this module is imported from page builders.
@@ -12,55 +17,57 @@ loading order predictable when this module is imported from page builders.
 
 from __future__ import annotations
 
-from django.db.models import Case, CharField, OuterRef, Subquery, Value, When
+from django.db.models import Case, CharField, F, Q, Value, When
 from django.utils.translation import gettext
 
 
-def _latest_operation_subquery(*, item_ref: str, field: str) -> Subquery:
-    from inventory.models.operation import Operation
+def _no_current_state(item_prefix: str) -> Q:
+    return Q(**{f"{item_prefix}current_state__isnull": True})
 
-    return Subquery(
-        Operation.objects.filter(item_id=OuterRef(item_ref))
-        .order_by("-created_at", "-id")
-        .values(field)[:1]
-    )
 
+def _system_location(item_prefix: str) -> Q:
+    from catalogs.models import Location
+
+    location = f"{item_prefix}current_state__location__"
+    return Q(
+        **{
+            f"{location}responsible__isnull": True,
+            f"{location}name": Location.ON_HAND,
+        }
+    )
 
-def latest_operation_location_name_subquery(*, item_ref: str) -> Subquery:
-    """
-    Return a subquery yielding the latest operation's location display name.
 
-    ``item_ref`` is the :class:`~django.db.models.OuterRef` lookup name on the
-    outer queryset (``\"pk\"`` for :class:`~inventory.models.Item` rows,
-    ``\"item_id\"`` for :class:`~inventory.models.PendingTransfer` rows).
-    """
+def current_location_name_expression(*, item_prefix: str) -> Case:
+    """Return the head operation's location display name (``None`` without ops)."""
 
-    from catalogs.models import Location
-    from inventory.models.operation import Operation
-
-    return Subquery(
-        Operation.objects.filter(item_id=OuterRef(item_ref))
-        .order_by("-created_at", "-id")
-        .annotate(
-            location_display_name=Case(
-                When(
-                    location__responsible__isnull=True,
-                    location__name=Location.ON_HAND,
-                    then=Value(gettext("On hand")),
-                ),
-                default="location__name",
-                output_field=CharField(),
-            )
-        )
-        .values("location_display_name")[:1]
+    return Case(
+        When(_no_current_state(item_prefix), then=Value(None)),
+        When(_system_location(item_prefix), then=Value(gettext("On hand"))),
+        default=F(f"{item_prefix}current_state__location__name"),
+        output_field=CharField(),
     )
 
 
-def latest_operation_status_name_subquery(*, item_ref: str) -> Subquery:
-    """
-    Return a subquery yielding the latest operation's status name for ``item_ref``.
+def current_location_scope_expression(*, item_prefix: str) -> Case:
+    """Return the head location scope label: System, Common, or Personal."""
+
+    return Case(
+        When(_no_current_state(item_prefix), then=Value(None)),
+        When(_system_location(item_prefix), then=Value(gettext("System"))),
+        When(
+            Q(
+                **{
+                    f"{item_prefix}current_state__location__responsible__isnull": True,
+                }
+            ),
+            then=Value(gettext("Common")),
+        ),
+        default=Value(gettext("Personal")),
+        output_field=CharField(),
+    )
+
 
-    See :func:`latest_operation_location_name_subquery` for ``item_ref`` meaning.
-    """
+def current_status_name_expression(*, item_prefix: str) -> F:
+    """Return the head operation's status name (``None`` without operations)."""
 
-    return _latest_operation_subquery(item_ref=item_ref, field="status__name")
+    return F(f"{item_prefix}current_state__status__name")
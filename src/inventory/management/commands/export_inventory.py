@@ -0,0 +1,82 @@
+"""
+Write every item with its current status, responsible and location as CSV.
+
+Same columns and filters as the admin export (see ``inventory.export``); rows
+are streamed from a server-side cursor, so memory stays flat on large tables.
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from catalogs.models import Responsible
+from inventory.export import (
+    EXPORT_CHUNK_SIZE,
+    inventory_export_queryset,
+    iter_inventory_rows,
+    write_inventory_csv,
+)
+
+
+class Command(BaseCommand):
+    """Export current inventory state to a CSV file or stdout."""
+
+    help = (
+        "Export every item with its current status, responsible and location as "
+        "CSV. --search and --employee-id filter like the item list search and "
+        "'my items'."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--output",
+            type=Path,
+            default=None,
+            help="CSV file to write (default: stdout).",
+        )
+        parser.add_argument(
+            "--search", default="", help="Item search string (as in the UI)."
+        )
+        parser.add_argument(
+            "--employee-id",
+            default="",
+            help="Only items currently held by this responsible.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=EXPORT_CHUNK_SIZE,
+            help=f"Rows per cursor fetch (default: {EXPORT_CHUNK_SIZE}).",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["chunk_size"] < 1:
+            raise CommandError("--chunk-size must be positive.")
+        responsible = None
+        if options["employee_id"]:
+            matches = list(
+                Responsible.objects.filter(employee_id=options["employee_id"])[:2]
+            )
+            if len(matches) != 1:
+                raise CommandError(
+                    f"Employee ID {options['employee_id']} matches "
+                    f"{'no' if not matches else 'several'} responsibles."
+                )
+            responsible = matches[0]
+
+        items = inventory_export_queryset(
+            query=options["search"], responsible=responsible
+        )
+        rows = iter_inventory_rows(items, chunk_size=options["chunk_size"])
+        output: Path | None = options["output"]
+        if output is None:
+            count = write_inventory_csv(rows, self.stdout)
+            # The summary goes to stderr so stdout stays a clean CSV.
+            self.stderr.write(f"Exported {count} item(s).")
+            return
+        with output.open("w", encoding="utf-8", newline="") as handle:
+            count = write_inventory_csv(rows, handle)
+        self.stdout.write(self.style.SUCCESS(f"Exported {count} item(s) to {output}."))
@@ -0,0 +1,52 @@
+"""
+Rebuild or verify the ``ItemCurrentState`` projection from the operation journal.
+
+Normal writes keep the projection current via ``Operation.save()``; run this after
+raw SQL repairs or bulk loads that bypass the model layer.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from inventory.models import ItemCurrentState
+
+#: Mismatching item ids echoed by ``--verify`` before the output is truncated.
+_VERIFY_REPORT_LIMIT = 20
+
+
+class Command(BaseCommand):
+    """Rebuild ``ItemCurrentState`` (default) or report drift with ``--verify``."""
+
+    help = (
+        "Rebuild the ItemCurrentState journal-head projection. "
+        "With --verify, only report items whose projection disagrees with the "
+        "journal and exit with an error when any are found."
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--verify",
+            action="store_true",
+            help="Compare the projection with the journal without writing.",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if options["verify"]:
+            mismatches = list(ItemCurrentState.iter_mismatches())
+            if not mismatches:
+                self.stdout.write(self.style.SUCCESS("Projection matches journal."))
+                return
+            shown = ", ".join(str(pk) for pk in mismatches[:_VERIFY_REPORT_LIMIT])
+            if len(mismatches) > _VERIFY_REPORT_LIMIT:
+                shown += ", ..."
+            raise CommandError(
+                f"{len(mismatches)} item(s) out of sync with the journal: {shown}"
+            )
+
+        written = ItemCurrentState.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt projection for {written} item(s).")
+        )
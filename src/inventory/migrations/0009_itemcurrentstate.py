@@ -0,0 +1,122 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_item_current_state(apps, _schema_editor):  # pragma: no cover
+    Operation = apps.get_model("inventory", "Operation")
+    ItemCurrentState = apps.get_model("inventory", "ItemCurrentState")
+
+    head_id = (
+        Operation.objects.filter(item_id=models.OuterRef("item_id"))
+        .order_by("-created_at", "-id")
+        .values("id")[:1]
+    )
+    heads = (
+        Operation.objects.annotate(head_id=models.Subquery(head_id))
+        .filter(id=models.F("head_id"))
+        .values(
+            "item_id",
+            "id",
+            "status_id",
+            "responsible_id",
+            "location_id",
+            "created_at",
+        )
+    )
+    batch = []
+    for row in heads.iterator(chunk_size=2000):
+        batch.append(
+            ItemCurrentState(
+                item_id=row["item_id"],
+                operation_id=row["id"],
+                status_id=row["status_id"],
+                responsible_id=row["responsible_id"],
+                location_id=row["location_id"],
+                head_created_at=row["created_at"],
+            )
+        )
+        if len(batch) >= 2000:
+            ItemCurrentState.objects.bulk_create(batch)
+            batch = []
+    if batch:
+        ItemCurrentState.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("catalogs", "0006_alter_location_name"),
+        ("inventory", "0008_alter_pendingtransfer_item"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemCurrentState",
+            fields=[
+                (
+                    "item",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="current_state",
+                        serialize=False,
+                        to="inventory.item",
+                        verbose_name="Item",
+                    ),
+                ),
+                (
+                    "head_created_at",
+                    models.DateTimeField(verbose_name="Head created at"),
+                ),
+                (
+                    "location",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="catalogs.location",
+                        verbose_name="Location",
+                    ),
+                ),
+                (
+                    "operation",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="inventory.operation",
+                        verbose_name="Operation",
+                    ),
+                ),
+                (
+                    "responsible",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="catalogs.responsible",
+                        verbose_name="Responsible",
+                    ),
+                ),
+                (
+                    "status",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="+",
+                        to="catalogs.status",
+                        verbose_name="Status",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Item current state",
+                "verbose_name_plural": "Item current states",
+                "indexes": [
+                    models.Index(
+                        fields=["responsible", "item"],
+                        name="inv_cur_state_resp_item_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_item_current_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,97 @@
+# Generated by Django 5.2.18 on 2026-10-18 15:35
+#
+# Trigram indexes need the ``pg_trgm`` extension. They are created only when the
+# server ships it (and on PostgreSQL at all); elsewhere search falls back to a
+# plain scan with the same results. See ``ItemQuerySet.apply_search``.
+
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper("search_text"),
+            name="gin_trgm_ops",
+        ),
+        name="inv_item_search_trgm_idx",
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.indexes.OpClass(
+            django.db.models.functions.text.Upper("notes"), name="gin_trgm_ops"
+        ),
+        name="inv_item_notes_trgm_idx",
+    ),
+]
+
+
+def backfill_item_search_text(apps, _schema_editor):  # pragma: no cover
+    Device = apps.get_model("devices", "Device")
+    Item = apps.get_model("inventory", "Item")
+
+    device = Device.objects.filter(pk=models.OuterRef("device_id"))
+    Item.objects.update(
+        search_text=models.functions.Concat(
+            "inventory_number",
+            models.Value("\n"),
+            "serial_number",
+            models.Value("\n"),
+            models.Subquery(device.values("manufacturer__name")[:1]),
+            models.Value("\n"),
+            models.Subquery(device.values("model__name")[:1]),
+            output_field=models.TextField(),
+        )
+    )
+
+
+def create_trigram_indexes(apps, schema_editor):  # pragma: no cover
+    connection = schema_editor.connection
+    if connection.vendor != "postgresql":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    Item = apps.get_model("inventory", "Item")
+    for index in TRIGRAM_INDEXES:
+        schema_editor.add_index(Item, index)
+
+
+def drop_trigram_indexes(apps, schema_editor):  # pragma: no cover
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for index in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            "DROP INDEX IF EXISTS %s" % schema_editor.quote_name(index.name)
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("devices", "0004_alter_device_unique_together_and_more"),
+        ("inventory", "0009_itemcurrentstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="search_text",
+            field=models.TextField(
+                blank=True, default="", editable=False, verbose_name="Search text"
+            ),
+        ),
+        migrations.RunPython(
+            backfill_item_search_text, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="item", index=index)
+                for index in TRIGRAM_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+            ],
+        ),
+    ]
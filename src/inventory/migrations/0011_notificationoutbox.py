@@ -0,0 +1,74 @@
+# Generated by Django 5.2.18 on 2026-10-18 17:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0010_item_search_text"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationOutbox",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("operation_assigned", "Operation Assigned"),
+                            ("operation_unassigned", "Operation Unassigned"),
+                            ("operation_updated", "Operation Updated"),
+                            ("operation_imported", "Operation Imported"),
+                            ("transfer_created", "Transfer Created"),
+                            ("transfer_accepted", "Transfer Accepted"),
+                            ("transfer_cancelled", "Transfer Cancelled"),
+                            ("transfer_batch_created", "Transfer Batch Created"),
+                            ("transfer_batch_accepted", "Transfer Batch Accepted"),
+                            ("transfer_batch_cancelled", "Transfer Batch Cancelled"),
+                            ("transfer_batch_expired", "Transfer Batch Expired"),
+                            ("responsible_linked", "Responsible Linked"),
+                            ("responsible_updated", "Responsible Updated"),
+                        ],
+                        max_length=32,
+                        verbose_name="Kind",
+                    ),
+                ),
+                ("object_id", models.PositiveBigIntegerField(verbose_name="Object ID")),
+                (
+                    "recipient_id",
+                    models.PositiveBigIntegerField(verbose_name="Recipient ID"),
+                ),
+                (
+                    "language",
+                    models.CharField(
+                        blank=True, max_length=15, verbose_name="Language"
+                    ),
+                ),
+                (
+                    "time_zone",
+                    models.CharField(
+                        blank=True, max_length=63, verbose_name="Time zone"
+                    ),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="Created at"),
+                ),
+            ],
+            options={
+                "verbose_name": "Notification outbox entry",
+                "verbose_name_plural": "Notification outbox",
+            },
+        ),
+    ]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-18 22:40
+#
+# Offers that lapsed before the expiry sweep existed are closed here without
+# notifications, so the first sweep does not email about long-gone offers.
+
+from django.db import migrations, models
+from django.utils import timezone
+
+OPEN_OFFERS = models.Q(
+    ("accepted_at__isnull", True),
+    ("cancelled_at__isnull", True),
+    ("expired_at__isnull", True),
+)
+
+
+def close_lapsed_offers(apps, _schema_editor):  # pragma: no cover
+    PendingTransfer = apps.get_model("inventory", "PendingTransfer")
+    PendingTransfer.objects.filter(
+        accepted_at__isnull=True,
+        cancelled_at__isnull=True,
+        expires_at__lte=timezone.now(),
+    ).update(expired_at=models.F("expires_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0011_notificationoutbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pendingtransfer",
+            name="expired_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="Set by the expiry sweep once the offer has lapsed.",
+                null=True,
+                verbose_name="Expired at",
+            ),
+        ),
+        migrations.RunPython(
+            close_lapsed_offers, reverse_code=migrations.RunPython.noop
+        ),
+        migrations.RemoveIndex(
+            model_name="pendingtransfer",
+            name="inv_pend_xfer_item_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="pendingtransfer",
+            name="inv_pend_xfer_from_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="pendingtransfer",
+            name="inv_pend_xfer_to_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="pendingtransfer",
+            name="inv_pend_xfer_expires_idx",
+        ),
+        migrations.AddIndex(
+            model_name="pendingtransfer",
+            index=models.Index(
+                condition=OPEN_OFFERS,
+                fields=["item", "-created_at", "-id"],
+                name="inv_pend_xfer_open_item_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pendingtransfer",
+            index=models.Index(
+                condition=OPEN_OFFERS,
+                fields=["from_responsible"],
+                name="inv_pend_xfer_open_from_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pendingtransfer",
+            index=models.Index(
+                condition=OPEN_OFFERS,
+                fields=["to_responsible"],
+                name="inv_pend_xfer_open_to_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="pendingtransfer",
+            index=models.Index(
+                condition=models.Q(
+                    ("accepted_at__isnull", True),
+                    ("cancelled_at__isnull", True),
+                    ("expired_at__isnull", True),
+                    ("expires_at__isnull", False),
+                ),
+                fields=["expires_at"],
+                name="inv_pend_xfer_open_exp_idx",
+            ),
+        ),
+    ]
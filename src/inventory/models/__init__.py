@@ -6,8 +6,10 @@ Submodules split the former monolith for maintainability; import from
 package).
 """
 
+from inventory.models.current_state import ItemCurrentState
 from inventory.models.item import Item, ItemQuerySet
 from inventory.models.operation import Operation
+from inventory.models.outbox import NotificationOutbox
 from inventory.models.pages import (
     MY_ITEMS_LIST_KINDS,
     ItemHistoryContext,
@@ -15,6 +17,8 @@ from inventory.models.pages import (
     PreviousItemsPageData,
     build_my_items_page_data,
     build_previous_items_page_data,
+    can_view_item_history,
+    inventory_list_page_size,
     parse_my_items_list_kind,
     pending_transfer_expiration_hours,
     resolve_item_history_context,
@@ -27,15 +31,19 @@ from inventory.models.pending_transfer import (
 __all__ = [
     "MY_ITEMS_LIST_KINDS",
     "Item",
+    "ItemCurrentState",
     "ItemHistoryContext",
     "ItemQuerySet",
     "MyItemsPageData",
+    "NotificationOutbox",
     "Operation",
     "PendingTransfer",
     "PendingTransferQuerySet",
     "PreviousItemsPageData",
     "build_my_items_page_data",
     "build_previous_items_page_data",
+    "can_view_item_history",
+    "inventory_list_page_size",
     "parse_my_items_list_kind",
     "pending_transfer_expiration_hours",
     "resolve_item_history_context",
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
+from django.db import models, transaction
+from django.db.models import OuterRef, Subquery
+from django.utils.translation import gettext_lazy as _
+
+from catalogs.models import Location, Responsible, Status
+from inventory.models.item import Item
+from inventory.models.operation import Operation
+
+#: Rows written per ``bulk_create`` batch by :meth:`ItemCurrentState.rebuild`.
+REBUILD_BATCH_SIZE = 2000
+
+
+class ItemCurrentState(models.Model):
+    """
+    Materialized journal head per item (derived projection, never edited by hand).
+
+    The append-only ``Operation`` stream stays the source of truth. This row
+    mirrors the latest operation (``-created_at``, ``-id``) so list pages can join
+    current state instead of running correlated "latest operation" subqueries per
+    row. ``Operation.save()`` refreshes it inside the same transaction (under the
+    item row lock); operation deletes are handled in ``inventory.signals``.
+
+    Use ``manage.py rebuild_item_current_state`` to rebuild or verify the table
+    after raw SQL repairs or bulk loads that bypass ``Operation.save()``.
+    """
+
+    item = models.OneToOneField(
+        Item,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="current_state",
+        verbose_name=_("Item"),
+    )
+    operation = models.OneToOneField(
+        Operation,
+        on_delete=models.CASCADE,
+        related_name="+",
+        verbose_name=_("Operation"),
+    )
+    status = models.ForeignKey(
+        Status, on_delete=models.PROTECT, related_name="+", verbose_name=_("Status")
+    )
+    responsible = models.ForeignKey(
+        Responsible,
+        on_delete=models.PROTECT,
+        related_name="+",
+        verbose_name=_("Responsible"),
+    )
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.PROTECT,
+        related_name="+",
+        verbose_name=_("Location"),
+    )
+    head_created_at = models.DateTimeField(verbose_name=_("Head created at"))
+
+    class Meta:
+        verbose_name = _("Item current state")
+        verbose_name_plural = _("Item current states")
+        indexes = [
+            # My items: "items whose head names this responsible".
+            models.Index(
+                fields=["responsible", "item"],
+                name="inv_cur_state_resp_item_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.item_id} -> {self.operation_id}"
+
+    @classmethod
+    def _head_values(cls) -> models.QuerySet:
+        """Journal head per item as ``values()`` rows keyed like this model."""
+
+        head_id = (
+            Operation.objects.filter(item_id=OuterRef("item_id"))
+            .order_by("-created_at", "-id")
+            .values("id")[:1]
+        )
+        return (
+            Operation.objects.annotate(head_id=Subquery(head_id))
+            .filter(id=models.F("head_id"))
+            .values(
+                "item_id",
+                "id",
+                "status_id",
+                "responsible_id",
+                "location_id",
+                "created_at",
+            )
+            .order_by("item_id")
+        )
+
+    @classmethod
+    def _from_head_row(cls, row: dict) -> "ItemCurrentState":
+        return cls(
+            item_id=row["item_id"],
+            operation_id=row["id"],
+            status_id=row["status_id"],
+            responsible_id=row["responsible_id"],
+            location_id=row["location_id"],
+            head_created_at=row["created_at"],
+        )
+
+    @classmethod
+    def refresh_for_item(cls, item_id: int) -> "ItemCurrentState | None":
+        """
+        Recompute the projection row for ``item_id`` from the journal.
+
+        Callers must hold the item row lock (``Operation.save()`` does) so two
+        writers cannot interleave a stale head. Returns ``None`` when the item
+        has no operations left (the row is removed).
+        """
+
+        head = (
+            Operation.objects.filter(item_id=item_id)
+            .order_by("-created_at", "-id")
+            .only("id", "status_id", "responsible_id", "location_id", "created_at")
+            .first()
+        )
+        if head is None:
+            cls.objects.filter(item_id=item_id).delete()
+            return None
+        state, _created = cls.objects.update_or_create(
+            item_id=item_id,
+            defaults={
+                "operation_id": head.pk,
+                "status_id": head.status_id,
+                "responsible_id": head.responsible_id,
+                "location_id": head.location_id,
+                "head_created_at": head.created_at,
+            },
+        )
+        return state
+
+    @classmethod
+    def iter_mismatches(cls) -> Iterator[int]:
+        """
+        Yield item ids whose projection row disagrees with the journal head.
+
+        Covers missing rows, stale rows, and rows left for items without
+        operations.
+        """
+
+        expected = {
+            row["item_id"]: cls._from_head_row(row) for row in cls._head_values()
+        }
+        seen: set[int] = set()
+        for state in cls.objects.all().iterator():
+            seen.add(state.item_id)
+            head = expected.get(state.item_id)
+            if head is None or (
+                state.operation_id,
+                state.status_id,
+                state.responsible_id,
+                state.location_id,
+                state.head_created_at,
+            ) != (
+                head.operation_id,
+                head.status_id,
+                head.responsible_id,
+                head.location_id,
+                head.head_created_at,
+            ):
+                yield state.item_id
+        yield from sorted(set(expected) - seen)
+
+    @classmethod
+    def rebuild(cls, *, batch_size: int = REBUILD_BATCH_SIZE) -> int:
+        """
+        Replace the whole projection with journal heads; return rows written.
+
+        Runs in one transaction so readers never observe a half-built table.
+        """
+
+        written = 0
+        with transaction.atomic():
+            cls.objects.all().delete()
+            batch: list[ItemCurrentState] = []
+            for row in cls._head_values().iterator(chunk_size=batch_size):
+                batch.append(cls._from_head_row(row))
+                if len(batch) >= batch_size:
+                    ItemCurrentState.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            if batch:
+                ItemCurrentState.objects.bulk_create(batch)
+                written += len(batch)
+        return written
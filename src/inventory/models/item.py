@@ -2,12 +2,17 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, Any, Optional, cast, overload
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import TrigramWordSimilarity
 from django.core.exceptions import ValidationError
-from django.db import models, transaction
-from django.db.models import OuterRef, Q, Subquery
+from django.db import DEFAULT_DB_ALIAS, connections, models, transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.fields.reverse_related import OneToOneRel
+from django.db.models.functions import Concat, Upper
 from django.utils.translation import gettext_lazy as _
 
 from catalogs.models import Location, Responsible, Status
+from common import metrics
 from common.edit_window import (
     catalog_entry_correction_window_expired_user_message,
     is_within_inventory_correction_window,
@@ -16,8 +21,37 @@ from common.models import BaseModel
 from devices.models import Device
 
 if TYPE_CHECKING:
+    from inventory.models.current_state import ItemCurrentState
     from inventory.models.operation import Operation
 
+#: Joins the searchable parts of ``Item.search_text``. Search input is a single
+#: line, so a query can never match across two parts.
+SEARCH_TEXT_SEPARATOR = "\n"
+
+#: Item fields copied into ``Item.search_text`` (device names are added too).
+SEARCH_TEXT_ITEM_FIELDS = ("inventory_number", "serial_number", "device")
+
+
+#: ``pg_trgm`` availability per database alias, looked up once per process.
+_trigram_search_by_alias: dict[str, bool] = {}
+
+
+def _trigram_search_available(using: str = DEFAULT_DB_ALIAS) -> bool:
+    """True on PostgreSQL with ``pg_trgm`` installed (cached per connection alias)."""
+
+    try:
+        return _trigram_search_by_alias[using]
+    except KeyError:
+        pass
+    db = connections[using]
+    available = False
+    if db.vendor == "postgresql":
+        with db.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            available = cursor.fetchone() is not None
+    _trigram_search_by_alias[using] = available
+    return available
+
 
 class ItemQuerySet(models.QuerySet):
     """
@@ -27,6 +61,27 @@ class ItemQuerySet(models.QuerySet):
     do not regress into N+1 queries.
     """
 
+    def lock_rows(self) -> list[int]:
+        """
+        Lock the matching rows in ``pk`` order (``SELECT ... FOR UPDATE``).
+
+        Returns the locked ids. A fixed lock order keeps concurrent writers over
+        overlapping items from deadlocking; the wait is recorded as
+        ``inventory_item_lock_wait_seconds``. Must run inside
+        ``transaction.atomic()``.
+        """
+
+        with metrics.timer("inventory_item_lock_wait_seconds"):
+            return list(
+                self.select_for_update().order_by("pk").values_list("pk", flat=True)
+            )
+
+    def lock_row(self, pk: int) -> None:
+        """:meth:`lock_rows` for one item; raises ``DoesNotExist`` when it is gone."""
+
+        if not self.filter(pk=pk).lock_rows():
+            raise self.model.DoesNotExist(f"Item {pk} does not exist.")
+
     def with_device_relations(self) -> "ItemQuerySet":
         """Prefetch device and its catalog FKs for template rendering."""
 
@@ -42,16 +97,64 @@ class ItemQuerySet(models.QuerySet):
         """
         Apply a user-facing search string to inventory number, serial, and device
         identifying fields.
+
+        Matches a substring of the denormalized ``search_text`` column (inventory
+        number, serial, manufacturer and model names). On PostgreSQL the
+        ``UPPER(search_text)`` trigram GIN index serves the ``icontains`` lookup,
+        so the cost stays flat as the item table grows; other backends run the
+        same lookup as a plain scan.
         """
 
         text = query.strip()
         if not text:
             return self
-        return self.filter(
-            Q(inventory_number__icontains=text)
-            | Q(serial_number__icontains=text)
-            | Q(device__manufacturer__name__icontains=text)
-            | Q(device__model__name__icontains=text)
+        return self.filter(search_text__icontains=text)
+
+    def order_by_search_rank(self, query: str) -> "ItemQuerySet":
+        """
+        Order items by how closely ``search_text`` matches ``query``, best first.
+
+        Ranks by ``pg_trgm`` word similarity, so it needs PostgreSQL with the
+        extension (see migration 0010); elsewhere, and for an empty query, the
+        queryset is returned unchanged. Keyset-paginated lists keep their own
+        order because a rank is not a stable cursor key.
+        """
+
+        text = query.strip()
+        if not text or not _trigram_search_available(self.db):
+            return self
+        # cast: django-stubs widen ``annotate().order_by()`` on a typed QuerySet to Any.
+        return cast(
+            ItemQuerySet,
+            self.annotate(
+                search_rank=TrigramWordSimilarity(text, "search_text")
+            ).order_by("-search_rank", "inventory_number"),
+        )
+
+    def refresh_search_text(self) -> int:
+        """
+        Recompute ``search_text`` for every item in this queryset in one UPDATE.
+
+        Used after device or catalog renames and bulk loads that bypass
+        ``Item.save()``. Returns the number of updated rows.
+        """
+
+        return self.update(search_text=Item.search_text_expression())
+
+    def with_current_operation(self) -> "ItemQuerySet":
+        """
+        Load each item's journal head (with status, responsible, location) in the
+        same query.
+
+        Joins the ``ItemCurrentState`` projection so ``Item.current_operation``
+        and the ``current_*`` descriptors read from memory for every row of the
+        batch instead of issuing one ``ORDER BY ... LIMIT 1`` query per item.
+        """
+
+        return self.select_related(
+            "current_state__operation__status",
+            "current_state__operation__responsible",
+            "current_state__operation__location",
         )
 
     def owned_by(self, responsible: Responsible) -> "ItemQuerySet":
@@ -59,22 +162,13 @@ class ItemQuerySet(models.QuerySet):
         Return items whose latest operation names ``responsible``.
 
         Reflects journal semantics: the latest ``Operation`` per item defines the
-        current responsible person.
+        current responsible person. Reads the ``ItemCurrentState`` projection
+        (maintained by ``Operation.save()``) through a join instead of a
+        correlated per-row subquery.
         """
 
-        from inventory.models.operation import Operation
-
-        latest_responsible_id = (
-            Operation.objects.filter(item_id=OuterRef("pk"))
-            .order_by("-created_at", "-id")
-            .values("responsible_id")[:1]
-        )
-        # cast: django-stubs widen ``annotate().filter()`` on a typed QuerySet to Any.
-        return cast(
-            ItemQuerySet,
-            self.with_device_relations()
-            .annotate(_latest_responsible_id=Subquery(latest_responsible_id))
-            .filter(_latest_responsible_id=responsible.pk),
+        return self.with_device_relations().filter(
+            current_state__responsible_id=responsible.pk
         )
 
 
@@ -104,6 +198,10 @@ class Item(BaseModel):
     serial_number = models.CharField(
         max_length=50, blank=True, verbose_name=_("Serial number")
     )
+    #: Denormalized search haystack, see :meth:`ItemQuerySet.apply_search`.
+    search_text = models.TextField(
+        blank=True, default="", editable=False, verbose_name=_("Search text")
+    )
 
     objects = ItemQuerySet.as_manager()
 
@@ -111,6 +209,19 @@ class Item(BaseModel):
         verbose_name = _("Item")
         verbose_name_plural = _("Items")
         ordering = ["inventory_number"]
+        indexes = [
+            # ``icontains`` compiles to ``UPPER(col) LIKE UPPER(%s)`` on PostgreSQL;
+            # trigram GIN indexes on the same expression serve any substring.
+            # Created only where ``pg_trgm`` is available (see migration 0010).
+            GinIndex(
+                OpClass(Upper("search_text"), name="gin_trgm_ops"),
+                name="inv_item_search_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("notes"), name="gin_trgm_ops"),
+                name="inv_item_notes_trgm_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.get_display_name()
@@ -118,6 +229,40 @@ class Item(BaseModel):
     def get_display_name(self) -> str:
         return f"{self.inventory_number} - {self.device}"
 
+    @classmethod
+    def search_text_expression(cls) -> Concat:
+        """
+        SQL expression equal to :meth:`build_search_text` for an ``Item`` row.
+
+        Used by bulk ``UPDATE`` statements, which cannot follow joins directly.
+        """
+
+        from devices.models import Device
+
+        device = Device.objects.filter(pk=OuterRef("device_id"))
+        return Concat(
+            "inventory_number",
+            Value(SEARCH_TEXT_SEPARATOR),
+            "serial_number",
+            Value(SEARCH_TEXT_SEPARATOR),
+            Subquery(device.values("manufacturer__name")[:1]),
+            Value(SEARCH_TEXT_SEPARATOR),
+            Subquery(device.values("model__name")[:1]),
+            output_field=models.TextField(),
+        )
+
+    def build_search_text(self) -> str:
+        """Return the ``search_text`` value for the current field values."""
+
+        return SEARCH_TEXT_SEPARATOR.join(
+            [
+                self.inventory_number,
+                self.serial_number,
+                self.device.manufacturer.name,
+                self.device.model.name,
+            ]
+        )
+
     def has_assigned_responsible(self) -> bool:
         """
         Return True when this item has at least one ``Operation``.
@@ -182,21 +327,83 @@ class Item(BaseModel):
         Persist after validation.
 
         Takes a row lock on updates so concurrent saves cannot race past ``clean()``
-        window checks (same pattern as ``Operation.save``).
+        window checks (same pattern as ``Operation.save``). ``search_text`` is
+        rebuilt whenever one of its source fields may have changed.
         """
 
         with transaction.atomic():
             if not self._state.adding:
-                Item.objects.select_for_update().only("id").get(pk=self.pk)
+                Item.objects.lock_row(self.pk)
             self.full_clean()
+            update_fields = kwargs.get("update_fields")
+            if update_fields is None or set(update_fields) & set(
+                SEARCH_TEXT_ITEM_FIELDS
+            ):
+                self.search_text = self.build_search_text()
+                if update_fields is not None:
+                    kwargs["update_fields"] = {*update_fields, "search_text"}
             return super().save(*args, **kwargs)
 
+    def refresh_from_db(self, *args: Any, **kwargs: Any) -> None:
+        """Reload fields and drop the memoized journal head."""
+
+        super().refresh_from_db(*args, **kwargs)
+        self.forget_current_operation()
+
+    def forget_current_operation(self) -> None:
+        """
+        Drop the memoized :attr:`current_operation` so the next read hits the DB.
+
+        ``Operation.save()`` and operation deletes call this on the ``Item``
+        instance attached to the operation; call it yourself after journal
+        writes made through another instance.
+        """
+
+        self.__dict__.pop("_current_operation", None)
+        current_state = cast(OneToOneRel, self._meta.get_field("current_state"))
+        if current_state.is_cached(self):
+            current_state.delete_cached_value(self)
+
     @property
     def current_operation(self) -> Optional["Operation"]:
-        return self.operation_set.order_by("-created_at", "-id").first()
+        """
+        Latest journal ``Operation`` (``-created_at``, ``-id``), memoized per instance.
+
+        Status, responsible and location are loaded in the same query, so the
+        ``current_*`` descriptors below cost one query per instance in total.
+        Querysets built with :meth:`ItemQuerySet.with_current_operation` already
+        carry the head and issue no query here.
+        """
+
+        try:
+            return cast(Optional["Operation"], self.__dict__["_current_operation"])
+        except KeyError:
+            pass
+        operation = self._load_current_operation()
+        self.__dict__["_current_operation"] = operation
+        return operation
+
+    def _load_current_operation(self) -> Optional["Operation"]:
+        current_state = cast(OneToOneRel, self._meta.get_field("current_state"))
+        if current_state.is_cached(self):
+            # Joined by ``with_current_operation()``; ``None`` means no journal yet.
+            state = cast(
+                "ItemCurrentState | None", current_state.get_cached_value(self)
+            )
+            return None if state is None else state.operation
+        return (
+            self.operation_set.select_related("status", "responsible", "location")
+            .order_by("-created_at", "-id")
+            .first()
+        )
 
     class CurrentOperationValue:
-        """Descriptor that reads display strings from the latest ``Operation``."""
+        """
+        Descriptor that reads display strings from the latest ``Operation``.
+
+        Reads go through the memoized :attr:`Item.current_operation`, so showing
+        all three values of one item costs a single query.
+        """
 
         def __init__(self, attr_name: str) -> None:
             self.attr_name = attr_name
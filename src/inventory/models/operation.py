@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Any
+from typing import Any, cast
 
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
@@ -37,6 +37,10 @@ class Operation(BaseModel):
         Location, on_delete=models.PROTECT, verbose_name=_("Location")
     )
 
+    #: Written by a batch transfer action: ``inventory.signals`` skips the
+    #: per-operation email because the batch email covers it.
+    _batch_notification: bool = False
+
     class Meta:
         verbose_name = _("Operation")
         verbose_name_plural = _("Operations")
@@ -182,7 +186,8 @@ class Operation(BaseModel):
     def _validate_location_scope(self) -> None:
         """Ensure a personal location is only used by its responsible owner."""
 
-        if not self.location_id:
+        if not self.location_id or Location.is_on_hand_id(self.location_id):
+            # The system ``on_hand`` location is global: no need to load it.
             return
 
         location_responsible_id = getattr(self.location, "responsible_id", None)
@@ -207,11 +212,18 @@ class Operation(BaseModel):
 
         Before persisting, we capture the previous responsible so the post_save
         signal can determine who to notify without an extra round-trip after commit.
+
+        After persisting, the ``ItemCurrentState`` projection is refreshed under the
+        same lock and transaction, so list pages never observe a head that
+        disagrees with the journal. The memoized ``Item.current_operation`` of the
+        attached item instance is dropped as well.
         """
 
+        from inventory.models.current_state import ItemCurrentState
+
         with transaction.atomic():
             # Lock the item row to serialize concurrent updates for the same item.
-            Item.objects.select_for_update().only("id").get(pk=self.item_id)
+            Item.objects.lock_row(self.item_id)
 
             if self._state.adding:
                 prev = (
@@ -229,7 +241,10 @@ class Operation(BaseModel):
 
             # Ensure `clean()` runs on updates as well (admin and any other code path).
             self.full_clean()
-            return super().save(*args, **kwargs)
+            super().save(*args, **kwargs)
+            ItemCurrentState.refresh_for_item(self.item_id)
+            if cast(models.ForeignKey, self._meta.get_field("item")).is_cached(self):
+                self.item.forget_current_operation()
 
     def __str__(self) -> str:
         return f"{self.item} - {self.status} ({self.location})"
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from django.db import models, transaction
+from django.utils import timezone, translation
+from django.utils.translation import gettext_lazy as _
+
+
+class NotificationOutbox(models.Model):
+    """
+    Pending inventory email, written in the transaction of the change it reports.
+
+    Rows hold ids only (event kind, operation or transfer pk, recipient
+    ``Responsible`` pk); nothing is fetched or rendered while the writer still
+    holds the item row lock. After commit ``inventory.notifications`` drains the
+    table: it loads what the pending rows reference in bulk, renders, and hands
+    the messages to the email backend in one call. A rolled-back change takes
+    its rows with it, so no email ever describes a change that did not happen.
+    Rows of recipients with ``Responsible.email_digest`` wait for the digest
+    interval and are sent as one summary email. Rows are deleted once their
+    emails are handed over; delivery retries are ``common.models.QueuedEmail``'s.
+
+    Each row keeps the language and time zone active when it was written, so the
+    email is rendered like it would have been in the writer's request rather
+    than with the worker's defaults.
+    """
+
+    class Kind(models.TextChoices):
+        """Email family; ``emails/<kind>_{subject.txt,body.txt,body.html}``."""
+
+        OPERATION_ASSIGNED = "operation_assigned"
+        OPERATION_UNASSIGNED = "operation_unassigned"
+        OPERATION_UPDATED = "operation_updated"
+        OPERATION_IMPORTED = "operation_imported"
+        TRANSFER_CREATED = "transfer_created"
+        TRANSFER_ACCEPTED = "transfer_accepted"
+        TRANSFER_CANCELLED = "transfer_cancelled"
+        TRANSFER_BATCH_CREATED = "transfer_batch_created"
+        TRANSFER_BATCH_ACCEPTED = "transfer_batch_accepted"
+        TRANSFER_BATCH_CANCELLED = "transfer_batch_cancelled"
+        TRANSFER_BATCH_EXPIRED = "transfer_batch_expired"
+        RESPONSIBLE_LINKED = "responsible_linked"
+        RESPONSIBLE_UPDATED = "responsible_updated"
+
+    kind = models.CharField(max_length=32, choices=Kind, verbose_name=_("Kind"))
+    #: ``Operation`` pk for ``operation_*`` kinds, ``PendingTransfer`` pk for
+    #: ``transfer_*`` kinds, the recipient's own pk for ``responsible_*`` kinds.
+    object_id = models.PositiveBigIntegerField(verbose_name=_("Object ID"))
+    recipient_id = models.PositiveBigIntegerField(verbose_name=_("Recipient ID"))
+    language = models.CharField(max_length=15, blank=True, verbose_name=_("Language"))
+    time_zone = models.CharField(max_length=63, blank=True, verbose_name=_("Time zone"))
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name=_("Created at"))
+
+    class Meta:
+        verbose_name = _("Notification outbox entry")
+        verbose_name_plural = _("Notification outbox")
+
+    def __str__(self) -> str:
+        return f"{self.kind} #{self.object_id} -> {self.recipient_id}"
+
+    @classmethod
+    def enqueue(
+        cls, kind: str, object_id: int, recipient_ids: Iterable[int | None]
+    ) -> None:
+        """
+        Record ``kind`` for ``object_id`` once per distinct recipient.
+
+        Must run in the writer's transaction; one drain per transaction is
+        scheduled for after its commit (immediately in autocommit mode). A
+        failing drain is logged and never reaches the writer; its rows stay for
+        the next drain.
+        """
+
+        cls.enqueue_many(
+            (kind, object_id, recipient_id) for recipient_id in recipient_ids
+        )
+
+    @classmethod
+    def enqueue_many(cls, events: Iterable[tuple[str, int, int | None]]) -> None:
+        """Bulk :meth:`enqueue` of ``(kind, object_id, recipient_id)`` triples."""
+
+        language = translation.get_language() or ""
+        time_zone = timezone.get_current_timezone_name()
+        rows = [
+            cls(
+                kind=kind,
+                object_id=object_id,
+                recipient_id=recipient_id,
+                language=language,
+                time_zone=time_zone,
+            )
+            for kind, object_id, recipient_id in dict.fromkeys(events)
+            if recipient_id is not None
+        ]
+        if not rows:
+            return
+        NotificationOutbox.objects.bulk_create(rows)
+        _schedule_drain_once()
+
+
+def _schedule_drain_once() -> None:
+    """
+    Register a post-commit drain that runs once per commit.
+
+    Every write registers a callback and marks the connection as having rows to
+    drain. The first callback to run after the commit clears the mark and drains
+    every row; the others find it cleared and return, so ``accept()``'s two
+    writes queue one drain. A rollback discards the callbacks and leaves the
+    mark set, which only means the next commit's first callback drains, as it
+    would anyway.
+    """
+
+    from inventory.notifications import schedule_outbox_drain
+
+    connection = transaction.get_connection()
+    connection._outbox_drain_pending = True
+
+    def drain() -> None:
+        if connection._outbox_drain_pending:
+            connection._outbox_drain_pending = False
+            schedule_outbox_drain()
+
+    transaction.on_commit(drain, robust=True)
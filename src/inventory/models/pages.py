@@ -9,24 +9,17 @@ from __future__ import annotations
 
 from collections.abc import Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, cast
-
-from django.db.models import (
-    Case,
-    CharField,
-    OuterRef,
-    Q,
-    QuerySet,
-    Subquery,
-    Value,
-    When,
-)
-from django.utils.translation import gettext
+from typing import TYPE_CHECKING, Any, cast
+
+from django.db.models import Exists, F, OuterRef, Q, QuerySet, Subquery, Window
+from django.db.models.functions import Lag
 
 from catalogs.models import Responsible
+from inventory.list_pagination import KeysetPage, KeysetSection, paginate_sections
 from inventory.list_query_helpers import (
-    latest_operation_location_name_subquery,
-    latest_operation_status_name_subquery,
+    current_location_name_expression,
+    current_location_scope_expression,
+    current_status_name_expression,
 )
 from inventory.models.item import Item
 from inventory.models.operation import Operation
@@ -36,45 +29,24 @@ if TYPE_CHECKING:
     from inventory.models.pending_transfer import PendingTransferQuerySet
 
 
-def _latest_operation_location_scope_subquery(*, item_ref: str) -> Subquery:
-    from catalogs.models import Location
-
-    return Subquery(
-        Operation.objects.filter(item_id=OuterRef(item_ref))
-        .order_by("-created_at", "-id")
-        .annotate(
-            location_scope=Case(
-                When(
-                    location__responsible__isnull=True,
-                    location__name=Location.ON_HAND,
-                    then=Value(gettext("System")),
-                ),
-                When(location__responsible__isnull=True, then=Value(gettext("Common"))),
-                default=Value(gettext("Personal")),
-                output_field=CharField(),
-            )
-        )
-        .values("location_scope")[:1]
-    )
-
-
 MY_ITEMS_LIST_KINDS = frozenset({"all", "incoming", "owned", "outgoing"})
 
+#: Keyset orderings (each ends in a unique column so cursors name one row).
+_OWNED_ITEMS_ORDERING = ("inventory_number",)
+_PREVIOUS_ITEMS_ORDERING = ("-last_on_me_created_at", "inventory_number")
+_TRANSFER_CARDS_ORDERING = ("-created_at", "-id")
+_HISTORY_ORDERING = ("-created_at", "-id")
+
 
 def _build_annotated_transfers_queryset() -> PendingTransferQuerySet:
     """
     Build base transfer queryset with relations and annotations.
 
     Centralizes select_related and annotate logic for transfer cards
-    so My items and Previously held pages stay aligned.
+    so My items and Previously held pages stay aligned. Cards show the
+    annotated current state, so no operation history is prefetched.
     """
 
-    latest_location_name = latest_operation_location_name_subquery(item_ref="item_id")
-    latest_location_scope = _latest_operation_location_scope_subquery(
-        item_ref="item_id"
-    )
-    latest_status_name = latest_operation_status_name_subquery(item_ref="item_id")
-
     return cast(
         "PendingTransferQuerySet",
         PendingTransfer.offers_visible_in_ui()
@@ -89,11 +61,12 @@ def _build_annotated_transfers_queryset() -> PendingTransferQuerySet:
             "to_responsible",
         )
         .annotate(
-            current_location=latest_location_name,
-            current_location_scope=latest_location_scope,
-            current_status=latest_status_name,
-        )
-        .prefetch_related("item__operation_set__location"),
+            current_location=current_location_name_expression(item_prefix="item__"),
+            current_location_scope=current_location_scope_expression(
+                item_prefix="item__"
+            ),
+            current_status=current_status_name_expression(item_prefix="item__"),
+        ),
     )
 
 
@@ -122,6 +95,38 @@ def pending_transfer_expiration_hours() -> int:
     )
 
 
+def inventory_list_page_size() -> int:
+    """Return configured number of cards per My items / Previously held page."""
+
+    from django.conf import settings
+
+    return max(1, int(getattr(settings, "INVENTORY_LIST_PAGE_SIZE", 50)))
+
+
+def _paginate_card_list(
+    *,
+    incoming_transfers: QuerySet[PendingTransfer],
+    items: QuerySet[Item],
+    items_ordering: tuple[str, ...],
+    outgoing_transfers: QuerySet[PendingTransfer],
+    cursor: str,
+    page_size: int | None,
+) -> KeysetPage:
+    return paginate_sections(
+        [
+            KeysetSection(
+                "incoming_transfers", incoming_transfers, _TRANSFER_CARDS_ORDERING
+            ),
+            KeysetSection("items", items, items_ordering),
+            KeysetSection(
+                "outgoing_transfers", outgoing_transfers, _TRANSFER_CARDS_ORDERING
+            ),
+        ],
+        cursor,
+        page_size=inventory_list_page_size() if page_size is None else page_size,
+    )
+
+
 @dataclass(frozen=True)
 class MyItemsPageData:
     """Querysets and metadata for the "My items" inventory page."""
@@ -131,6 +136,23 @@ class MyItemsPageData:
     outgoing_transfers: QuerySet[PendingTransfer]
     has_any: bool
 
+    def window(self, cursor: str, *, page_size: int | None = None) -> KeysetPage:
+        """
+        Return one keyset page: incoming cards, owned items, then outgoing cards.
+
+        Rows are keyed by ``"incoming_transfers"``, ``"items"`` and
+        ``"outgoing_transfers"``; pass ``next_cursor`` back for the next page.
+        """
+
+        return _paginate_card_list(
+            incoming_transfers=self.incoming_transfers,
+            items=self.items,
+            items_ordering=_OWNED_ITEMS_ORDERING,
+            outgoing_transfers=self.outgoing_transfers,
+            cursor=cursor,
+            page_size=page_size,
+        )
+
 
 @dataclass(frozen=True)
 class PreviousItemsPageData:
@@ -141,6 +163,18 @@ class PreviousItemsPageData:
     outgoing_transfers: QuerySet[PendingTransfer]
     has_any: bool
 
+    def window(self, cursor: str, *, page_size: int | None = None) -> KeysetPage:
+        """Same as :meth:`MyItemsPageData.window`, items keyed by last holding."""
+
+        return _paginate_card_list(
+            incoming_transfers=self.incoming_transfers,
+            items=self.items,
+            items_ordering=_PREVIOUS_ITEMS_ORDERING,
+            outgoing_transfers=self.outgoing_transfers,
+            cursor=cursor,
+            page_size=page_size,
+        )
+
 
 @dataclass(frozen=True)
 class ItemHistoryContext:
@@ -152,6 +186,8 @@ class ItemHistoryContext:
     pending_transfer: PendingTransfer | None
     #: Latest ``Operation`` pk when the viewer may accept (UI posts this with Accept).
     accept_journal_head_operation_id: int | None = None
+    #: Cursor of the next (older) page of ``operations``, if there is one.
+    next_cursor: str | None = None
 
 
 def build_my_items_page_data(
@@ -166,7 +202,9 @@ def build_my_items_page_data(
 
     Owned ``Item`` rows are annotated with ``current_location`` and ``current_status``
     (latest operation display strings) so list templates do not trigger one query
-    per row via :class:`~inventory.models.item.Item` descriptors.
+    per row via :class:`~inventory.models.item.Item` descriptors. Both ownership and
+    the annotations join the ``ItemCurrentState`` projection, so cost follows the
+    number of owned items rather than the size of the journal.
     """
 
     items = Item.objects.apply_search(query).owned_by(responsible)
@@ -182,12 +220,12 @@ def build_my_items_page_data(
     incoming_transfers = (
         base_transfers_qs.filter(to_responsible=responsible)
         .apply_search(query)
-        .order_by("-created_at", "-id")
+        .order_by(*_TRANSFER_CARDS_ORDERING)
     )
     outgoing_transfers = (
         base_transfers_qs.filter(from_responsible=responsible)
         .apply_search(query)
-        .order_by("-created_at", "-id")
+        .order_by(*_TRANSFER_CARDS_ORDERING)
     )
 
     transfer_item_ids = (
@@ -209,14 +247,11 @@ def build_my_items_page_data(
         items = items.none()
         incoming_transfers = incoming_transfers.none()
 
-    item_loc = latest_operation_location_name_subquery(item_ref="pk")
-    item_scope = _latest_operation_location_scope_subquery(item_ref="pk")
-    item_stat = latest_operation_status_name_subquery(item_ref="pk")
     items = items.annotate(
-        current_location=item_loc,
-        current_location_scope=item_scope,
-        current_status=item_stat,
-    )
+        current_location=current_location_name_expression(item_prefix=""),
+        current_location_scope=current_location_scope_expression(item_prefix=""),
+        current_status=current_status_name_expression(item_prefix=""),
+    ).order_by(*_OWNED_ITEMS_ORDERING)
 
     return MyItemsPageData(
         items=items,
@@ -249,7 +284,7 @@ def build_previous_items_page_data(
         .exclude(pk__in=current_items)
         .distinct()
         .annotate(last_on_me_created_at=Subquery(last_on_me_created_at))
-        .order_by("-last_on_me_created_at", "inventory_number")
+        .order_by(*_PREVIOUS_ITEMS_ORDERING)
     )
     has_any = items.exists()
     items = items.apply_search(query)
@@ -260,11 +295,11 @@ def build_previous_items_page_data(
         .filter(Q(to_responsible=responsible) | Q(from_responsible=responsible))
     )
     incoming_transfers = base_transfers_qs.filter(to_responsible=responsible).order_by(
-        "-created_at", "-id"
+        *_TRANSFER_CARDS_ORDERING
     )
     outgoing_transfers = base_transfers_qs.filter(
         from_responsible=responsible
-    ).order_by("-created_at", "-id")
+    ).order_by(*_TRANSFER_CARDS_ORDERING)
     transfer_item_ids = base_transfers_qs.values_list("item_id", flat=True).distinct()
     items = items.exclude(id__in=transfer_item_ids)
 
@@ -276,35 +311,93 @@ def build_previous_items_page_data(
     )
 
 
-def _filter_operations_for_viewer(
+def _visible_operations_for_viewer(
     operations_qs: QuerySet[Operation],
     viewer_responsible_id: int,
-) -> list[Operation]:
+) -> QuerySet[Operation]:
     """
     A viewer always sees operations where they are the responsible person.
     Additionally, handoff operations (responsible changed) and status
-    changes are visible.      Only pure location changes by someone else
+    changes are visible. Only pure location changes by someone else
     (same responsible, same status) are excluded.
+
+    The rule runs in SQL: ``LAG()`` over the item's journal gives each row the
+    previous responsible and status, and Django filters on those window columns
+    in an outer query. Plain filters (former-owner slice, keyset cursor) land in
+    the inner query before the window is computed; each of them keeps a
+    prefix of the journal (everything up to some point), so every remaining
+    row still sees its true predecessor.
+    """
+
+    journal_order = [F("created_at").asc(), F("id").asc()]
+    return operations_qs.annotate(
+        prev_responsible_id=Window(
+            Lag("responsible_id"), partition_by=[F("item_id")], order_by=journal_order
+        ),
+        prev_status_id=Window(
+            Lag("status_id"), partition_by=[F("item_id")], order_by=journal_order
+        ),
+    ).filter(
+        Q(responsible_id=viewer_responsible_id)
+        | Q(prev_responsible_id__isnull=True)
+        | ~Q(responsible_id=F("prev_responsible_id"))
+        | ~Q(status_id=F("prev_status_id"))
+    )
+
+
+def _history_viewer_annotations(responsible: Responsible) -> dict[str, Any]:
+    """
+    Per-item access facts for ``responsible`` as correlated subqueries.
+
+    ``has_offer_for_viewer``: an active offer addressed to the viewer;
+    ``last_mine_id`` / ``last_mine_created_at``: the viewer's latest operation.
+    All three are index lookups, so the annotated row costs the same however long
+    the journal is.
+    """
+
+    last_mine = Operation.objects.filter(
+        item_id=OuterRef("pk"), responsible=responsible
+    ).order_by("-created_at", "-id")
+    return {
+        "has_offer_for_viewer": Exists(
+            PendingTransfer.offers_visible_in_ui().filter(
+                item_id=OuterRef("pk"), to_responsible=responsible
+            )
+        ),
+        "last_mine_id": Subquery(last_mine.values("id")[:1]),
+        "last_mine_created_at": Subquery(last_mine.values("created_at")[:1]),
+    }
+
+
+def can_view_item_history(responsible: Responsible, item_id: int) -> bool:
+    """
+    Return whether ``responsible`` may open the history page of ``item_id``.
+
+    Same rule as :func:`resolve_item_history_context` (current or former holder,
+    or the receiver of an active offer for an item with a journal) in a single
+    ``EXISTS`` query, for callers that only pick a redirect target.
     """
 
-    ops = list(operations_qs.order_by("created_at", "id"))
-    result: list[Operation] = []
-    prev_resp_id: int | None = None
-    prev_status_id: int | None = None
-    for op in ops:
-        is_own = op.responsible_id == viewer_responsible_id
-        is_handoff = op.responsible_id != prev_resp_id
-        is_status_change = op.status_id != prev_status_id
-        if is_own or is_handoff or is_status_change:
-            result.append(op)
-        prev_resp_id = op.responsible_id
-        prev_status_id = op.status_id
-    result.reverse()
-    return result
+    journal = Operation.objects.filter(item_id=OuterRef("pk"))
+    offer_for_viewer = PendingTransfer.offers_visible_in_ui().filter(
+        item_id=OuterRef("pk"), to_responsible=responsible
+    )
+    return (
+        Item.objects.filter(pk=item_id)
+        .filter(
+            Exists(journal.filter(responsible=responsible))
+            | (Exists(offer_for_viewer) & Exists(journal))
+        )
+        .exists()
+    )
 
 
 def resolve_item_history_context(
-    responsible: Responsible, item_id: int
+    responsible: Responsible,
+    item_id: int,
+    *,
+    cursor: str = "",
+    page_size: int | None = None,
 ) -> ItemHistoryContext | None:
     """
     Resolve item, operations, and optional pending transfer for the history page.
@@ -312,83 +405,64 @@ def resolve_item_history_context(
     Returns ``None`` when the viewer must not see this item (caller maps to
     HTTP 404). Implements owner, incoming-offer receiver, and former-owner slice
     rules in one place so views and other entry points stay aligned.
-    """
 
-    item_qs = Item.objects.owned_by(responsible)
-    item = item_qs.filter(pk=item_id).first()
-    is_owner = item is not None
+    Operations are listed newest first, one keyset page at a time (``cursor``
+    as returned in ``next_cursor``; ``page_size`` defaults to the list page
+    size). Costs at most three queries whatever the journal length: the item with
+    its journal head and the viewer's access facts
+    (:func:`_history_viewer_annotations`), one page of visible operations, and
+    the active offer. The Accept baseline is the head already joined through
+    ``ItemCurrentState``.
+    """
 
-    if item is None:
-        pending_for_me = (
-            PendingTransfer.offers_visible_in_ui()
-            .filter(
-                item_id=item_id,
-                to_responsible=responsible,
-            )
-            .order_by("-created_at", "-id")
-            .first()
+    item = (
+        Item.objects.with_device_relations()
+        .with_current_operation()
+        .annotate(**_history_viewer_annotations(responsible))
+        .filter(pk=item_id)
+        .first()
+    )
+    head = None if item is None else item.current_operation
+    if item is None or head is None:
+        # Unknown item, or no journal to show (nobody holds it yet).
+        return None
+
+    is_owner = head.responsible_id == responsible.pk
+    operations_qs = Operation.objects.filter(item=item).select_related(
+        "status", "responsible", "location"
+    )
+    if not is_owner and not item.has_offer_for_viewer:
+        if item.last_mine_id is None:
+            return None
+        # Former owner: the journal up to their last operation plus the one
+        # handoff right after it.
+        after_last_mine = Q(created_at__gt=item.last_mine_created_at) | Q(
+            created_at=item.last_mine_created_at, id__gt=item.last_mine_id
+        )
+        handoff_id = (
+            Operation.objects.filter(item_id=item_id)
+            .filter(after_last_mine)
+            .order_by("created_at", "id")
+            .values("id")[:1]
+        )
+        operations_qs = operations_qs.filter(
+            ~after_last_mine | Q(pk=Subquery(handoff_id))
         )
-        if pending_for_me is not None and pending_for_me.is_active:
-            try:
-                item = Item.objects.with_device_relations().get(pk=item_id)
-            except Item.DoesNotExist:  # pragma: no cover
-                # Defensive: ``item_id`` may race with concurrent deletions.
-                return None
-            operations = _filter_operations_for_viewer(
-                Operation.objects.filter(item=item).select_related(
-                    "status", "responsible", "location"
-                ),
-                viewer_responsible_id=responsible.pk,
-            )
-            if not operations:
-                return None
-        else:
-            last_mine = (
-                Operation.objects.filter(item_id=item_id, responsible=responsible)
-                .order_by("-created_at", "-id")
-                .first()
-            )
-            if last_mine is None:
-                return None
-
-            try:
-                item = Item.objects.with_device_relations().get(pk=item_id)
-            except Item.DoesNotExist:  # pragma: no cover
-                # Defensive: same race window as the pending-receiver branch.
-                return None
-
-            handoff = (
-                Operation.objects.filter(item_id=item_id)
-                .filter(
-                    Q(created_at__gt=last_mine.created_at)
-                    | Q(created_at=last_mine.created_at, id__gt=last_mine.id)
-                )
-                .order_by("created_at", "id")
-                .first()
-            )
-            if handoff is None:
-                raise AssertionError(
-                    "Invariant violation: former-owner flow requires "
-                    "a handoff operation"
-                )
-            ops_filter = Q(created_at__lt=last_mine.created_at) | Q(
-                created_at=last_mine.created_at, id__lte=last_mine.id
-            )
-            ops_filter |= Q(pk=handoff.pk)
 
-            operations = _filter_operations_for_viewer(
-                Operation.objects.filter(item=item)
-                .filter(ops_filter)
-                .select_related("status", "responsible", "location"),
-                viewer_responsible_id=responsible.pk,
+    page = paginate_sections(
+        [
+            KeysetSection(
+                "operations",
+                _visible_operations_for_viewer(
+                    operations_qs, viewer_responsible_id=responsible.pk
+                ),
+                _HISTORY_ORDERING,
             )
-    else:
-        operations = _filter_operations_for_viewer(
-            Operation.objects.filter(item=item).select_related(
-                "status", "responsible", "location"
-            ),
-            viewer_responsible_id=responsible.pk,
-        )
+        ],
+        cursor,
+        page_size=inventory_list_page_size() if page_size is None else page_size,
+    )
+    operations = page.rows["operations"]
 
     location_cache = Operation._meta.get_field("location")
     for op in operations:
@@ -408,7 +482,7 @@ def resolve_item_history_context(
         pending_transfer is not None
         and pending_transfer.to_responsible_id == responsible.pk
     ):
-        accept_head = Operation.latest_operation_id_for_item(item.pk)
+        accept_head = head.pk
 
     return ItemHistoryContext(
         item=item,
@@ -416,4 +490,5 @@ def resolve_item_history_context(
         is_owner=is_owner,
         pending_transfer=pending_transfer,
         accept_journal_head_operation_id=accept_head,
+        next_cursor=page.next_cursor,
     )
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime, timedelta
 from typing import Any
 
 from django.core.exceptions import ValidationError
 from django.db import models, transaction
-from django.db.models import Q
+from django.db.models import F, Q
+from django.dispatch import Signal
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -13,6 +15,38 @@ from catalogs.models import Location, Responsible
 from common.models import BaseModel
 from inventory.models.item import Item
 
+#: Sent once per batch action (``create_offers`` / ``accept_offers`` /
+#: ``cancel_offers`` / ``expire_offers``) with ``action`` ("created",
+#: "accepted", "cancelled" or "expired") and the affected ``transfers``, inside
+#: the batch's transaction. Per-offer and
+#: per-operation notifications are suppressed for the rows of a batch;
+#: ``inventory.signals`` queues one email per recipient instead.
+transfers_batch_processed = Signal()
+
+#: Offers without a terminal state; the partial indexes cover only these rows.
+OPEN_OFFERS = Q(
+    accepted_at__isnull=True, cancelled_at__isnull=True, expired_at__isnull=True
+)
+
+
+def _lock_items(item_ids: list[int]) -> dict[int, Item]:
+    """
+    Lock ``item_ids`` in ascending order and return them with their journal heads.
+
+    A fixed lock order keeps concurrent batches over overlapping items from
+    deadlocking. Must run inside ``transaction.atomic()``.
+    """
+
+    Item.objects.filter(pk__in=item_ids).lock_rows()
+    return Item.objects.with_current_operation().in_bulk(item_ids)
+
+
+def _send_batch_signal(action: str, transfers: list["PendingTransfer"]) -> None:
+    if transfers:
+        transfers_batch_processed.send(
+            sender=PendingTransfer, action=action, transfers=transfers
+        )
+
 
 class PendingTransferQuerySet(models.QuerySet):
     """
@@ -22,25 +56,28 @@ class PendingTransferQuerySet(models.QuerySet):
     property checks in Python for list views.
     """
 
+    def open(self) -> "PendingTransferQuerySet":
+        """Offers not accepted, cancelled or closed by the expiry sweep."""
+
+        return self.filter(OPEN_OFFERS)
+
     def offers_visible_in_ui(self) -> "PendingTransferQuerySet":
-        """Exclude finished or expired offers."""
+        """
+        Exclude finished or expired offers.
+
+        :meth:`open` matches the partial indexes. The deadline check only
+        filters the few open rows that lapsed since the last expiry sweep.
+        """
 
         now = timezone.now()
-        return self.filter(
-            accepted_at__isnull=True,
-            cancelled_at__isnull=True,
-        ).filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+        return self.open().filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
 
     def apply_search(self, query: str) -> "PendingTransferQuerySet":
         text = query.strip()
         if not text:
             return self
-        return self.filter(
-            Q(item__inventory_number__icontains=text)
-            | Q(item__serial_number__icontains=text)
-            | Q(item__device__manufacturer__name__icontains=text)
-            | Q(item__device__model__name__icontains=text)
-        )
+        # Same haystack (and trigram index) as ``ItemQuerySet.apply_search``.
+        return self.filter(item__search_text__icontains=text)
 
     def active_offer_for_item(self, item: Item) -> PendingTransfer | None:
         """Return the newest visible pending transfer for ``item``, if any."""
@@ -93,29 +130,44 @@ class PendingTransfer(BaseModel):
         blank=True,
         verbose_name=_("Cancelled at"),
     )
+    expired_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        verbose_name=_("Expired at"),
+        help_text=_("Set by the expiry sweep once the offer has lapsed."),
+    )
 
     objects = PendingTransferQuerySet.as_manager()
 
+    #: Part of a batch action: ``inventory.signals`` skips the per-offer email
+    #: and ``notify_transfers_batch`` sends one per recipient instead.
+    _batch_notification: bool = False
+
     class Meta:
         verbose_name = _("Pending transfer")
         verbose_name_plural = _("Pending transfers")
         ordering = ["-created_at", "-id"]
+        # Partial: closed offers pile up, lists and the sweep only read open ones.
         indexes = [
             models.Index(
-                fields=["item", "accepted_at", "cancelled_at", "-created_at", "-id"],
-                name="inv_pend_xfer_item_idx",
+                fields=["item", "-created_at", "-id"],
+                name="inv_pend_xfer_open_item_idx",
+                condition=OPEN_OFFERS,
             ),
             models.Index(
-                fields=["from_responsible", "accepted_at", "cancelled_at"],
-                name="inv_pend_xfer_from_idx",
+                fields=["from_responsible"],
+                name="inv_pend_xfer_open_from_idx",
+                condition=OPEN_OFFERS,
             ),
             models.Index(
-                fields=["to_responsible", "accepted_at", "cancelled_at"],
-                name="inv_pend_xfer_to_idx",
+                fields=["to_responsible"],
+                name="inv_pend_xfer_open_to_idx",
+                condition=OPEN_OFFERS,
             ),
             models.Index(
                 fields=["expires_at"],
-                name="inv_pend_xfer_expires_idx",
+                name="inv_pend_xfer_open_exp_idx",
+                condition=OPEN_OFFERS & Q(expires_at__isnull=False),
             ),
         ]
 
@@ -155,11 +207,9 @@ class PendingTransfer(BaseModel):
             raise ValidationError({"expires_at": _("Expiration must be in the future")})
 
         if self._state.adding and self.item_id:
-            now = timezone.now()
             active_exists = (
                 PendingTransfer.objects.filter(item_id=self.item_id)
-                .filter(accepted_at__isnull=True, cancelled_at__isnull=True)
-                .filter(Q(expires_at__isnull=True) | Q(expires_at__gt=now))
+                .offers_visible_in_ui()
                 .exists()
             )
             if active_exists:
@@ -176,7 +226,7 @@ class PendingTransfer(BaseModel):
         """
 
         with transaction.atomic():
-            Item.objects.select_for_update().only("id").get(pk=self.item_id)
+            Item.objects.lock_row(self.item_id)
 
             if not self._state.adding:
                 prev = PendingTransfer.objects.only(
@@ -209,7 +259,7 @@ class PendingTransfer(BaseModel):
 
         with transaction.atomic():
             # Lock the item row to serialize concurrent updates for the same item.
-            Item.objects.select_for_update().only("id").get(pk=item.pk)
+            Item.objects.lock_row(item.pk)
 
             transfer = cls.objects.create(
                 item=item,
@@ -222,6 +272,157 @@ class PendingTransfer(BaseModel):
                 transfer.accept()
             return transfer
 
+    @classmethod
+    def create_offers(
+        cls,
+        *,
+        items: Iterable[Item],
+        from_responsible: Responsible,
+        to_responsible: Responsible,
+        expires_at: datetime | None,
+        notes: str = "",
+    ) -> list["PendingTransfer"]:
+        """
+        Create one offer per item in a single transaction (bulk handover).
+
+        Item rows are locked in primary key order, so two concurrent batches
+        over overlapping items wait for each other instead of deadlocking. Any
+        validation error rolls the whole batch back. Offers to a receiver
+        without a linked user are accepted automatically, as in
+        :meth:`create_offer`.
+
+        Per-offer notifications are replaced by one ``transfers_batch_processed``
+        signal per action, so each party gets a single aggregated email. The
+        signal is sent inside the transaction, so its outbox rows commit or
+        roll back with the batch.
+        """
+
+        item_ids = sorted({item.pk for item in items})
+        created: list[PendingTransfer] = []
+        accepted: list[PendingTransfer] = []
+        with transaction.atomic():
+            locked_items = _lock_items(item_ids)
+            for item_id in item_ids:
+                transfer = cls(
+                    item=locked_items[item_id],
+                    from_responsible=from_responsible,
+                    to_responsible=to_responsible,
+                    expires_at=expires_at,
+                    notes=notes,
+                )
+                transfer._batch_notification = True
+                transfer.save()
+                if to_responsible.user_id is None:
+                    transfer._accept_locked(item=locked_items[item_id])
+                    accepted.append(transfer)
+                else:
+                    created.append(transfer)
+            _send_batch_signal("created", created)
+            _send_batch_signal("accepted", accepted)
+        return created + accepted
+
+    @classmethod
+    def accept_offers(cls, transfer_ids: Iterable[int]) -> list["PendingTransfer"]:
+        """
+        Accept many offers in one transaction and return the accepted ones.
+
+        Offers that can no longer be accepted (inactive, or the sender no longer
+        holds the item) are skipped; each acceptance runs in its own savepoint
+        so a skipped offer leaves no partial writes. Locking follows
+        :meth:`create_offers`.
+        """
+
+        accepted: list[PendingTransfer] = []
+        with transaction.atomic():
+            transfers, items = cls._lock_batch(transfer_ids)
+            for transfer in transfers:
+                try:
+                    with transaction.atomic():
+                        transfer._accept_locked(item=items[transfer.item_id])
+                except ValidationError:
+                    continue
+                accepted.append(transfer)
+            _send_batch_signal("accepted", accepted)
+        return accepted
+
+    @classmethod
+    def cancel_offers(cls, transfer_ids: Iterable[int]) -> list["PendingTransfer"]:
+        """
+        Cancel (or decline) many offers in one transaction.
+
+        Returns the offers that were still active; inactive ones are skipped.
+        Locking follows :meth:`create_offers`.
+        """
+
+        cancelled: list[PendingTransfer] = []
+        with transaction.atomic():
+            transfers, _items = cls._lock_batch(transfer_ids)
+            for transfer in transfers:
+                if not transfer.is_active:
+                    continue
+                transfer._cancel_locked()
+                cancelled.append(transfer)
+            _send_batch_signal("cancelled", cancelled)
+        return cancelled
+
+    @classmethod
+    def expire_offers(cls, transfer_ids: Iterable[int]) -> list["PendingTransfer"]:
+        """
+        Close many lapsed offers in one transaction and return them.
+
+        Offers that are closed already, or whose ``expires_at`` was moved into
+        the future meanwhile, are skipped. ``expired_at`` records the deadline
+        itself. One ``UPDATE`` writes the rows, as :meth:`save` rejects a past
+        ``expires_at``. Locking follows :meth:`create_offers`.
+        """
+
+        with transaction.atomic():
+            transfers, _items = cls._lock_batch(transfer_ids)
+            now = timezone.now()
+            expired = [
+                transfer
+                for transfer in transfers
+                if not (
+                    transfer.accepted_at or transfer.cancelled_at or transfer.expired_at
+                )
+                and transfer.expires_at is not None
+                and transfer.expires_at <= now
+            ]
+            cls.objects.filter(pk__in=[transfer.pk for transfer in expired]).update(
+                expired_at=F("expires_at"), updated_at=now
+            )
+            for transfer in expired:
+                transfer.expired_at = transfer.expires_at
+                transfer.updated_at = now
+            _send_batch_signal("expired", expired)
+        return expired
+
+    @classmethod
+    def _lock_batch(
+        cls, transfer_ids: Iterable[int]
+    ) -> tuple[list["PendingTransfer"], dict[int, Item]]:
+        """
+        Lock the items (in primary key order), then the transfers of a batch.
+
+        Must run inside ``transaction.atomic()``. Returned transfers carry both
+        parties and are flagged for aggregated notification.
+        """
+
+        ids = sorted(set(transfer_ids))
+        item_ids = sorted(
+            set(cls.objects.filter(pk__in=ids).values_list("item_id", flat=True))
+        )
+        items = _lock_items(item_ids)
+        transfers = list(
+            cls.objects.select_for_update(of=("self",))
+            .select_related("from_responsible", "to_responsible")
+            .filter(pk__in=ids)
+            .order_by("item_id", "pk")
+        )
+        for transfer in transfers:
+            transfer._batch_notification = True
+        return transfers, items
+
     def accept(self) -> None:
         """
         Accept the transfer and append an ownership-changing operation.
@@ -234,45 +435,52 @@ class PendingTransfer(BaseModel):
         the offer is stale and acceptance is rejected.
         """
 
-        from inventory.models.operation import Operation
-
         with transaction.atomic():
             # Serialize per-item to avoid races with other operations/transfers.
-            Item.objects.select_for_update().only("id").get(pk=self.item_id)
+            Item.objects.lock_row(self.item_id)
             transfer = PendingTransfer.objects.select_for_update().get(pk=self.pk)
-            if not transfer.is_active:
-                raise ValidationError(
-                    _("Transfer is not active"),
-                    code="transfer_inactive",
-                )
+            transfer._accept_locked(item=Item.objects.get(pk=transfer.item_id))
 
-            item = Item.objects.get(pk=transfer.item_id)
-            current_op = item.current_operation
-            if current_op is None:
-                raise ValidationError(
-                    _("Cannot accept transfer for an item without operations"),
-                    code="no_current_operation",
-                )
-            # The offer is valid only while the journal head still names the sender.
-            # Ownership may move while a stale PendingTransfer row stays active (e.g.
-            # admin repair); we must not copy state from a non-sender head for the
-            # receiver.
-            if current_op.responsible_id != transfer.from_responsible_id:
-                raise ValidationError(
-                    _("Cannot accept transfer: sender no longer holds the item."),
-                    code="sender_no_longer_holds_item",
-                )
+    def _accept_locked(self, *, item: Item) -> None:
+        """Accept this (row-locked) transfer; the caller holds the item lock."""
 
-            transfer.accepted_at = timezone.now()
-            transfer.save(update_fields=["accepted_at", "updated_at"])
-            Operation.objects.create(
-                item=item,
-                status=current_op.status,
-                responsible=transfer.to_responsible,
-                location=Location.on_hand(),
-                notes=transfer.notes,
+        from inventory.models.operation import Operation
+
+        if not self.is_active:
+            raise ValidationError(
+                _("Transfer is not active"),
+                code="transfer_inactive",
             )
 
+        current_op = item.current_operation
+        if current_op is None:
+            raise ValidationError(
+                _("Cannot accept transfer for an item without operations"),
+                code="no_current_operation",
+            )
+        # The offer is valid only while the journal head still names the sender.
+        # Ownership may move while a stale PendingTransfer row stays active (e.g.
+        # admin repair); we must not copy state from a non-sender head for the
+        # receiver.
+        if current_op.responsible_id != self.from_responsible_id:
+            raise ValidationError(
+                _("Cannot accept transfer: sender no longer holds the item."),
+                code="sender_no_longer_holds_item",
+            )
+
+        self.accepted_at = timezone.now()
+        self.save(update_fields=["accepted_at", "updated_at"])
+        operation = Operation(
+            item=item,
+            status_id=current_op.status_id,
+            responsible_id=self.to_responsible_id,
+            location_id=Location.on_hand_id(),
+            notes=self.notes,
+        )
+        # The batch email already tells both parties about the handover.
+        operation._batch_notification = self._batch_notification
+        operation.save()
+
     def cancel(self) -> None:
         """
         Cancel the transfer offer.
@@ -281,13 +489,17 @@ class PendingTransfer(BaseModel):
         """
 
         with transaction.atomic():
-            Item.objects.select_for_update().only("id").get(pk=self.item_id)
+            Item.objects.lock_row(self.item_id)
             transfer = PendingTransfer.objects.select_for_update().get(pk=self.pk)
             if not transfer.is_active:
                 raise ValidationError(_("Transfer is not active"))
+            transfer._cancel_locked()
+
+    def _cancel_locked(self) -> None:
+        """Cancel this (row-locked) transfer; the caller holds the item lock."""
 
-            transfer.cancelled_at = timezone.now()
-            transfer.save(update_fields=["cancelled_at", "updated_at"])
+        self.cancelled_at = timezone.now()
+        self.save(update_fields=["cancelled_at", "updated_at"])
 
     def update_offer(
         self,
@@ -315,7 +527,7 @@ class PendingTransfer(BaseModel):
             raise ValidationError(_("Expiration window must be non-negative"))
 
         with transaction.atomic():
-            Item.objects.select_for_update().only("id").get(pk=self.item_id)
+            Item.objects.lock_row(self.item_id)
             transfer = PendingTransfer.objects.select_for_update().get(pk=self.pk)
 
             if not transfer.is_active:
@@ -346,7 +558,7 @@ class PendingTransfer(BaseModel):
     def is_active(self) -> bool:
         """Return True when the transfer is pending and not expired."""
 
-        if self.accepted_at or self.cancelled_at:
+        if self.accepted_at or self.cancelled_at or self.expired_at:
             return False
         if self.expires_at is not None and timezone.now() >= self.expires_at:
             return False
@@ -0,0 +1,356 @@
+"""
+Delivery of inventory emails recorded in ``NotificationOutbox``.
+
+``inventory.signals`` only writes outbox rows inside the writer's transaction.
+Once it commits, :func:`schedule_outbox_drain` runs :func:`drain_notification_outbox`
+(as a django-q2 task when ``EMAIL_SEND_ASYNC`` is on, inline otherwise). The
+drain claims pending rows with ``SELECT ... FOR UPDATE SKIP LOCKED`` (concurrent
+drains never send the same row twice), loads the operations, transfers and
+recipients they reference with a few bulk queries, renders every email and
+hands the whole batch to the email backend in one call. The rows of a transfer
+batch, like the per-item rows of a stocktake import, become one email per
+recipient. Each email is rendered in the language and time zone that were
+active when its row was written (a django-q2 worker would otherwise use
+``LANGUAGE_CODE`` and ``TIME_ZONE``).
+
+Recipients with ``Responsible.email_digest`` are held back: once their oldest
+pending row is ``NOTIFICATION_DIGEST_INTERVAL_MINUTES`` old, all their rows go
+out as one digest email. A one-off schedule wakes the drain up for the next
+digest when the queue is asynchronous; otherwise the next drain after the
+interval sends it.
+
+Rows are deleted in the transaction that hands their emails over. Delivery
+retries belong to the email layer: with batched asynchronous delivery the
+backend stores the batch as ``common.QueuedEmail`` rows in that same
+transaction (one bulk INSERT), and the queue flush retries failed messages with
+the ``EMAIL_RETRY_*`` backoff. A backend that raises rolls the batch back, so
+its rows stay for the next drain. A row whose object is gone, or whose email
+cannot be rendered, is logged and dropped so it cannot block the queue.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, cast
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import Min, QuerySet
+from django.utils import timezone, translation
+from django.utils.translation import gettext
+from django_q.tasks import async_task
+
+from catalogs.models import Responsible
+from common.email_utils import build_transfer_email
+from common.scheduling import schedule_once
+from inventory.models import NotificationOutbox, Operation, PendingTransfer
+
+logger = logging.getLogger(__name__)
+
+#: Outbox rows claimed, rendered and sent per transaction.
+OUTBOX_DRAIN_BATCH_SIZE = 500
+
+#: Digest recipients whose rows are claimed and sent per transaction.
+DIGEST_RECIPIENTS_PER_BATCH = 50
+
+_DRAIN_TASK = "inventory.notifications.drain_notification_outbox"
+
+_Kind = NotificationOutbox.Kind
+
+#: Batch kinds: one email per recipient listing every transfer of the batch.
+_BATCH_KINDS = frozenset(
+    {
+        _Kind.TRANSFER_BATCH_CREATED,
+        _Kind.TRANSFER_BATCH_ACCEPTED,
+        _Kind.TRANSFER_BATCH_CANCELLED,
+        _Kind.TRANSFER_BATCH_EXPIRED,
+    }
+)
+
+_Target = Operation | PendingTransfer | Responsible
+
+
+def schedule_outbox_drain() -> None:
+    """Drain the outbox after a commit: queue a task, or drain inline."""
+
+    if settings.EMAIL_SEND_ASYNC:
+        async_task(_DRAIN_TASK)
+    else:
+        drain_notification_outbox()
+
+
+def drain_notification_outbox(batch_size: int = OUTBOX_DRAIN_BATCH_SIZE) -> int:
+    """
+    Render and send every pending outbox row; return the number of emails.
+
+    Also safe to run on a schedule as a safety net for rows whose post-commit
+    drain never ran (e.g. the process stopped right after the commit).
+    """
+
+    digest = Responsible.objects.filter(email_digest=True).values("pk")
+    pending = NotificationOutbox.objects.all()
+    sent = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                pending.select_for_update(skip_locked=True)
+                .exclude(recipient_id__in=digest)
+                .order_by("pk")[:batch_size]
+            )
+            if not rows:
+                break
+            sent += _send_and_delete(rows, _render(rows))
+        if len(rows) < batch_size:
+            break
+    return sent + _drain_digests(pending.filter(recipient_id__in=digest))
+
+
+def _drain_digests(pending: QuerySet[NotificationOutbox]) -> int:
+    """Send the digests that are due; schedule a drain for the next one."""
+
+    interval = timedelta(minutes=settings.NOTIFICATION_DIGEST_INTERVAL_MINUTES)
+    cutoff = timezone.now() - interval
+    due: list[int] = []
+    next_oldest = None
+    for recipient_id, oldest in (
+        pending.order_by("recipient_id")
+        .values("recipient_id")
+        .annotate(oldest=Min("created_at"))
+        .values_list("recipient_id", "oldest")
+    ):
+        if oldest <= cutoff:
+            due.append(recipient_id)
+        elif next_oldest is None or oldest < next_oldest:
+            next_oldest = oldest
+
+    sent = 0
+    for start in range(0, len(due), DIGEST_RECIPIENTS_PER_BATCH):
+        chunk = due[start : start + DIGEST_RECIPIENTS_PER_BATCH]
+        with transaction.atomic():
+            rows = list(
+                pending.select_for_update(skip_locked=True)
+                .filter(recipient_id__in=chunk)
+                .order_by("pk")
+            )
+            sent += _send_and_delete(rows, _render_digests(rows))
+
+    if next_oldest is not None and settings.EMAIL_SEND_ASYNC:
+        schedule_once(_DRAIN_TASK, next_oldest + interval)
+    return sent
+
+
+def _send_and_delete(
+    rows: Sequence[NotificationOutbox], messages: list[EmailMessage]
+) -> int:
+    """Hand ``messages`` to the email backend in one call and delete ``rows``."""
+
+    sent = get_connection().send_messages(messages) if messages else 0
+    NotificationOutbox.objects.filter(pk__in=[row.pk for row in rows]).delete()
+    return sent
+
+
+def _load_targets(
+    rows: Sequence[NotificationOutbox],
+) -> tuple[dict[int, Responsible], dict[int, _Target]]:
+    """
+    Bulk-load the recipients and the objects ``rows`` refer to.
+
+    Returns the recipients by pk and each row's object by row pk; rows whose
+    recipient or object is gone are logged and left out.
+    """
+
+    operation_ids = {r.object_id for r in rows if r.kind.startswith("operation_")}
+    transfer_ids = {r.object_id for r in rows if r.kind.startswith("transfer_")}
+    operations = Operation.objects.select_related(
+        "item__device__manufacturer",
+        "item__device__model",
+        "status",
+        "responsible",
+        "location",
+    ).in_bulk(operation_ids)
+    transfers = PendingTransfer.objects.select_related(
+        "item__device__manufacturer",
+        "item__device__model",
+        "from_responsible",
+        "to_responsible",
+    ).in_bulk(transfer_ids)
+    recipients = Responsible.objects.select_related("user").in_bulk(
+        {row.recipient_id for row in rows}
+    )
+
+    targets: dict[int, _Target] = {}
+    for row in rows:
+        lookup: dict[int, Any]
+        if row.kind.startswith("operation_"):
+            lookup = operations
+        elif row.kind.startswith("transfer_"):
+            lookup = transfers
+        else:
+            lookup = recipients
+        target = lookup.get(row.object_id)
+        if row.recipient_id not in recipients or target is None:
+            logger.warning("Dropping notification %s: its object is gone", row)
+            continue
+        targets[row.pk] = target
+    return recipients, targets
+
+
+def _render(rows: Sequence[NotificationOutbox]) -> list[EmailMessage]:
+    """Build one email per row (one per recipient for batch and import kinds)."""
+
+    recipients, targets = _load_targets(rows)
+    messages: list[EmailMessage] = []
+    batches: dict[tuple[str, int], list[Operation | PendingTransfer]] = {}
+    batch_rows: dict[tuple[str, int], NotificationOutbox] = {}
+    for row in rows:
+        target = targets.get(row.pk)
+        if target is None:
+            continue
+        recipient = recipients[row.recipient_id]
+        if row.kind in _BATCH_KINDS or row.kind == _Kind.OPERATION_IMPORTED:
+            batch_target = cast(Operation | PendingTransfer, target)
+            batches.setdefault((row.kind, recipient.pk), []).append(batch_target)
+            # One writer's transaction records a batch, so any row's locale will do.
+            batch_rows.setdefault((row.kind, recipient.pk), row)
+            continue
+        with _row_locale(row):
+            context = _single_context(target, recipient)
+            _collect(messages, row.kind, recipient, context)
+
+    for (kind, recipient_pk), batch in batches.items():
+        batch.sort(key=lambda entry: (entry.item.inventory_number, entry.pk))
+        recipient = recipients[recipient_pk]
+        if kind == _Kind.OPERATION_IMPORTED:
+            # A stocktake import: one summary of the items it assigned.
+            context = {"responsible": recipient, "count": len(batch)}
+        else:
+            context = {"recipient": recipient, "transfers": batch}
+        with _row_locale(batch_rows[(kind, recipient_pk)]):
+            _collect(messages, kind, recipient, context)
+    return messages
+
+
+def _render_digests(rows: Sequence[NotificationOutbox]) -> list[EmailMessage]:
+    """
+    Build one digest email per recipient listing all of their rows.
+
+    A digest is rendered in the language and time zone of its newest row.
+    """
+
+    recipients, targets = _load_targets(rows)
+    pending: dict[int, list[tuple[NotificationOutbox, _Target]]] = {}
+    for row in rows:
+        target = targets.get(row.pk)
+        if target is not None:
+            pending.setdefault(row.recipient_id, []).append((row, target))
+
+    messages: list[EmailMessage] = []
+    for recipient_pk, recipient_rows in pending.items():
+        recipient = recipients[recipient_pk]
+        with _row_locale(recipient_rows[-1][0]):
+            entries = [
+                {"created_at": row.created_at, "summary": _summary(row.kind, target)}
+                for row, target in recipient_rows
+            ]
+            _collect(
+                messages,
+                "notification_digest",
+                recipient,
+                {"recipient": recipient, "entries": entries},
+            )
+    return messages
+
+
+@contextmanager
+def _row_locale(row: NotificationOutbox) -> Iterator[None]:
+    """Activate the language and time zone that were active when ``row`` was written."""
+
+    with (
+        translation.override(row.language or settings.LANGUAGE_CODE),
+        timezone.override(row.time_zone or None),
+    ):
+        yield
+
+
+def _single_context(target: _Target, recipient: Responsible) -> dict[str, Any]:
+    if isinstance(target, Operation):
+        return {"item": target.item, "operation": target, "responsible": recipient}
+    if isinstance(target, Responsible):
+        return {"responsible": target, "user": target.user}
+    # The previous receiver of a re-addressed offer is told about "their" offer.
+    parties = (target.from_responsible_id, target.to_responsible_id)
+    receiver = target.to_responsible if recipient.pk in parties else recipient
+    return {
+        "item": target.item,
+        "sender": target.from_responsible,
+        "receiver": receiver,
+    }
+
+
+def _summary(kind: str, target: _Target) -> str:
+    """One digest line describing an outbox row."""
+
+    if isinstance(target, Responsible):
+        if kind == _Kind.RESPONSIBLE_LINKED:
+            text = gettext('Your account was linked to the profile "%(name)s".')
+        else:
+            text = gettext('Your profile "%(name)s" was updated.')
+        return text % {"name": target}
+    if isinstance(target, Operation):
+        if kind in (_Kind.OPERATION_ASSIGNED, _Kind.OPERATION_IMPORTED):
+            text = gettext("Item %(item)s was assigned to you.")
+        elif kind == _Kind.OPERATION_UNASSIGNED:
+            text = gettext("Item %(item)s is no longer assigned to you.")
+        else:
+            text = gettext("Item %(item)s was updated.")
+        return text % {"item": target.item}
+    if kind in (_Kind.TRANSFER_CREATED, _Kind.TRANSFER_BATCH_CREATED):
+        text = gettext("%(sender)s offered item %(item)s to %(receiver)s.")
+    elif kind in (_Kind.TRANSFER_ACCEPTED, _Kind.TRANSFER_BATCH_ACCEPTED):
+        text = gettext(
+            "The transfer of item %(item)s from %(sender)s to %(receiver)s "
+            "was accepted."
+        )
+    elif kind == _Kind.TRANSFER_BATCH_EXPIRED:
+        text = gettext(
+            "The transfer of item %(item)s from %(sender)s to %(receiver)s "
+            "has expired."
+        )
+    else:
+        text = gettext(
+            "The transfer of item %(item)s from %(sender)s to %(receiver)s "
+            "was cancelled."
+        )
+    return text % {
+        "item": target.item,
+        "sender": target.from_responsible,
+        "receiver": target.to_responsible,
+    }
+
+
+def _collect(
+    messages: list[EmailMessage],
+    kind: str,
+    recipient: Responsible,
+    context: dict[str, Any],
+) -> None:
+    """Render one email into ``messages``; rendering errors are logged and skipped."""
+
+    email = recipient.user.email if recipient.user_id and recipient.user else ""
+    try:
+        message = build_transfer_email(
+            f"emails/{kind}_subject.txt",
+            f"emails/{kind}_body.txt",
+            context,
+            email,
+            html_template=f"emails/{kind}_body.html",
+        )
+    except Exception:
+        logger.exception("Failed to render %s notification for %s", kind, recipient.pk)
+        return
+    if message is not None:
+        messages.append(message)
@@ -1,54 +1,21 @@
-import logging
 from typing import Any
 
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 
-from catalogs.models import Responsible
-from common.email_utils import send_transfer_email
+from catalogs.models import Responsible, responsible_digest_event
+from devices.attributes import Manufacturer, Model
+from devices.models import Device
+from inventory.models.current_state import ItemCurrentState
 from inventory.models.item import Item
 from inventory.models.operation import Operation
-from inventory.models.pending_transfer import PendingTransfer
+from inventory.models.outbox import NotificationOutbox
+from inventory.models.pending_transfer import (
+    PendingTransfer,
+    transfers_batch_processed,
+)
 
-logger = logging.getLogger(__name__)
-
-
-def _responsible_email(responsible: Responsible) -> str:
-    """Return the email address of the user associated with the responsible person."""
-    return responsible.user.email if responsible.user_id and responsible.user else ""
-
-
-def _notify(
-    template_name: str,
-    responsible: Responsible,
-    item: Item,
-    operation: Operation,
-) -> None:
-    """Send an email notification related to an inventory operation."""
-    send_transfer_email(
-        f"emails/operation_{template_name}_subject.txt",
-        f"emails/operation_{template_name}_body.txt",
-        {"item": item, "operation": operation, "responsible": responsible},
-        _responsible_email(responsible),
-        html_template=f"emails/operation_{template_name}_body.html",
-    )
-
-
-def _notify_transfer(
-    template_name: str,
-    item: Item,
-    from_responsible: Responsible,
-    to_responsible: Responsible,
-    recipients: list[str],
-) -> None:
-    """Send an email notification related to a pending item transfer."""
-    send_transfer_email(
-        f"emails/transfer_{template_name}_subject.txt",
-        f"emails/transfer_{template_name}_body.txt",
-        {"item": item, "sender": from_responsible, "receiver": to_responsible},
-        recipients,
-        html_template=f"emails/transfer_{template_name}_body.html",
-    )
+_Kind = NotificationOutbox.Kind
 
 
 @receiver(post_save, sender=Operation)
@@ -59,47 +26,56 @@ def notify_operation_saved(
     **kwargs: Any,
 ) -> None:
     """
-    Handle post-save signal for Operation to send notifications.
+    Handle post-save signal for Operation to queue notifications.
     Notifies responsible persons when they are assigned or unassigned from an item,
-    or when operation details are updated.
+    or when operation details are updated. Only outbox rows are written here, in
+    the saving transaction; ``inventory.notifications`` sends after commit.
+    Operations written by a batch transfer action are covered by the batch email.
     """
-    pre_responsible_id: int | None = getattr(instance, "_pre_save_responsible_id", None)
-    responsible_changed = (
-        pre_responsible_id is not None and pre_responsible_id != instance.responsible_id
-    )
+    if getattr(instance, "_batch_notification", False):
+        return
 
-    try:
-        item = Item.objects.select_related("device__manufacturer", "device__model").get(
-            pk=instance.item_id
+    pre_responsible_id: int | None = getattr(instance, "_pre_save_responsible_id", None)
+    if pre_responsible_id is not None and pre_responsible_id != instance.responsible_id:
+        NotificationOutbox.enqueue_many(
+            [
+                (_Kind.OPERATION_ASSIGNED, instance.pk, instance.responsible_id),
+                (_Kind.OPERATION_UNASSIGNED, instance.pk, pre_responsible_id),
+            ]
         )
-        new_responsible = Responsible.objects.select_related("user").get(
-            pk=instance.responsible_id
+    elif created and pre_responsible_id is None:
+        NotificationOutbox.enqueue(
+            _Kind.OPERATION_ASSIGNED, instance.pk, [instance.responsible_id]
         )
-
-        if created and responsible_changed and pre_responsible_id is not None:
-            _notify("assigned", new_responsible, item, instance)
-            prev_responsible = Responsible.objects.select_related("user").get(
-                pk=pre_responsible_id
-            )
-            _notify("unassigned", prev_responsible, item, instance)
-        elif created and pre_responsible_id is None:
-            _notify("assigned", new_responsible, item, instance)
-        elif created:
-            _notify("updated", new_responsible, item, instance)
-        elif responsible_changed and pre_responsible_id is not None:
-            _notify("assigned", new_responsible, item, instance)
-            prev_responsible = Responsible.objects.select_related("user").get(
-                pk=pre_responsible_id
-            )
-            _notify("unassigned", prev_responsible, item, instance)
-        else:
-            _notify("updated", new_responsible, item, instance)
-    except Exception:
-        logger.exception(
-            "Failed to send operation notification for operation %s", instance.pk
+    else:
+        NotificationOutbox.enqueue(
+            _Kind.OPERATION_UPDATED, instance.pk, [instance.responsible_id]
         )
 
 
+@receiver(post_delete, sender=Operation)
+def refresh_current_state_after_operation_delete(
+    sender: type[Operation],
+    instance: Operation,
+    **kwargs: Any,
+) -> None:
+    """
+    Keep ``ItemCurrentState`` aligned when a journal row is removed.
+
+    Deleting the head cascades to its projection row; recomputing restores the
+    previous operation as head (or leaves no row when the journal is empty).
+    Runs for queryset deletes too (the admin bulk action), unlike ``delete()``.
+    The memoized head of an attached ``Item`` instance is dropped as well.
+    """
+
+    # Same per-item serialization as ``Operation.save()``; the collector already
+    # runs inside a transaction.
+    Item.objects.filter(pk=instance.item_id).lock_rows()
+    ItemCurrentState.refresh_for_item(instance.item_id)
+    if instance._meta.get_field("item").is_cached(instance):
+        instance.item.forget_current_operation()
+
+
 @receiver(post_save, sender=PendingTransfer)
 def notify_transfer_saved(
     sender: type[PendingTransfer],
@@ -108,9 +84,13 @@ def notify_transfer_saved(
     **kwargs: Any,
 ) -> None:
     """
-    Handle post-save signal for PendingTransfer to send notifications.
+    Handle post-save signal for PendingTransfer to queue notifications.
     Notifies both parties when a transfer is created, accepted, or cancelled.
+    Rows of a batch action are skipped (see ``notify_transfers_batch``).
     """
+    if getattr(instance, "_batch_notification", False):
+        return
+
     pre_to_responsible_id: int | None = getattr(
         instance, "_pre_save_to_responsible_id", None
     )
@@ -127,54 +107,91 @@ def notify_transfer_saved(
     if not (created or just_accepted or just_cancelled or receiver_changed):
         return
 
-    try:
-        item = Item.objects.select_related("device__manufacturer", "device__model").get(
-            pk=instance.item_id
-        )
-        from_responsible = Responsible.objects.select_related("user").get(
-            pk=instance.from_responsible_id
+    parties = [instance.from_responsible_id, instance.to_responsible_id]
+    if created:
+        NotificationOutbox.enqueue(
+            _Kind.TRANSFER_CREATED, instance.pk, [instance.to_responsible_id]
         )
-        to_responsible = Responsible.objects.select_related("user").get(
-            pk=instance.to_responsible_id
+    elif receiver_changed:
+        # The previous receiver learns that "their" offer is withdrawn.
+        NotificationOutbox.enqueue_many(
+            [
+                (_Kind.TRANSFER_CANCELLED, instance.pk, pre_to_responsible_id),
+                (_Kind.TRANSFER_CREATED, instance.pk, instance.to_responsible_id),
+            ]
         )
-        from_email = _responsible_email(from_responsible)
-        to_email = _responsible_email(to_responsible)
-
-        if created:
-            _notify_transfer(
-                "created", item, from_responsible, to_responsible, [to_email]
-            )
-        elif receiver_changed and pre_to_responsible_id is not None:
-            old_receiver = Responsible.objects.select_related("user").get(
-                pk=pre_to_responsible_id
-            )
-            _notify_transfer(
-                "cancelled",
-                item,
-                from_responsible,
-                old_receiver,
-                [_responsible_email(old_receiver)],
-            )
-            _notify_transfer(
-                "created", item, from_responsible, to_responsible, [to_email]
-            )
-        elif just_accepted:
-            _notify_transfer(
-                "accepted",
-                item,
-                from_responsible,
-                to_responsible,
-                [from_email, to_email],
-            )
-        else:
-            _notify_transfer(
-                "cancelled",
-                item,
-                from_responsible,
-                to_responsible,
-                [from_email, to_email],
-            )
-    except Exception:
-        logger.exception(
-            "Failed to send transfer notification for transfer %s", instance.pk
+    elif just_accepted:
+        NotificationOutbox.enqueue(_Kind.TRANSFER_ACCEPTED, instance.pk, parties)
+    else:
+        NotificationOutbox.enqueue(_Kind.TRANSFER_CANCELLED, instance.pk, parties)
+
+
+@receiver(transfers_batch_processed, sender=PendingTransfer)
+def notify_transfers_batch(
+    sender: type[PendingTransfer],
+    action: str,
+    transfers: list[PendingTransfer],
+    **kwargs: Any,
+) -> None:
+    """
+    Queue one aggregated email per recipient for a batch transfer action.
+
+    Created offers notify the receiver; accepted, cancelled and expired offers
+    notify both parties, as the per-offer notifications do. The outbox drain groups
+    the rows so each recipient gets the list of offers that concern them.
+    """
+    kind = f"transfer_batch_{action}"
+    NotificationOutbox.enqueue_many(
+        (kind, transfer.pk, party_id)
+        for transfer in transfers
+        for party_id in (
+            [transfer.to_responsible_id]
+            if action == "created"
+            else [transfer.from_responsible_id, transfer.to_responsible_id]
         )
+    )
+
+
+@receiver(responsible_digest_event, sender=Responsible)
+def queue_responsible_digest_event(
+    sender: type[Responsible],
+    responsible: Responsible,
+    event: str,
+    **kwargs: Any,
+) -> None:
+    """Queue a profile change for the responsible's digest (``catalogs.signals``)."""
+    NotificationOutbox.enqueue(f"responsible_{event}", responsible.pk, [responsible.pk])
+
+
+@receiver(post_save, sender=Device)
+def refresh_item_search_text_after_device_save(
+    sender: type[Device],
+    instance: Device,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """Re-point ``Item.search_text`` when a device changes manufacturer or model."""
+
+    if not created:
+        Item.objects.filter(device_id=instance.pk).refresh_search_text()
+
+
+@receiver(post_save, sender=Manufacturer)
+@receiver(post_save, sender=Model)
+def refresh_item_search_text_after_catalog_rename(
+    sender: type[Manufacturer] | type[Model],
+    instance: Manufacturer | Model,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    """
+    Keep ``Item.search_text`` in sync with manufacturer and model names.
+
+    One bounded ``UPDATE`` over the items of the affected devices; new catalog
+    rows have no items yet.
+    """
+
+    if created:
+        return
+    lookup = "manufacturer" if sender is Manufacturer else "model"
+    Item.objects.filter(**{f"device__{lookup}_id": instance.pk}).refresh_search_text()
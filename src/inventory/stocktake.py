@@ -0,0 +1,338 @@
+"""
+Bulk import of an initial stocktake: items plus their first ``Operation``.
+
+``Item.save()`` and ``Operation.save()`` lock, validate, look up the previous
+head and send a notification per row, which is right for interactive edits and
+far too slow for loading a whole inventory. This pipeline instead:
+
+- streams rows from CSV or JSONL (:func:`read_stocktake_rows`);
+- resolves device, status, responsible and location against catalog maps loaded
+  once per import (:class:`StocktakeCatalog`), so validation issues no queries
+  per row;
+- writes each batch with ``bulk_create`` (items, operations and their
+  ``ItemCurrentState`` rows) in one transaction;
+- skips per-row ``post_save`` notifications and instead records one
+  ``NotificationOutbox`` row per item in the batch's transaction, which the
+  drain sends as one summary email per responsible (or digest lines);
+- reports rejected rows by line number instead of stopping.
+
+Row columns: ``inventory_number``, ``serial_number`` (optional), ``notes``
+(optional), ``category``, ``type``, ``manufacturer``, ``model`` (device by
+catalog names), ``status`` (name), ``responsible`` (``Responsible.employee_id``)
+and ``location`` (a global location name, or one of the responsible's personal
+locations).
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import time
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, transaction
+
+from catalogs.models import Location, Responsible, Status
+from devices.models import Device
+from inventory.models import Item, ItemCurrentState, NotificationOutbox, Operation
+
+#: Rows validated and written per transaction by :func:`import_stocktake`.
+STOCKTAKE_BATCH_SIZE = 1000
+
+STOCKTAKE_FORMATS = ("csv", "jsonl")
+
+#: Columns every row must provide (``serial_number`` and ``notes`` may be empty).
+STOCKTAKE_REQUIRED_COLUMNS = (
+    "inventory_number",
+    "category",
+    "type",
+    "manufacturer",
+    "model",
+    "status",
+    "responsible",
+    "location",
+)
+
+#: A stocktake row as read from the file: ``(line number, column -> value)``.
+StocktakeRow = tuple[int, dict[str, str]]
+
+
+@dataclass(frozen=True)
+class StocktakeRowError:
+    """A rejected row: source line number and the reason."""
+
+    line: int
+    message: str
+
+
+@dataclass
+class StocktakeReport:
+    """Outcome of :func:`import_stocktake`."""
+
+    rows_read: int = 0
+    items_created: int = 0
+    errors: list[StocktakeRowError] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_read / self.seconds if self.seconds > 0 else 0.0
+
+
+def read_stocktake_rows(
+    path: Path, *, fmt: str | None = None
+) -> Iterator[StocktakeRow]:
+    """
+    Stream rows from a CSV (with header) or JSONL file.
+
+    ``fmt`` defaults to the file extension. Values are stripped strings; a
+    malformed JSONL line is yielded as an empty row so it is reported by line.
+    """
+
+    fmt = fmt or path.suffix.lstrip(".").lower()
+    if fmt not in STOCKTAKE_FORMATS:
+        raise ValueError(f"Unsupported stocktake format: {fmt!r}")
+
+    with path.open(encoding="utf-8", newline="") as handle:
+        if fmt == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, _clean_row(row)
+            return
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except ValueError:
+                data = None
+            yield line_number, _clean_row(data if isinstance(data, dict) else {})
+
+
+def _clean_row(row: dict) -> dict[str, str]:
+    return {
+        str(key).strip(): "" if value is None else str(value).strip()
+        for key, value in row.items()
+        if key is not None
+    }
+
+
+class StocktakeCatalog:
+    """
+    In-memory lookup maps for the catalogs a stocktake row references.
+
+    Loaded once per import (a handful of queries regardless of the row count);
+    catalogs are small next to the inventory itself.
+    """
+
+    def __init__(self) -> None:
+        self.devices: dict[tuple[str, str, str, str], Device] = {
+            (
+                device.category.name,
+                device.type.name,
+                device.manufacturer.name,
+                device.model.name,
+            ): device
+            for device in Device.objects.select_related(
+                "category", "type", "manufacturer", "model"
+            )
+        }
+        self.statuses: dict[str, int] = dict(Status.objects.values_list("name", "id"))
+        employee_ids = Counter(
+            Responsible.objects.exclude(employee_id="").values_list(
+                "employee_id", flat=True
+            )
+        )
+        self.ambiguous_employee_ids = {
+            employee_id for employee_id, count in employee_ids.items() if count > 1
+        }
+        self.responsibles: dict[str, int] = dict(
+            Responsible.objects.exclude(employee_id="").values_list("employee_id", "id")
+        )
+        self.global_locations: dict[str, int] = {}
+        self.personal_locations: dict[tuple[int, str], int] = {}
+        for location in Location.objects.only("name", "responsible_id"):
+            if location.responsible_id is None:
+                self.global_locations[location.name] = location.pk
+            else:
+                key = (location.responsible_id, location.name)
+                self.personal_locations[key] = location.pk
+
+    def resolve(self, row: dict[str, str]) -> tuple[Item, Operation]:
+        """
+        Build unsaved ``Item`` and ``Operation`` instances for ``row``.
+
+        Raises ``ValidationError`` with a user-facing message for the first
+        problem found.
+        """
+
+        missing = [
+            column for column in STOCKTAKE_REQUIRED_COLUMNS if not row.get(column)
+        ]
+        if missing:
+            raise ValidationError(f"Missing value(s): {', '.join(missing)}")
+
+        device_key = (row["category"], row["type"], row["manufacturer"], row["model"])
+        device = self.devices.get(device_key)
+        if device is None:
+            raise ValidationError(f"Unknown device: {' | '.join(device_key)}")
+
+        status_id = self.statuses.get(row["status"])
+        if status_id is None:
+            raise ValidationError(f"Unknown status: {row['status']}")
+
+        employee_id = row["responsible"]
+        if employee_id in self.ambiguous_employee_ids:
+            raise ValidationError(
+                f"Employee ID {employee_id} matches several responsibles"
+            )
+        responsible_id = self.responsibles.get(employee_id)
+        if responsible_id is None:
+            raise ValidationError(f"Unknown responsible employee ID: {employee_id}")
+
+        location_id = self.personal_locations.get(
+            (responsible_id, row["location"])
+        ) or self.global_locations.get(row["location"])
+        if location_id is None:
+            raise ValidationError(
+                f"Unknown location for this responsible: {row['location']}"
+            )
+
+        item = Item(
+            inventory_number=row["inventory_number"],
+            serial_number=row.get("serial_number", ""),
+            notes=row.get("notes", ""),
+            device=device,
+        )
+        item.clean_fields(exclude=["device", "search_text"])
+        item.search_text = item.build_search_text()
+        operation = Operation(
+            status_id=status_id,
+            responsible_id=responsible_id,
+            location_id=location_id,
+        )
+        return item, operation
+
+
+def import_stocktake(
+    rows: Iterable[StocktakeRow],
+    *,
+    batch_size: int = STOCKTAKE_BATCH_SIZE,
+    dry_run: bool = False,
+    notify: bool = True,
+) -> StocktakeReport:
+    """
+    Validate and insert stocktake ``rows`` in batches; return a report.
+
+    Each batch is written in its own transaction, so a rejected row never
+    blocks the rest of the file and an interrupted import keeps the batches
+    already committed (re-running reports those rows as already existing).
+    With ``dry_run`` rows are validated but nothing is written or sent; with
+    ``notify`` off no notification rows are written.
+    """
+
+    started = time.perf_counter()
+    report = StocktakeReport()
+    catalog = StocktakeCatalog()
+    seen_numbers: set[str] = set()
+
+    iterator = iter(rows)
+    while batch := list(islice(iterator, batch_size)):
+        report.rows_read += len(batch)
+        resolved = _resolve_batch(batch, catalog, seen_numbers, report)
+        if dry_run or not resolved:
+            continue
+        try:
+            _write_batch(resolved, notify=notify)
+        except DatabaseError as exc:
+            # E.g. a concurrent insert of the same inventory number.
+            report.errors.extend(
+                StocktakeRowError(line, f"Batch rejected by the database: {exc}")
+                for line, _item, _operation in resolved
+            )
+            continue
+        report.items_created += len(resolved)
+
+    report.errors.sort(key=lambda error: error.line)
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+def _resolve_batch(
+    batch: list[StocktakeRow],
+    catalog: StocktakeCatalog,
+    seen_numbers: set[str],
+    report: StocktakeReport,
+) -> list[tuple[int, Item, Operation]]:
+    """Validate ``batch``; record errors and return rows ready to insert."""
+
+    numbers = [row.get("inventory_number", "") for _line, row in batch]
+    existing = set(
+        Item.objects.filter(inventory_number__in=numbers).values_list(
+            "inventory_number", flat=True
+        )
+    )
+    resolved: list[tuple[int, Item, Operation]] = []
+    for line, row in batch:
+        number = row.get("inventory_number", "")
+        if number in existing:
+            report.errors.append(StocktakeRowError(line, f"Item {number} exists"))
+            continue
+        if number in seen_numbers:
+            report.errors.append(
+                StocktakeRowError(line, f"Duplicate inventory number {number}")
+            )
+            continue
+        try:
+            item, operation = catalog.resolve(row)
+        except ValidationError as exc:
+            report.errors.append(StocktakeRowError(line, "; ".join(exc.messages)))
+            continue
+        seen_numbers.add(number)
+        resolved.append((line, item, operation))
+    return resolved
+
+
+def _write_batch(
+    resolved: list[tuple[int, Item, Operation]], *, notify: bool = True
+) -> None:
+    """
+    Insert items, their first operations and projection rows in one transaction.
+
+    ``bulk_create`` sends no ``post_save``, so no per-row notification goes out;
+    with ``notify`` each operation gets an ``operation_imported`` outbox row in
+    the same transaction instead. New items have no other writers yet, so no
+    row locks are needed.
+    """
+
+    with transaction.atomic():
+        items = Item.objects.bulk_create([item for _line, item, _op in resolved])
+        operations = [operation for _line, _item, operation in resolved]
+        for item, operation in zip(items, operations, strict=True):
+            operation.item = item
+        Operation.objects.bulk_create(operations)
+        ItemCurrentState.objects.bulk_create(
+            ItemCurrentState(
+                item_id=operation.item_id,
+                operation_id=operation.pk,
+                status_id=operation.status_id,
+                responsible_id=operation.responsible_id,
+                location_id=operation.location_id,
+                head_created_at=operation.created_at,
+            )
+            for operation in operations
+        )
+        if notify:
+            NotificationOutbox.enqueue_many(
+                (
+                    NotificationOutbox.Kind.OPERATION_IMPORTED,
+                    operation.pk,
+                    operation.responsible_id,
+                )
+                for operation in operations
+            )
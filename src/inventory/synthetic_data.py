@@ -0,0 +1,433 @@
+"""
+Deterministic synthetic inventory for benchmarks and EXPLAIN sessions.
+
+:func:`generate_dataset` creates catalog rows (statuses, device attributes,
+devices, global and personal locations), responsibles, some of them linked to
+login users, items with operation journals, and transfer offers. Offers are
+active, accepted (one per recorded handoff) or expired. Every row is written
+with ``bulk_create`` in batches of :data:`SYNTHETIC_BATCH_SIZE` items per
+transaction, so nothing goes through ``save()``:
+
+- no ``post_save`` signal fires, so no notification or outbox row is written;
+- no item row lock is taken and no journal head is looked up per row; the
+  ``ItemCurrentState`` projection and ``Item.search_text`` are computed here;
+- ``created_at`` / ``updated_at`` of items, operations and offers are spread
+  over ``SyntheticSpec.days`` instead of all being "now".
+
+The same :class:`SyntheticSpec` (including ``seed``) always yields the same
+rows, with timestamps relative to the time of the run. Generated rows carry the
+:data:`SYNTHETIC_PREFIX` in their names and numbers; generation refuses to run
+twice on the same database.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections import Counter
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from catalogs.models import Location, Responsible, Status
+from common.models import NamedModel
+from devices.attributes import Category, Manufacturer, Model, Type
+from devices.models import Device
+from inventory.models import Item, ItemCurrentState, Operation, PendingTransfer
+
+#: Marks generated rows (names, inventory and employee numbers, usernames).
+SYNTHETIC_PREFIX = "SYN"
+
+#: Items (with their journals and offers) written per transaction.
+SYNTHETIC_BATCH_SIZE = 2000
+
+
+@dataclass(frozen=True)
+class SyntheticSpec:
+    """What :func:`generate_dataset` creates; every count is a row count."""
+
+    responsibles: int = 100
+    items: int = 1000
+    #: Operations per item are drawn from ``[min_operations, max_operations]``.
+    min_operations: int = 1
+    max_operations: int = 10
+    #: 0 draws journal lengths uniformly; higher values favour short journals,
+    #: leaving a long tail of busy items.
+    operations_skew: float = 1.0
+    #: Share of later operations that hand the item to another responsible.
+    handoff_ratio: float = 0.3
+    #: Share of handoffs recorded as an accepted transfer offer.
+    accepted_transfers: float = 0.5
+    #: Share of items with an open offer, and with an offer that expired.
+    active_transfers: float = 0.05
+    expired_transfers: float = 0.05
+    users: int = 10
+    statuses: int = 5
+    devices: int = 50
+    global_locations: int = 5
+    locations_per_responsible: int = 2
+    #: Journals start up to this many days ago.
+    days: int = 730
+    seed: int = 0
+
+    def validate(self) -> list[str]:
+        """Return a message per invalid setting (empty when the spec is usable)."""
+
+        errors = [
+            f"{name} must be positive"
+            for name in ("responsibles", "statuses", "devices", "days")
+            if getattr(self, name) < 1
+        ]
+        if self.responsibles < 2:
+            errors.append("responsibles must be at least 2 for handoffs")
+        errors += [
+            f"{name} must not be negative"
+            for name in (
+                "items",
+                "users",
+                "global_locations",
+                "locations_per_responsible",
+                "operations_skew",
+            )
+            if getattr(self, name) < 0
+        ]
+        if not 1 <= self.min_operations <= self.max_operations:
+            errors.append("operations need 1 <= min_operations <= max_operations")
+        if self.users > self.responsibles:
+            errors.append("users must not exceed responsibles")
+        errors += [
+            f"{name} must be between 0 and 1"
+            for name in ("handoff_ratio", "accepted_transfers")
+            if not 0 <= getattr(self, name) <= 1
+        ]
+        if not (
+            0 <= self.active_transfers
+            and 0 <= self.expired_transfers
+            and self.active_transfers + self.expired_transfers <= 1
+        ):
+            errors.append(
+                "active_transfers and expired_transfers must be non-negative "
+                "and add up to at most 1"
+            )
+        return errors
+
+
+@dataclass
+class SyntheticReport:
+    """Rows written per model (``app_label.ModelName``) and the elapsed time."""
+
+    rows: Counter[str] = field(default_factory=Counter)
+    seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return sum(self.rows.values()) / self.seconds if self.seconds else 0.0
+
+
+def synthetic_data_exists() -> bool:
+    """True when a previous run left its items behind."""
+
+    return Item.objects.filter(inventory_number__startswith=SYNTHETIC_PREFIX).exists()
+
+
+@contextmanager
+def _explicit_timestamps(*model_classes: type[models.Model]) -> Iterator[None]:
+    """
+    Let ``bulk_create`` keep the given ``created_at`` / ``updated_at`` values.
+
+    ``auto_now`` and ``auto_now_add`` would overwrite them with the current
+    time. The flags are restored on exit; the command runs in its own process.
+    """
+
+    fields = [
+        model_field
+        for model_class in model_classes
+        for model_field in model_class._meta.concrete_fields
+        if isinstance(model_field, models.DateTimeField)
+        and (model_field.auto_now or model_field.auto_now_add)
+    ]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for model_field in fields:
+        model_field.auto_now = model_field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for model_field, auto_now, auto_now_add in saved:
+            model_field.auto_now = auto_now
+            model_field.auto_now_add = auto_now_add
+
+
+def _named_rows(model_class: type[NamedModel], label: str, count: int) -> list[int]:
+    return [
+        row.pk
+        for row in model_class._default_manager.bulk_create(
+            model_class(name=f"{SYNTHETIC_PREFIX} {label} {n}") for n in range(count)
+        )
+    ]
+
+
+class _Catalog:
+    """Catalog and responsible rows the journals draw from."""
+
+    def __init__(self, spec: SyntheticSpec, rng: random.Random) -> None:
+        prefix = SYNTHETIC_PREFIX
+        self.statuses = _named_rows(Status, "status", spec.statuses)
+        attribute_count = max(1, spec.devices // 10)
+        categories = _named_rows(Category, "category", attribute_count)
+        types = _named_rows(Type, "type", attribute_count)
+        manufacturers = _named_rows(Manufacturer, "manufacturer", attribute_count)
+        # One model per device keeps (category, type, manufacturer, model) unique.
+        device_models = _named_rows(Model, "model", spec.devices)
+        devices = Device.objects.bulk_create(
+            Device(
+                category_id=rng.choice(categories),
+                type_id=rng.choice(types),
+                manufacturer_id=rng.choice(manufacturers),
+                model_id=model_id,
+            )
+            for model_id in device_models
+        )
+        # ``Item.build_search_text`` reads the manufacturer and model names.
+        self.devices = list(
+            Device.objects.select_related("manufacturer", "model")
+            .filter(pk__in=[device.pk for device in devices])
+            .order_by("pk")
+        )
+
+        users = User.objects.bulk_create(
+            User(
+                username=f"{prefix.lower()}-user-{n:06d}",
+                email=f"{prefix.lower()}-user-{n:06d}@example.com",
+                # Unusable, so no hashing cost; set one with ``changepassword``.
+                password=make_password(None),
+            )
+            for n in range(spec.users)
+        )
+        self.responsibles = [
+            responsible.pk
+            for responsible in Responsible.objects.bulk_create(
+                Responsible(
+                    last_name=f"{prefix} Responsible {n:06d}",
+                    first_name="Synthetic",
+                    employee_id=f"{prefix}-{n:06d}",
+                    user=users[n] if n < len(users) else None,
+                )
+                for n in range(spec.responsibles)
+            )
+        ]
+
+        self.on_hand = Location.on_hand_id()
+        self.global_locations = [self.on_hand] + [
+            location.pk
+            for location in Location.objects.bulk_create(
+                Location(name=f"{prefix} warehouse {n}")
+                for n in range(spec.global_locations)
+            )
+        ]
+        self.personal_locations: dict[int, list[int]] = {}
+        for location in Location.objects.bulk_create(
+            Location(name=f"{prefix} desk {n}", responsible_id=responsible_id)
+            for responsible_id in self.responsibles
+            for n in range(spec.locations_per_responsible)
+        ):
+            self.personal_locations.setdefault(
+                location.responsible_id, []  # type: ignore[arg-type]
+            ).append(location.pk)
+
+
+class _Generator:
+    """Builds one batch of items with their journals, offers and projection."""
+
+    def __init__(self, spec: SyntheticSpec, catalog: _Catalog) -> None:
+        self.spec = spec
+        self.catalog = catalog
+        self.rng = random.Random(spec.seed)  # nosec B311 — seeded data, not security
+        self.now = timezone.now()
+        self.start = self.now - timedelta(days=spec.days)
+
+    def _other(self, responsible_id: int) -> int:
+        candidates = self.catalog.responsibles
+        while True:
+            other = self.rng.choice(candidates)
+            if other != responsible_id:
+                return other
+
+    def _journal_length(self) -> int:
+        spec = self.spec
+        span = spec.max_operations - spec.min_operations + 1
+        draw = self.rng.random() ** (1 + spec.operations_skew)
+        return min(spec.max_operations, spec.min_operations + int(span * draw))
+
+    def _location(self, responsible_id: int) -> int:
+        personal = self.catalog.personal_locations.get(responsible_id, [])
+        return self.rng.choice(personal + self.catalog.global_locations)
+
+    def batch(
+        self, first: int, count: int
+    ) -> tuple[list[Item], list[list[Operation]], list[list[PendingTransfer]]]:
+        """Unsaved items ``first..first+count-1`` with their operations and offers."""
+
+        rng, spec, catalog = self.rng, self.spec, self.catalog
+        span = (self.now - self.start).total_seconds()
+        items: list[Item] = []
+        journals: list[list[Operation]] = []
+        offers: list[list[PendingTransfer]] = []
+        for number in range(first, first + count):
+            device = rng.choice(catalog.devices)
+            began = self.start + timedelta(seconds=rng.random() * span * 0.9)
+            remaining = (self.now - began).total_seconds()
+            length = self._journal_length()
+            times = sorted(
+                began + timedelta(seconds=rng.random() * remaining)
+                for _ in range(length)
+            )
+            item = Item(
+                inventory_number=f"{SYNTHETIC_PREFIX}-{number:09d}",
+                serial_number=f"SN{rng.getrandbits(40):012X}",
+                device=device,
+                created_at=began,
+                updated_at=began,
+            )
+            item.search_text = item.build_search_text()
+
+            journal: list[Operation] = []
+            item_offers: list[PendingTransfer] = []
+            holder = rng.choice(catalog.responsibles)
+            for index, created_at in enumerate(times):
+                location = self._location(holder)
+                if index and rng.random() < spec.handoff_ratio:
+                    receiver = self._other(holder)
+                    if rng.random() < spec.accepted_transfers:
+                        offered_at = max(
+                            journal[-1].created_at,
+                            created_at - timedelta(hours=rng.uniform(1, 72)),
+                        )
+                        item_offers.append(
+                            PendingTransfer(
+                                from_responsible_id=holder,
+                                to_responsible_id=receiver,
+                                created_at=offered_at,
+                                updated_at=created_at,
+                                accepted_at=created_at,
+                            )
+                        )
+                        # An accepted offer hands the item over "on hand".
+                        location = catalog.on_hand
+                    else:
+                        location = self._location(receiver)
+                    holder = receiver
+                journal.append(
+                    Operation(
+                        status_id=rng.choice(catalog.statuses),
+                        responsible_id=holder,
+                        location_id=location,
+                        created_at=created_at,
+                        updated_at=created_at,
+                    )
+                )
+
+            draw = rng.random()
+            if draw < spec.active_transfers + spec.expired_transfers:
+                offered_at = max(
+                    times[-1], self.now - timedelta(hours=rng.uniform(1, 96))
+                )
+                offer = PendingTransfer(
+                    from_responsible_id=holder,
+                    to_responsible_id=self._other(holder),
+                    created_at=offered_at,
+                    updated_at=offered_at,
+                    expires_at=self.now + timedelta(days=7),
+                )
+                if draw >= spec.active_transfers:
+                    # Closed by an earlier expiry sweep.
+                    offer.expires_at = offer.updated_at = offer.expired_at = (
+                        offered_at
+                        + timedelta(
+                            seconds=rng.random()
+                            * (self.now - offered_at).total_seconds()
+                        )
+                    )
+                item_offers.append(offer)
+            items.append(item)
+            journals.append(journal)
+            offers.append(item_offers)
+        return items, journals, offers
+
+
+def _write_batch(
+    items: list[Item],
+    journals: list[list[Operation]],
+    offers: list[list[PendingTransfer]],
+    report: SyntheticReport,
+) -> None:
+    with transaction.atomic():
+        Item.objects.bulk_create(items)
+        for item, journal, item_offers in zip(items, journals, offers, strict=True):
+            for operation in journal:
+                operation.item = item
+            for offer in item_offers:
+                offer.item = item
+        operations = Operation.objects.bulk_create(
+            [operation for journal in journals for operation in journal]
+        )
+        ItemCurrentState.objects.bulk_create(
+            ItemCurrentState(
+                item_id=head.item_id,
+                operation_id=head.pk,
+                status_id=head.status_id,
+                responsible_id=head.responsible_id,
+                location_id=head.location_id,
+                head_created_at=head.created_at,
+            )
+            for head in (journal[-1] for journal in journals)
+        )
+        transfers = PendingTransfer.objects.bulk_create(
+            [offer for item_offers in offers for offer in item_offers]
+        )
+    report.rows["inventory.Item"] += len(items)
+    report.rows["inventory.Operation"] += len(operations)
+    report.rows["inventory.ItemCurrentState"] += len(items)
+    report.rows["inventory.PendingTransfer"] += len(transfers)
+
+
+def generate_dataset(
+    spec: SyntheticSpec, *, batch_size: int = SYNTHETIC_BATCH_SIZE
+) -> SyntheticReport:
+    """
+    Write the dataset described by ``spec``; return the rows written per model.
+
+    Catalog rows go in one transaction, then each batch of items in its own.
+    Planner statistics of the written tables are refreshed at the end.
+    """
+
+    started = time.perf_counter()
+    report = SyntheticReport()
+    with transaction.atomic():
+        rng = random.Random(spec.seed)  # nosec B311 — seeded data, not security
+        catalog = _Catalog(spec, rng)
+    report.rows["catalogs.Responsible"] = len(catalog.responsibles)
+    report.rows["auth.User"] = spec.users
+    report.rows["catalogs.Location"] = spec.global_locations + sum(
+        len(locations) for locations in catalog.personal_locations.values()
+    )
+    report.rows["devices.Device"] = len(catalog.devices)
+
+    generator = _Generator(spec, catalog)
+    with _explicit_timestamps(Item, Operation, PendingTransfer):
+        for first in range(0, spec.items, batch_size):
+            _write_batch(
+                *generator.batch(first, min(batch_size, spec.items - first)), report
+            )
+
+    with connection.cursor() as cursor:
+        for model_class in (Item, Operation, ItemCurrentState, PendingTransfer):
+            table = connection.ops.quote_name(model_class._meta.db_table)
+            cursor.execute(f"ANALYZE {table}")  # nosec B608 — model table names
+    report.seconds = time.perf_counter() - started
+    return report
@@ -400,6 +400,110 @@ def test_item_admin_queryset_is_select_related() -> None:
     assert "device" in qs.query.select_related
 
 
+@pytest.mark.django_db
+def test_item_admin_search_matches_device_category_and_type(
+    inventory_test_device,
+) -> None:
+    """
+    Admin search covers ``search_text``, notes and the device category/type;
+    every word must match somewhere.
+    """
+
+    other_device = Device.objects.create(
+        category=Category.objects.create(name="Monitors"),
+        type=Type.objects.create(name="Display"),
+        manufacturer=inventory_test_device.manufacturer,
+        model=Model.objects.create(name="View 27"),
+    )
+    laptop = Item.objects.create(
+        inventory_number="INV-ADM-SRCH-1", device=inventory_test_device
+    )
+    monitor = Item.objects.create(
+        inventory_number="INV-ADM-SRCH-2", device=other_device, notes="desk 4"
+    )
+    model_admin = ItemAdmin(Item, AdminSite())
+    request = RequestFactory().get("/")
+
+    def search(term: str) -> list[str]:
+        qs, may_have_duplicates = model_admin.get_search_results(
+            request, Item.objects.all(), term
+        )
+        assert may_have_duplicates is False
+        return sorted(item.inventory_number for item in qs)
+
+    assert search("Laptops") == [laptop.inventory_number]
+    assert search("display") == [monitor.inventory_number]
+    assert search("acme srch") == [laptop.inventory_number, monitor.inventory_number]
+    assert search('"desk 4" monitors') == [monitor.inventory_number]
+    assert search("laptops desk") == []
+    assert search("") == [laptop.inventory_number, monitor.inventory_number]
+
+
+@pytest.mark.django_db
+def test_item_admin_changelist_current_columns_constant_queries(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """
+    Current responsible/location/status columns, their sorting and filters must
+    not add per-row queries to the changelist.
+    """
+
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    alpha = Responsible.objects.create(last_name="Alpha", first_name="A")
+    omega = Responsible.objects.create(last_name="Omega", first_name="O")
+    Item.objects.create(inventory_number="INV-ADM-NOOPS", device=inventory_test_device)
+
+    def add_items(count: int, offset: int) -> None:
+        for i in range(offset, offset + count):
+            item = Item.objects.create(
+                inventory_number=f"INV-ADM-{i:02d}", device=inventory_test_device
+            )
+            Operation.objects.create(
+                item=item,
+                status=status,
+                responsible=alpha if i % 2 else omega,
+                location=location if i % 2 else Location.on_hand(),
+            )
+
+    client = Client()
+    client.force_login(
+        get_user_model().objects.create_superuser(
+            username="admin-cols", email="admin-cols@example.com", password="pw"
+        )
+    )
+    url = reverse("admin:inventory_item_changelist")
+
+    add_items(2, 0)
+    with CaptureQueriesContext(connection) as small:
+        response = client.get(url)
+    assert response.status_code == 200
+
+    add_items(6, 2)
+    with CaptureQueriesContext(connection) as large:
+        response = client.get(url)
+    assert response.status_code == 200
+    assert len(large.captured_queries) == len(small.captured_queries)
+    content = response.content.decode()
+    assert "Alpha A" in content
+    assert "Moscow (Common)" in content
+
+    # ``list_display[3]`` is ``current_responsible``: sorted by last name in SQL.
+    response = client.get(url, {"o": "3"})
+    numbers = [row.inventory_number for row in response.context["cl"].result_list]
+    assert numbers.index("INV-ADM-01") < numbers.index("INV-ADM-00")
+
+    response = client.get(url, {"current_state__responsible__id__exact": omega.pk})
+    numbers = [row.inventory_number for row in response.context["cl"].result_list]
+    assert sorted(numbers) == ["INV-ADM-00", "INV-ADM-02", "INV-ADM-04", "INV-ADM-06"]
+
+    response = client.get(url, {"current_state__location__id__exact": location.pk})
+    assert response.context["cl"].result_count == 4
+
+
 @pytest.mark.django_db
 def test_operation_admin_queryset_is_select_related() -> None:
     """OperationAdmin queryset must use select_related for performance."""
@@ -0,0 +1,340 @@
+"""
+Query-count and latency budgets for the inventory pages and write paths.
+
+Skipped unless ``INVENTORY_BENCHMARK=1`` (``make bench`` / ``make bench-sqlite``).
+Each scale in ``BENCHMARK_SCALES`` (default ``small,medium``) is generated once
+with ``inventory.synthetic_data`` and rolled back afterwards. Every scenario runs
+one warm-up round and ``BENCHMARK_ROUNDS`` timed rounds; write scenarios roll
+each round back so rounds see the same data.
+
+Results (query count, p50 and p95 in milliseconds per scenario and scale) are
+written to ``BENCHMARK_OUTPUT`` (default ``benchmark-results.json``). A
+scenario fails when it issues more queries than its budget in
+``benchmark_budgets.json`` or, where the budget has a latency for the scale,
+when p95 exceeds it times ``BENCHMARK_LATENCY_FACTOR`` (default 1).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import statistics
+import time
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.db import connection, transaction
+from django.db.models import Count
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from catalogs.models import Location, Responsible
+from inventory.models import (
+    Item,
+    ItemCurrentState,
+    Operation,
+    PendingTransfer,
+    build_my_items_page_data,
+    build_previous_items_page_data,
+    resolve_item_history_context,
+)
+from inventory.synthetic_data import SyntheticSpec, generate_dataset
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+SCALES = {
+    "small": SyntheticSpec(responsibles=20, items=500, users=20, max_operations=10),
+    "medium": SyntheticSpec(responsibles=100, items=5000, users=100, max_operations=20),
+    "large": SyntheticSpec(responsibles=500, items=50000, users=500, max_operations=40),
+}
+
+BUDGETS = json.loads(
+    (Path(__file__).with_name("benchmark_budgets.json")).read_text(encoding="utf-8")
+)
+
+
+def _env_scales() -> list[str]:
+    names = os.environ.get("BENCHMARK_SCALES", "small,medium").split(",")
+    return [name.strip() for name in names if name.strip()]
+
+
+@dataclass
+class BenchmarkResult:
+    scenario: str
+    scale: str
+    queries: int
+    p50_ms: float
+    p95_ms: float
+    rounds: int
+
+
+@dataclass
+class Dataset:
+    """A generated scale and the rows the scenarios act on."""
+
+    scale: str
+    viewer: Responsible
+    #: Item held by the viewer with the longest journal.
+    item: Item
+    #: Location the viewer may move ``item`` to.
+    other_location: Location
+    #: Item held by someone else, offered to the viewer in each round.
+    incoming_item: Item
+
+
+@pytest.fixture(autouse=True)
+def _set_locale() -> None:
+    """One locale is enough here (overrides the parametrized root fixture)."""
+
+
+@pytest.fixture(scope="module")
+def results() -> Iterator[list[BenchmarkResult]]:
+    collected: list[BenchmarkResult] = []
+    yield collected
+    output = Path(os.environ.get("BENCHMARK_OUTPUT", "benchmark-results.json"))
+    output.write_text(
+        json.dumps(
+            {
+                "database": connection.vendor,
+                "results": [asdict(result) for result in collected],
+            },
+            indent=2,
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture(scope="module", params=_env_scales())
+def dataset(
+    request: pytest.FixtureRequest, django_db_setup: Any, django_db_blocker: Any
+) -> Iterator[Dataset]:
+    scale = request.param
+    with django_db_blocker.unblock(), transaction.atomic():
+        generate_dataset(SCALES[scale])
+        # The ``on_hand`` id is cached on commit, which never comes here; run the
+        # callback so the scenarios take production's warm path. The row itself
+        # is created at migrate time, so the id survives the rollback below.
+        with TestCase.captureOnCommitCallbacks(execute=True):
+            Location.on_hand_id()
+        viewer = _busiest_user_responsible()
+        item = (
+            Item.objects.owned_by(viewer)
+            .annotate(journal=Count("operation"))
+            .order_by("-journal", "pk")
+            .first()
+        )
+        assert item is not None
+        current_location_id = item.current_state.location_id
+        other_location = (
+            Location.objects.available_for_responsible(viewer)
+            .exclude(pk=current_location_id)
+            .order_by("pk")
+            .first()
+        )
+        incoming_item = (
+            Item.objects.exclude(current_state__responsible=viewer)
+            .exclude(pk__in=PendingTransfer.objects.open().values("item_id"))
+            .filter(current_state__isnull=False)
+            .order_by("pk")
+            .first()
+        )
+        assert other_location is not None and incoming_item is not None
+        yield Dataset(scale, viewer, item, other_location, incoming_item)
+        transaction.set_rollback(True)
+    Location.forget_on_hand_id()
+
+
+def _busiest_user_responsible() -> Responsible:
+    """Responsible with a login user who currently holds the most items."""
+
+    row = (
+        ItemCurrentState.objects.filter(responsible__user__isnull=False)
+        .values("responsible_id")
+        .annotate(held=Count("item_id"))
+        .order_by("-held", "responsible_id")
+        .first()
+    )
+    assert row is not None
+    return Responsible.objects.select_related("user").get(pk=row["responsible_id"])
+
+
+def _rounds() -> int:
+    return max(1, int(os.environ.get("BENCHMARK_ROUNDS", "20")))
+
+
+def _measure(
+    scenario: str,
+    dataset: Dataset,
+    results: list[BenchmarkResult],
+    run: Callable[[], object] | None = None,
+    *,
+    prepare: Callable[[], Callable[[], object]] | None = None,
+) -> BenchmarkResult:
+    """
+    Time ``run``, or the callable ``prepare`` returns for each round.
+
+    With ``prepare`` every round runs in a savepoint that is rolled back, and
+    only the returned callable is timed.
+    """
+
+    samples: list[float] = []
+    queries = 0
+    for round_number in range(_rounds() + 1):
+        with transaction.atomic():
+            action = prepare() if prepare is not None else run
+            assert action is not None
+            with CaptureQueriesContext(connection) as captured:
+                started = time.perf_counter()
+                action()
+                elapsed = time.perf_counter() - started
+            if prepare is not None:
+                transaction.set_rollback(True)
+        # Round 0 warms caches (content types, templates).
+        if round_number:
+            samples.append(elapsed * 1000)
+            queries = max(queries, len(captured))
+    p50 = statistics.median(samples)
+    p95 = (
+        statistics.quantiles(samples, n=20, method="inclusive")[-1]
+        if len(samples) > 1
+        else samples[0]
+    )
+    result = BenchmarkResult(
+        scenario, dataset.scale, queries, round(p50, 3), round(p95, 3), len(samples)
+    )
+    results.append(result)
+    _check_budget(result)
+    return result
+
+
+def _check_budget(result: BenchmarkResult) -> None:
+    budget = BUDGETS[result.scenario]
+    assert result.queries <= budget["queries"], (
+        f"{result.scenario} ({result.scale}) issued {result.queries} queries; "
+        f"budget is {budget['queries']}"
+    )
+    p95_budget = budget.get("p95_ms", {}).get(result.scale)
+    if p95_budget is None:
+        return
+    limit = p95_budget * float(os.environ.get("BENCHMARK_LATENCY_FACTOR", "1"))
+    assert result.p95_ms <= limit, (
+        f"{result.scenario} ({result.scale}) p95 {result.p95_ms:.1f} ms; "
+        f"budget is {limit:.1f} ms"
+    )
+
+
+def _offer_to_viewer(dataset: Dataset) -> PendingTransfer:
+    holder_id = ItemCurrentState.objects.get(
+        item_id=dataset.incoming_item.pk
+    ).responsible_id
+    return PendingTransfer.objects.create(
+        item=dataset.incoming_item,
+        from_responsible_id=holder_id,
+        to_responsible=dataset.viewer,
+    )
+
+
+def _client(dataset: Dataset) -> Client:
+    client = Client()
+    client.force_login(dataset.viewer.user)  # type: ignore[arg-type]
+    return client
+
+
+def test_my_items_page_data(dataset: Dataset, results: list[BenchmarkResult]):
+    _measure(
+        "my_items_page_data",
+        dataset,
+        results,
+        lambda: build_my_items_page_data(dataset.viewer, query="", list_kind="").window(
+            ""
+        ),
+    )
+
+
+def test_previous_items_page_data(dataset: Dataset, results: list[BenchmarkResult]):
+    _measure(
+        "previous_items_page_data",
+        dataset,
+        results,
+        lambda: build_previous_items_page_data(dataset.viewer, query="").window(""),
+    )
+
+
+def test_item_history_context(dataset: Dataset, results: list[BenchmarkResult]):
+    _measure(
+        "item_history_context",
+        dataset,
+        results,
+        lambda: resolve_item_history_context(dataset.viewer, dataset.item.pk),
+    )
+
+
+def test_transfer_accept(dataset: Dataset, results: list[BenchmarkResult]):
+    _measure(
+        "transfer_accept",
+        dataset,
+        results,
+        prepare=lambda: _offer_to_viewer(dataset).accept,
+    )
+
+
+def test_item_change_location(dataset: Dataset, results: list[BenchmarkResult]):
+    def prepare() -> Callable[[], Operation]:
+        item = Item.objects.get(pk=dataset.item.pk)
+        return lambda: item.change_location(
+            responsible=dataset.viewer, location=dataset.other_location
+        )
+
+    _measure("item_change_location", dataset, results, prepare=prepare)
+
+
+def test_my_items_view(dataset: Dataset, results: list[BenchmarkResult]):
+    client = _client(dataset)
+    url = reverse("inventory:my-items")
+    _measure("my_items_view", dataset, results, lambda: client.get(url))
+
+
+def test_previous_items_view(dataset: Dataset, results: list[BenchmarkResult]):
+    client = _client(dataset)
+    url = reverse("inventory:previous-items")
+    _measure("previous_items_view", dataset, results, lambda: client.get(url))
+
+
+def test_item_history_view(dataset: Dataset, results: list[BenchmarkResult]):
+    client = _client(dataset)
+    url = reverse("inventory:item-history", kwargs={"item_id": dataset.item.pk})
+    _measure("item_history_view", dataset, results, lambda: client.get(url))
+
+
+def test_change_location_view(dataset: Dataset, results: list[BenchmarkResult]):
+    client = _client(dataset)
+    url = reverse("inventory:change-location", kwargs={"item_id": dataset.item.pk})
+
+    def post() -> None:
+        response = client.post(url, {"location_id": dataset.other_location.pk})
+        assert response.status_code == 302
+
+    _measure("change_location_view", dataset, results, prepare=lambda: post)
+
+
+def test_accept_transfer_view(dataset: Dataset, results: list[BenchmarkResult]):
+    client = _client(dataset)
+
+    def prepare() -> Callable[[], None]:
+        transfer = _offer_to_viewer(dataset)
+        url = reverse("inventory:accept-transfer", kwargs={"transfer_id": transfer.pk})
+        head = Operation.latest_operation_id_for_item(transfer.item_id)
+
+        def post() -> None:
+            response = client.post(url, {"journal_head_operation_id": head})
+            assert response.status_code == 302
+            assert PendingTransfer.objects.get(pk=transfer.pk).accepted_at is not None
+
+        return post
+
+    _measure("accept_transfer_view", dataset, results, prepare=prepare)
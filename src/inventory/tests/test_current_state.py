@@ -0,0 +1,188 @@
+"""
+Tests for the ``ItemCurrentState`` journal-head projection and its command.
+"""
+
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from catalogs.models import Location, Responsible, Status
+from inventory.models import Item, ItemCurrentState, Operation
+
+
+@pytest.mark.django_db
+def test_current_state_follows_operation_writes(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Create, head edits, and head deletes keep the projection on the journal head."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    item = Item.objects.create(
+        inventory_number="INV-CS-1", device=inventory_test_device
+    )
+
+    assert not ItemCurrentState.objects.filter(item=item).exists()
+
+    first = Operation.objects.create(
+        item=item, status=status, responsible=owner, location=location
+    )
+    state = ItemCurrentState.objects.get(item=item)
+    assert state.operation_id == first.pk
+    assert state.responsible_id == owner.pk
+    assert state.head_created_at == first.created_at
+    assert str(state) == f"{item.pk} -> {first.pk}"
+
+    second = Operation.objects.create(
+        item=item, status=status, responsible=other, location=Location.on_hand()
+    )
+    state.refresh_from_db()
+    assert state.operation_id == second.pk
+    assert state.location_id == Location.on_hand().pk
+
+    new_status = Status.objects.create(name="Broken")
+    second.status = new_status
+    second.save()
+    state.refresh_from_db()
+    assert state.status_id == new_status.pk
+
+    second.delete()
+    state.refresh_from_db()
+    assert state.operation_id == first.pk
+    assert state.responsible_id == owner.pk
+
+    Operation.objects.filter(item=item).delete()
+    assert not ItemCurrentState.objects.filter(item=item).exists()
+
+
+@pytest.mark.django_db
+def test_owned_by_reads_projection(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """``owned_by`` joins the projection, so a stale row is what the lists see."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    item = Item.objects.create(
+        inventory_number="INV-CS-2", device=inventory_test_device
+    )
+    Operation.objects.create(
+        item=item, status=status, responsible=owner, location=location
+    )
+
+    assert list(Item.objects.owned_by(owner)) == [item]
+    assert list(Item.objects.owned_by(other)) == []
+
+    ItemCurrentState.objects.filter(item=item).update(responsible=other)
+    assert list(Item.objects.owned_by(other)) == [item]
+
+
+@pytest.mark.django_db
+def test_rebuild_item_current_state_command_verify_and_rebuild(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """``--verify`` reports drift; the default mode rebuilds the table."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    items = [
+        Item.objects.create(
+            inventory_number=f"INV-CS-R{i}", device=inventory_test_device
+        )
+        for i in range(3)
+    ]
+    for item in items:
+        Operation.objects.create(
+            item=item, status=status, responsible=owner, location=location
+        )
+    orphan = Item.objects.create(
+        inventory_number="INV-CS-R9", device=inventory_test_device
+    )
+
+    out = StringIO()
+    call_command("rebuild_item_current_state", "--verify", stdout=out)
+    assert "matches" in out.getvalue()
+
+    # Stale, missing, and orphaned projection rows.
+    ItemCurrentState.objects.filter(item=items[0]).update(responsible=other)
+    ItemCurrentState.objects.filter(item=items[1]).delete()
+    ItemCurrentState.objects.create(
+        item=orphan,
+        operation=Operation.objects.get(item=items[1]),
+        status=status,
+        responsible=owner,
+        location=location,
+        head_created_at=items[1].created_at,
+    )
+
+    with pytest.raises(CommandError) as exc:
+        call_command("rebuild_item_current_state", "--verify")
+    assert "3 item(s)" in str(exc.value)
+
+    out = StringIO()
+    call_command("rebuild_item_current_state", stdout=out)
+    assert "3 item(s)" in out.getvalue()
+    assert list(ItemCurrentState.iter_mismatches()) == []
+    assert set(ItemCurrentState.objects.values_list("responsible_id", flat=True)) == {
+        owner.pk
+    }
+
+
+@pytest.mark.django_db
+def test_rebuild_item_current_state_verify_truncates_report(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Long drift reports list the first ids only."""
+
+    from inventory.management.commands import rebuild_item_current_state
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    for i in range(3):
+        item = Item.objects.create(
+            inventory_number=f"INV-CS-T{i}", device=inventory_test_device
+        )
+        Operation.objects.create(
+            item=item, status=status, responsible=owner, location=location
+        )
+    ItemCurrentState.objects.all().delete()
+
+    with (
+        pytest.MonkeyPatch.context() as mp,
+        pytest.raises(CommandError) as exc,
+    ):
+        mp.setattr(rebuild_item_current_state, "_VERIFY_REPORT_LIMIT", 2)
+        call_command("rebuild_item_current_state", "--verify")
+    assert str(exc.value).endswith(", ...")
+
+
+@pytest.mark.django_db
+def test_rebuild_writes_in_batches(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Batches flush at ``batch_size`` and the remainder is written at the end."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    for i in range(3):
+        item = Item.objects.create(
+            inventory_number=f"INV-CS-B{i}", device=inventory_test_device
+        )
+        Operation.objects.create(
+            item=item, status=status, responsible=owner, location=location
+        )
+
+    assert ItemCurrentState.rebuild(batch_size=2) == 3
+    assert ItemCurrentState.objects.count() == 3
+    # Exact multiple of the batch size: nothing left to flush at the end.
+    assert ItemCurrentState.rebuild(batch_size=3) == 3
@@ -0,0 +1,182 @@
+"""
+Tests for the current-state CSV export (``inventory.export``), its admin view and
+the ``export_inventory`` command.
+"""
+
+import csv
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.translation import gettext as _
+
+from catalogs.models import Location, Responsible
+from inventory.export import (
+    export_headers,
+    inventory_export_queryset,
+    iter_inventory_rows,
+)
+from inventory.models import Item, Operation
+
+
+@pytest.fixture
+def export_items(inventory_test_device, inventory_test_status_location) -> dict:
+    """Two held items (one on hand), plus one item with no journal yet."""
+
+    alice = Responsible.objects.create(
+        last_name="Alice", first_name="Test", middle_name="M", employee_id="E1"
+    )
+    bob = Responsible.objects.create(last_name="Bob", first_name="Test")
+    for number, responsible, location in (
+        ("EX-1", alice, inventory_test_status_location["location"]),
+        ("EX-2", bob, Location.on_hand()),
+    ):
+        Operation.objects.create(
+            item=Item.objects.create(
+                inventory_number=number,
+                serial_number=f"SN-{number}",
+                device=inventory_test_device,
+            ),
+            status=inventory_test_status_location["status"],
+            responsible=responsible,
+            location=location,
+        )
+    Item.objects.create(inventory_number="EX-0", device=inventory_test_device)
+    return {"alice": alice, "bob": bob}
+
+
+def _read(content: str) -> list[list[str]]:
+    return list(csv.reader(StringIO(content)))
+
+
+@pytest.mark.django_db
+def test_export_rows_join_current_state_in_one_query(export_items) -> None:
+    items = inventory_export_queryset()
+    with CaptureQueriesContext(connection) as queries:
+        rows = list(iter_inventory_rows(items, chunk_size=1))
+
+    assert len(queries.captured_queries) == 1
+    assert [row[0] for row in rows] == ["EX-1", "EX-2", "EX-0"]
+    headers = export_headers()
+    alice_row = dict(zip(headers, rows[0], strict=True))
+    assert alice_row[_("Responsible Person")] == "Alice Test M"
+    assert alice_row[_("Employee ID")] == "E1"
+    assert alice_row[_("Location")] == "Moscow"
+    assert alice_row[_("Model")] == "Model X"
+    assert dict(zip(headers, rows[1], strict=True))[_("Location")] == _("On hand")
+    # No journal yet: empty current-state columns.
+    assert rows[2][6:11] == ["", "", "", "", ""]
+
+    owned = inventory_export_queryset(query="ex-", responsible=export_items["bob"])
+    assert [row[0] for row in iter_inventory_rows(owned)] == ["EX-2"]
+
+
+@pytest.mark.django_db
+def test_export_neutralises_formula_cells(inventory_test_device) -> None:
+    Item.objects.create(
+        inventory_number="=HYPERLINK(1)",
+        serial_number="+SN",
+        notes="@SUM(A1)",
+        device=inventory_test_device,
+    )
+    Item.objects.create(
+        inventory_number="-1", notes="plain - text", device=inventory_test_device
+    )
+
+    rows = list(iter_inventory_rows(inventory_export_queryset()))
+
+    assert [(row[0], row[1], row[-1]) for row in rows] == [
+        ("'=HYPERLINK(1)", "'+SN", "'@SUM(A1)"),
+        ("'-1", "", "plain - text"),
+    ]
+
+
+@pytest.mark.django_db
+def test_admin_export_streams_filtered_csv(export_items) -> None:
+    url = reverse("admin:inventory_item_export")
+    client = Client()
+    client.force_login(
+        get_user_model().objects.create_superuser(
+            username="auditor", email="auditor@example.com", password="pw"
+        )
+    )
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Disposition"].startswith("attachment;")
+    rows = _read(b"".join(response.streaming_content).decode())
+    assert rows[0] == export_headers()
+    assert len(rows) == 4
+
+    response = client.get(
+        url, {"current_state__responsible__id__exact": export_items["alice"].pk}
+    )
+    rows = _read(b"".join(response.streaming_content).decode())
+    assert [row[0] for row in rows[1:]] == ["EX-1"]
+
+    assert (
+        client.get(url, {"current_state__responsible__id__exact": "x"}).status_code
+        == 400
+    )
+
+    changelist = client.get(reverse("admin:inventory_item_changelist"), {"q": "ex"})
+    assert f"{url}?q=ex" in changelist.content.decode()
+
+    staff = get_user_model().objects.create_user(
+        username="no-perms", email="no-perms@example.com", password="pw", is_staff=True
+    )
+    client.force_login(staff)
+    assert client.get(url).status_code == 403
+
+
+@pytest.mark.django_db
+def test_admin_export_matches_the_changelist(export_items) -> None:
+    """Multi-word, category and list-filter searches export the listed rows."""
+
+    client = Client()
+    client.force_login(
+        get_user_model().objects.create_superuser(
+            username="auditor", email="auditor@example.com", password="pw"
+        )
+    )
+    moscow = Location.objects.get(name="Moscow")
+    for params, expected in (
+        ({"q": "ACME laptop"}, {"EX-0", "EX-1", "EX-2"}),
+        ({"q": "laptops"}, {"EX-0", "EX-1", "EX-2"}),
+        ({"q": "EX-2 laptop"}, {"EX-2"}),
+        ({"q": "laptop", "current_state__location__id__exact": moscow.pk}, {"EX-1"}),
+    ):
+        changelist = client.get(reverse("admin:inventory_item_changelist"), params)
+        listed = {
+            item.inventory_number for item in changelist.context_data["cl"].result_list
+        }
+        response = client.get(reverse("admin:inventory_item_export"), params)
+        rows = _read(b"".join(response.streaming_content).decode())
+        assert listed == {row[0] for row in rows[1:]} == expected, params
+
+
+@pytest.mark.django_db
+def test_export_inventory_command_writes_csv(tmp_path, export_items) -> None:
+    out = StringIO()
+    call_command(
+        "export_inventory", "--employee-id", "E1", stdout=out, stderr=StringIO()
+    )
+    assert [row[0] for row in _read(out.getvalue())] == [export_headers()[0], "EX-1"]
+
+    target = tmp_path / "inventory.csv"
+    out = StringIO()
+    call_command("export_inventory", "--output", str(target), stdout=out)
+    assert "Exported 3 item(s)" in out.getvalue()
+    assert len(_read(target.read_text(encoding="utf-8"))) == 4
+
+    with pytest.raises(CommandError, match="matches no responsibles"):
+        call_command("export_inventory", "--employee-id", "E9")
+    with pytest.raises(CommandError, match="must be positive"):
+        call_command("export_inventory", "--chunk-size", "0")
@@ -0,0 +1,296 @@
+"""
+Tests for keyset pagination of My items / Previously held card lists.
+"""
+
+import base64
+from datetime import timedelta
+from typing import Any
+
+import pytest
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from catalogs.models import Responsible
+from inventory.list_pagination import KeysetSection, encode_cursor, paginate_sections
+from inventory.models import (
+    Item,
+    Operation,
+    PendingTransfer,
+    build_my_items_page_data,
+    build_previous_items_page_data,
+)
+
+
+def _owner_with_cards(
+    device: Any, status_location: dict[str, Any]
+) -> tuple[User, Responsible]:
+    """
+    Owner with one incoming offer, four owned items and one outgoing offer.
+
+    Card order on My items: ``INV-IN``, ``INV-P0``..``INV-P3``, ``INV-OUT``.
+    """
+
+    status = status_location["status"]
+    location = status_location["location"]
+    user = User.objects.create_user(
+        username="pager", password="pw", email="pager@example.com"
+    )
+    owner = Responsible.objects.create(last_name="Page", first_name="R", user=user)
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+
+    def make(number: str, responsible: Responsible) -> Item:
+        item = Item.objects.create(inventory_number=number, device=device)
+        Operation.objects.create(
+            item=item, status=status, responsible=responsible, location=location
+        )
+        return item
+
+    for i in range(4):
+        make(f"INV-P{i}", owner)
+    PendingTransfer.objects.create(
+        item=make("INV-IN", other), from_responsible=other, to_responsible=owner
+    )
+    PendingTransfer.objects.create(
+        item=make("INV-OUT", owner), from_responsible=owner, to_responsible=other
+    )
+    return user, owner
+
+
+def _card_numbers(response: Any) -> list[str]:
+    context = response.context
+    return (
+        [t.item.inventory_number for t in context["incoming_transfers"]]
+        + [i.inventory_number for i in context["items"]]
+        + [t.item.inventory_number for t in context["outgoing_transfers"]]
+    )
+
+
+@pytest.mark.django_db
+@override_settings(INVENTORY_LIST_PAGE_SIZE=2)
+def test_my_items_pages_follow_next_links_across_sections(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Next links walk every card once, in order, keeping search and kind params."""
+
+    user, _owner = _owner_with_cards(
+        inventory_test_device, inventory_test_status_location
+    )
+    client = Client()
+    client.force_login(user)
+
+    seen: list[str] = []
+    response = client.get("/", {"q": "INV"})
+    assert response.context["first_page_query"] == ""
+    pages = 0
+    while True:
+        pages += 1
+        seen += _card_numbers(response)
+        next_query = response.context["next_page_query"]
+        if not next_query:
+            break
+        assert "q=INV" in next_query
+        response = client.get("/" + next_query)
+        assert response.context["first_page_query"] == "?q=INV"
+        assert "First page" in response.content.decode()
+
+    assert seen == ["INV-IN", "INV-P0", "INV-P1", "INV-P2", "INV-P3", "INV-OUT"]
+    assert pages == 3
+
+
+@pytest.mark.django_db
+def test_my_items_deep_page_costs_same_as_first(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """A cursor page issues the same bounded queries as the first page."""
+
+    _user, owner = _owner_with_cards(
+        inventory_test_device, inventory_test_status_location
+    )
+    page = build_my_items_page_data(owner, query="", list_kind="owned")
+
+    with CaptureQueriesContext(connection) as first_ctx:
+        first = page.window("", page_size=2)
+    with CaptureQueriesContext(connection) as deep_ctx:
+        deep = page.window(first.next_cursor or "", page_size=2)
+
+    assert [i.inventory_number for i in first.rows["items"]] == ["INV-P0", "INV-P1"]
+    assert [i.inventory_number for i in deep.rows["items"]] == ["INV-P2", "INV-P3"]
+    assert deep.next_cursor is None
+    assert len(deep_ctx.captured_queries) <= len(first_ctx.captured_queries)
+    assert "OFFSET" not in deep_ctx.captured_queries[0]["sql"].upper()
+
+
+@pytest.mark.django_db
+def test_my_items_page_ending_on_section_boundary(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """A full page at a section end links to the next non-empty section only."""
+
+    _user, owner = _owner_with_cards(
+        inventory_test_device, inventory_test_status_location
+    )
+    page = build_my_items_page_data(owner, query="", list_kind="all")
+
+    first = page.window("", page_size=5)
+    assert first.next_cursor == encode_cursor("outgoing_transfers", None)
+    second = page.window(first.next_cursor or "", page_size=5)
+    assert [t.item.inventory_number for t in second.rows["outgoing_transfers"]] == [
+        "INV-OUT"
+    ]
+    assert second.rows["items"] == []
+
+    owned_only = build_my_items_page_data(owner, query="", list_kind="owned")
+    assert owned_only.window("", page_size=4).next_cursor is None
+
+
+@pytest.mark.django_db
+def test_previous_items_paginate_by_last_holding(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Previously held items page by ``last_on_me_created_at`` (newest first)."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    former = Responsible.objects.create(last_name="Form", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    for i in range(3):
+        item = Item.objects.create(
+            inventory_number=f"INV-F{i}", device=inventory_test_device
+        )
+        for responsible in (former, other):
+            Operation.objects.create(
+                item=item, status=status, responsible=responsible, location=location
+            )
+
+    page = build_previous_items_page_data(former, query="")
+    first = page.window("", page_size=2)
+    rest = page.window(first.next_cursor or "", page_size=2)
+
+    assert [i.inventory_number for i in first.rows["items"]] == ["INV-F2", "INV-F1"]
+    assert [i.inventory_number for i in rest.rows["items"]] == ["INV-F0"]
+    assert rest.next_cursor is None
+
+
+@pytest.mark.django_db
+def test_transfer_cards_page_through_sub_millisecond_timestamps(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Offers created within one millisecond are each shown exactly once."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    owner = Responsible.objects.create(last_name="Own", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    base = timezone.now().replace(microsecond=0)
+    expected: list[int] = []
+    for i in range(6):
+        item = Item.objects.create(
+            inventory_number=f"INV-MS{i}", device=inventory_test_device
+        )
+        Operation.objects.create(
+            item=item, status=status, responsible=other, location=location
+        )
+        transfer = PendingTransfer.objects.create(
+            item=item, from_responsible=other, to_responsible=owner
+        )
+        PendingTransfer.objects.filter(pk=transfer.pk).update(
+            created_at=base + timedelta(microseconds=100 * i)
+        )
+        expected.insert(0, transfer.pk)
+
+    page = build_my_items_page_data(owner, query="", list_kind="incoming")
+    seen: list[int] = []
+    cursor = ""
+    while True:
+        window = page.window(cursor, page_size=2)
+        seen += [t.pk for t in window.rows["incoming_transfers"]]
+        if window.next_cursor is None:
+            break
+        cursor = window.next_cursor
+
+    assert seen == expected
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64 !",
+        "bm90IGpzb24",  # "not json"
+        encode_cursor("unknown", None),
+        encode_cursor("items", ["a", "b"]),
+        base64.urlsafe_b64encode(b'["items","INV-P0"]').decode(),
+        encode_cursor("outgoing_transfers", ["not a date", 1]),
+        encode_cursor("outgoing_transfers", ["2024-01-01T00:00:00+00:00", "x"]),
+    ],
+)
+def test_invalid_cursor_restarts_from_first_page(
+    inventory_test_device, inventory_test_status_location, cursor: str
+) -> None:
+    """Edited or stale cursors fall back to the first page instead of failing."""
+
+    _user, owner = _owner_with_cards(
+        inventory_test_device, inventory_test_status_location
+    )
+    page = build_my_items_page_data(owner, query="", list_kind="all")
+
+    window = page.window(cursor, page_size=1)
+
+    assert [t.item.inventory_number for t in window.rows["incoming_transfers"]] == [
+        "INV-IN"
+    ]
+
+
+@pytest.mark.django_db
+def test_paginate_sections_clamps_page_size(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Non-positive page sizes still return one row per page."""
+
+    _owner_with_cards(inventory_test_device, inventory_test_status_location)
+    window = paginate_sections(
+        [KeysetSection("items", Item.objects.all(), ("inventory_number",))],
+        "",
+        page_size=0,
+    )
+
+    assert [i.inventory_number for i in window.rows["items"]] == ["INV-IN"]
+    assert window.next_cursor == encode_cursor("items", ["INV-IN"])
+
+
+def _transfer_cards(owner: Responsible) -> list[PendingTransfer]:
+    page = build_my_items_page_data(owner, query="", list_kind="all")
+    return [*page.incoming_transfers, *page.outgoing_transfers]
+
+
+@pytest.mark.django_db
+def test_transfer_cards_do_not_load_operation_history(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Card queries do not grow with journal length; no operations are fetched."""
+
+    _user, owner = _owner_with_cards(
+        inventory_test_device, inventory_test_status_location
+    )
+    with CaptureQueriesContext(connection) as short_ctx:
+        short = _transfer_cards(owner)
+
+    for transfer in PendingTransfer.objects.select_related("item"):
+        for _ in range(20):
+            Operation.objects.create(
+                item=transfer.item,
+                status=inventory_test_status_location["status"],
+                responsible=transfer.from_responsible,
+                location=inventory_test_status_location["location"],
+            )
+    with CaptureQueriesContext(connection) as long_ctx:
+        cards = _transfer_cards(owner)
+
+    assert len(cards) == len(short) == 2
+    assert len(long_ctx.captured_queries) == len(short_ctx.captured_queries)
+    for card in cards:
+        assert not hasattr(card.item, "_prefetched_objects_cache")
+        assert card.current_location == inventory_test_status_location["location"].name
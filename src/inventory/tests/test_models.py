@@ -4,9 +4,12 @@ from unittest.mock import patch
 import pytest
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
+from django.db import connection, transaction
 from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
+import inventory.models.item as item_models
 from catalogs.models import Location, Responsible, Status
 from devices.attributes import Category, Manufacturer, Model, Type
 from devices.models import Device
@@ -33,6 +36,24 @@ def test_item_display_name_and_str(inventory_test_device) -> None:
     assert str(item) == item.get_display_name()
 
 
+@pytest.mark.django_db
+def test_item_lock_rows_returns_locked_ids_in_order(inventory_test_device) -> None:
+    """Row locks are taken in primary-key order; a missing row raises."""
+    first, second = (
+        Item.objects.create(inventory_number=f"INV-L{n}", device=inventory_test_device)
+        for n in (1, 2)
+    )
+
+    with transaction.atomic():
+        assert Item.objects.filter(pk__in=[second.pk, first.pk]).lock_rows() == [
+            first.pk,
+            second.pk,
+        ]
+        Item.objects.lock_row(first.pk)
+        with pytest.raises(Item.DoesNotExist):
+            Item.objects.lock_row(second.pk + 1000)
+
+
 @pytest.mark.django_db
 def test_item_clean_requires_inventory_number() -> None:
     """Validation must fail if inventory number is empty."""
@@ -527,6 +548,168 @@ def test_operation_default_ordering_and_current_operation_tiebreaker() -> None:
     assert item.current_operation == op2
 
 
+@pytest.mark.django_db
+def test_item_current_operation_is_memoized_until_journal_changes(
+    inventory_test_device, inventory_test_status_location, django_assert_num_queries
+) -> None:
+    """
+    The head and its FKs load once per instance; appends and deletes through the
+    instance, and ``refresh_from_db()``, drop the memo.
+    """
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    responsible = Responsible.objects.create(last_name="Ivanov", first_name="Ivan")
+    item = Item.objects.create(
+        inventory_number="INV-MEMO", device=inventory_test_device
+    )
+    Operation.objects.create(
+        item=item, status=status, responsible=responsible, location=location
+    )
+
+    item = Item.objects.get(pk=item.pk)
+    with django_assert_num_queries(1):
+        assert item.current_status == "In stock"
+        assert item.current_location == "Moscow (Common)"
+        assert item.current_responsible == "Ivanov Ivan"
+    with django_assert_num_queries(0):
+        assert item.current_operation is not None
+
+    moved = item.change_location(responsible=responsible, location=Location.on_hand())
+    assert item.current_operation == moved
+    assert item.current_location == "On hand (System)"
+
+    # Writes through another instance are only seen after a refresh.
+    other_status = Status.objects.create(name="Broken")
+    Item.objects.get(pk=item.pk).change_status(
+        responsible=responsible, status=other_status
+    )
+    assert item.current_status == "In stock"
+    item.refresh_from_db()
+    assert item.current_status == "Broken"
+
+    head = item.current_operation
+    assert head is not None
+    head.item = item
+    head.delete()
+    assert item.current_operation == moved
+
+
+@pytest.mark.django_db
+def test_with_current_operation_loads_heads_in_one_query(
+    inventory_test_device, inventory_test_status_location, django_assert_num_queries
+) -> None:
+    """``with_current_operation()`` joins heads for the whole batch."""
+
+    status = inventory_test_status_location["status"]
+    location = inventory_test_status_location["location"]
+    responsible = Responsible.objects.create(last_name="Ivanov", first_name="Ivan")
+    for i in range(3):
+        item = Item.objects.create(
+            inventory_number=f"INV-BATCH-{i}", device=inventory_test_device
+        )
+        Operation.objects.create(
+            item=item, status=status, responsible=responsible, location=location
+        )
+    Item.objects.create(inventory_number="INV-BATCH-9", device=inventory_test_device)
+
+    with django_assert_num_queries(1):
+        rows = list(Item.objects.with_current_operation().order_by("inventory_number"))
+        readouts = [
+            (row.current_status, row.current_location, row.current_responsible)
+            for row in rows
+        ]
+
+    assert readouts == [("In stock", "Moscow (Common)", "Ivanov Ivan")] * 3 + [
+        (None, None, None)
+    ]
+
+    # Appending through the instance drops the joined (now stale) state too.
+    first = rows[0]
+    new_status = Status.objects.create(name="Broken")
+    first.change_status(responsible=responsible, status=new_status)
+    assert first.current_status == "Broken"
+
+
+@pytest.mark.django_db
+def test_item_search_text_follows_item_device_and_catalog_changes(
+    inventory_test_device,
+) -> None:
+    """
+    ``search_text`` is rebuilt on item saves, device edits, and manufacturer or
+    model renames, and the SQL expression matches the Python builder.
+    """
+
+    item = Item.objects.create(
+        inventory_number="INV-SRCH", device=inventory_test_device, serial_number="SN1"
+    )
+    assert item.search_text == "INV-SRCH\nSN1\nACME\nModel X"
+    assert list(Item.objects.apply_search("sn1 acme")) == []
+    assert list(Item.objects.apply_search("model x")) == [item]
+
+    item.serial_number = "SN2"
+    item.save(update_fields=["serial_number"])
+    item.refresh_from_db()
+    assert item.search_text == "INV-SRCH\nSN2\nACME\nModel X"
+
+    # Unrelated partial saves leave the column alone.
+    Item.objects.filter(pk=item.pk).update(search_text="stale")
+    item.notes = "note"
+    item.save(update_fields=["notes"])
+    item.refresh_from_db()
+    assert item.search_text == "stale"
+
+    manufacturer = inventory_test_device.manufacturer
+    manufacturer.name = "Globex"
+    manufacturer.save()
+    item.refresh_from_db()
+    assert item.search_text == item.build_search_text()
+    assert "Globex" in item.search_text
+
+    device_model = inventory_test_device.model
+    device_model.name = "Model Y"
+    device_model.save()
+    other_model = Model.objects.create(name="Model Z")
+    inventory_test_device.refresh_from_db()
+    assert Item.objects.get(pk=item.pk).search_text.endswith("Model Y")
+    inventory_test_device.model = other_model
+    inventory_test_device.save()
+    assert Item.objects.get(pk=item.pk).search_text.endswith("Model Z")
+
+    Item.objects.update(search_text="")
+    assert Item.objects.all().refresh_search_text() == 1
+    item = Item.objects.get(pk=item.pk)
+    assert item.search_text == item.build_search_text()
+
+
+@pytest.mark.django_db
+def test_item_search_rank_leaves_order_alone_without_pg_trgm(
+    inventory_test_device, monkeypatch
+) -> None:
+    """Without PostgreSQL (and ``pg_trgm``) ranking keeps the queryset as is."""
+
+    Item.objects.create(inventory_number="INV-RANK", device=inventory_test_device)
+    monkeypatch.setattr(connection, "vendor", "sqlite")
+    monkeypatch.setattr(item_models, "_trigram_search_by_alias", {})
+    items = Item.objects.apply_search("acme")
+
+    assert items.order_by_search_rank("acme") is items
+    assert items.order_by_search_rank("  ") is items
+    assert item_models._trigram_search_by_alias == {"default": False}
+
+
+@pytest.mark.django_db
+def test_trigram_availability_is_looked_up_once_per_alias(monkeypatch) -> None:
+    """The ``pg_extension`` lookup is cached per alias, not repeated per search."""
+
+    monkeypatch.setattr(item_models, "_trigram_search_by_alias", {"default": True})
+
+    with CaptureQueriesContext(connection) as ctx:
+        assert item_models._trigram_search_available() is True
+        assert item_models._trigram_search_available("default") is True
+    assert ctx.captured_queries == []
+
+
 def test_current_operation_value_is_introspectable_via_class_access() -> None:
     """
     Descriptor contract: accessing the attribute via the class returns the descriptor.
@@ -653,6 +836,43 @@ def test_pending_transfer_accept_sets_on_hand_from_sender_location() -> None:
     assert latest.location.responsible_id is None
 
 
+@pytest.mark.django_db
+def test_pending_transfer_accept_uses_cached_on_hand_id(
+    django_capture_on_commit_callbacks, inventory_test_device
+) -> None:
+    """With a warm cache, accept does not look the system location up by name."""
+
+    item = Item.objects.create(
+        inventory_number="INV-XFER-CACHED", device=inventory_test_device
+    )
+    status = Status.objects.create(name="In use")
+    sender = Responsible.objects.create(last_name="Sender", first_name="User")
+    receiver = Responsible.objects.create(last_name="Receiver", first_name="User")
+    Operation.objects.create(
+        item=item,
+        status=status,
+        responsible=sender,
+        location=Location.objects.create(name="Home", responsible=sender),
+    )
+    transfer = PendingTransfer.objects.create(
+        item=item, from_responsible=sender, to_responsible=receiver
+    )
+    with django_capture_on_commit_callbacks(execute=True):
+        on_hand_id = Location.on_hand_id()
+
+    with CaptureQueriesContext(connection) as ctx:
+        transfer.accept()
+
+    assert item.current_operation is not None
+    assert item.current_operation.location_id == on_hand_id
+    # No ``get_or_create`` by name (and no savepoint INSERT) under the item lock.
+    assert not any(
+        '"catalogs_location"."name" =' in query["sql"]
+        or 'INSERT INTO "catalogs_location"' in query["sql"]
+        for query in ctx.captured_queries
+    )
+
+
 @pytest.mark.django_db
 def test_pending_transfer_str_and_is_active() -> None:
     category = Category.objects.create(name="Laptops")
@@ -1775,3 +1995,127 @@ def test_pending_transfer_update_offer_same_receiver_skips_expiry_block() -> Non
     transfer.refresh_from_db()
     assert transfer.expires_at == exp
     assert transfer.notes == "same path"
+
+
+def _batch_transfer_setup(
+    device: Device, count: int
+) -> tuple[Responsible, Responsible, list[Item]]:
+    status = Status.objects.create(name="In use")
+    sender = Responsible.objects.create(
+        last_name="Sender",
+        first_name="Batch",
+        user=User.objects.create_user(
+            username="batch_sender", password="pw", email="bs@example.com"
+        ),
+    )
+    receiver = Responsible.objects.create(
+        last_name="Receiver",
+        first_name="Batch",
+        user=User.objects.create_user(
+            username="batch_receiver", password="pw", email="br@example.com"
+        ),
+    )
+    home = Location.objects.create(name="Home", responsible=sender)
+    items = []
+    for n in range(count):
+        item = Item.objects.create(inventory_number=f"INV-BATCH-{n}", device=device)
+        Operation.objects.create(
+            item=item, status=status, responsible=sender, location=home
+        )
+        items.append(item)
+    return sender, receiver, items
+
+
+@pytest.mark.django_db
+def test_pending_transfer_create_offers_creates_one_offer_per_item(
+    inventory_test_device,
+) -> None:
+    sender, receiver, items = _batch_transfer_setup(inventory_test_device, 3)
+
+    transfers = PendingTransfer.create_offers(
+        items=list(reversed(items)),
+        from_responsible=sender,
+        to_responsible=receiver,
+        expires_at=None,
+        notes="leaving",
+    )
+
+    assert [t.item_id for t in transfers] == sorted(item.pk for item in items)
+    assert all(t.is_active and t.notes == "leaving" for t in transfers)
+    assert PendingTransfer.objects.offers_visible_in_ui().count() == 3
+
+
+@pytest.mark.django_db
+def test_pending_transfer_create_offers_rolls_back_whole_batch(
+    inventory_test_device,
+) -> None:
+    sender, receiver, items = _batch_transfer_setup(inventory_test_device, 2)
+    PendingTransfer.objects.create(
+        item=items[1], from_responsible=sender, to_responsible=receiver
+    )
+
+    with pytest.raises(ValidationError):
+        PendingTransfer.create_offers(
+            items=items,
+            from_responsible=sender,
+            to_responsible=receiver,
+            expires_at=None,
+        )
+
+    assert not PendingTransfer.objects.filter(item=items[0]).exists()
+
+
+@pytest.mark.django_db
+def test_pending_transfer_create_offers_auto_accepts_receiver_without_user(
+    inventory_test_device,
+) -> None:
+    sender, _receiver, items = _batch_transfer_setup(inventory_test_device, 2)
+    offline = Responsible.objects.create(last_name="Offline", first_name="Batch")
+
+    transfers = PendingTransfer.create_offers(
+        items=items, from_responsible=sender, to_responsible=offline, expires_at=None
+    )
+
+    assert all(t.accepted_at is not None for t in transfers)
+    assert set(Item.objects.owned_by(offline)) == set(items)
+
+
+@pytest.mark.django_db
+def test_pending_transfer_accept_offers_skips_stale_offers(
+    inventory_test_device,
+) -> None:
+    sender, receiver, items = _batch_transfer_setup(inventory_test_device, 3)
+    transfers = PendingTransfer.create_offers(
+        items=items, from_responsible=sender, to_responsible=receiver, expires_at=None
+    )
+    # Ownership moved by an admin repair: the first offer is stale.
+    other = Responsible.objects.create(last_name="Other", first_name="Batch")
+    Operation.objects.create(
+        item=items[0],
+        status=Status.objects.get(name="In use"),
+        responsible=other,
+        location=Location.on_hand(),
+    )
+    transfers[2].cancel()
+
+    accepted = PendingTransfer.accept_offers([t.pk for t in transfers])
+
+    assert [t.pk for t in accepted] == [transfers[1].pk]
+    assert list(Item.objects.owned_by(receiver)) == [items[1]]
+    transfers[0].refresh_from_db()
+    assert transfers[0].accepted_at is None
+
+
+@pytest.mark.django_db
+def test_pending_transfer_cancel_offers_skips_inactive(inventory_test_device) -> None:
+    sender, receiver, items = _batch_transfer_setup(inventory_test_device, 2)
+    transfers = PendingTransfer.create_offers(
+        items=items, from_responsible=sender, to_responsible=receiver, expires_at=None
+    )
+    transfers[0].accept()
+
+    cancelled = PendingTransfer.cancel_offers([t.pk for t in transfers])
+
+    assert [t.pk for t in cancelled] == [transfers[1].pk]
+    transfers[1].refresh_from_db()
+    assert transfers[1].cancelled_at is not None
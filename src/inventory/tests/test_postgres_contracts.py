@@ -146,3 +146,63 @@ def test_previous_items_ordering_by_last_on_me_created_at_is_stable() -> None:
     assert pos_new != -1
     assert pos_old != -1
     assert pos_new < pos_old, "Newer previously-owned item should be listed first"
+
+
+@pytest.mark.django_db
+def test_item_search_trigram_indexes_exist_when_pg_trgm_is_installed() -> None:
+    """
+    Migration 0010 creates the search GIN indexes wherever ``pg_trgm`` exists.
+
+    Servers without the extension keep working (plain scans), so the test only
+    asserts the indexes when the extension was available at migrate time.
+    """
+
+    from django.db import connection
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            pytest.skip("pg_trgm is not available on this server")
+        cursor.execute(
+            "SELECT indexname, indexdef FROM pg_indexes "
+            "WHERE tablename = 'inventory_item' AND indexname LIKE '%%_trgm_idx'"
+        )
+        indexes = dict(cursor.fetchall())
+
+    assert set(indexes) == {"inv_item_search_trgm_idx", "inv_item_notes_trgm_idx"}
+    assert "gin_trgm_ops" in indexes["inv_item_search_trgm_idx"]
+
+
+@pytest.mark.django_db
+def test_item_admin_search_ranks_closest_matches_first() -> None:
+    """
+    With ``pg_trgm`` installed, admin search (and so the item autocomplete)
+    lists the best word match first, ahead of inventory-number order.
+    """
+
+    from django.contrib.admin.sites import AdminSite
+    from django.db import connection
+    from django.test import RequestFactory
+
+    from inventory.admin import ItemAdmin
+
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            pytest.skip("pg_trgm is not available on this server")
+
+    device = _make_device()
+    exact = Device.objects.create(
+        category=device.category,
+        type=device.type,
+        manufacturer=device.manufacturer,
+        model=Model.objects.create(name="X1"),
+    )
+    Item.objects.create(inventory_number="INV-1-X100", device=device)
+    Item.objects.create(inventory_number="INV-2", device=exact)
+
+    qs, _ = ItemAdmin(Item, AdminSite()).get_search_results(
+        RequestFactory().get("/"), Item.objects.all(), "x1"
+    )
+
+    assert [item.inventory_number for item in qs] == ["INV-2", "INV-1-X100"]
@@ -2,9 +2,12 @@
 Tests for ``resolve_item_history_context`` edge cases in ``inventory.models.pages``.
 """
 
-from unittest.mock import MagicMock, patch
+from datetime import timedelta
 
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
 from catalogs.models import Location, Responsible, Status
 from devices.attributes import Category, Manufacturer, Model, Type
@@ -13,6 +16,7 @@ from inventory.models import (
     Item,
     Operation,
     PendingTransfer,
+    can_view_item_history,
     resolve_item_history_context,
 )
 
@@ -59,10 +63,10 @@ def test_resolve_item_history_pending_receiver_no_operations() -> None:
 
 
 @pytest.mark.django_db
-def test_resolve_item_history_former_owner_item_get_miss() -> None:
+def test_resolve_item_history_query_count_does_not_grow_with_journal() -> None:
     """
-    Former-owner branch calls ``Item.objects.with_device_relations().get``; a miss
-    maps to ``None`` (same HTTP outcome as unknown items).
+    Owner, receiver and former-owner views cost a fixed number of queries, and
+    ``can_view_item_history`` answers the same access question in one.
     """
 
     category = Category.objects.create(name="Laptops")
@@ -78,26 +82,56 @@ def test_resolve_item_history_former_owner_item_get_miss() -> None:
     status = Status.objects.create(name="In stock")
     location = Location.objects.create(name="Moscow")
     former = Responsible.objects.create(last_name="Former", first_name="Own")
-    new_owner = Responsible.objects.create(last_name="New", first_name="Own")
+    owner = Responsible.objects.create(last_name="New", first_name="Own")
+    receiver = Responsible.objects.create(last_name="Recv", first_name="Er")
+    stranger = Responsible.objects.create(last_name="Str", first_name="Anger")
 
-    item = Item.objects.create(inventory_number="INV-RES-DEL", device=device)
+    item = Item.objects.create(inventory_number="INV-RES-QC", device=device)
     Operation.objects.create(
-        item=item,
-        status=status,
-        responsible=former,
-        location=location,
+        item=item, status=status, responsible=former, location=location
     )
-    Operation.objects.create(
-        item=item,
-        status=status,
-        responsible=new_owner,
-        location=location,
+    handoff = Operation.objects.create(
+        item=item, status=status, responsible=owner, location=location
     )
+    PendingTransfer.objects.create(
+        item=item, from_responsible=owner, to_responsible=receiver, notes=""
+    )
+
+    def query_counts() -> list[int]:
+        counts = []
+        for viewer in (owner, receiver, former):
+            with CaptureQueriesContext(connection) as queries:
+                ctx = resolve_item_history_context(viewer, item.pk)
+            assert ctx is not None
+            counts.append(len(queries.captured_queries))
+        return counts
+
+    short = query_counts()
+    for _ in range(5):
+        Operation.objects.create(
+            item=item, status=status, responsible=owner, location=location
+        )
+    assert query_counts() == short
+    assert max(short) <= 3
+
+    former_ctx = resolve_item_history_context(former, item.pk)
+    assert former_ctx is not None
+    # Only the handoff after the former owner's last operation is visible.
+    assert former_ctx.operations[0].pk == handoff.pk
+    assert former_ctx.pending_transfer is None
 
-    mqs = MagicMock()
-    mqs.get.side_effect = Item.DoesNotExist
-    with patch.object(Item.objects, "with_device_relations", return_value=mqs):
-        assert resolve_item_history_context(former, item.pk) is None
+    with CaptureQueriesContext(connection) as queries:
+        assert resolve_item_history_context(stranger, item.pk) is None
+    assert len(queries.captured_queries) == 1
+
+    with CaptureQueriesContext(connection) as queries:
+        allowed = [
+            can_view_item_history(viewer, item.pk)
+            for viewer in (owner, receiver, former, stranger)
+        ]
+    assert allowed == [True, True, True, False]
+    assert len(queries.captured_queries) == 4
+    assert not can_view_item_history(owner, item.pk + 1000)
 
 
 @pytest.mark.django_db
@@ -136,3 +170,97 @@ def test_resolve_item_history_sets_accept_journal_head_for_receiver() -> None:
     ctx = resolve_item_history_context(receiver, item.pk)
     assert ctx is not None
     assert ctx.accept_journal_head_operation_id == op.pk
+
+
+@pytest.mark.django_db
+def test_resolve_item_history_pages_visible_operations_newest_first(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """
+    Pages walk the visible journal newest first; other people's pure location
+    moves stay hidden across page boundaries and each page costs the same.
+    """
+
+    status = inventory_test_status_location["status"]
+    moscow = inventory_test_status_location["location"]
+    other_location = Location.objects.create(name="Kazan")
+    broken = Status.objects.create(name="Broken")
+    viewer = Responsible.objects.create(last_name="View", first_name="Er")
+    other = Responsible.objects.create(last_name="Oth", first_name="Er")
+    item = Item.objects.create(
+        inventory_number="INV-RES-PAGE", device=inventory_test_device
+    )
+
+    def add(responsible, location=moscow, op_status=status) -> Operation:
+        return Operation.objects.create(
+            item=item, status=op_status, responsible=responsible, location=location
+        )
+
+    expected = [add(viewer), add(viewer, other_location), add(other)]
+    add(other, other_location)  # hidden: someone else's location change
+    expected.append(add(other, other_location, broken))  # status change
+    add(other, moscow, broken)  # hidden: location change only
+    expected.append(add(viewer))  # handoff back
+    for index in range(4):
+        expected.append(add(viewer, other_location if index % 2 else moscow))
+    expected.reverse()
+
+    seen: list[int] = []
+    query_counts: list[int] = []
+    cursor = ""
+    while True:
+        with CaptureQueriesContext(connection) as queries:
+            ctx = resolve_item_history_context(
+                viewer, item.pk, cursor=cursor, page_size=3
+            )
+        assert ctx is not None
+        query_counts.append(len(queries.captured_queries))
+        seen.extend(op.pk for op in ctx.operations)
+        if ctx.next_cursor is None:
+            break
+        cursor = ctx.next_cursor
+
+    assert seen == [op.pk for op in expected]
+    assert len(set(query_counts)) == 1
+    # A stale or edited cursor restarts from the newest operation.
+    ctx = resolve_item_history_context(viewer, item.pk, cursor="bogus", page_size=3)
+    assert ctx is not None
+    assert [op.pk for op in ctx.operations] == seen[:3]
+
+
+@pytest.mark.django_db
+def test_resolve_item_history_pages_sub_millisecond_journal(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Operations written within one millisecond are each listed exactly once."""
+
+    viewer = Responsible.objects.create(last_name="View", first_name="Er")
+    item = Item.objects.create(
+        inventory_number="INV-RES-MS", device=inventory_test_device
+    )
+    base = timezone.now().replace(microsecond=0)
+    expected: list[int] = []
+    for index in range(6):
+        op = Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=viewer,
+            location=inventory_test_status_location["location"],
+        )
+        Operation.objects.filter(pk=op.pk).update(
+            created_at=base + timedelta(microseconds=100 * index)
+        )
+        expected.insert(0, op.pk)
+
+    seen: list[int] = []
+    cursor = ""
+    while True:
+        ctx = resolve_item_history_context(viewer, item.pk, cursor=cursor, page_size=2)
+        assert ctx is not None
+        assert len(ctx.operations) <= 2
+        seen.extend(op.pk for op in ctx.operations)
+        if ctx.next_cursor is None:
+            break
+        cursor = ctx.next_cursor
+
+    assert seen == expected
@@ -1,11 +1,24 @@
+from datetime import timedelta
+from typing import Any
 from unittest.mock import patch
 
 import pytest
 from django.contrib.auth.models import User
 from django.core import mail
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone, translation
+from django.utils.html import escape
+from django.utils.translation import gettext as _
 
 from catalogs.models import Responsible
-from inventory.models import Item, Operation, PendingTransfer
+from common.email_utils import build_transfer_email
+from common.models import QueuedEmail
+from inventory.models import Item, NotificationOutbox, Operation, PendingTransfer
+from inventory.models.pending_transfer import transfers_batch_processed
+from inventory.notifications import drain_notification_outbox, schedule_outbox_drain
+
+_LOCMEM_SEND = "django.core.mail.backends.locmem.EmailBackend.send_messages"
 
 
 @pytest.fixture(autouse=True)
@@ -20,7 +33,7 @@ def _responsible(username: str, email: str) -> Responsible:
     )
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_create_first_operation_sends_assigned(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -41,7 +54,7 @@ def test_create_first_operation_sends_assigned(
     assert "SIG-001" in mail.outbox[0].subject
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_create_operation_with_prev_responsible_sends_assigned_and_unassigned(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -67,7 +80,7 @@ def test_create_operation_with_prev_responsible_sends_assigned_and_unassigned(
     assert "c@example.com" in recipients
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_create_operation_same_responsible_as_prev_sends_updated(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -91,7 +104,7 @@ def test_create_operation_same_responsible_as_prev_sends_updated(
     assert "SIG-003" in mail.outbox[0].subject
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_edit_operation_no_responsible_change_sends_updated(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -113,7 +126,7 @@ def test_edit_operation_no_responsible_change_sends_updated(
     assert "SIG-004" in mail.outbox[0].subject
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_edit_operation_responsible_change_sends_assigned_and_unassigned(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -137,7 +150,7 @@ def test_edit_operation_responsible_change_sends_assigned_and_unassigned(
     assert "g@example.com" in recipients
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_no_email_when_responsible_has_no_user(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -175,7 +188,7 @@ def _make_transfer(item, from_resp, to_resp, sl):
     )
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_created_notifies_receiver(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -189,7 +202,7 @@ def test_transfer_created_notifies_receiver(
     assert mail.outbox[0].to == ["to1@example.com"]
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_accepted_notifies_both(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -208,7 +221,7 @@ def test_transfer_accepted_notifies_both(
     assert "to2@example.com" in all_recipients
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_accepted_sends_accepted_email_to_both(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -235,7 +248,7 @@ def test_transfer_accepted_sends_accepted_email_to_both(
     _ = transfer_emails  # referenced to avoid lint
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_cancelled_notifies_both(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -259,18 +272,20 @@ def test_transfer_cancelled_notifies_both(
     assert "r4@example.com" in all_recipients
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_operation_notification_failure_does_not_roll_back_save(
     inventory_test_device, inventory_test_status_location
 ) -> None:
-    """Email failure in notify_operation_saved must not roll back the Operation."""
+    """An email that fails to render must not roll back the Operation."""
     item = Item.objects.create(
         inventory_number="SIG-ERR-OP", device=inventory_test_device
     )
     resp = _responsible("sig_err_op", "err_op@example.com")
+    mail.outbox.clear()
 
     with patch(
-        "inventory.signals.send_transfer_email", side_effect=RuntimeError("boom")
+        "inventory.notifications.build_transfer_email",
+        side_effect=RuntimeError("boom"),
     ):
         op = Operation.objects.create(
             item=item,
@@ -280,13 +295,15 @@ def test_operation_notification_failure_does_not_roll_back_save(
         )
 
     assert Operation.objects.filter(pk=op.pk).exists()
+    assert not NotificationOutbox.objects.exists()
+    assert len(mail.outbox) == 0
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_notification_failure_does_not_roll_back_save(
     inventory_test_device, inventory_test_status_location
 ) -> None:
-    """Email failure in notify_transfer_saved must not roll back the PendingTransfer."""
+    """An email that fails to render must not roll back the PendingTransfer."""
     item = Item.objects.create(
         inventory_number="SIG-ERR-TR", device=inventory_test_device
     )
@@ -301,7 +318,8 @@ def test_transfer_notification_failure_does_not_roll_back_save(
     mail.outbox.clear()
 
     with patch(
-        "inventory.signals.send_transfer_email", side_effect=RuntimeError("boom")
+        "inventory.notifications.build_transfer_email",
+        side_effect=RuntimeError("boom"),
     ):
         transfer = PendingTransfer.create_offer(
             item=item,
@@ -314,7 +332,7 @@ def test_transfer_notification_failure_does_not_roll_back_save(
     assert PendingTransfer.objects.filter(pk=transfer.pk).exists()
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_receiver_change_notifies_new_receiver(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -338,7 +356,7 @@ def test_transfer_receiver_change_notifies_new_receiver(
     assert "r5a@example.com" in recipients  # old receiver notified (cancelled)
 
 
-@pytest.mark.django_db
+@pytest.mark.django_db(transaction=True)
 def test_transfer_created_no_email_for_offline_receiver(
     inventory_test_device, inventory_test_status_location
 ) -> None:
@@ -365,3 +383,467 @@ def test_transfer_created_no_email_for_offline_receiver(
     # The auto-accept path also triggers operation_assigned for the offline
     # receiver — also suppressed — and operation_unassigned for the sender.
     assert not any("Transfer offer created" in m.subject for m in mail.outbox)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_transfer_actions_send_one_email_per_recipient(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Batch create/accept aggregate per-offer and per-operation notifications."""
+    sender = _responsible("batch_a", "batch_a@example.com")
+    receiver = _responsible("batch_b", "batch_b@example.com")
+    items = []
+    for n in range(3):
+        item = Item.objects.create(
+            inventory_number=f"SIG-B{n}", device=inventory_test_device
+        )
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=sender,
+            location=inventory_test_status_location["location"],
+        )
+        items.append(item)
+    mail.outbox.clear()
+
+    transfers = PendingTransfer.create_offers(
+        items=items, from_responsible=sender, to_responsible=receiver, expires_at=None
+    )
+
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["batch_b@example.com"]
+    assert all(f"SIG-B{n}" in mail.outbox[0].body for n in range(3))
+    mail.outbox.clear()
+
+    PendingTransfer.accept_offers([t.pk for t in transfers])
+
+    assert sorted(msg.to[0] for msg in mail.outbox) == [
+        "batch_a@example.com",
+        "batch_b@example.com",
+    ]
+    assert all("SIG-B2" in msg.body for msg in mail.outbox)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_signal_is_sent_inside_the_batch_transaction(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """Batch outbox rows commit or roll back together with the batch."""
+    sender = _responsible("batch_tx_a", "batch_tx_a@example.com")
+    receiver = _responsible("batch_tx_b", "batch_tx_b@example.com")
+    item = Item.objects.create(inventory_number="SIG-TX", device=inventory_test_device)
+    Operation.objects.create(
+        item=item,
+        status=inventory_test_status_location["status"],
+        responsible=sender,
+        location=inventory_test_status_location["location"],
+    )
+    in_atomic: list[bool] = []
+
+    def record(**kwargs) -> None:
+        in_atomic.append(transaction.get_connection().in_atomic_block)
+
+    transfers_batch_processed.connect(record, sender=PendingTransfer)
+    try:
+        (transfer,) = PendingTransfer.create_offers(
+            items=[item],
+            from_responsible=sender,
+            to_responsible=receiver,
+            expires_at=None,
+        )
+        PendingTransfer.cancel_offers([transfer.pk])
+        (transfer,) = PendingTransfer.create_offers(
+            items=[item],
+            from_responsible=sender,
+            to_responsible=receiver,
+            expires_at=None,
+        )
+        PendingTransfer.accept_offers([transfer.pk])
+    finally:
+        transfers_batch_processed.disconnect(record, sender=PendingTransfer)
+
+    assert in_atomic == [True, True, True, True]
+
+
+@pytest.mark.django_db
+def test_outbox_rows_are_written_in_transaction_and_sent_after_commit(
+    django_capture_on_commit_callbacks,
+    inventory_test_device,
+    inventory_test_status_location,
+) -> None:
+    """Nothing is sent while the writer's transaction is open."""
+    item = Item.objects.create(inventory_number="OB-001", device=inventory_test_device)
+    resp = _responsible("ob_a", "ob_a@example.com")
+    mail.outbox.clear()
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=resp,
+            location=inventory_test_status_location["location"],
+        )
+        assert NotificationOutbox.objects.filter(recipient_id=resp.pk).count() == 1
+        assert len(mail.outbox) == 0
+
+    assert len(callbacks) == 1
+    assert mail.outbox[0].to == ["ob_a@example.com"]
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_accept_schedules_one_drain(
+    django_capture_on_commit_callbacks,
+    inventory_test_device,
+    inventory_test_status_location,
+) -> None:
+    """Every outbox write of one transaction goes out with a single drain."""
+    item = Item.objects.create(inventory_number="OB-003", device=inventory_test_device)
+    sender = _responsible("ob_from", "ob_from@example.com")
+    receiver = _responsible("ob_to", "ob_to@example.com")
+    with django_capture_on_commit_callbacks(execute=True):
+        _, transfer = _make_transfer(
+            item, sender, receiver, inventory_test_status_location
+        )
+
+    with (
+        patch("inventory.notifications.schedule_outbox_drain") as drain,
+        django_capture_on_commit_callbacks(execute=True),
+    ):
+        transfer.accept()
+
+    drain.assert_called_once_with()
+    assert NotificationOutbox.objects.values("kind").distinct().count() > 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_rolled_back_change_sends_nothing(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    item = Item.objects.create(inventory_number="OB-002", device=inventory_test_device)
+    resp = _responsible("ob_b", "ob_b@example.com")
+    mail.outbox.clear()
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=resp,
+            location=inventory_test_status_location["location"],
+        )
+        raise RuntimeError("abort")
+
+    assert not Operation.objects.filter(item=item).exists()
+    assert not NotificationOutbox.objects.exists()
+    assert len(mail.outbox) == 0
+
+    # The discarded drain does not hold back the next transaction's.
+    Operation.objects.create(
+        item=item,
+        status=inventory_test_status_location["status"],
+        responsible=resp,
+        location=inventory_test_status_location["location"],
+    )
+    assert mail.outbox[0].to == ["ob_b@example.com"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_backend_failure_keeps_rows_for_next_drain(
+    settings, inventory_test_device, inventory_test_status_location
+) -> None:
+    """A failing backend does not break the save; a later drain delivers."""
+    settings.EMAIL_SEND_ASYNC = False
+    item = Item.objects.create(inventory_number="OB-003", device=inventory_test_device)
+    resp = _responsible("ob_c", "ob_c@example.com")
+    mail.outbox.clear()
+
+    with patch(_LOCMEM_SEND, side_effect=OSError("down")):
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=resp,
+            location=inventory_test_status_location["location"],
+        )
+
+    assert NotificationOutbox.objects.get().recipient_id == resp.pk
+    assert len(mail.outbox) == 0
+
+    assert drain_notification_outbox() == 1
+    assert mail.outbox[0].to == ["ob_c@example.com"]
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_hands_the_batch_to_the_email_queue_in_one_insert(
+    settings, inventory_test_device, inventory_test_status_location
+) -> None:
+    """Batched async delivery stores every email of a drain with one INSERT."""
+    # Without a commit the post-commit drains never ran.
+    for number in ("OB-Q1", "OB-Q2", "OB-Q3"):
+        Operation.objects.create(
+            item=Item.objects.create(
+                inventory_number=number, device=inventory_test_device
+            ),
+            status=inventory_test_status_location["status"],
+            responsible=_responsible(number.lower(), f"{number}@example.com"),
+            location=inventory_test_status_location["location"],
+        )
+
+    settings.EMAIL_BACKEND = "common.email_backends.AsyncEmailBackend"
+    settings.EMAIL_SEND_ASYNC = True
+    settings.EMAIL_BATCH_DELIVERY = True
+    with CaptureQueriesContext(connection) as ctx:
+        assert drain_notification_outbox() == 3
+
+    inserts = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("INSERT")]
+    assert len(inserts) == 1
+    assert 'INTO "common_queuedemail"' in inserts[0]
+    assert QueuedEmail.objects.count() == 3
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+def test_drain_walks_full_batches_and_drops_rows_of_deleted_objects(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    resp = _responsible("ob_batch", "ob_batch@example.com")
+    for number in ("OB-B1", "OB-B2"):
+        Operation.objects.create(
+            item=Item.objects.create(
+                inventory_number=number, device=inventory_test_device
+            ),
+            status=inventory_test_status_location["status"],
+            responsible=resp,
+            location=inventory_test_status_location["location"],
+        )
+    NotificationOutbox.objects.create(
+        kind=NotificationOutbox.Kind.OPERATION_UPDATED,
+        object_id=10**9,
+        recipient_id=resp.pk,
+    )
+    # Without a commit the post-commit drains never ran.
+    assert NotificationOutbox.objects.count() == 3
+    mail.outbox.clear()
+
+    assert drain_notification_outbox(batch_size=1) == 2
+    assert len(mail.outbox) == 2
+    assert all(f"OB-B{n}" in mail.outbox[n - 1].subject for n in (1, 2))
+    assert not NotificationOutbox.objects.exists()
+
+
+def _locale_spy() -> tuple[list[tuple[str, str]], Any]:
+    """Wrap ``build_transfer_email`` to record the active language and time zone."""
+    seen: list[tuple[str, str]] = []
+
+    def build(*args: Any, **kwargs: Any) -> Any:
+        seen.append((translation.get_language(), timezone.get_current_timezone_name()))
+        return build_transfer_email(*args, **kwargs)
+
+    return seen, build
+
+
+@pytest.mark.django_db
+def test_drain_renders_in_the_writers_language_and_time_zone(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    """A ``ru`` row is sent in Russian even when the drain runs under ``en``."""
+    item = Item.objects.create(inventory_number="OB-RU", device=inventory_test_device)
+    resp = _responsible("ob_ru", "ob_ru@example.com")
+    mail.outbox.clear()
+    with translation.override("ru"), timezone.override("Asia/Tokyo"):
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=resp,
+            location=inventory_test_status_location["location"],
+        )
+        expected = _("Item assigned to you: %(item)s") % {"item": item}
+    row = NotificationOutbox.objects.get()
+    assert (row.language, row.time_zone) == ("ru", "Asia/Tokyo")
+
+    seen, build = _locale_spy()
+    with (
+        translation.override("en"),
+        patch("inventory.notifications.build_transfer_email", build),
+    ):
+        assert drain_notification_outbox() == 1
+
+    assert seen == [("ru", "Asia/Tokyo")]
+    assert mail.outbox[0].subject == expected
+
+
+@pytest.mark.django_db
+def test_async_drain_is_queued(settings) -> None:
+    settings.EMAIL_SEND_ASYNC = True
+    row = NotificationOutbox.objects.create(
+        kind=NotificationOutbox.Kind.RESPONSIBLE_UPDATED, object_id=1, recipient_id=2
+    )
+    assert str(row) == "responsible_updated #1 -> 2"
+    NotificationOutbox.enqueue_many([("responsible_updated", 1, None)])
+    assert NotificationOutbox.objects.count() == 1
+
+    with patch("inventory.notifications.async_task") as async_task:
+        schedule_outbox_drain()
+    async_task.assert_called_once_with(
+        "inventory.notifications.drain_notification_outbox"
+    )
+
+
+# ---------------------------------------------------------------------------
+# Digest mode
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.django_db(transaction=True)
+def test_digest_recipient_gets_one_summary_per_interval(
+    settings, inventory_test_device, inventory_test_status_location
+) -> None:
+    settings.NOTIFICATION_DIGEST_INTERVAL_MINUTES = 30
+    sender = _responsible("dg_sender", "dg_sender@example.com")
+    receiver = _responsible("dg_receiver", "dg_receiver@example.com")
+    Responsible.objects.filter(pk=receiver.pk).update(email_digest=True)
+    items = [
+        Item.objects.create(inventory_number=f"DG-{n}", device=inventory_test_device)
+        for n in range(2)
+    ]
+    for item in items:
+        Operation.objects.create(
+            item=item,
+            status=inventory_test_status_location["status"],
+            responsible=sender,
+            location=inventory_test_status_location["location"],
+        )
+    mail.outbox.clear()
+
+    for item in items:
+        PendingTransfer.objects.create(
+            item=item, from_responsible=sender, to_responsible=receiver
+        ).accept()
+
+    # The sender is not on digest and is notified right away.
+    assert {m.to[0] for m in mail.outbox} == {"dg_sender@example.com"}
+    held = NotificationOutbox.objects.filter(recipient_id=receiver.pk)
+    assert held.count() == 6  # created, accepted and assigned for each item
+    mail.outbox.clear()
+
+    assert drain_notification_outbox() == 0
+    held.update(created_at=timezone.now() - timedelta(minutes=31))
+    # The newest row decides the digest's language and time zone.
+    held.filter(pk=held.latest("pk").pk).update(language="ru", time_zone="Asia/Tokyo")
+    seen, build = _locale_spy()
+    with patch("inventory.notifications.build_transfer_email", build):
+        assert drain_notification_outbox() == 1
+    assert seen == [("ru", "Asia/Tokyo")]
+
+    (digest,) = mail.outbox
+    assert digest.to == ["dg_receiver@example.com"]
+    assert "6" in digest.subject
+    assert all(f"DG-{n}" in digest.body for n in range(2))
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_responsible_events_join_the_digest() -> None:
+    user = User.objects.create_user(
+        username="dg_linked", password="pw", email="dg_linked@example.com"
+    )
+    mail.outbox.clear()
+
+    responsible = Responsible.objects.create(
+        last_name="Linked", first_name="Digest", user=user, email_digest=True
+    )
+
+    assert len(mail.outbox) == 0
+    row = NotificationOutbox.objects.get()
+    assert (row.kind, row.object_id) == ("responsible_linked", responsible.pk)
+
+    # Turning the digest off releases held rows as regular emails.
+    Responsible.objects.filter(pk=responsible.pk).update(email_digest=False)
+    assert drain_notification_outbox() == 1
+    assert mail.outbox[0].to == ["dg_linked@example.com"]
+
+
+@pytest.mark.django_db
+def test_digest_lists_every_kind_of_change(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    sender = _responsible("dg_kinds_a", "dg_kinds_a@example.com")
+    receiver = _responsible("dg_kinds_b", "dg_kinds_b@example.com")
+    Responsible.objects.filter(pk=receiver.pk).update(email_digest=True)
+    receiver.refresh_from_db()
+    item = Item.objects.create(inventory_number="DG-K", device=inventory_test_device)
+    operation = Operation.objects.create(
+        item=item,
+        status=inventory_test_status_location["status"],
+        responsible=sender,
+        location=inventory_test_status_location["location"],
+    )
+    transfer = PendingTransfer.objects.create(
+        item=item, from_responsible=sender, to_responsible=receiver
+    )
+    NotificationOutbox.objects.all().delete()
+    mail.outbox.clear()
+    Kind = NotificationOutbox.Kind
+    NotificationOutbox.enqueue_many(
+        (kind, object_id, receiver.pk)
+        for kind, object_id in (
+            (Kind.RESPONSIBLE_LINKED, receiver.pk),
+            (Kind.RESPONSIBLE_UPDATED, receiver.pk),
+            (Kind.OPERATION_UNASSIGNED, operation.pk),
+            (Kind.OPERATION_UPDATED, operation.pk),
+            (Kind.TRANSFER_CANCELLED, transfer.pk),
+            (Kind.TRANSFER_BATCH_EXPIRED, transfer.pk),
+            (Kind.OPERATION_UPDATED, 10**9),  # deleted since: left out
+        )
+    )
+    NotificationOutbox.objects.update(created_at=timezone.now() - timedelta(days=1))
+
+    assert drain_notification_outbox() == 1
+
+    (digest,) = mail.outbox
+    for line in (
+        _('Your account was linked to the profile "%(name)s".') % {"name": receiver},
+        _('Your profile "%(name)s" was updated.') % {"name": receiver},
+        _("Item %(item)s is no longer assigned to you.") % {"item": item},
+        _("Item %(item)s was updated.") % {"item": item},
+        _(
+            "The transfer of item %(item)s from %(sender)s to %(receiver)s "
+            "was cancelled."
+        )
+        % {"item": item, "sender": sender, "receiver": receiver},
+        _(
+            "The transfer of item %(item)s from %(sender)s to %(receiver)s "
+            "has expired."
+        )
+        % {"item": item, "sender": sender, "receiver": receiver},
+    ):
+        assert escape(line) in digest.body
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("offsets", [(20, 10), (10, 20)])
+def test_async_drain_schedules_the_next_digest(settings, offsets) -> None:
+    """The earliest pending digest is scheduled whichever recipient comes first."""
+    settings.EMAIL_SEND_ASYNC = True
+    settings.NOTIFICATION_DIGEST_INTERVAL_MINUTES = 30
+    now = timezone.now()
+    for offset, recipient in zip(offsets, ("dg_first", "dg_second"), strict=True):
+        responsible = _responsible(recipient, f"{recipient}@example.com")
+        Responsible.objects.filter(pk=responsible.pk).update(email_digest=True)
+        NotificationOutbox.objects.create(
+            kind=NotificationOutbox.Kind.RESPONSIBLE_UPDATED,
+            object_id=responsible.pk,
+            recipient_id=responsible.pk,
+        )
+        NotificationOutbox.objects.filter(recipient_id=responsible.pk).update(
+            created_at=now - timedelta(minutes=offset)
+        )
+
+    with patch("inventory.notifications.schedule_once") as schedule_once:
+        assert drain_notification_outbox() == 0
+
+    schedule_once.assert_called_once_with(
+        "inventory.notifications.drain_notification_outbox",
+        now + timedelta(minutes=10),
+    )
@@ -0,0 +1,257 @@
+"""
+Tests for the bulk stocktake import (``inventory.stocktake``) and its command.
+"""
+
+import json
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import DatabaseError, transaction
+from django.utils import timezone
+
+from catalogs.models import Location, Responsible, Status
+from inventory.models import Item, ItemCurrentState, NotificationOutbox, Operation
+from inventory.notifications import drain_notification_outbox
+from inventory.stocktake import import_stocktake, read_stocktake_rows
+
+_HEADER = (
+    "inventory_number,serial_number,category,type,manufacturer,model,"
+    "status,responsible,location\n"
+)
+
+
+@pytest.fixture
+def stocktake_catalog(inventory_test_device) -> dict[str, Responsible]:
+    """Catalog rows referenced by the stocktake files below."""
+
+    Status.objects.create(name="In use")
+    Location.objects.create(name="Office")
+    alice = Responsible.objects.create(
+        last_name="Alice",
+        first_name="Test",
+        employee_id="E1",
+        user=User.objects.create_user(
+            username="alice", password="pw", email="alice@example.com"
+        ),
+    )
+    bob = Responsible.objects.create(
+        last_name="Bob", first_name="Test", employee_id="E2"
+    )
+    Location.objects.create(name="Desk", responsible=alice)
+    return {"alice": alice, "bob": bob}
+
+
+def _write(tmp_path: Path, name: str, content: str) -> Path:
+    path = tmp_path / name
+    path.write_text(content, encoding="utf-8")
+    return path
+
+
+def _row(number: str, responsible: str = "E1", location: str = "Office") -> str:
+    return (
+        f"{number},SN-{number},Laptops,Laptop,ACME,Model X,"
+        f"In use,{responsible},{location}\n"
+    )
+
+
+@pytest.mark.django_db
+def test_import_stocktake_creates_items_operations_and_current_state(
+    tmp_path, stocktake_catalog, django_capture_on_commit_callbacks
+) -> None:
+    path = _write(
+        tmp_path,
+        "stock.csv",
+        _HEADER + _row("ST-1") + _row("ST-2", location="Desk") + _row("ST-3", "E2"),
+    )
+    mail.outbox.clear()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        report = import_stocktake(read_stocktake_rows(path), batch_size=2)
+
+    assert report.errors == []
+    assert report.rows_read == report.items_created == 3
+    assert Operation.objects.count() == 3
+    assert ItemCurrentState.objects.count() == 3
+    assert set(Item.objects.owned_by(stocktake_catalog["alice"])) == set(
+        Item.objects.filter(inventory_number__in=["ST-1", "ST-2"])
+    )
+    item = Item.objects.get(inventory_number="ST-2")
+    assert item.current_operation is not None
+    assert item.current_operation.location.name == "Desk"
+    assert item.search_text == item.build_search_text()
+    # One summary email for Alice's batch; Bob has no linked user.
+    assert len(mail.outbox) == 1
+    assert mail.outbox[0].to == ["alice@example.com"]
+    assert "2" in mail.outbox[0].subject
+    assert not NotificationOutbox.objects.exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_import_stocktake_notifies_through_the_outbox(
+    tmp_path, stocktake_catalog
+) -> None:
+    """A rolled-back import sends nothing; digest recipients get digest lines."""
+    path = _write(tmp_path, "stock.csv", _HEADER + _row("ST-1") + _row("ST-2"))
+    mail.outbox.clear()
+
+    with pytest.raises(RuntimeError), transaction.atomic():
+        import_stocktake(read_stocktake_rows(path))
+        raise RuntimeError("abort")
+
+    assert not Item.objects.exists()
+    assert not NotificationOutbox.objects.exists()
+    assert len(mail.outbox) == 0
+
+    Responsible.objects.filter(pk=stocktake_catalog["alice"].pk).update(
+        email_digest=True
+    )
+    import_stocktake(read_stocktake_rows(path))
+
+    assert len(mail.outbox) == 0
+    assert NotificationOutbox.objects.filter(kind="operation_imported").count() == 2
+    NotificationOutbox.objects.update(created_at=timezone.now() - timedelta(days=1))
+    assert drain_notification_outbox() == 1
+    (digest,) = mail.outbox
+    assert all(f"ST-{n}" in digest.body for n in (1, 2))
+
+
+@pytest.mark.django_db
+def test_import_stocktake_reports_rejected_rows_by_line(
+    tmp_path, stocktake_catalog, inventory_test_device
+) -> None:
+    Item.objects.create(
+        inventory_number="ST-OLD",
+        device=inventory_test_device,
+    )
+    path = _write(
+        tmp_path,
+        "stock.csv",
+        _HEADER
+        + _row("ST-1")
+        + _row("ST-1")
+        + _row("ST-OLD")
+        + _row("ST-2", "E9")
+        + _row("ST-3", "E2", "Desk")
+        + "ST-4,,Laptops,Laptop,ACME,Unknown,In use,E1,Office\n"
+        + ",,,,,,,,\n",
+    )
+
+    report = import_stocktake(read_stocktake_rows(path), notify=False)
+
+    assert report.items_created == 1
+    assert [error.line for error in report.errors] == [3, 4, 5, 6, 7, 8]
+    assert "Duplicate" in report.errors[0].message
+    assert "exists" in report.errors[1].message
+    assert "employee ID" in report.errors[2].message
+    # Alice's personal location is not available to Bob.
+    assert "location" in report.errors[3].message
+    assert "device" in report.errors[4].message
+    assert "Missing" in report.errors[5].message
+
+
+@pytest.mark.django_db
+def test_import_stocktake_rejects_unknown_status_and_ambiguous_employee_id(
+    tmp_path, stocktake_catalog
+) -> None:
+    for last_name in ("Twin", "Other twin"):
+        Responsible.objects.create(
+            last_name=last_name, first_name="Test", employee_id="E3"
+        )
+    path = _write(
+        tmp_path,
+        "stock.csv",
+        _HEADER
+        + "ST-1,,Laptops,Laptop,ACME,Model X,Lost,E1,Office\n"
+        + _row("ST-2", "E3"),
+    )
+
+    report = import_stocktake(read_stocktake_rows(path), notify=False)
+
+    assert report.items_created == 0
+    assert [error.line for error in report.errors] == [2, 3]
+    assert "Unknown status: Lost" in report.errors[0].message
+    assert "several responsibles" in report.errors[1].message
+
+
+@pytest.mark.django_db
+def test_import_stocktake_reports_batches_rejected_by_the_database(
+    tmp_path, stocktake_catalog
+) -> None:
+    path = _write(tmp_path, "stock.csv", _HEADER + _row("ST-1") + _row("ST-2"))
+
+    with patch(
+        "inventory.stocktake._write_batch", side_effect=DatabaseError("conflict")
+    ):
+        report = import_stocktake(read_stocktake_rows(path), notify=False)
+
+    assert report.items_created == 0
+    assert [error.line for error in report.errors] == [2, 3]
+    assert "Batch rejected by the database: conflict" in report.errors[0].message
+    assert not Item.objects.exists()
+
+
+@pytest.mark.django_db
+def test_import_stocktake_reads_jsonl_and_supports_dry_run(
+    tmp_path, stocktake_catalog
+) -> None:
+    row = {
+        "inventory_number": "ST-J1",
+        "category": "Laptops",
+        "type": "Laptop",
+        "manufacturer": "ACME",
+        "model": "Model X",
+        "status": "In use",
+        "responsible": "E1",
+        "location": "Office",
+    }
+    path = _write(tmp_path, "stock.jsonl", json.dumps(row) + "\n\nnot json\n")
+
+    report = import_stocktake(read_stocktake_rows(path), dry_run=True)
+
+    assert report.rows_read == 2
+    assert [error.line for error in report.errors] == [3]
+    assert not Item.objects.filter(inventory_number="ST-J1").exists()
+
+
+@pytest.mark.django_db
+def test_import_stocktake_command_reports_summary_and_errors(
+    tmp_path, stocktake_catalog
+) -> None:
+    good = _write(tmp_path, "good.csv", _HEADER + _row("ST-C1"))
+    out = StringIO()
+    call_command("import_stocktake", str(good), "--no-notify", stdout=out)
+    assert "Imported 1 of 1 row(s)" in out.getvalue()
+
+    bad = _write(tmp_path, "bad.csv", _HEADER + _row("ST-C1"))
+    err = StringIO()
+    with pytest.raises(CommandError, match="1 row\\(s\\) rejected"):
+        call_command("import_stocktake", str(bad), stderr=err)
+    assert "line 2:" in err.getvalue()
+
+    with pytest.raises(CommandError, match="Unsupported"):
+        call_command("import_stocktake", str(_write(tmp_path, "x.txt", "")))
+    with pytest.raises(CommandError, match="No such file"):
+        call_command("import_stocktake", str(tmp_path / "missing.csv"))
+
+
+@pytest.mark.django_db
+def test_import_stocktake_command_caps_the_error_report(
+    tmp_path, stocktake_catalog
+) -> None:
+    rows = "".join(_row(f"ST-X{n}", responsible="E9") for n in range(52))
+    path = _write(tmp_path, "many.csv", _HEADER + rows)
+    err = StringIO()
+    with pytest.raises(CommandError, match="52 row\\(s\\) rejected"):
+        call_command("import_stocktake", str(path), stderr=err)
+    assert err.getvalue().count("line ") == 50
+    assert "... 2 more rejected row(s)" in err.getvalue()
+
+    with pytest.raises(CommandError, match="--batch-size must be positive"):
+        call_command("import_stocktake", str(path), "--batch-size", "0")
@@ -0,0 +1,167 @@
+"""Tests for the synthetic inventory generator."""
+
+import random
+from dataclasses import replace
+from io import StringIO
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.utils import timezone
+
+from catalogs.models import Location, Responsible
+from inventory.models import (
+    Item,
+    ItemCurrentState,
+    NotificationOutbox,
+    Operation,
+    PendingTransfer,
+)
+from inventory.synthetic_data import (
+    SyntheticSpec,
+    _Catalog,
+    _Generator,
+    generate_dataset,
+)
+
+SPEC = SyntheticSpec(
+    responsibles=6,
+    items=25,
+    min_operations=2,
+    max_operations=6,
+    handoff_ratio=0.5,
+    active_transfers=0.2,
+    expired_transfers=0.2,
+    users=2,
+    statuses=3,
+    devices=4,
+    global_locations=2,
+    locations_per_responsible=1,
+    days=30,
+    seed=7,
+)
+
+
+@pytest.mark.django_db
+def test_generate_dataset_writes_consistent_rows_without_notifications() -> None:
+    before = timezone.now()
+
+    report = generate_dataset(SPEC, batch_size=10)
+
+    assert Item.objects.count() == report.rows["inventory.Item"] == 25
+    assert Responsible.objects.filter(employee_id__startswith="SYN-").count() == 6
+    assert User.objects.filter(username__startswith="syn-user-").count() == 2
+    assert not any(user.has_usable_password() for user in User.objects.all())
+    assert Location.objects.filter(responsible__isnull=False).count() == 6
+    operations = Operation.objects.count()
+    assert operations == report.rows["inventory.Operation"]
+    assert 2 * 25 <= operations <= 6 * 25
+    assert list(ItemCurrentState.iter_mismatches()) == []
+    assert not NotificationOutbox.objects.exists()
+
+    # Timestamps are historical and every journal starts after its item.
+    assert Item.objects.filter(created_at__lt=before).count() == 25
+    for operation in Operation.objects.select_related("item"):
+        assert operation.item.created_at <= operation.created_at <= before
+        assert operation.updated_at == operation.created_at
+
+    transfers = PendingTransfer.objects.all()
+    assert transfers.count() == report.rows["inventory.PendingTransfer"]
+    accepted = transfers.filter(accepted_at__isnull=False)
+    assert accepted.exists()
+    on_hand = Location.on_hand_id()
+    for transfer in accepted:
+        assert Operation.objects.filter(
+            item_id=transfer.item_id,
+            responsible_id=transfer.to_responsible_id,
+            location_id=on_hand,
+            created_at=transfer.accepted_at,
+        ).exists()
+    expired = transfers.filter(expired_at__isnull=False)
+    assert expired.exists()
+    assert all(t.expired_at == t.expires_at <= before for t in expired)
+    active = list(PendingTransfer.objects.offers_visible_in_ui())
+    assert active
+    assert len(active) == transfers.open().count()
+    for transfer in active:
+        assert (
+            ItemCurrentState.objects.get(item_id=transfer.item_id).responsible_id
+            == transfer.from_responsible_id
+        )
+    assert Item.objects.apply_search("syn-000000003").get().inventory_number == (
+        "SYN-000000003"
+    )
+
+
+@pytest.mark.django_db
+def test_generate_dataset_is_deterministic_per_seed() -> None:
+    catalog = _Catalog(SPEC, random.Random(SPEC.seed))
+
+    def journals(spec: SyntheticSpec) -> list[tuple]:
+        items, operations, offers = _Generator(spec, catalog).batch(0, 10)
+        return [
+            (
+                item.inventory_number,
+                item.serial_number,
+                [(op.responsible_id, op.location_id) for op in journal],
+                [(t.from_responsible_id, t.to_responsible_id) for t in item_offers],
+            )
+            for item, journal, item_offers in zip(items, operations, offers)
+        ]
+
+    assert journals(SPEC) == journals(SPEC)
+    assert journals(SPEC) != journals(replace(SPEC, seed=8))
+
+
+def test_spec_validation_reports_every_problem() -> None:
+    assert SPEC.validate() == []
+    errors = SyntheticSpec(
+        responsibles=1,
+        items=-1,
+        min_operations=3,
+        max_operations=2,
+        users=5,
+        handoff_ratio=2,
+        active_transfers=0.7,
+        expired_transfers=0.7,
+    ).validate()
+    assert errors == [
+        "responsibles must be at least 2 for handoffs",
+        "items must not be negative",
+        "operations need 1 <= min_operations <= max_operations",
+        "users must not exceed responsibles",
+        "handoff_ratio must be between 0 and 1",
+        "active_transfers and expired_transfers must be non-negative "
+        "and add up to at most 1",
+    ]
+
+
+@pytest.mark.django_db
+def test_generate_synthetic_inventory_command() -> None:
+    out = StringIO()
+
+    call_command(
+        "generate_synthetic_inventory",
+        "--responsibles",
+        "3",
+        "--items",
+        "4",
+        "--max-operations",
+        "3",
+        "--users",
+        "1",
+        "--expired-transfers",
+        "0.5",
+        stdout=out,
+    )
+
+    assert "inventory.Item: 4" in out.getvalue()
+    assert "Generated " in out.getvalue()
+    assert Item.objects.count() == 4
+    with pytest.raises(CommandError, match="already exist"):
+        call_command("generate_synthetic_inventory", "--items", "1")
+    with pytest.raises(CommandError, match="items must not be negative; batch_size"):
+        call_command(
+            "generate_synthetic_inventory", "--items", "-1", "--batch-size", "0"
+        )
@@ -0,0 +1,139 @@
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth.models import User
+from django.core import mail
+from django.utils import timezone
+from django_q.models import Schedule
+
+from catalogs.models import Responsible
+from inventory.models import Item, NotificationOutbox, Operation, PendingTransfer
+from inventory.transfer_expiry import (
+    _EXPIRY_TASK,
+    ensure_expiry_schedule,
+    expire_pending_transfers,
+)
+
+
+def _responsible(username: str) -> Responsible:
+    user = User.objects.create_user(
+        username=username, password="pw", email=f"{username}@example.com"
+    )
+    return Responsible.objects.create(
+        last_name=username.title(), first_name="Expiry", user=user
+    )
+
+
+def _offers(device, status_location, count: int) -> list[PendingTransfer]:
+    sender = _responsible("exp_sender")
+    receiver = _responsible("exp_receiver")
+    items = []
+    for n in range(count):
+        item = Item.objects.create(inventory_number=f"EXP-{n}", device=device)
+        Operation.objects.create(
+            item=item,
+            status=status_location["status"],
+            responsible=sender,
+            location=status_location["location"],
+        )
+        items.append(item)
+    return PendingTransfer.create_offers(
+        items=items,
+        from_responsible=sender,
+        to_responsible=receiver,
+        expires_at=timezone.now() + timedelta(hours=1),
+    )
+
+
+def _lapse(transfers: list[PendingTransfer]) -> None:
+    """Move deadlines into the past (``save()`` rejects that)."""
+
+    PendingTransfer.objects.filter(pk__in=[t.pk for t in transfers]).update(
+        expires_at=timezone.now() - timedelta(minutes=1)
+    )
+
+
+@pytest.mark.django_db
+def test_sweep_closes_lapsed_offers_in_batches(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    transfers = _offers(inventory_test_device, inventory_test_status_location, 5)
+    _lapse(transfers[:4])
+    PendingTransfer.objects.filter(pk=transfers[0].pk).update(
+        cancelled_at=timezone.now()
+    )
+    NotificationOutbox.objects.all().delete()
+
+    assert expire_pending_transfers(batch_size=2) == 3
+
+    expired = PendingTransfer.objects.filter(expired_at__isnull=False)
+    assert sorted(expired.values_list("pk", flat=True)) == [
+        t.pk for t in transfers[1:4]
+    ]
+    assert all(t.expired_at == t.expires_at for t in expired)
+    assert list(PendingTransfer.objects.open()) == [transfers[4]]
+    sender, receiver = transfers[0].from_responsible, transfers[0].to_responsible
+    assert sorted(
+        NotificationOutbox.objects.values_list("kind", "object_id", "recipient_id")
+    ) == sorted(
+        (NotificationOutbox.Kind.TRANSFER_BATCH_EXPIRED, t.pk, party.pk)
+        for t in transfers[1:4]
+        for party in (sender, receiver)
+    )
+    assert expire_pending_transfers() == 0
+
+
+@pytest.mark.django_db
+def test_expire_offers_skips_offers_whose_deadline_moved(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    transfers = _offers(inventory_test_device, inventory_test_status_location, 2)
+    _lapse(transfers[:1])
+
+    expired = PendingTransfer.expire_offers([t.pk for t in transfers])
+
+    assert [t.pk for t in expired] == [transfers[0].pk]
+    assert not expired[0].is_active
+    transfers[1].refresh_from_db()
+    assert transfers[1].expired_at is None
+    assert transfers[1].is_active
+
+
+@pytest.mark.django_db(transaction=True)
+def test_sweep_sends_one_expiry_email_per_party(
+    inventory_test_device, inventory_test_status_location
+) -> None:
+    transfers = _offers(inventory_test_device, inventory_test_status_location, 2)
+    _lapse(transfers)
+    mail.outbox.clear()
+
+    expire_pending_transfers()
+
+    assert sorted(msg.to[0] for msg in mail.outbox) == [
+        "exp_receiver@example.com",
+        "exp_sender@example.com",
+    ]
+    assert all("EXP-0" in msg.body and "EXP-1" in msg.body for msg in mail.outbox)
+
+
+@pytest.mark.django_db
+def test_expiry_schedule_follows_the_interval_setting(settings) -> None:
+    settings.INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES = 7
+    ensure_expiry_schedule(sender=None, using="default")
+    ensure_expiry_schedule(sender=None, using="default")
+
+    schedule = Schedule.objects.get(name=_EXPIRY_TASK)
+    assert schedule.func == _EXPIRY_TASK
+    assert (schedule.schedule_type, schedule.minutes) == (Schedule.MINUTES, 7)
+    assert schedule.repeats == -1
+    assert schedule.cluster is None
+
+    settings.INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES = 0
+    ensure_expiry_schedule(sender=None, using="default")
+
+    assert not Schedule.objects.filter(name=_EXPIRY_TASK).exists()
+
+
+@pytest.mark.django_db
+def test_migrate_creates_the_expiry_schedule() -> None:
+    assert Schedule.objects.filter(name=_EXPIRY_TASK, func=_EXPIRY_TASK).exists()
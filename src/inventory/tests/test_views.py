@@ -753,6 +753,42 @@ def test_item_history_for_former_owner_includes_only_one_handoff_after_last_mine
     assert b">c2<" not in response.content
 
 
+@pytest.mark.django_db
+@override_settings(INVENTORY_LIST_PAGE_SIZE=2)
+def test_item_history_paginates_operations_with_next_page_link() -> None:
+    user = User.objects.create_user(
+        username="hist-page", password="pw", email="hist-page@example.com"
+    )
+    responsible = Responsible.objects.create(
+        last_name="Page", first_name="Hist", user=user
+    )
+    status = Status.objects.create(name="In stock")
+    location = Location.objects.create(name="Moscow")
+    item = _make_item_with_operation(status, location, responsible, "INV-HIST-PG")
+    for note in ("second", "third"):
+        Operation.objects.create(
+            item=item,
+            status=status,
+            responsible=responsible,
+            location=location,
+            notes=note,
+        )
+
+    client = Client()
+    client.force_login(user)
+    url = reverse("inventory:item-history", kwargs={"item_id": item.pk})
+    response = client.get(url)
+    assert [op.notes for op in response.context["operations"]] == ["third", "second"]
+    next_page_query = response.context["next_page_query"]
+    assert next_page_query.startswith("?after=")
+    assert response.context["first_page_query"] == ""
+
+    response = client.get(url + next_page_query)
+    assert [op.notes for op in response.context["operations"]] == [""]
+    assert response.context["next_page_query"] == ""
+    assert response.context["first_page_query"] == "?"
+
+
 def _make_item_with_operation(
     status: "Status",
     location: "Location",
@@ -2829,8 +2865,8 @@ def test_accept_transfer_stale_baseline_goes_my_items_when_no_history_context(
     item.change_location(responsible=resp_sender, location=loc_b, notes="move")
 
     monkeypatch.setattr(
-        "inventory.views.transfer_views.resolve_item_history_context",
-        lambda *args, **kwargs: None,
+        "inventory.views.transfer_views.can_view_item_history",
+        lambda *args, **kwargs: False,
     )
 
     client = Client()
@@ -2923,3 +2959,186 @@ def test_item_history_includes_accept_journal_baseline_for_receiver() -> None:
     assert response.status_code == 200
     assert b"journal_head_operation_id" in response.content
     assert str(head).encode("utf-8") in response.content
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_creates_offers_for_selected_owned_items() -> None:
+    user_sender = User.objects.create_user(
+        username="sender", password="pw", email="sender@example.com"
+    )
+    user_receiver = User.objects.create_user(
+        username="receiver", password="pw", email="receiver@example.com"
+    )
+    resp_sender = Responsible.objects.create(
+        last_name="Sender", first_name="User", user=user_sender
+    )
+    resp_receiver = Responsible.objects.create(
+        last_name="Receiver", first_name="User", user=user_receiver
+    )
+    status = Status.objects.create(name="In use")
+    location = Location.objects.create(name="Home")
+    first = _make_item_with_operation(status, location, resp_sender, "INV-BULK-1")
+    second = _make_item_with_operation(status, location, resp_sender, "INV-BULK-2")
+    foreign = _make_item_with_operation(status, location, resp_receiver, "INV-BULK-3")
+
+    client = Client()
+    client.force_login(user_sender)
+    page = client.get("/transfers/bulk/?select=all")
+    assert page.status_code == 200
+    assert b"INV-BULK-1" in page.content and b"INV-BULK-3" not in page.content
+
+    missing = client.post(
+        "/transfers/bulk/", {"to_responsible_id": str(resp_receiver.pk)}
+    )
+    assert missing.status_code == 400
+
+    response = client.post(
+        "/transfers/bulk/",
+        {
+            "item_id": [str(first.pk), str(second.pk), str(foreign.pk), "x"],
+            "to_responsible_id": str(resp_receiver.pk),
+        },
+    )
+    assert response.status_code == 302
+    assert set(
+        PendingTransfer.objects.filter(to_responsible=resp_receiver).values_list(
+            "item_id", flat=True
+        )
+    ) == {first.pk, second.pk}
+    assert all(
+        offer.expires_at is not None
+        for offer in PendingTransfer.objects.filter(to_responsible=resp_receiver)
+    )
+
+
+@pytest.mark.django_db
+@override_settings(INVENTORY_PENDING_TRANSFER_EXPIRATION_HOURS=0)
+def test_bulk_transfer_offers_do_not_expire_when_expiration_is_off() -> None:
+    user_sender = User.objects.create_user(
+        username="sender", password="pw", email="sender@example.com"
+    )
+    resp_sender = Responsible.objects.create(
+        last_name="Sender", first_name="User", user=user_sender
+    )
+    resp_receiver = Responsible.objects.create(last_name="Receiver", first_name="User")
+    status = Status.objects.create(name="In use")
+    location = Location.objects.create(name="Home")
+    item = _make_item_with_operation(status, location, resp_sender, "INV-BULK-N")
+
+    client = Client()
+    client.force_login(user_sender)
+    response = client.post(
+        "/transfers/bulk/",
+        {"item_id": [str(item.pk)], "to_responsible_id": str(resp_receiver.pk)},
+    )
+
+    assert response.status_code == 302
+    offer = PendingTransfer.objects.get(item=item)
+    assert offer.expires_at is None
+
+
+@pytest.mark.django_db
+def test_accept_and_decline_transfers_handle_only_posted_incoming_offers() -> None:
+    user_sender = User.objects.create_user(
+        username="sender", password="pw", email="sender@example.com"
+    )
+    user_receiver = User.objects.create_user(
+        username="receiver", password="pw", email="receiver@example.com"
+    )
+    resp_sender = Responsible.objects.create(
+        last_name="Sender", first_name="User", user=user_sender
+    )
+    resp_receiver = Responsible.objects.create(
+        last_name="Receiver", first_name="User", user=user_receiver
+    )
+    status = Status.objects.create(name="In use")
+    location = Location.objects.create(name="Home")
+    items = [
+        _make_item_with_operation(status, location, resp_sender, f"INV-ALL-{n}")
+        for n in range(3)
+    ]
+    transfers = [
+        PendingTransfer.objects.create(
+            item=item, from_responsible=resp_sender, to_responsible=resp_receiver
+        )
+        for item in items
+    ]
+
+    client = Client()
+    client.force_login(user_receiver)
+    my_items = client.get("/")
+    assert b"/transfers/incoming/accept/" in my_items.content
+    assert client.get("/transfers/incoming/accept/").status_code == 404
+
+    accepted = client.post(
+        "/transfers/incoming/accept/",
+        {"transfer_id": [str(transfers[0].pk), str(transfers[1].pk)]},
+    )
+    assert accepted.status_code == 302
+    assert set(Item.objects.owned_by(resp_receiver)) == {items[0], items[1]}
+
+    # The sender cannot decline through the incoming batch endpoint.
+    sender_client = Client()
+    sender_client.force_login(user_sender)
+    sender_client.post(
+        "/transfers/incoming/decline/", {"transfer_id": [str(transfers[2].pk)]}
+    )
+    transfers[2].refresh_from_db()
+    assert transfers[2].is_active
+
+    declined = client.post(
+        "/transfers/incoming/decline/",
+        {"transfer_id": [str(t.pk) for t in transfers]},
+    )
+    assert declined.status_code == 302
+    transfers[2].refresh_from_db()
+    assert transfers[2].cancelled_at is not None
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_views_require_linked_responsible_and_post() -> None:
+    """Unlinked users get 404 everywhere; the batch decline endpoint is POST-only."""
+
+    unlinked = User.objects.create_user(
+        username="unlinked", password="pw", email="unlinked@example.com"
+    )
+    client = Client()
+    client.force_login(unlinked)
+
+    assert client.get("/transfers/bulk/").status_code == 404
+    assert client.post("/transfers/incoming/accept/").status_code == 404
+    assert client.post("/transfers/incoming/decline/").status_code == 404
+    assert client.get("/transfers/incoming/decline/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_bulk_transfer_reports_form_and_batch_errors() -> None:
+    user_sender = User.objects.create_user(
+        username="sender", password="pw", email="sender@example.com"
+    )
+    resp_sender = Responsible.objects.create(
+        last_name="Sender", first_name="User", user=user_sender
+    )
+    resp_receiver = Responsible.objects.create(last_name="Receiver", first_name="U")
+    status = Status.objects.create(name="In use")
+    location = Location.objects.create(name="Home")
+    item = _make_item_with_operation(status, location, resp_sender, "INV-BULK-ERR")
+
+    client = Client()
+    client.force_login(user_sender)
+    no_receiver = client.post("/transfers/bulk/", {"item_id": [str(item.pk)]})
+    assert no_receiver.status_code == 400
+    assert no_receiver.context["selected_item_ids"] == {item.pk}
+
+    with patch.object(
+        PendingTransfer,
+        "create_offers",
+        side_effect=ValidationError("Batch rejected", code="rejected"),
+    ):
+        rejected = client.post(
+            "/transfers/bulk/",
+            {"item_id": [str(item.pk)], "to_responsible_id": str(resp_receiver.pk)},
+        )
+    assert rejected.status_code == 400
+    assert b"Batch rejected" in rejected.content
+    assert not PendingTransfer.objects.filter(item=item).exists()
@@ -0,0 +1,74 @@
+"""
+Scheduled bulk expiry of lapsed transfer offers.
+
+Offers are hidden from the UI as soon as ``expires_at`` passes
+(``PendingTransferQuerySet.offers_visible_in_ui``), but only the sweep gives
+them a terminal state. Every ``INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES`` a
+django-q2 schedule runs :func:`expire_pending_transfers`. The sweep closes
+lapsed offers in batches with ``PendingTransfer.expire_offers``, under the
+same item locks as the other batch actions. Each batch queues one
+``transfer_batch_expired`` email per party. The closed rows then drop out of
+the partial indexes on open offers.
+
+:func:`ensure_expiry_schedule` keeps the schedule in line with the setting
+after every ``migrate``.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+from django_q.models import Schedule
+
+from inventory.models import PendingTransfer
+
+#: Offers locked, closed and notified per transaction.
+EXPIRY_BATCH_SIZE = 500
+
+_EXPIRY_TASK = "inventory.transfer_expiry.expire_pending_transfers"
+
+
+def expire_pending_transfers(batch_size: int = EXPIRY_BATCH_SIZE) -> int:
+    """Close every open offer past its ``expires_at``; return how many."""
+
+    due = (
+        PendingTransfer.objects.open()
+        .filter(expires_at__lte=timezone.now())
+        .order_by("pk")
+        .values_list("pk", flat=True)
+    )
+    expired = 0
+    while True:
+        ids = list(due[:batch_size])
+        if not ids:
+            break
+        expired += len(PendingTransfer.expire_offers(ids))
+        if len(ids) < batch_size:
+            break
+    return expired
+
+
+def ensure_expiry_schedule(sender: Any, using: str, **kwargs: Any) -> None:
+    """
+    Create, update or remove the sweep's schedule after ``migrate``.
+
+    Connected to ``post_migrate`` for the inventory app in
+    ``InventoryConfig.ready``. The schedule runs on the default queue.
+    """
+
+    schedules = Schedule.objects.using(using).filter(name=_EXPIRY_TASK)
+    minutes = settings.INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES
+    if minutes <= 0:
+        schedules.delete()
+        return
+    schedules.update_or_create(
+        name=_EXPIRY_TASK,
+        defaults={
+            "func": _EXPIRY_TASK,
+            "schedule_type": Schedule.MINUTES,
+            "minutes": minutes,
+            "repeats": -1,
+        },
+    )
@@ -23,6 +23,17 @@ urlpatterns = [
         views.create_transfer,
         name="create-transfer",
     ),
+    path("transfers/bulk/", views.bulk_transfer, name="bulk-transfer"),
+    path(
+        "transfers/incoming/accept/",
+        views.accept_transfers,
+        name="accept-transfers",
+    ),
+    path(
+        "transfers/incoming/decline/",
+        views.decline_transfers,
+        name="decline-transfers",
+    ),
     path(
         "transfers/<int:transfer_id>/accept/",
         views.accept_transfer,
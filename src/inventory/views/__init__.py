@@ -4,14 +4,24 @@ Inventory HTTP views (split by area; import from ``inventory.views`` for URLconf
 
 from .item_views import change_location, change_status, item_history
 from .list_views import my_items, previous_items
-from .transfer_views import accept_transfer, cancel_transfer, create_transfer
+from .transfer_views import (
+    accept_transfer,
+    accept_transfers,
+    bulk_transfer,
+    cancel_transfer,
+    create_transfer,
+    decline_transfers,
+)
 
 __all__ = [
     "accept_transfer",
+    "accept_transfers",
+    "bulk_transfer",
     "cancel_transfer",
     "change_location",
     "change_status",
     "create_transfer",
+    "decline_transfers",
     "item_history",
     "my_items",
     "previous_items",
@@ -5,6 +5,7 @@ HTTP-only helpers shared by inventory view modules (forms, template rendering).
 from typing import Any
 
 from django import forms
+from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
 
@@ -32,6 +33,38 @@ class CreateTransferForm(forms.Form):
         )
 
 
+#: Query parameter carrying the keyset cursor of the requested page.
+CURSOR_PARAM = "after"
+
+
+def pagination_context(request: HttpRequest, next_cursor: str | None) -> dict[str, str]:
+    """
+    Return query strings for the "First page" / "Next page" links.
+
+    ``next_cursor`` is the keyset cursor of the following page (``None`` on the
+    last page). Other parameters (search, list kind) are preserved; only the
+    cursor changes.
+    Empty strings mean the link is not shown.
+    """
+
+    context = {"first_page_query": "", "next_page_query": ""}
+    if request.GET.get(CURSOR_PARAM):
+        params = request.GET.copy()
+        params.pop(CURSOR_PARAM)
+        context["first_page_query"] = "?" + params.urlencode()
+    if next_cursor is not None:
+        params = request.GET.copy()
+        params[CURSOR_PARAM] = next_cursor
+        context["next_page_query"] = "?" + params.urlencode()
+    return context
+
+
+def posted_ids(request: HttpRequest, name: str) -> list[int]:
+    """Return the integer values posted under ``name``; others are ignored."""
+
+    return [int(raw) for raw in request.POST.getlist(name) if raw.strip().isdigit()]
+
+
 def render_transfer_form(
     request: HttpRequest,
     *,
@@ -58,3 +91,33 @@ def render_transfer_form(
     if error is not None:
         ctx["error"] = error
     return render(request, "inventory/transfer_create.html", ctx, status=status)
+
+
+def render_bulk_transfer_form(
+    request: HttpRequest,
+    *,
+    items: QuerySet[Item],
+    sender: Responsible,
+    query: str,
+    transfer_expiration_hours: int,
+    selected_item_ids: set[int],
+    notes: str,
+    selected_to_responsible_id: int | None,
+    error: str | None = None,
+    status: int = 200,
+) -> HttpResponse:
+    """Render the bulk transfer template (owned items with checkboxes)."""
+
+    ctx: dict[str, object] = {
+        "items": items,
+        "responsible": sender,
+        "responsibles": Responsible.transfer_receiver_candidates(sender),
+        "query": query,
+        "transfer_expiration_hours": transfer_expiration_hours,
+        "selected_item_ids": selected_item_ids,
+        "notes": notes,
+        "selected_to_responsible_id": selected_to_responsible_id,
+    }
+    if error is not None:
+        ctx["error"] = error
+    return render(request, "inventory/transfer_bulk.html", ctx, status=status)
@@ -8,9 +8,12 @@ from django.shortcuts import redirect, render
 from django.utils.translation import gettext_lazy as _
 
 from catalogs.models import Location, Responsible, Status
+from catalogs.request_helpers import request_responsible
 from inventory.models import Item, resolve_item_history_context
 from inventory.presentation import validation_error_user_message
 
+from .http_helpers import CURSOR_PARAM, pagination_context
+
 
 class ChangeLocationForm(forms.Form):
     location_id = forms.IntegerField(
@@ -50,13 +53,16 @@ def item_history(request: HttpRequest, *, item_id: int) -> HttpResponse:
     Display the operation history for a specific item.
 
     Access is restricted to the current owner, the receiver of an active
-    transfer offer, or former owners.
+    transfer offer, or former owners. Operations are shown newest first and
+    paginated with a keyset cursor in the ``after`` query parameter.
     """
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404  # pragma: no cover
 
-    ctx = resolve_item_history_context(responsible, item_id)
+    ctx = resolve_item_history_context(
+        responsible, item_id, cursor=request.GET.get(CURSOR_PARAM, "")
+    )
     if ctx is None:
         raise Http404
 
@@ -70,6 +76,7 @@ def item_history(request: HttpRequest, *, item_id: int) -> HttpResponse:
             "is_owner": ctx.is_owner,
             "pending_transfer": ctx.pending_transfer,
             "accept_journal_head_operation_id": ctx.accept_journal_head_operation_id,
+            **pagination_context(request, ctx.next_cursor),
         },
     )
 
@@ -82,7 +89,7 @@ def change_location(request: HttpRequest, *, item_id: int) -> HttpResponse:
     GET: Display the location change form.
     POST: Create a new operation with the updated location.
     """
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404
 
@@ -181,7 +188,7 @@ def change_status(request: HttpRequest, *, item_id: int) -> HttpResponse:
     GET: Display the status change form.
     POST: Create a new operation with the updated status.
     """
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404
 
@@ -4,13 +4,15 @@ from django.contrib.auth.decorators import login_required
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect, render
 
-from catalogs.models import Responsible
+from catalogs.request_helpers import request_responsible
 from inventory.models import (
     build_my_items_page_data,
     build_previous_items_page_data,
     parse_my_items_list_kind,
 )
 
+from .http_helpers import CURSOR_PARAM, pagination_context
+
 
 @login_required
 def my_items(request: HttpRequest) -> HttpResponse:
@@ -18,25 +20,28 @@ def my_items(request: HttpRequest) -> HttpResponse:
     Display items currently owned by the user and active transfer offers.
 
     Supports searching and filtering by transfer kind (incoming, outgoing, owned).
+    Cards are paginated with a keyset cursor in the ``after`` query parameter.
     """
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         return redirect("common:profile")
 
     query = request.GET.get("q", "")
     list_kind = parse_my_items_list_kind(request.GET.get("kind", ""))
     page = build_my_items_page_data(responsible, query=query, list_kind=list_kind)
+    window = page.window(request.GET.get(CURSOR_PARAM, ""))
     return render(
         request,
         "inventory/my_items.html",
         {
             "responsible": responsible,
-            "items": page.items,
+            "items": window.rows["items"],
             "query": query,
             "list_kind": list_kind,
-            "incoming_transfers": page.incoming_transfers,
-            "outgoing_transfers": page.outgoing_transfers,
+            "incoming_transfers": window.rows["incoming_transfers"],
+            "outgoing_transfers": window.rows["outgoing_transfers"],
             "show_search": page.has_any,
+            **pagination_context(request, window.next_cursor),
         },
     )
 
@@ -47,23 +52,25 @@ def previous_items(request: HttpRequest) -> HttpResponse:
     Display items previously held by the user but no longer owned.
 
     Includes items that were once in the user's possession and any active
-    transfer offers for those items.
+    transfer offers for those items. Paginated like :func:`my_items`.
     """
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         return redirect("common:profile")
 
     query = request.GET.get("q", "")
     page = build_previous_items_page_data(responsible, query=query)
+    window = page.window(request.GET.get(CURSOR_PARAM, ""))
     return render(
         request,
         "inventory/previous_items.html",
         {
             "responsible": responsible,
-            "items": page.items,
+            "items": window.rows["items"],
             "query": query,
-            "incoming_transfers": page.incoming_transfers,
-            "outgoing_transfers": page.outgoing_transfers,
+            "incoming_transfers": window.rows["incoming_transfers"],
+            "outgoing_transfers": window.rows["outgoing_transfers"],
             "show_search": page.has_any,
+            **pagination_context(request, window.next_cursor),
         },
     )
@@ -1,4 +1,4 @@
-"""Pending transfer create / accept / cancel views."""
+"""Pending transfer create / accept / cancel views (single and batch)."""
 
 import logging
 from datetime import timedelta
@@ -10,18 +10,26 @@ from django.http import Http404, HttpRequest, HttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
 from django.utils.translation import gettext as _
+from django.utils.translation import ngettext
 
 from catalogs.models import Responsible
+from catalogs.request_helpers import request_responsible
 from inventory.models import (
     Item,
     PendingTransfer,
+    build_my_items_page_data,
+    can_view_item_history,
     pending_transfer_expiration_hours,
-    resolve_item_history_context,
 )
 from inventory.models.operation import Operation
 from inventory.presentation import validation_error_user_message
 
-from .http_helpers import CreateTransferForm, render_transfer_form
+from .http_helpers import (
+    CreateTransferForm,
+    posted_ids,
+    render_bulk_transfer_form,
+    render_transfer_form,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +44,7 @@ def _redirect_with_message(
 ) -> HttpResponse:
     """Set a flash message and redirect to a page the user can navigate from."""
     getattr(messages, level)(request, message)
-    if (
-        item_id is not None
-        and resolve_item_history_context(responsible, item_id) is not None
-    ):
+    if item_id is not None and can_view_item_history(responsible, item_id):
         return redirect("inventory:item-history", item_id=item_id)
     return redirect("inventory:my-items")
 
@@ -54,7 +59,7 @@ def create_transfer(request: HttpRequest, *, item_id: int) -> HttpResponse:
     Only the current owner may initiate or update a transfer.
     """
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404
 
@@ -195,7 +200,7 @@ def accept_transfer(request: HttpRequest, *, transfer_id: int) -> HttpResponse:
     if request.method != "POST":
         raise Http404
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404
 
@@ -281,7 +286,7 @@ def cancel_transfer(request: HttpRequest, *, transfer_id: int) -> HttpResponse:
     if request.method != "POST":
         raise Http404
 
-    responsible = Responsible.linked_profile_for_user(request.user)
+    responsible = request_responsible(request)
     if responsible is None:
         raise Http404
 
@@ -312,3 +317,181 @@ def cancel_transfer(request: HttpRequest, *, transfer_id: int) -> HttpResponse:
         return redirect("inventory:item-history", item_id=transfer.item_id)
     messages.success(request, _("Transfer offer closed."))
     return redirect("inventory:item-history", item_id=transfer.item_id)
+
+
+@login_required
+def bulk_transfer(request: HttpRequest) -> HttpResponse:
+    """
+    Offer many owned items to one receiver at once (e.g. when someone leaves).
+
+    GET: List owned items without an active offer; ``?select=all`` pre-checks
+    every item. POST: Create all selected offers in one transaction via
+    :meth:`PendingTransfer.create_offers`; the receiver gets one email.
+    """
+
+    responsible = request_responsible(request)
+    if responsible is None:
+        raise Http404
+
+    query = request.GET.get("q", "")
+    items = build_my_items_page_data(responsible, query=query, list_kind="owned").items
+    transfer_expiration_hours = pending_transfer_expiration_hours()
+
+    if request.method != "POST":
+        return render_bulk_transfer_form(
+            request,
+            items=items,
+            sender=responsible,
+            query=query,
+            transfer_expiration_hours=transfer_expiration_hours,
+            selected_item_ids=(
+                {item.pk for item in items}
+                if request.GET.get("select") == "all"
+                else set()
+            ),
+            notes="",
+            selected_to_responsible_id=None,
+        )
+
+    selected_ids = posted_ids(request, "item_id")
+    selected_items = list(items.filter(pk__in=selected_ids))
+    form = CreateTransferForm(request.POST, sender=responsible)
+    to_responsible: Responsible | None = None
+    if not form.is_valid():
+        error = str(form.errors.get("to_responsible_id", [""])[0])
+    else:
+        to_responsible = form.cleaned_data["to_responsible_id"]
+        error = _("Select at least one item.")
+
+    if to_responsible is not None and selected_items:
+        expires_at = None
+        if transfer_expiration_hours > 0:
+            expires_at = timezone.now() + timedelta(hours=transfer_expiration_hours)
+        try:
+            PendingTransfer.create_offers(
+                items=selected_items,
+                from_responsible=responsible,
+                to_responsible=to_responsible,
+                expires_at=expires_at,
+                notes=form.cleaned_data["notes"],
+            )
+        except ValidationError as exc:
+            error = validation_error_user_message(exc)
+        else:
+            count = len(selected_items)
+            messages.success(
+                request,
+                ngettext(
+                    "%(count)d transfer offer submitted.",
+                    "%(count)d transfer offers submitted.",
+                    count,
+                )
+                % {"count": count},
+            )
+            return redirect("inventory:my-items")
+
+    return render_bulk_transfer_form(
+        request,
+        items=items,
+        sender=responsible,
+        query=query,
+        transfer_expiration_hours=transfer_expiration_hours,
+        selected_item_ids=set(selected_ids),
+        notes=form.cleaned_data.get("notes", ""),
+        selected_to_responsible_id=(
+            to_responsible.pk if to_responsible is not None else None
+        ),
+        error=error,
+        status=400,
+    )
+
+
+def _incoming_transfer_ids(request: HttpRequest, responsible: Responsible) -> list[int]:
+    """Posted ``transfer_id`` values limited to offers addressed to ``responsible``."""
+
+    return list(
+        PendingTransfer.objects.filter(
+            pk__in=posted_ids(request, "transfer_id"), to_responsible=responsible
+        ).values_list("pk", flat=True)
+    )
+
+
+@login_required
+def accept_transfers(request: HttpRequest) -> HttpResponse:
+    """
+    Accept every posted incoming offer in one transaction.
+
+    The My items page posts the ids of the incoming offers it shows, so offers
+    that arrived after the page was loaded are never accepted unseen. Offers
+    that can no longer be accepted are skipped and reported. Requires POST.
+    """
+
+    if request.method != "POST":
+        raise Http404
+
+    responsible = request_responsible(request)
+    if responsible is None:
+        raise Http404
+
+    transfer_ids = _incoming_transfer_ids(request, responsible)
+    accepted = PendingTransfer.accept_offers(transfer_ids)
+    _batch_result_messages(
+        request,
+        done=len(accepted),
+        skipped=len(transfer_ids) - len(accepted),
+        done_message=ngettext(
+            "%(count)d transfer accepted.",
+            "%(count)d transfers accepted.",
+            len(accepted),
+        ),
+    )
+    return redirect("inventory:my-items")
+
+
+@login_required
+def decline_transfers(request: HttpRequest) -> HttpResponse:
+    """
+    Decline every posted incoming offer in one transaction.
+
+    Same input and skipping rules as :func:`accept_transfers`. Requires POST.
+    """
+
+    if request.method != "POST":
+        raise Http404
+
+    responsible = request_responsible(request)
+    if responsible is None:
+        raise Http404
+
+    transfer_ids = _incoming_transfer_ids(request, responsible)
+    declined = PendingTransfer.cancel_offers(transfer_ids)
+    _batch_result_messages(
+        request,
+        done=len(declined),
+        skipped=len(transfer_ids) - len(declined),
+        done_message=ngettext(
+            "%(count)d transfer offer declined.",
+            "%(count)d transfer offers declined.",
+            len(declined),
+        ),
+    )
+    return redirect("inventory:my-items")
+
+
+def _batch_result_messages(
+    request: HttpRequest, *, done: int, skipped: int, done_message: str
+) -> None:
+    """Flash the outcome of a batch accept/decline."""
+
+    if done:
+        messages.success(request, done_message % {"count": done})
+    if skipped:
+        messages.warning(
+            request,
+            ngettext(
+                "%(count)d transfer offer is no longer active and was skipped.",
+                "%(count)d transfer offers are no longer active and were skipped.",
+                skipped,
+            )
+            % {"count": skipped},
+        )
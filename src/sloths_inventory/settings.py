@@ -10,10 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import importlib.util
 import os
 from pathlib import Path
 
 import environ
+from django.core.exceptions import ImproperlyConfigured
 
 env = environ.Env()
 # reading .env file
@@ -101,6 +103,17 @@ INVENTORY_PENDING_TRANSFER_EXPIRATION_HOURS = _env_int(
     "INVENTORY_PENDING_TRANSFER_EXPIRATION_HOURS", default=168
 )
 
+# Minutes between runs of the django-q2 sweep that closes lapsed offers in bulk
+# and notifies both parties (``inventory.transfer_expiry``). Zero removes the
+# schedule at the next ``migrate``.
+INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES = _env_int(
+    "INVENTORY_TRANSFER_EXPIRY_INTERVAL_MINUTES", default=5
+)
+
+# Cards per page on "My items" and "Previously held" (keyset pagination: the URL
+# cursor carries the last row's sort key, so deep pages cost the same as the first).
+INVENTORY_LIST_PAGE_SIZE = _env_int("INVENTORY_LIST_PAGE_SIZE", default=50)
+
 
 # Application definition
 
@@ -124,6 +137,8 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
+    "common.request_timing.RequestTimingMiddleware",
+    "common.metrics.MetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.locale.LocaleMiddleware",
     "common.timezone.TimezoneMiddleware",
@@ -134,14 +149,35 @@ MIDDLEWARE = [
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# The session user load joins the linked ``Responsible`` (one query per request for
+# ``request.user`` and ``request_responsible()``). Only one backend is listed: a
+# second ``ModelBackend`` would check every failed password twice. Sessions created
+# by ``ModelBackend`` before the switch name a backend that is no longer listed, so
+# those users log in once more.
+AUTHENTICATION_BACKENDS = [
+    "catalogs.backends.ResponsibleModelBackend",
+]
+
 ROOT_URLCONF = "sloths_inventory.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [BASE_DIR / "templates"],
-        "APP_DIRS": True,
         "OPTIONS": {
+            # Explicit cached loader (Django's default, spelled out so it is not
+            # lost when options change): every process, including the django-q2
+            # cluster, compiles each template once. With DEBUG the cached loader
+            # is reset by the autoreloader when a template changes.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
             "context_processors": [
                 "django.template.context_processors.request",
                 "django.contrib.auth.context_processors.auth",
@@ -153,6 +189,26 @@ TEMPLATES = [
     },
 ]
 
+# Per-request query counts and DB / template / view / total time, returned in a
+# ``Server-Timing`` header and logged (``common.request_timing``). Requests
+# slower than REQUEST_TIMING_SLOW_MS are logged as warnings with their
+# REQUEST_TIMING_SLOW_QUERIES slowest statements. Off: the middleware drops out
+# of the chain and templates render through the stock backend.
+REQUEST_TIMING = _env_bool("REQUEST_TIMING", default=False)
+REQUEST_TIMING_SLOW_MS = _env_int("REQUEST_TIMING_SLOW_MS", default=500)
+REQUEST_TIMING_SLOW_QUERIES = _env_int("REQUEST_TIMING_SLOW_QUERIES", default=5)
+if REQUEST_TIMING:
+    TEMPLATES[0]["BACKEND"] = "common.request_timing.TimedDjangoTemplates"
+
+# Prometheus metrics at /health/metrics (``common.metrics``). Every web and
+# qcluster process writes its counters to METRICS_DIR (at most every
+# METRICS_FLUSH_SECONDS) so the endpoint can add them up; without a directory
+# only the answering process is reported. Off: nothing is recorded and the
+# endpoint answers 404.
+METRICS = _env_bool("METRICS", default=False)
+METRICS_DIR = env.str("METRICS_DIR", default="")
+METRICS_FLUSH_SECONDS = _env_float("METRICS_FLUSH_SECONDS", default=5.0)
+
 WSGI_APPLICATION = "sloths_inventory.wsgi.application"
 
 
@@ -167,9 +223,30 @@ DATABASES = {
         "PASSWORD": env.str("DATABASE_PASSWORD", default=""),
         "HOST": env.str("DATABASE_HOST", default=""),
         "PORT": _env_int("DATABASE_PORT", default=5432),
+        # Keep connections open between requests and django-q2 tasks instead
+        # of reconnecting every time; a health check before reuse drops
+        # connections the server (or a proxy) has closed.
+        "CONN_MAX_AGE": _env_int("DATABASE_CONN_MAX_AGE", default=60),
+        "CONN_HEALTH_CHECKS": _env_bool("DATABASE_CONN_HEALTH_CHECKS", default=True),
+        "OPTIONS": {},
     }
 }
 
+# psycopg 3 connection pool (requires ``psycopg[pool]`` instead of
+# ``psycopg2-binary``). Django refuses pooling with persistent connections, so
+# the pool replaces CONN_MAX_AGE.
+if _env_bool("DATABASE_POOL", default=False):
+    if importlib.util.find_spec("psycopg_pool") is None:
+        raise ImproperlyConfigured(
+            "DATABASE_POOL=1 needs the psycopg_pool package (install psycopg[pool])."
+        )
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"]["OPTIONS"]["pool"] = {
+        "min_size": _env_int("DATABASE_POOL_MIN_SIZE", default=2),
+        "max_size": _env_int("DATABASE_POOL_MAX_SIZE", default=10),
+        "timeout": _env_float("DATABASE_POOL_TIMEOUT", default=10.0),
+    }
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -274,6 +351,29 @@ EMAIL_RETRY_BASE_DELAY_SECONDS = _env_float(
     "EMAIL_RETRY_BASE_DELAY_SECONDS", default=60.0
 )
 EMAIL_RETRY_BACKOFF_FACTOR = _env_float("EMAIL_RETRY_BACKOFF_FACTOR", default=2.0)
+# Batched async delivery: coalesce messages queued within the window and send
+# each batch over one SMTP connection (see common.email_backends).
+EMAIL_BATCH_DELIVERY = _env_bool("EMAIL_BATCH_DELIVERY", default=True)
+EMAIL_BATCH_WINDOW_SECONDS = _env_float("EMAIL_BATCH_WINDOW_SECONDS", default=5.0)
+EMAIL_BATCH_SIZE = _env_int("EMAIL_BATCH_SIZE", default=200)
+# Responsibles with ``email_digest`` get one summary email per interval instead
+# of one email per inventory change (see inventory.notifications).
+NOTIFICATION_DIGEST_INTERVAL_MINUTES = _env_int(
+    "NOTIFICATION_DIGEST_INTERVAL_MINUTES", default=60
+)
+
+# Gunicorn worker model for ``manage.py gunicorn`` / ``manage.py start`` (see
+# common.web_server). 0 workers: derived from the CPU count; 0 threads: 4 per
+# gthread worker. ``uvicorn`` serves sloths_inventory.asgi instead of WSGI.
+GUNICORN_WORKER_CLASS = env.str("GUNICORN_WORKER_CLASS", default="gthread")
+GUNICORN_WORKERS = _env_int("GUNICORN_WORKERS", default=0)
+GUNICORN_THREADS = _env_int("GUNICORN_THREADS", default=0)
+GUNICORN_TIMEOUT = _env_int("GUNICORN_TIMEOUT", default=30)
+GUNICORN_KEEPALIVE = _env_int("GUNICORN_KEEPALIVE", default=5)
+# Recycle a worker after this many requests (plus up to the jitter); 0: never.
+GUNICORN_MAX_REQUESTS = _env_int("GUNICORN_MAX_REQUESTS", default=1000)
+GUNICORN_MAX_REQUESTS_JITTER = _env_int("GUNICORN_MAX_REQUESTS_JITTER", default=100)
+GUNICORN_PRELOAD = _env_bool("GUNICORN_PRELOAD", default=False)
 
 # django-q2 task queue — PostgreSQL ORM broker (no Redis required)
 Q_CLUSTER = {
@@ -284,6 +384,20 @@ Q_CLUSTER = {
     "orm": "default",
     "sync": not _env_bool("Q_ASYNC", default=True),
 }
+# Opt-in: a queue name moves email delivery to its own queue so slow SMTP
+# retries never delay other tasks (see common.task_queues). Only a qcluster
+# started with ``Q_QUEUE`` set to it serves that queue. Empty (default):
+# everything shares the default queue, so a single qcluster delivers email.
+Q_EMAIL_QUEUE = env.str("Q_EMAIL_QUEUE", default="")
+Q_EMAIL_WORKERS = _env_int("Q_EMAIL_WORKERS", default=1)
+# qcluster processes ``manage.py start`` runs for the default and email queues.
+Q_CLUSTERS = _env_int("Q_CLUSTERS", default=1)
+Q_EMAIL_CLUSTERS = _env_int("Q_EMAIL_CLUSTERS", default=1)
+# Queue served by this qcluster process (set by ``manage.py start``); empty: the
+# default queue.
+Q_QUEUE = env.str("Q_QUEUE", default="")
+if Q_QUEUE and Q_QUEUE == Q_EMAIL_QUEUE:
+    Q_CLUSTER |= {"cluster_name": Q_EMAIL_QUEUE, "workers": Q_EMAIL_WORKERS}
 
 # Site URL for email links (required for password reset emails)
 SITE_URL = env.str("SITE_URL", default="")
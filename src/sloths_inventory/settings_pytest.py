@@ -8,8 +8,17 @@ Note: run tests via `make test` / `make all` so the tooling-only `SECRET_KEY` is
 provided via environment variables.
 """
 
+import os
+
 from .settings import *  # noqa: F401,F403
 
+# ``make bench-sqlite`` runs the benchmark suite without a PostgreSQL server; the
+# regular suite is PostgreSQL-only.
+if os.environ.get("TEST_DATABASE") == "sqlite":
+    DATABASES = {
+        "default": {"ENGINE": "django.db.backends.sqlite3", "NAME": ":memory:"}
+    }
+
 # Static files in tests should not depend on `collectstatic`.
 #
 # The production settings use WhiteNoise's manifest-based storage, which requires a
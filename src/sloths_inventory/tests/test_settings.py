@@ -1,5 +1,6 @@
 import importlib.util
 from types import ModuleType
+from typing import Any
 
 import pytest
 from django.core.exceptions import ImproperlyConfigured
@@ -214,3 +215,118 @@ def test_settings_secure_proxy_ssl_header_requires_both_parts(
     )
 
     assert not hasattr(module, "SECURE_PROXY_SSL_HEADER")
+
+
+def test_settings_database_uses_persistent_connections_by_default(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    for name in ("DATABASE_CONN_MAX_AGE", "DATABASE_CONN_HEALTH_CHECKS"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.delenv("DATABASE_POOL", raising=False)
+
+    module = _load_module_from_path(
+        "sloths_inventory._settings_database_persistent_default_test",
+        sloths_inventory.settings.__file__,
+    )
+    database = module.DATABASES["default"]
+    assert database["CONN_MAX_AGE"] == 60
+    assert database["CONN_HEALTH_CHECKS"] is True
+    assert "pool" not in database["OPTIONS"]
+
+
+def _fake_psycopg_pool(monkeypatch, installed: bool) -> None:
+    find_spec = importlib.util.find_spec
+
+    def fake(name: str, *args: Any) -> Any:
+        if name == "psycopg_pool":
+            return object() if installed else None
+        return find_spec(name, *args)
+
+    monkeypatch.setattr(importlib.util, "find_spec", fake)
+
+
+def test_settings_database_pool_replaces_persistent_connections(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    _fake_psycopg_pool(monkeypatch, installed=True)
+    monkeypatch.setenv("DATABASE_POOL", "1")
+    monkeypatch.setenv("DATABASE_CONN_MAX_AGE", "300")
+    monkeypatch.setenv("DATABASE_POOL_MAX_SIZE", "20")
+
+    module = _load_module_from_path(
+        "sloths_inventory._settings_database_pool_test",
+        sloths_inventory.settings.__file__,
+    )
+    database = module.DATABASES["default"]
+    assert database["CONN_MAX_AGE"] == 0
+    assert database["OPTIONS"]["pool"] == {
+        "min_size": 2,
+        "max_size": 20,
+        "timeout": 10.0,
+    }
+
+
+def test_settings_database_pool_requires_psycopg_pool(tmp_path, monkeypatch) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("DATABASE_POOL", "1")
+    _fake_psycopg_pool(monkeypatch, installed=False)
+
+    with pytest.raises(ImproperlyConfigured, match="psycopg_pool"):
+        _load_module_from_path(
+            "sloths_inventory._settings_database_pool_missing_test",
+            sloths_inventory.settings.__file__,
+        )
+
+
+def test_settings_q_queue_selects_the_email_queue_cluster(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("Q_QUEUE", "email")
+    monkeypatch.setenv("Q_EMAIL_WORKERS", "3")
+    monkeypatch.setenv("Q_EMAIL_QUEUE", "email")
+
+    module = _load_module_from_path(
+        "sloths_inventory._settings_q_queue_test",
+        sloths_inventory.settings.__file__,
+    )
+    assert module.Q_CLUSTER["cluster_name"] == "email"
+    assert module.Q_CLUSTER["workers"] == 3
+    # The name salts task signatures, so every queue's cluster shares it.
+    assert module.Q_CLUSTER["name"] == sloths_inventory.settings.Q_CLUSTER["name"]
+
+
+def test_settings_email_queue_is_opt_in(tmp_path, monkeypatch) -> None:
+    """Unset, email shares the default queue that a plain qcluster serves."""
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("Q_EMAIL_QUEUE", raising=False)
+    monkeypatch.setenv("Q_QUEUE", "email")
+
+    module = _load_module_from_path(
+        "sloths_inventory._settings_email_queue_default_test",
+        sloths_inventory.settings.__file__,
+    )
+    assert module.Q_EMAIL_QUEUE == ""
+    assert "cluster_name" not in module.Q_CLUSTER
+
+
+def test_settings_request_timing_switches_the_template_backend(
+    tmp_path, monkeypatch
+) -> None:
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("REQUEST_TIMING", "1")
+
+    module = _load_module_from_path(
+        "sloths_inventory._settings_request_timing_test",
+        sloths_inventory.settings.__file__,
+    )
+    assert module.TEMPLATES[0]["BACKEND"] == (
+        "common.request_timing.TimedDjangoTemplates"
+    )
+    assert "common.request_timing.RequestTimingMiddleware" in module.MIDDLEWARE
+    assert sloths_inventory.settings.TEMPLATES[0]["BACKEND"] == (
+        "django.template.backends.django.DjangoTemplates"
+    )
@@ -39,6 +39,7 @@ def test_home_and_health_routes_are_wired(monkeypatch) -> None:
     health_index = client.get("/health/")
     assert health_index.status_code == 200
     assert b"liveness" in health_index.content
+    assert b"/health/metrics/" in health_index.content
     assert b"readiness" in health_index.content
 
     assert client.get("/health/liveness/").status_code == 200